@@ -22,6 +22,11 @@ from .embedding_service import (
     EmbeddingService,
     embedding_service,
 )
+from .local_vector_store import (
+    LocalVectorStore,
+    LocalVectorStoreError,
+    get_local_vector_store,
+)
 
 __all__ = [
     # ChromaDB
@@ -31,6 +36,10 @@ __all__ = [
     "Document",
     "QueryResult",
     "get_chroma_adapter",
+    # Local vector store
+    "LocalVectorStore",
+    "LocalVectorStoreError",
+    "get_local_vector_store",
     # Embeddings
     "EmbeddingService",
     "EmbeddingError",
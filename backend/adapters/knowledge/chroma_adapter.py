@@ -4,8 +4,11 @@ ChromaDB adapter for vector storage and retrieval.
 Provides interface for storing and querying document embeddings using ChromaDB HTTP client.
 """
 
+import asyncio
 import logging
 import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
@@ -36,6 +39,18 @@ class QueryResult:
     score: float  # similarity score (0-1, higher is more similar)
 
 
+# user_id -> {source_id: project collection id} (see ChromaAdapter.legacy_source_projects)
+LegacySourceProjects = Callable[[str], Awaitable[dict[str, str]]]
+
+
+def _and_where(*conditions: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Combine Chroma ``where`` filters, skipping empty ones."""
+    present = [c for c in conditions if c]
+    if not present:
+        return None
+    return present[0] if len(present) == 1 else {"$and": present}
+
+
 class ChromaDBError(Exception):
     """Base exception for ChromaDB operations."""
 
@@ -53,13 +68,23 @@ class ChromaAdapter:
     ChromaDB vector store adapter for RAG.
 
     Uses HTTP client to connect to ChromaDB service running in Docker.
+
+    Collection handles are kept in a small LRU keyed by (user, project) so a
+    query costs a single round trip once the collection is known to be
+    populated.  Legacy (pre-CHROMA-C1) collections are probed once per user
+    and copied once, in the background, into the collections of the projects
+    their documents' sources belong to.
     """
 
+    COLLECTION_CACHE_SIZE = 256
+    DEFAULT_MAX_BATCH_SIZE = 5000
+
     def __init__(
         self,
         host: str | None = None,
         port: int | None = None,
         collection_prefix: str | None = None,
+        legacy_source_projects: LegacySourceProjects | None = None,
     ):
         """
         Initialize ChromaDB adapter with HTTP client.
@@ -68,14 +93,27 @@ class ChromaAdapter:
             host: ChromaDB server host (defaults to settings.chroma_host)
             port: ChromaDB server port (defaults to settings.chroma_port)
             collection_prefix: Prefix for collection names (defaults to settings.chroma_collection_prefix)
+            legacy_source_projects: Async lookup of a user's source ids -> project
+                collection, used to route legacy documents (without it they all
+                belong to the personal collection)
         """
         self.host = host or settings.chroma_host
         self.port = port or settings.chroma_port
         self.collection_prefix = collection_prefix or settings.chroma_collection_prefix
+        self.legacy_source_projects = legacy_source_projects
 
         # Thread pool for blocking operations (ChromaDB client is synchronous)
         self._executor = ThreadPoolExecutor(max_workers=4)
 
+        # Collection handle LRU and per-process legacy migration bookkeeping
+        self._collections: OrderedDict[tuple[str, str], chromadb.Collection] = OrderedDict()
+        self._collections_lock = threading.Lock()
+        self._populated: set[tuple[str, str]] = set()
+        self._legacy_by_user: dict[str, chromadb.Collection | None] = {}
+        self._legacy_routes: dict[str, dict[str, str] | None] = {}
+        self._migrations: dict[str, asyncio.Task] = {}
+        self._max_batch_size: int | None = None
+
         try:
             self.client = chromadb.HttpClient(host=self.host, port=self.port)
             # Test connection
@@ -118,6 +156,13 @@ class ChromaAdapter:
         Returns:
             ChromaDB Collection instance
         """
+        key = (user_id, project_id)
+        with self._collections_lock:
+            collection = self._collections.get(key)
+            if collection is not None:
+                self._collections.move_to_end(key)
+                return collection
+
         collection_name = f"{self.collection_prefix}_{user_id}_{project_id}"
 
         try:
@@ -126,11 +171,177 @@ class ChromaAdapter:
                 metadata={"hnsw:space": "cosine"},  # Use cosine similarity
             )
             logger.debug("Retrieved collection: %s", collection_name)
-            return collection
         except Exception as e:
             logger.error("Failed to get collection %s: %s", collection_name, e)
             raise ChromaDBError(f"Could not get collection: {e}")
 
+        with self._collections_lock:
+            self._collections[key] = collection
+            while len(self._collections) > self.COLLECTION_CACHE_SIZE:
+                self._collections.popitem(last=False)
+        return collection
+
+    def _invalidate_collection(self, user_id: str, project_id: str) -> None:
+        """Drop a cached handle so the next access re-resolves the collection."""
+        key = (user_id, project_id)
+        with self._collections_lock:
+            self._collections.pop(key, None)
+        self._populated.discard(key)
+
+    def _get_max_batch_size(self) -> int:
+        """Largest batch the server accepts in one add/upsert call (cached)."""
+        if self._max_batch_size is None:
+            size = None
+            try:
+                size = self.client.get_max_batch_size()
+            except Exception as e:
+                logger.debug("Could not read ChromaDB max batch size: %s", e)
+            self._max_batch_size = (
+                size if isinstance(size, int) and size > 0 else self.DEFAULT_MAX_BATCH_SIZE
+            )
+        return self._max_batch_size
+
+    async def _get_legacy_collection(self, user_id: str) -> "chromadb.Collection | None":
+        """Probe for a user's legacy collection once per process."""
+        if user_id not in self._legacy_by_user:
+            self._legacy_by_user[user_id] = await self._run_in_executor(
+                self._try_get_legacy_collection, user_id
+            )
+        return self._legacy_by_user[user_id]
+
+    async def _get_legacy_routes(self, user_id: str) -> dict[str, str] | None:
+        """Source id -> project collection of the user's sources (None: all personal)."""
+        if self.legacy_source_projects is None:
+            return None
+        if user_id not in self._legacy_routes:
+            self._legacy_routes[user_id] = await self.legacy_source_projects(user_id)
+        return self._legacy_routes[user_id]
+
+    async def _legacy_scope(self, user_id: str, project_id: str) -> dict[str, Any] | None:
+        """
+        ``where`` filter for the legacy documents that belong to *project_id*:
+        ``{}`` for all of them, None when none do.
+        """
+        routes = await self._get_legacy_routes(user_id)
+        if routes is None:
+            return {} if project_id == "personal" else None
+        sources = sorted(source for source, project in routes.items() if project == project_id)
+        return {"source_id": {"$in": sources}} if sources else None
+
+    async def _resolve_query_collection(
+        self, user_id: str, project_id: str
+    ) -> tuple[chromadb.Collection, dict[str, Any] | None]:
+        """
+        Return the collection to query and, for the legacy fallback, the
+        ``where`` scope restricting it to this project's documents.
+
+        Once a project collection is known to hold documents it is used
+        directly.  While it is empty, or the user's legacy per-user collection
+        (CHROMA-C1) is still being copied, a project that owns legacy
+        documents reads them from the legacy collection and the one-time
+        migration is started.  Other projects never see legacy documents.
+        """
+        key = (user_id, project_id)
+        collection = self.get_collection(user_id, project_id)
+        if key in self._populated:
+            return collection, None
+
+        migration = self._migrations.get(user_id)
+        if migration is None or migration.done():
+            count = await self._run_in_executor(collection.count)
+            if count > 0:
+                self._populated.add(key)
+                return collection, None
+
+        try:
+            legacy = await self._get_legacy_collection(user_id)
+            if legacy is None:
+                return collection, None
+            scope = await self._legacy_scope(user_id, project_id)
+        except Exception as e:
+            logger.warning("Could not resolve legacy collection for user %s: %s", user_id, e)
+            return collection, None
+        if scope is None:
+            return collection, None
+
+        self._schedule_legacy_migration(user_id, legacy)
+        return legacy, scope
+
+    def _schedule_legacy_migration(self, user_id: str, legacy: chromadb.Collection) -> None:
+        """Start the one-time copy of a user's legacy collection (once at a time)."""
+        task = self._migrations.get(user_id)
+        if task is not None and not task.done():
+            return
+        self._migrations[user_id] = asyncio.create_task(
+            self._migrate_legacy_collection(user_id, legacy)
+        )
+
+    async def _migrate_legacy_collection(self, user_id: str, legacy: chromadb.Collection) -> None:
+        """
+        Copy documents, embeddings and metadata from the legacy collection in
+        batches, each into the collection of the project its source belongs
+        to.  Documents of sources that no longer exist are left behind, since
+        nothing could delete them from a project collection.  The legacy
+        collection is then renamed so no process migrates it again.
+        """
+        batch_size = self._get_max_batch_size()
+        offset = 0
+        copied = 0
+        skipped = 0
+        targets: set[str] = set()
+        try:
+            routes = await self._get_legacy_routes(user_id)
+            while True:
+                page = await self._run_in_executor(
+                    legacy.get,
+                    limit=batch_size,
+                    offset=offset,
+                    include=["documents", "embeddings", "metadatas"],
+                )
+                ids = list(page.get("ids") or [])
+                if not ids:
+                    break
+                documents = page.get("documents")
+                embeddings = page.get("embeddings")
+                metadatas = page.get("metadatas") or [{}] * len(ids)
+
+                by_project: dict[str, list[int]] = {}
+                for i, metadata in enumerate(metadatas):
+                    source_id = (metadata or {}).get("source_id")
+                    project_id = "personal" if routes is None else routes.get(source_id)
+                    if project_id is None:
+                        skipped += 1
+                    else:
+                        by_project.setdefault(project_id, []).append(i)
+
+                for project_id, rows in by_project.items():
+                    target = self.get_collection(user_id, project_id)
+                    await self._run_in_executor(
+                        target.upsert,
+                        ids=[ids[i] for i in rows],
+                        documents=[documents[i] for i in rows] if documents is not None else None,
+                        embeddings=[embeddings[i] for i in rows],
+                        metadatas=[metadatas[i] for i in rows],
+                    )
+                    targets.add(project_id)
+                    copied += len(rows)
+                offset += len(ids)
+                if len(ids) < batch_size:
+                    break
+
+            await self._run_in_executor(
+                legacy.modify, name=f"{self._legacy_collection_name(user_id)}_migrated"
+            )
+            self._legacy_by_user[user_id] = None
+            self._legacy_routes.pop(user_id, None)
+            self._populated.update((user_id, project_id) for project_id in targets)
+            logger.info(
+                "Migrated %d legacy documents of user %s into %s (%d of deleted sources skipped)",
+                copied, user_id, sorted(targets), skipped,
+            )
+        except Exception as e:
+            logger.error("Legacy collection migration failed for user %s: %s", user_id, e)
+
     async def add_documents(
         self,
         user_id: str,
@@ -167,14 +378,19 @@ class ChromaAdapter:
             contents = [doc.content for doc in documents]
             metadatas = [doc.metadata for doc in documents]
 
-            # ChromaDB add is synchronous, run in executor
-            await self._run_in_executor(
-                collection.add,
-                ids=ids,
-                documents=contents,
-                embeddings=embeddings,
-                metadatas=metadatas,
-            )
+            # Upsert in chunks no larger than the server's max batch size;
+            # upsert keeps retries idempotent. ChromaDB is synchronous, run in executor.
+            batch_size = self._get_max_batch_size()
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                await self._run_in_executor(
+                    collection.upsert,
+                    ids=ids[start:end],
+                    documents=contents[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=metadatas[start:end],
+                )
+            self._populated.add((user_id, project_id))
 
             logger.info(
                 "Added %s documents to collection for user %s / project %s",
@@ -184,6 +400,7 @@ class ChromaAdapter:
 
         except Exception as e:
             logger.error("Failed to add documents to collection: %s", e)
+            self._invalidate_collection(user_id, project_id)
             raise ChromaDBError(f"Could not add documents: {e}")
 
     async def query(
@@ -211,32 +428,26 @@ class ChromaAdapter:
             ChromaDBError: If query fails
         """
         try:
-            collection = self.get_collection(user_id, project_id)
-
             # CHROMA-C1 migration fallback: if the new project-scoped collection
-            # is empty, transparently fall back to the legacy per-user collection
-            # so existing knowledge bases keep working until sources are re-processed.
-            new_count = await self._run_in_executor(collection.count)
-            if new_count == 0:
-                legacy = await self._run_in_executor(
-                    self._try_get_legacy_collection, user_id
+            # is empty, transparently read this project's documents from the
+            # legacy per-user collection while it is copied over in the background.
+            collection, legacy_scope = await self._resolve_query_collection(user_id, project_id)
+            where = filter_metadata
+            if legacy_scope is not None:
+                logger.warning(
+                    "Collection %r_%s_%s is empty — falling back to legacy "
+                    "collection %r while it is migrated.",
+                    self.collection_prefix, user_id, project_id,
+                    self._legacy_collection_name(user_id),
                 )
-                if legacy is not None:
-                    logger.warning(
-                        "Collection %r_%s_%s is empty — falling back to legacy "
-                        "collection %r (%d docs). Re-process knowledge sources to migrate.",
-                        self.collection_prefix, user_id, project_id,
-                        self._legacy_collection_name(user_id),
-                        legacy.count(),
-                    )
-                    collection = legacy
+                where = _and_where(filter_metadata, legacy_scope)
 
             # Query is synchronous, run in executor
             results = await self._run_in_executor(
                 collection.query,
                 query_embeddings=[query_embedding],
                 n_results=n_results,
-                where=filter_metadata,
+                where=where,
             )
 
             # Parse results
@@ -264,6 +475,7 @@ class ChromaAdapter:
 
         except Exception as e:
             logger.error("Failed to query collection: %s", e)
+            self._invalidate_collection(user_id, project_id)
             raise ChromaDBError(f"Query failed: {e}")
 
     async def delete_document(
@@ -327,6 +539,107 @@ class ChromaAdapter:
             logger.error("Failed to delete documents by source %s: %s", source_id, e)
             return 0
 
+    async def get_source_chunks(
+        self, user_id: str, source_id: str, project_id: str = "personal"
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """
+        List the stored chunks of a source as ``(document_id, metadata)``.
+
+        Only ids and metadata are fetched (no documents or embeddings), so this
+        is cheap enough to run before every reprocess.  Chunks stored before
+        content hashing existed have no ``content_hash`` in their metadata.
+
+        Args:
+            user_id: User ID
+            source_id: Source document ID
+            project_id: Project ID for collection isolation (default ``"personal"``)
+
+        Returns:
+            List of (document_id, metadata) tuples
+
+        Raises:
+            ChromaDBError: If the lookup fails
+        """
+        try:
+            collection = self.get_collection(user_id, project_id)
+            results = await self._run_in_executor(
+                collection.get, where={"source_id": source_id}, include=["metadatas"]
+            )
+            ids = results.get("ids") or []
+            metadatas = results.get("metadatas") or []
+            return [
+                (doc_id, dict((metadatas[i] if i < len(metadatas) else None) or {}))
+                for i, doc_id in enumerate(ids)
+            ]
+
+        except Exception as e:
+            logger.error("Failed to list chunks for source %s: %s", source_id, e)
+            raise ChromaDBError(f"Could not list source chunks: {e}")
+
+    async def update_metadata(
+        self,
+        user_id: str,
+        document_ids: list[str],
+        metadatas: list[dict[str, Any]],
+        project_id: str = "personal",
+    ) -> None:
+        """
+        Replace the metadata of existing documents without re-embedding them.
+
+        Args:
+            user_id: User ID
+            document_ids: Document IDs to update
+            metadatas: New metadata dicts (must match document_ids length)
+            project_id: Project ID for collection isolation (default ``"personal"``)
+
+        Raises:
+            ChromaDBError: If the update fails
+        """
+        if len(document_ids) != len(metadatas):
+            raise ValueError("Document IDs and metadatas lists must have the same length")
+
+        if not document_ids:
+            return
+
+        try:
+            collection = self.get_collection(user_id, project_id)
+            await self._run_in_executor(collection.update, ids=document_ids, metadatas=metadatas)
+
+        except Exception as e:
+            logger.error("Failed to update document metadata: %s", e)
+            raise ChromaDBError(f"Could not update documents: {e}")
+
+    async def delete_documents(
+        self, user_id: str, document_ids: list[str], project_id: str = "personal"
+    ) -> int:
+        """
+        Delete several documents from the collection in a single call.
+
+        Args:
+            user_id: User ID
+            document_ids: Document IDs to delete
+            project_id: Project ID for collection isolation (default ``"personal"``)
+
+        Returns:
+            Number of documents deleted (0 on failure)
+        """
+        if not document_ids:
+            return 0
+
+        try:
+            collection = self.get_collection(user_id, project_id)
+            await self._run_in_executor(collection.delete, ids=document_ids)
+
+            logger.info(
+                "Deleted %s documents from collection for user %s / project %s",
+                len(document_ids), user_id, project_id,
+            )
+            return len(document_ids)
+
+        except Exception as e:
+            logger.error("Failed to delete %s documents: %s", len(document_ids), e)
+            return 0
+
     async def get_collection_stats(
         self, user_id: str, project_id: str = "personal"
     ) -> dict[str, Any]:
@@ -347,12 +660,16 @@ class ChromaAdapter:
             # If new collection is empty, report legacy count so callers know
             # data exists but needs re-processing.
             legacy_count = 0
-            if count == 0:
-                legacy = await self._run_in_executor(
-                    self._try_get_legacy_collection, user_id
-                )
-                if legacy is not None:
+            if count > 0:
+                self._populated.add((user_id, project_id))
+            else:
+                legacy = await self._get_legacy_collection(user_id)
+                scope = await self._legacy_scope(user_id, project_id) if legacy else None
+                if scope == {}:
                     legacy_count = await self._run_in_executor(legacy.count)
+                elif scope is not None:
+                    page = await self._run_in_executor(legacy.get, where=scope, include=[])
+                    legacy_count = len(page.get("ids") or [])
 
             return {
                 "collection_name": f"{self.collection_prefix}_{user_id}_{project_id}",
@@ -382,6 +699,7 @@ class ChromaAdapter:
             collection_name = f"{self.collection_prefix}_{user_id}_{project_id}"
 
             # Delete is synchronous, run in executor
+            self._invalidate_collection(user_id, project_id)
             await self._run_in_executor(self.client.delete_collection, name=collection_name)
 
             logger.info("Deleted collection %s", collection_name)
@@ -4,6 +4,7 @@ Document processor for extracting and chunking text from various file types.
 Supports PDF, TXT, Markdown, DOCX, and HTML files.
 """
 
+import hashlib
 import logging
 import re
 from dataclasses import dataclass
@@ -274,9 +275,12 @@ class DocumentProcessor:
 
     def chunk_text(self, text: str) -> list[ProcessedChunk]:
         """
-        Split text into overlapping chunks.
+        Split text into overlapping chunks at content-defined sentence boundaries.
 
-        Uses sentence boundaries when possible for better semantic coherence.
+        Whether a chunk may end after a sentence depends only on that sentence
+        (see ``is_content_boundary``), not on where the chunk started, so an
+        edit moves at most the boundaries next to it and the rest of the
+        document chunks exactly as before.
 
         Args:
             text: Text to chunk
@@ -284,58 +288,67 @@ class DocumentProcessor:
         Returns:
             List of ProcessedChunk objects
         """
-        chunks = []
-        chunk_index = 0
-
         # Clean up excessive whitespace
         text = re.sub(r"\s+", " ", text).strip()
 
         if not text:
-            return chunks
-
-        start = 0
-        while start < len(text):
-            # Calculate end position
-            end = min(start + self.chunk_size, len(text))
-
-            # If this isn't the last chunk, try to break at a sentence boundary
-            if end < len(text):
-                # Look for sentence endings near the chunk boundary
-                search_start = max(start, end - 100)
-                search_end = min(len(text), end + 100)
-                search_text = text[search_start:search_end]
+            return []
+
+        # Sentence spans; sentences longer than a chunk are sliced
+        units: list[tuple[int, int]] = []
+        sentence_start = 0
+        for end in [m.end() for m in re.finditer(r"[.!?]\s+", text)] + [len(text)]:
+            for start in range(sentence_start, end, self.chunk_size):
+                units.append((start, min(start + self.chunk_size, end)))
+            sentence_start = end
+
+        min_size = self.chunk_size // 4
+        max_size = self.chunk_size * 2
+        target = self.chunk_size - min_size
+        bounds: list[tuple[int, int]] = []
+        chunk_start = 0
+        for start, end in units:
+            if start > chunk_start and end - chunk_start > max_size:
+                bounds.append((chunk_start, start))
+                chunk_start = start
+            if end - chunk_start >= min_size and is_content_boundary(text[start:end], end - start, target):
+                bounds.append((chunk_start, end))
+                chunk_start = end
+        if chunk_start < len(text):
+            bounds.append((chunk_start, len(text)))
 
-                # Find sentence boundaries (. ! ? followed by space or newline)
-                sentence_endings = [m.end() for m in re.finditer(r"[.!?]\s+", search_text)]
-
-                if sentence_endings:
-                    # Use the sentence ending closest to our target
-                    best_ending = min(sentence_endings, key=lambda x: abs(x - (end - search_start)))
-                    end = search_start + best_ending
-
-            # Extract chunk
+        chunks = []
+        for start, end in bounds:
+            if chunks and self.chunk_overlap:
+                # Overlap with the previous chunk's tail, from a word boundary
+                overlap_start = max(start - self.chunk_overlap, 0)
+                space = text.find(" ", overlap_start, start)
+                start = space + 1 if space != -1 else overlap_start
             chunk_text = text[start:end].strip()
-
             if chunk_text:
                 chunks.append(
                     ProcessedChunk(
                         content=chunk_text,
-                        chunk_index=chunk_index,
+                        chunk_index=len(chunks),
                         start_char=start,
                         end_char=end,
                         metadata={},
                     )
                 )
-                chunk_index += 1
 
-            # Move to next chunk with overlap
-            start = end - self.chunk_overlap
+        return chunks
 
-            # Prevent infinite loop
-            if start >= len(text):
-                break
 
-        return chunks
+def is_content_boundary(unit: str, unit_size: int, target_size: int) -> bool:
+    """
+    Whether a chunk may end after *unit* (a sentence or paragraph).
+
+    Decided by a hash of the unit's own text, true with probability
+    unit_size / target_size, so chunks average *target_size* whatever the
+    unit sizes while the boundaries stay put when other text changes.
+    """
+    digest = hashlib.blake2b(unit.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") < unit_size / target_size * 2**64
 
 
 # Singleton instance
@@ -0,0 +1,837 @@
+"""
+In-process vector store for RAG, an alternative to the ChromaDB HTTP server.
+
+Each (user, project) collection is a directory holding:
+
+- ``vectors.f32`` — a row-major float32 matrix of L2-normalised embeddings,
+  appended to on write and memory-mapped for search.
+- ``documents.jsonl`` — an append-only log of add/update/delete records that
+  is replayed on load and compacted once too many rows are tombstoned.
+- ``lock`` — an ``flock`` target that serialises writers across worker
+  processes; each process replays the log records others appended.
+
+Compaction writes both files in full under ``.tmp`` names and renames the
+vectors before the log; a crash part-way is finished or undone on the next
+access (see ``_LocalCollection._recover``).
+
+Small collections are searched with a brute-force NumPy dot product.  Above
+``ann_threshold`` rows an IVF (inverted file) index built with a few k-means
+iterations restricts the scan to the closest clusters.  The index is built
+in a background thread once a write (or a query on a freshly loaded
+collection) finds it missing or stale; queries keep using the previous index
+plus the rows appended since, or a brute-force scan, until it is swapped in.
+
+The public interface mirrors ``ChromaAdapter`` so ``KnowledgeService`` can
+use either backend (see ``settings.vector_store_backend``).
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from infrastructure.config.settings import settings
+
+from .chroma_adapter import ChromaDBError, Document, QueryResult
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+DOCUMENTS_FILE = "documents.jsonl"
+LOCK_FILE = "lock"
+
+# Rewrite the collection once this fraction of rows is tombstoned
+COMPACT_RATIO = 0.25
+# Rebuild the IVF index once this fraction of rows was added since the last build
+REINDEX_RATIO = 0.1
+KMEANS_ITERATIONS = 8
+IVF_NPROBE = 8
+
+
+class LocalVectorStoreError(ChromaDBError):
+    """Local vector store error (subclasses ChromaDBError for drop-in handling)."""
+
+    pass
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so a dot product equals cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make renames within *path* durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_durably(path: Path, data: bytes) -> None:
+    with open(path, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _matches(metadata: dict[str, Any], where: dict[str, Any]) -> bool:
+    """Evaluate the subset of Chroma's ``where`` syntax used by this codebase."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class _IVFIndex:
+    """Inverted-file index over a snapshot of collection rows."""
+
+    def __init__(self, vectors: np.ndarray, rows: np.ndarray, seed: int = 0):
+        nlist = max(1, int(np.sqrt(len(rows))))
+        rng = np.random.default_rng(seed)
+        data = np.asarray(vectors[rows], dtype=np.float32)
+        centroids = data[rng.choice(len(rows), size=nlist, replace=False)]
+
+        for _ in range(KMEANS_ITERATIONS):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        assign = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+        self.centroids = centroids
+        self.lists = [rows[order[bounds[i] : bounds[i + 1]]] for i in range(nlist)]
+        # Rows at or beyond this position were appended after the build
+        self.size = int(rows[-1]) + 1
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Rows in the clusters closest to *query* (about a tenth of the lists)."""
+        scores = self.centroids @ query
+        nprobe = min(max(IVF_NPROBE, len(self.lists) // 10), len(self.lists))
+        closest = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return np.concatenate([self.lists[i] for i in closest])
+
+
+class _LocalCollection:
+    """
+    A single on-disk collection (one per user/project).
+
+    Several worker processes may open the same collection.  Every operation
+    holds an ``flock`` on the collection's lock file (exclusive to write,
+    shared to read) and first replays whatever other processes appended to
+    the log since this process last looked; a compaction elsewhere (new log
+    inode) triggers a full reload.  Add records carry the vector row they
+    start at, and a writer truncates both files back to the last complete
+    log record before appending, so a write torn by a crash is dropped
+    rather than shifting later rows.
+    """
+
+    def __init__(self, path: Path, ann_threshold: int):
+        self.path = path
+        self.ann_threshold = ann_threshold
+        self.lock = threading.RLock()
+        self._generation = 0
+        self._indexing = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self.dim: int | None = None
+        self.ids: list[str] = []
+        self.documents: list[str] = []
+        self.metadatas: list[dict[str, Any]] = []
+        self.alive: list[bool] = []
+        self.row_by_id: dict[str, int] = {}
+        self.rows_by_source: dict[str, set[int]] = defaultdict(set)
+        self._vectors: np.ndarray | None = None
+        self._ivf: _IVFIndex | None = None
+        self._log_inode: int | None = None
+        self._log_offset = 0
+        # Row numbers change on reload, so indexes built before it are discarded
+        self._generation += 1
+
+    # -- persistence ---------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.path / VECTORS_FILE
+
+    @property
+    def _log_path(self) -> Path:
+        return self.path / DOCUMENTS_FILE
+
+    @property
+    def _compact_paths(self) -> tuple[Path, Path]:
+        """Temporary vectors and log files written by a compaction."""
+        return self._vectors_path.with_suffix(".tmp"), self._log_path.with_suffix(".tmp")
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False) -> Iterator[None]:
+        """Hold the thread and file locks with in-memory state synced to disk."""
+        with self.lock:
+            if not exclusive and not self.path.exists():
+                self._sync()
+                yield
+                return
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.path / LOCK_FILE, "a+b") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    self._sync()
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Apply the log records written since the last sync (by any process)."""
+        self._recover()
+        try:
+            stat = self._log_path.stat()
+        except FileNotFoundError:
+            if self._log_inode is not None:
+                self._reset()
+            return
+        if stat.st_ino != self._log_inode or stat.st_size < self._log_offset:
+            self._reset()
+            self._log_inode = stat.st_ino
+        if stat.st_size == self._log_offset:
+            return
+        with open(self._log_path, "rb") as fh:
+            fh.seek(self._log_offset)
+            data = fh.read(stat.st_size - self._log_offset)
+        # A trailing record without its newline is a torn write: ignore it
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._log_offset += complete
+        self._remap()
+
+    def _recover(self) -> None:
+        """
+        Finish or undo a compaction interrupted by a crash (caller holds a file
+        lock, so no compaction is running).  A leftover temporary vectors file
+        means the crash came before the switch and the old files are intact;
+        a temporary log on its own means the compacted vectors are already in
+        place and only their log still has to be renamed over the old one.
+        """
+        tmp_vectors, tmp_log = self._compact_paths
+        if tmp_vectors.exists():
+            # The log goes first, so no reader ever sees only the log left over
+            tmp_log.unlink(missing_ok=True)
+            tmp_vectors.unlink(missing_ok=True)
+        elif tmp_log.exists():
+            try:
+                tmp_log.replace(self._log_path)
+            except FileNotFoundError:
+                return  # another reader finished it
+            _fsync_dir(self.path)
+            logger.warning("Finished an interrupted compaction of %s", self.path.name)
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "add":
+            if record.get("row", len(self.ids)) != len(self.ids):
+                raise LocalVectorStoreError(
+                    f"Log of {self.path.name} is out of line with its vectors "
+                    f"(record at row {record['row']}, expected {len(self.ids)})"
+                )
+            self.dim = record["dim"]
+            for doc_id, content, metadata in zip(
+                record["ids"], record["documents"], record["metadatas"], strict=True
+            ):
+                self._drop(doc_id)
+                row = len(self.ids)
+                self.ids.append(doc_id)
+                self.documents.append(content)
+                self.metadatas.append(metadata)
+                self.alive.append(True)
+                self.row_by_id[doc_id] = row
+                if metadata.get("source_id") is not None:
+                    self.rows_by_source[metadata["source_id"]].add(row)
+        elif op == "update":
+            for doc_id, metadata in zip(record["ids"], record["metadatas"], strict=True):
+                row = self.row_by_id.get(doc_id)
+                if row is None:
+                    continue
+                old_source = self.metadatas[row].get("source_id")
+                if old_source is not None:
+                    self.rows_by_source[old_source].discard(row)
+                self.metadatas[row] = metadata
+                if metadata.get("source_id") is not None:
+                    self.rows_by_source[metadata["source_id"]].add(row)
+        elif op == "delete":
+            for doc_id in record["ids"]:
+                self._drop(doc_id)
+
+    def _drop(self, doc_id: str) -> None:
+        row = self.row_by_id.pop(doc_id, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        source_id = self.metadatas[row].get("source_id")
+        if source_id is not None:
+            self.rows_by_source[source_id].discard(row)
+
+    def _append_log(self, record: dict[str, Any]) -> None:
+        """Append *record* after the last complete one (caller holds the exclusive lock)."""
+        with open(self._log_path, "ab") as fh:
+            fh.truncate(self._log_offset)
+            fh.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            fh.flush()
+            self._log_inode = os.fstat(fh.fileno()).st_ino
+            self._log_offset = fh.tell()
+        self._apply(record)
+
+    def _remap(self) -> None:
+        """(Re)open the memory map after the vectors file changed size."""
+        rows = len(self.ids)
+        if rows == 0 or self.dim is None or not self._vectors_path.exists():
+            self._vectors = None
+            return
+        if self._vectors_path.stat().st_size < rows * self.dim * 4:
+            raise LocalVectorStoreError(f"Vectors of {self.path.name} are shorter than its log")
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)
+        )
+
+    def _compact(self) -> None:
+        """Rewrite the collection without tombstoned rows (caller holds the exclusive lock)."""
+        keep = [row for row, alive in enumerate(self.alive) if alive]
+        vectors = np.array(self._vectors[keep]) if self._vectors is not None else None
+        record = {
+            "op": "add",
+            "row": 0,
+            "dim": self.dim,
+            "ids": [self.ids[r] for r in keep],
+            "documents": [self.documents[r] for r in keep],
+            "metadatas": [self.metadatas[r] for r in keep],
+        }
+
+        # Both files are durable before either replaces the live one, and the
+        # log is renamed last: until then the old log still describes the old
+        # vectors, or _recover completes the switch
+        tmp_vectors, tmp_log = self._compact_paths
+        _write_durably(
+            tmp_vectors, vectors.astype(np.float32).tobytes() if vectors is not None else b""
+        )
+        _write_durably(tmp_log, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        tmp_vectors.replace(self._vectors_path)
+        _fsync_dir(self.path)
+        tmp_log.replace(self._log_path)
+        _fsync_dir(self.path)
+
+        # Other processes see the new log inode and reload on their next sync
+        self._reset()
+        self._sync()
+        logger.info("Compacted local vector collection %s (%d rows)", self.path.name, len(keep))
+
+    def _maybe_compact(self) -> None:
+        dead = len(self.alive) - len(self.row_by_id)
+        if self.alive and dead / len(self.alive) > COMPACT_RATIO:
+            self._compact()
+
+    # -- operations ----------------------------------------------------------
+
+    def count(self) -> int:
+        with self._locked():
+            return len(self.row_by_id)
+
+    def add(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        matrix = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._locked(exclusive=True):
+            if self.dim is not None and matrix.shape[1] != self.dim:
+                raise LocalVectorStoreError(
+                    f"Embedding dimension {matrix.shape[1]} does not match collection ({self.dim})"
+                )
+            row = len(self.ids)
+            self._vectors = None
+            # Vectors first, durably, then the log record that makes them visible;
+            # rows left over from a torn write are cut off here
+            with open(self._vectors_path, "ab") as fh:
+                fh.truncate(row * matrix.shape[1] * 4)
+                fh.write(matrix.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._append_log(
+                {
+                    "op": "add",
+                    "row": row,
+                    "dim": int(matrix.shape[1]),
+                    "ids": ids,
+                    "documents": documents,
+                    "metadatas": metadatas,
+                }
+            )
+            self._remap()
+            self._maybe_compact()
+            self._schedule_index()
+
+    def update(self, ids: list[str], metadatas: list[dict[str, Any]]) -> None:
+        with self._locked(exclusive=True):
+            self._append_log({"op": "update", "ids": ids, "metadatas": metadatas})
+
+    def delete(self, ids: list[str]) -> int:
+        with self._locked(exclusive=True):
+            present = [doc_id for doc_id in ids if doc_id in self.row_by_id]
+            if not present:
+                return 0
+            self._append_log({"op": "delete", "ids": present})
+            self._maybe_compact()
+            return len(present)
+
+    def delete_source(self, source_id: str) -> int:
+        with self._locked(exclusive=True):
+            rows = self.rows_matching({"source_id": source_id})
+            present = [self.ids[row] for row in rows]
+            if not present:
+                return 0
+            self._append_log({"op": "delete", "ids": present})
+            self._maybe_compact()
+            return len(present)
+
+    def source_chunks(self, source_id: str) -> list[tuple[str, dict[str, Any]]]:
+        with self._locked():
+            return [
+                (self.ids[row], dict(self.metadatas[row]))
+                for row in self.rows_matching({"source_id": source_id})
+            ]
+
+    def rows_matching(self, where: dict[str, Any] | None) -> np.ndarray:
+        """Alive row numbers matching *where* (source_id filters use the index)."""
+        if not where:
+            return np.fromiter(self.row_by_id.values(), dtype=np.int64)
+        if set(where) == {"source_id"}:
+            condition = where["source_id"]
+            if isinstance(condition, dict) and set(condition) == {"$in"}:
+                sources = condition["$in"]
+            elif isinstance(condition, dict) and set(condition) == {"$eq"}:
+                sources = [condition["$eq"]]
+            elif not isinstance(condition, dict):
+                sources = [condition]
+            else:
+                sources = None
+            if sources is not None:
+                rows = set().union(*(self.rows_by_source.get(s, set()) for s in sources))
+                return np.fromiter(sorted(rows), dtype=np.int64)
+        return np.fromiter(
+            (row for row in self.row_by_id.values() if _matches(self.metadatas[row], where)),
+            dtype=np.int64,
+        )
+
+    def search(
+        self,
+        query: np.ndarray,
+        n_results: int,
+        where: dict[str, Any] | None,
+    ) -> list[tuple[str, str, dict[str, Any], float]]:
+        """Top matches as (id, document, metadata, score), most similar first."""
+        with self._locked():
+            if self._vectors is None or not self.row_by_id:
+                return []
+            rows = self.rows_matching(where)
+            if len(rows) == 0:
+                return []
+
+            if len(rows) > self.ann_threshold:
+                self._schedule_index()
+                ivf = self._ivf
+                if ivf is not None:
+                    # Rows appended after the last index build are always scanned
+                    tail = np.arange(ivf.size, len(self.ids), dtype=np.int64)
+                    candidates = np.concatenate([ivf.candidates(query), tail])
+                    rows = np.intersect1d(candidates, rows, assume_unique=False)
+                    if len(rows) == 0:
+                        return []
+
+            scores = self._vectors[rows] @ query
+            k = min(n_results, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = []
+            for i in top:
+                row = int(rows[i])
+                hits.append((self.ids[row], self.documents[row], self.metadatas[row], float(scores[i])))
+            return hits
+
+    def destroy(self) -> None:
+        """Remove the collection from disk; other processes reset on their next sync."""
+        with self.lock:
+            if not self.path.exists():
+                return
+            with open(self.path / LOCK_FILE, "a+b") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                self._log_path.unlink(missing_ok=True)
+                self._vectors_path.unlink(missing_ok=True)
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._reset()
+
+    def _schedule_index(self) -> None:
+        """Start a background IVF build if the index is missing or stale (caller holds the lock)."""
+        if self._indexing or self._vectors is None or len(self.row_by_id) <= self.ann_threshold:
+            return
+        ivf = self._ivf
+        if ivf is not None and len(self.ids) - ivf.size <= ivf.size * REINDEX_RATIO:
+            return
+        self._indexing = True
+        threading.Thread(
+            target=self._build_index,
+            args=(self._vectors, list(self.row_by_id.values()), self._generation),
+            name=f"ivf-{self.path.name}",
+            daemon=True,
+        ).start()
+
+    def _build_index(self, vectors: np.ndarray, rows: list[int], generation: int) -> None:
+        """Build an index over a snapshot of rows and swap it in unless the collection reloaded."""
+        try:
+            ivf = _IVFIndex(vectors, np.array(sorted(rows), dtype=np.int64))
+        except Exception as e:
+            logger.error("Failed to build IVF index for %s: %s", self.path.name, e)
+            ivf = None
+        with self.lock:
+            self._indexing = False
+            if ivf is None or generation != self._generation:
+                return
+            self._ivf = ivf
+        logger.info(
+            "Built IVF index for %s: %d rows, %d lists", self.path.name, len(rows), len(ivf.lists)
+        )
+
+
+class LocalVectorStore:
+    """
+    Embedded vector store with the same async interface as ``ChromaAdapter``.
+
+    Collections live under ``persist_directory`` and are loaded lazily on
+    first use.  No external service is required.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str | None = None,
+        collection_prefix: str | None = None,
+        ann_threshold: int | None = None,
+    ):
+        """
+        Initialize the local vector store.
+
+        Args:
+            persist_directory: Root directory for collections
+                (defaults to settings.local_vector_store_dir)
+            collection_prefix: Prefix for collection names
+                (defaults to settings.chroma_collection_prefix)
+            ann_threshold: Row count above which queries use the IVF index
+                (defaults to settings.local_vector_ann_threshold)
+        """
+        self.persist_directory = Path(persist_directory or settings.local_vector_store_dir)
+        self.collection_prefix = collection_prefix or settings.chroma_collection_prefix
+        self.ann_threshold = ann_threshold or settings.local_vector_ann_threshold
+        self._collections: dict[str, _LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def _collection_name(self, user_id: str, project_id: str) -> str:
+        return f"{self.collection_prefix}_{user_id}_{project_id}"
+
+    def get_collection(self, user_id: str, project_id: str = "personal") -> _LocalCollection:
+        """
+        Get or load a project-scoped collection.
+
+        Args:
+            user_id: User ID
+            project_id: Project ID (use ``"personal"`` for personal/non-project sources)
+
+        Returns:
+            Local collection instance
+        """
+        name = self._collection_name(user_id, project_id)
+        if not re.fullmatch(r"[\w\-]+", name):
+            raise LocalVectorStoreError(f"Invalid collection name: {name}")
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = _LocalCollection(self.persist_directory / name, self.ann_threshold)
+                self._collections[name] = collection
+            return collection
+
+    async def add_documents(
+        self,
+        user_id: str,
+        documents: list[Document],
+        embeddings: list[list[float]],
+        project_id: str = "personal",
+    ) -> list[str]:
+        """
+        Add documents with their embeddings to the collection.
+
+        Args:
+            user_id: User ID
+            documents: List of documents to add
+            embeddings: List of embedding vectors (must match documents length)
+            project_id: Project ID for collection isolation (default ``"personal"``)
+
+        Returns:
+            List of document IDs that were added
+
+        Raises:
+            LocalVectorStoreError: If adding documents fails
+        """
+        if len(documents) != len(embeddings):
+            raise ValueError("Documents and embeddings lists must have the same length")
+
+        if not documents:
+            return []
+
+        try:
+            collection = self.get_collection(user_id, project_id)
+            ids = [doc.id for doc in documents]
+            await asyncio.to_thread(
+                collection.add,
+                ids,
+                [doc.content for doc in documents],
+                embeddings,
+                [doc.metadata for doc in documents],
+            )
+            logger.info(
+                "Added %s documents to local collection for user %s / project %s",
+                len(documents), user_id, project_id,
+            )
+            return ids
+
+        except Exception as e:
+            logger.error("Failed to add documents to local collection: %s", e)
+            raise LocalVectorStoreError(f"Could not add documents: {e}")
+
+    async def query(
+        self,
+        user_id: str,
+        query_embedding: list[float],
+        n_results: int = 5,
+        filter_metadata: dict | None = None,
+        project_id: str = "personal",
+    ) -> list[QueryResult]:
+        """
+        Query similar documents using cosine similarity.
+
+        Searches run in a worker thread: they take the collection's file lock
+        and may first replay writes made by other processes.
+
+        Args:
+            user_id: User ID
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_metadata: Optional metadata filter (Chroma ``where`` syntax)
+            project_id: Project ID for collection isolation (default ``"personal"``)
+
+        Returns:
+            List of query results sorted by similarity (most similar first)
+
+        Raises:
+            LocalVectorStoreError: If query fails
+        """
+        try:
+            collection = self.get_collection(user_id, project_id)
+            query = _normalize(np.asarray([query_embedding], dtype=np.float32))[0]
+
+            hits = await asyncio.to_thread(
+                collection.search, query, n_results, filter_metadata
+            )
+
+            return [
+                QueryResult(document_id=doc_id, content=content, metadata=metadata, score=score)
+                for doc_id, content, metadata, score in hits
+            ]
+
+        except Exception as e:
+            logger.error("Failed to query local collection: %s", e)
+            raise LocalVectorStoreError(f"Query failed: {e}")
+
+    async def delete_document(
+        self, user_id: str, document_id: str, project_id: str = "personal"
+    ) -> bool:
+        """
+        Delete a document from the collection.
+
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        return await self.delete_documents(user_id, [document_id], project_id) > 0
+
+    async def delete_documents(
+        self, user_id: str, document_ids: list[str], project_id: str = "personal"
+    ) -> int:
+        """
+        Delete several documents from the collection in a single call.
+
+        Returns:
+            Number of documents deleted (0 on failure)
+        """
+        if not document_ids:
+            return 0
+
+        try:
+            collection = self.get_collection(user_id, project_id)
+            return await asyncio.to_thread(collection.delete, document_ids)
+
+        except Exception as e:
+            logger.error("Failed to delete %s documents: %s", len(document_ids), e)
+            return 0
+
+    async def delete_by_source(
+        self, user_id: str, source_id: str, project_id: str = "personal"
+    ) -> int:
+        """
+        Delete all chunks from a source document.
+
+        Returns:
+            Number of documents deleted
+        """
+        try:
+            collection = self.get_collection(user_id, project_id)
+            return await asyncio.to_thread(collection.delete_source, source_id)
+
+        except Exception as e:
+            logger.error("Failed to delete documents by source %s: %s", source_id, e)
+            return 0
+
+    async def get_source_chunks(
+        self, user_id: str, source_id: str, project_id: str = "personal"
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """
+        List the stored chunks of a source as ``(document_id, metadata)``.
+
+        Raises:
+            LocalVectorStoreError: If the lookup fails
+        """
+        try:
+            collection = self.get_collection(user_id, project_id)
+            return await asyncio.to_thread(collection.source_chunks, source_id)
+
+        except Exception as e:
+            logger.error("Failed to list chunks for source %s: %s", source_id, e)
+            raise LocalVectorStoreError(f"Could not list source chunks: {e}")
+
+    async def update_metadata(
+        self,
+        user_id: str,
+        document_ids: list[str],
+        metadatas: list[dict[str, Any]],
+        project_id: str = "personal",
+    ) -> None:
+        """
+        Replace the metadata of existing documents without re-embedding them.
+
+        Raises:
+            LocalVectorStoreError: If the update fails
+        """
+        if len(document_ids) != len(metadatas):
+            raise ValueError("Document IDs and metadatas lists must have the same length")
+
+        if not document_ids:
+            return
+
+        try:
+            collection = self.get_collection(user_id, project_id)
+            await asyncio.to_thread(collection.update, document_ids, metadatas)
+
+        except Exception as e:
+            logger.error("Failed to update document metadata: %s", e)
+            raise LocalVectorStoreError(f"Could not update documents: {e}")
+
+    async def get_collection_stats(
+        self, user_id: str, project_id: str = "personal"
+    ) -> dict[str, Any]:
+        """
+        Get stats about a user/project collection.
+
+        Returns:
+            Dictionary with collection statistics (same keys as ``ChromaAdapter``)
+        """
+        try:
+            collection = self.get_collection(user_id, project_id)
+            return {
+                "collection_name": self._collection_name(user_id, project_id),
+                "document_count": await asyncio.to_thread(collection.count),
+                "user_id": user_id,
+                "project_id": project_id,
+                "legacy_docs": 0,
+            }
+
+        except Exception as e:
+            logger.error("Failed to get collection stats: %s", e)
+            raise LocalVectorStoreError(f"Could not get collection stats: {e}")
+
+    async def delete_collection(self, user_id: str, project_id: str = "personal") -> bool:
+        """
+        Delete an entire project-scoped collection from disk.
+
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        try:
+            name = self._collection_name(user_id, project_id)
+            collection = self.get_collection(user_id, project_id)
+            with self._lock:
+                self._collections.pop(name, None)
+            await asyncio.to_thread(collection.destroy)
+            logger.info("Deleted local collection %s", name)
+            return True
+
+        except Exception as e:
+            logger.error("Failed to delete collection: %s", e)
+            return False
+
+
+# Lazy singleton - only instantiated when actually needed
+_local_vector_store: LocalVectorStore | None = None
+_local_lock = threading.Lock()
+
+
+def get_local_vector_store() -> LocalVectorStore:
+    """Get or create the LocalVectorStore singleton."""
+    global _local_vector_store
+    if _local_vector_store is None:
+        with _local_lock:
+            if _local_vector_store is None:
+                _local_vector_store = LocalVectorStore()
+    return _local_vector_store
@@ -7,6 +7,7 @@ from .gsc_adapter import (
     GSCAuthError,
     GSCCredentials,
     GSCQuotaError,
+    close_gsc_client,
     create_gsc_adapter,
 )
 
@@ -16,5 +17,6 @@ __all__ = [
     "GSCAuthError",
     "GSCAPIError",
     "GSCQuotaError",
+    "close_gsc_client",
     "create_gsc_adapter",
 ]
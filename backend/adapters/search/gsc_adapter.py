@@ -3,22 +3,60 @@ Google Search Console OAuth adapter for fetching SEO analytics data.
 
 Provides integration with Google Search Console API for retrieving
 search performance data, keyword rankings, and page-level analytics.
+
+The adapter talks to the Search Console REST API directly with httpx, so
+no call blocks the event loop: there is no discovery document to fetch or
+service object to build per call, connections are pooled across adapters,
+and refreshed access tokens are reused by every call made with the same
+refresh token.
 """
 
+import asyncio
+import hashlib
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
-from typing import Any
-from urllib.parse import urlencode
+from typing import Any, Protocol
+from urllib.parse import quote, urlencode
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import httpx
 
 from infrastructure.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+GSC_API_BASE = "https://searchconsole.googleapis.com"
+REQUEST_TIMEOUT = 30.0
+MAX_CONCURRENT_REQUESTS = 5  # in-flight API calls per adapter
+MAX_ROW_LIMIT = 25000  # rows per search analytics request (API maximum)
+TOKEN_REFRESH_SKEW = timedelta(seconds=60)  # refresh slightly before expiry
+
+# Shared connection pool for all adapters (see close_gsc_client)
+_http_client: httpx.AsyncClient | None = None
+# Refreshed credentials by refresh-token digest, so concurrent calls with the
+# same stale token refresh it once and later requests reuse the new token
+_fresh_credentials: dict[str, "GSCCredentials"] = {}
+_refresh_locks: dict[str, asyncio.Lock] = {}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_gsc_client() -> None:
+    """Close the shared GSC HTTP connection pool (application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 # Custom Exceptions
 class GSCAuthError(Exception):
@@ -68,12 +106,21 @@ class GSCCredentials:
         )
 
 
+class QuotaGovernor(Protocol):
+    """Request budget shared by every process calling the Search Console API."""
+
+    async def acquire(self, site_url: str) -> None: ...
+
+
 class GSCAdapter:
     """
     Google Search Console API adapter for SEO analytics.
 
     Uses OAuth 2.0 for authentication and provides methods for fetching
     search performance data, keyword rankings, and page-level metrics.
+    All calls are async REST requests over a shared httpx connection pool,
+    at most MAX_CONCURRENT_REQUESTS in flight per adapter, so independent
+    queries can be issued concurrently with ``asyncio.gather``.
     """
 
     # OAuth 2.0 settings
@@ -81,15 +128,19 @@ class GSCAdapter:
     OAUTH_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
     OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
-    # API settings
-    API_SERVICE_NAME = "searchconsole"
-    API_VERSION = "v1"
+    # API endpoints
+    SITES_URL = f"{GSC_API_BASE}/webmasters/v3/sites"
+    SEARCH_ANALYTICS_URL = f"{GSC_API_BASE}/webmasters/v3/sites/{{site}}/searchAnalytics/query"
+    URL_INSPECTION_URL = f"{GSC_API_BASE}/v1/urlInspection/index:inspect"
 
     def __init__(
         self,
         client_id: str | None = None,
         client_secret: str | None = None,
         redirect_uri: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        quota_governor: QuotaGovernor | None = None,
     ):
         """
         Initialize Google Search Console adapter.
@@ -98,10 +149,17 @@ class GSCAdapter:
             client_id: Google OAuth client ID (defaults to settings)
             client_secret: Google OAuth client secret (defaults to settings)
             redirect_uri: OAuth redirect URI (defaults to settings)
+            http_client: HTTP client to use (defaults to the shared pool)
+            max_concurrency: Maximum concurrent API requests
+            quota_governor: Shared request budget awaited before each
+                search analytics query (no throttling when omitted)
         """
         self.client_id = client_id or settings.google_client_id
         self.client_secret = client_secret or settings.google_client_secret
         self.redirect_uri = redirect_uri or settings.google_redirect_uri
+        self._client = http_client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._quota_governor = quota_governor
 
         if not all([self.client_id, self.client_secret, self.redirect_uri]):
             logger.warning(
@@ -109,6 +167,10 @@ class GSCAdapter:
                 "Set google_client_id, google_client_secret, and google_redirect_uri."
             )
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or _get_http_client()
+
     def get_authorization_url(self, state: str) -> str:
         """
         Generate OAuth 2.0 authorization URL.
@@ -142,7 +204,7 @@ class GSCAdapter:
         logger.info("Generated OAuth authorization URL")
         return authorization_url
 
-    def exchange_code(self, code: str) -> GSCCredentials:
+    async def exchange_code(self, code: str) -> GSCCredentials:
         """
         Exchange authorization code for OAuth tokens.
 
@@ -161,8 +223,6 @@ class GSCAdapter:
             )
 
         try:
-            import httpx
-
             logger.info("Exchanging authorization code for tokens")
 
             # Exchange code for tokens
@@ -174,7 +234,7 @@ class GSCAdapter:
                 "grant_type": "authorization_code",
             }
 
-            response = httpx.post(self.OAUTH_TOKEN_URL, data=token_data)
+            response = await self.client.post(self.OAUTH_TOKEN_URL, data=token_data)
             response.raise_for_status()
             tokens = response.json()
 
@@ -204,7 +264,7 @@ class GSCAdapter:
             logger.error("Unexpected error during token exchange: %s", e)
             raise GSCAuthError(f"Token exchange failed: {e}")
 
-    def refresh_tokens(self, credentials: GSCCredentials) -> GSCCredentials:
+    async def refresh_tokens(self, credentials: GSCCredentials) -> GSCCredentials:
         """
         Refresh expired OAuth tokens.
 
@@ -221,8 +281,6 @@ class GSCAdapter:
             raise GSCAuthError("No refresh token available. User must re-authenticate.")
 
         try:
-            import httpx
-
             logger.info("Refreshing OAuth tokens")
 
             refresh_data = {
@@ -232,7 +290,7 @@ class GSCAdapter:
                 "grant_type": "refresh_token",
             }
 
-            response = httpx.post(self.OAUTH_TOKEN_URL, data=refresh_data)
+            response = await self.client.post(self.OAUTH_TOKEN_URL, data=refresh_data)
             response.raise_for_status()
             tokens = response.json()
 
@@ -243,12 +301,14 @@ class GSCAdapter:
             logger.info("Successfully refreshed tokens")
 
             # Return updated credentials
-            return GSCCredentials(
+            refreshed = GSCCredentials(
                 access_token=tokens["access_token"],
                 refresh_token=credentials.refresh_token,  # Keep existing refresh token
                 token_expiry=token_expiry,
                 site_url=credentials.site_url,
             )
+            _fresh_credentials[_token_digest(credentials.refresh_token)] = refreshed
+            return refreshed
 
         except httpx.HTTPError as e:
             logger.error("HTTP error during token refresh: %s", e)
@@ -257,53 +317,61 @@ class GSCAdapter:
             logger.error("Unexpected error during token refresh: %s", e)
             raise GSCAuthError(f"Token refresh failed: {e}")
 
-    def _get_service(self, credentials: GSCCredentials):
+    async def _ensure_fresh(
+        self, credentials: GSCCredentials, force: bool = False
+    ) -> GSCCredentials:
         """
-        Get authenticated Google Search Console API service.
-
-        Args:
-            credentials: OAuth credentials
-
-        Returns:
-            Google API service object
-
-        Raises:
-            GSCAuthError: If authentication fails
+        Return usable credentials: the given ones while unexpired, else a
+        token already refreshed for the same refresh token, else a new one.
+        Concurrent callers with the same stale token share one refresh.
         """
-        try:
-            # Check if token is expired and refresh if needed
-            # Ensure token_expiry is timezone-aware for comparison
-            token_expiry = credentials.token_expiry
-            if token_expiry.tzinfo is None:
-                token_expiry = token_expiry.replace(tzinfo=UTC)
-            if datetime.now(UTC) >= token_expiry:
-                logger.info("Access token expired, refreshing...")
-                credentials = self.refresh_tokens(credentials)
-
-            # Create Google OAuth credentials object
-            google_creds = Credentials(
-                token=credentials.access_token,
-                refresh_token=credentials.refresh_token,
-                token_uri=self.OAUTH_TOKEN_URL,
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-            )
+        if not force and not _is_expired(credentials):
+            return credentials
+        if not credentials.refresh_token:
+            raise GSCAuthError("No refresh token available. User must re-authenticate.")
 
-            # Build the service
-            service = build(
-                self.API_SERVICE_NAME,
-                self.API_VERSION,
-                credentials=google_creds,
-                cache_discovery=False,
+        digest = _token_digest(credentials.refresh_token)
+        async with _refresh_locks.setdefault(digest, asyncio.Lock()):
+            cached = _fresh_credentials.get(digest)
+            if (
+                cached is not None
+                and not _is_expired(cached)
+                and cached.access_token != credentials.access_token
+            ):
+                return GSCCredentials(
+                    access_token=cached.access_token,
+                    refresh_token=credentials.refresh_token,
+                    token_expiry=cached.token_expiry,
+                    site_url=credentials.site_url,
+                )
+            logger.info("Access token expired, refreshing...")
+            return await self.refresh_tokens(credentials)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        credentials: GSCCredentials,
+        json: dict[str, Any] | None = None,
+    ) -> tuple[httpx.Response, GSCCredentials]:
+        """
+        Send an authenticated API request, refreshing the access token when it
+        has expired or is rejected. Returns the response and the credentials
+        used, which differ from the input when a refresh happened.
+        """
+        credentials = await self._ensure_fresh(credentials)
+        async with self._semaphore:
+            response = await self.client.request(
+                method, url, json=json, headers=_auth_headers(credentials)
             )
-
-            return service, credentials
-
-        except Exception as e:
-            logger.error("Failed to create API service: %s", e)
-            raise GSCAuthError(f"Failed to authenticate with Google API: {e}")
-
-    def list_sites(
+            if response.status_code == 401 and credentials.refresh_token:
+                credentials = await self._ensure_fresh(credentials, force=True)
+                response = await self.client.request(
+                    method, url, json=json, headers=_auth_headers(credentials)
+                )
+        return response, credentials
+
+    async def list_sites(
         self, credentials: GSCCredentials
     ) -> tuple[list[dict[str, Any]], "GSCCredentials"]:
         """
@@ -319,32 +387,32 @@ class GSCAdapter:
             GSCAPIError: If API request fails
         """
         try:
-            service, updated_creds = self._get_service(credentials)
-
             logger.info("Fetching verified sites from Google Search Console")
-            response = service.sites().list().execute()
+            response, updated_creds = await self._request("GET", self.SITES_URL, credentials)
+            _raise_for_api_status(response, "Google Search Console API quota exceeded")
+            data = response.json()
 
             logger.info(
                 "GSC sites API raw response keys: %s",
-                list(response.keys()) if response else "None",
+                list(data.keys()) if data else "None",
             )
-            logger.info("GSC sites API raw response: %s", response)
+            logger.info("GSC sites API raw response: %s", data)
 
-            sites = response.get("siteEntry", [])
+            sites = data.get("siteEntry", [])
             logger.info("Retrieved %s verified sites", len(sites))
 
             return sites, updated_creds
 
-        except HttpError as e:
-            if e.resp.status == 403:
-                raise GSCQuotaError("Google Search Console API quota exceeded")
+        except (GSCAuthError, GSCQuotaError):
+            raise
+        except GSCAPIError as e:
             logger.error("Google API error while listing sites: %s", e)
             raise GSCAPIError(f"Failed to list sites: {e}")
         except Exception as e:
             logger.error("Unexpected error while listing sites: %s", e)
             raise GSCAPIError(f"Failed to list sites: {e}")
 
-    def get_search_analytics(
+    async def get_search_analytics(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -352,6 +420,7 @@ class GSCAdapter:
         end_date: date,
         dimensions: list[str],
         row_limit: int = 1000,
+        start_row: int = 0,
     ) -> list[dict[str, Any]]:
         """
         Fetch search analytics data from Google Search Console.
@@ -363,6 +432,7 @@ class GSCAdapter:
             end_date: End date for the data range
             dimensions: List of dimensions (query, page, country, device, date)
             row_limit: Maximum number of rows to return (default: 1000, max: 25000)
+            start_row: Zero-based index of the first row (for pagination)
 
         Returns:
             List of search analytics rows with clicks, impressions, CTR, position
@@ -371,37 +441,89 @@ class GSCAdapter:
             GSCAPIError: If API request fails
         """
         try:
-            service, updated_creds = self._get_service(credentials)
-
-            logger.info("Fetching search analytics for %s from %s to %s", site_url, start_date, end_date)
+            logger.info(
+                "Fetching search analytics for %s from %s to %s (start row %d)",
+                site_url, start_date, end_date, start_row,
+            )
 
             request_body = {
                 "startDate": start_date.isoformat(),
                 "endDate": end_date.isoformat(),
                 "dimensions": dimensions,
-                "rowLimit": min(row_limit, 25000),  # API max is 25000
-                "startRow": 0,
+                "rowLimit": min(row_limit, MAX_ROW_LIMIT),
+                "startRow": start_row,
             }
 
-            response = (
-                service.searchanalytics().query(siteUrl=site_url, body=request_body).execute()
+            if self._quota_governor is not None:
+                await self._quota_governor.acquire(site_url)
+            response, _ = await self._request(
+                "POST",
+                self.SEARCH_ANALYTICS_URL.format(site=quote(site_url, safe="")),
+                credentials,
+                json=request_body,
             )
+            _raise_for_api_status(response, "Google Search Console API quota exceeded")
 
-            rows = response.get("rows", [])
+            rows = response.json().get("rows", [])
             logger.info("Retrieved %s search analytics rows", len(rows))
 
             return rows
 
-        except HttpError as e:
-            if e.resp.status == 403:
-                raise GSCQuotaError("Google Search Console API quota exceeded")
+        except (GSCAuthError, GSCQuotaError):
+            raise
+        except GSCAPIError as e:
             logger.error("Google API error while fetching search analytics: %s", e)
             raise GSCAPIError(f"Failed to fetch search analytics: {e}")
         except Exception as e:
             logger.error("Unexpected error while fetching search analytics: %s", e)
             raise GSCAPIError(f"Failed to fetch search analytics: {e}")
 
-    def get_keyword_rankings(
+    async def iter_search_analytics(
+        self,
+        credentials: GSCCredentials,
+        site_url: str,
+        start_date: date,
+        end_date: date,
+        dimensions: list[str],
+        page_size: int = MAX_ROW_LIMIT,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream every search analytics row for the range, one page of up to
+        *page_size* rows at a time, walking startRow until a short page.
+
+        The next page is requested while the caller processes the current
+        one, so at most two pages are held in memory.
+
+        Yields:
+            Lists of search analytics rows, in API order
+
+        Raises:
+            GSCAPIError: If an API request fails
+        """
+        page_size = min(page_size, MAX_ROW_LIMIT)
+
+        def fetch(start_row: int) -> asyncio.Task:
+            return asyncio.ensure_future(self.get_search_analytics(
+                credentials, site_url, start_date, end_date, dimensions,
+                row_limit=page_size, start_row=start_row,
+            ))
+
+        start_row = 0
+        pending: asyncio.Task | None = fetch(start_row)
+        try:
+            while pending is not None:
+                rows = await pending
+                pending = None
+                start_row += len(rows)
+                if len(rows) == page_size:
+                    pending = fetch(start_row)
+                if rows:
+                    yield rows
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def get_keyword_rankings(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -429,7 +551,7 @@ class GSCAdapter:
         end_date = date.today() - timedelta(days=3)  # Data has 2-3 day delay
         start_date = end_date - timedelta(days=days)
 
-        rows = self.get_search_analytics(
+        rows = await self.get_search_analytics(
             credentials=credentials,
             site_url=site_url,
             start_date=start_date,
@@ -460,7 +582,7 @@ class GSCAdapter:
         logger.info("Retrieved %s keyword rankings", len(keywords))
         return keywords
 
-    def get_page_performance(
+    async def get_page_performance(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -488,7 +610,7 @@ class GSCAdapter:
         end_date = date.today() - timedelta(days=3)
         start_date = end_date - timedelta(days=days)
 
-        rows = self.get_search_analytics(
+        rows = await self.get_search_analytics(
             credentials=credentials,
             site_url=site_url,
             start_date=start_date,
@@ -519,7 +641,7 @@ class GSCAdapter:
         logger.info("Retrieved %s page performance metrics", len(pages))
         return pages
 
-    def get_daily_stats(
+    async def get_daily_stats(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -547,7 +669,7 @@ class GSCAdapter:
         end_date = date.today() - timedelta(days=3)
         start_date = end_date - timedelta(days=days)
 
-        rows = self.get_search_analytics(
+        rows = await self.get_search_analytics(
             credentials=credentials,
             site_url=site_url,
             start_date=start_date,
@@ -578,7 +700,7 @@ class GSCAdapter:
         logger.info("Retrieved %s days of statistics", len(daily_stats))
         return daily_stats
 
-    def get_device_breakdown(
+    async def get_device_breakdown(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -601,7 +723,7 @@ class GSCAdapter:
         end_date = date.today() - timedelta(days=3)
         start_date = end_date - timedelta(days=days)
 
-        rows = self.get_search_analytics(
+        rows = await self.get_search_analytics(
             credentials=credentials,
             site_url=site_url,
             start_date=start_date,
@@ -629,7 +751,7 @@ class GSCAdapter:
         logger.info("Retrieved device breakdown with %s device types", len(devices))
         return devices
 
-    def get_country_breakdown(
+    async def get_country_breakdown(
         self,
         credentials: GSCCredentials,
         site_url: str,
@@ -654,7 +776,7 @@ class GSCAdapter:
         end_date = date.today() - timedelta(days=3)
         start_date = end_date - timedelta(days=days)
 
-        rows = self.get_search_analytics(
+        rows = await self.get_search_analytics(
             credentials=credentials,
             site_url=site_url,
             start_date=start_date,
@@ -685,7 +807,7 @@ class GSCAdapter:
         logger.info("Retrieved top %s countries", len(countries))
         return countries
 
-    def inspect_url(
+    async def inspect_url(
         self, credentials: GSCCredentials, url: str, site_url: str
     ) -> tuple[dict[str, Any], "GSCCredentials"]:
         """
@@ -704,21 +826,23 @@ class GSCAdapter:
             GSCQuotaError: If quota is exceeded
         """
         try:
-            service, credentials = self._get_service(credentials)
-
             request_body = {
                 "inspectionUrl": url,
                 "siteUrl": site_url,
             }
 
-            response = (
-                service.urlInspection()
-                .index()
-                .inspect(body=request_body)
-                .execute()
+            response, credentials = await self._request(
+                "POST", self.URL_INSPECTION_URL, credentials, json=request_body
             )
+            if response.status_code == 429:
+                logger.warning("Rate limited for URL inspection: %s", response.text[:200])
+                raise GSCQuotaError("URL Inspection API rate limited — try again later")
+            if response.status_code == 403:
+                logger.warning("Quota exceeded for URL inspection: %s", response.text[:200])
+                raise GSCQuotaError("URL Inspection API quota exceeded")
+            _raise_for_api_status(response, "URL Inspection API quota exceeded")
 
-            inspection = response.get("inspectionResult", {})
+            inspection = response.json().get("inspectionResult", {})
             index_status_result = inspection.get("indexStatusResult", {})
             mobile_result = inspection.get("mobileUsabilityResult", {})
             rich_results = inspection.get("richResultsResult", {})
@@ -740,22 +864,46 @@ class GSCAdapter:
             logger.info("URL inspection for %s: verdict=%s", url, result['verdict'])
             return result, credentials
 
-        except HttpError as e:
-            if e.resp.status == 403:
-                logger.warning("Quota exceeded for URL inspection: %s", e)
-                raise GSCQuotaError("URL Inspection API quota exceeded")
-            elif e.resp.status == 429:
-                logger.warning("Rate limited for URL inspection: %s", e)
-                raise GSCQuotaError("URL Inspection API rate limited — try again later")
-            logger.error("URL inspection API error: %s", e)
-            raise GSCAPIError(f"URL inspection failed: {e}")
         except (GSCAuthError, GSCQuotaError):
             raise
+        except GSCAPIError as e:
+            logger.error("URL inspection API error: %s", e)
+            raise GSCAPIError(f"URL inspection failed: {e}")
         except Exception as e:
             logger.error("Unexpected error during URL inspection: %s", e)
             raise GSCAPIError(f"URL inspection failed: {e}")
 
 
+def _token_digest(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def _is_expired(credentials: GSCCredentials) -> bool:
+    # Ensure token_expiry is timezone-aware for comparison
+    token_expiry = credentials.token_expiry
+    if token_expiry.tzinfo is None:
+        token_expiry = token_expiry.replace(tzinfo=UTC)
+    return datetime.now(UTC) >= token_expiry - TOKEN_REFRESH_SKEW
+
+
+def _auth_headers(credentials: GSCCredentials) -> dict[str, str]:
+    return {"Authorization": f"Bearer {credentials.access_token}"}
+
+
+def _raise_for_api_status(response: httpx.Response, quota_message: str) -> None:
+    """Map an API error response to GSCQuotaError, GSCAuthError or GSCAPIError."""
+    if response.status_code in (403, 429):
+        raise GSCQuotaError(quota_message)
+    if response.status_code == 401:
+        raise GSCAuthError("Google Search Console rejected the access token. Please reconnect.")
+    if response.is_error:
+        try:
+            message = response.json().get("error", {}).get("message") or response.text
+        except ValueError:
+            message = response.text
+        raise GSCAPIError(f"HTTP {response.status_code}: {message[:500]}")
+
+
 # Factory function for easy instantiation
 def create_gsc_adapter(
     client_id: str | None = None,
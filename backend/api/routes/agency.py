@@ -635,8 +635,8 @@ async def generate_report(
     result as a GeneratedReport record.
     """
     require_tier("enterprise")(current_user)
-    from infrastructure.database.models.analytics import DailyAnalytics, PagePerformance
     from infrastructure.database.models.revenue import ContentConversion
+    from services.analytics_rollups import keyword_totals, page_totals, site_totals
 
     profile = await get_agency_profile(current_user.id, db)
 
@@ -662,29 +662,18 @@ async def generate_report(
             )
 
     # -----------------------------------------------------------------------
-    # Aggregate: daily clicks + impressions from DailyAnalytics
-    # DailyAnalytics is keyed by user_id (the project owner), not project_id.
+    # Aggregate: clicks + impressions from the site analytics rollups
+    # Analytics are keyed by user_id (the project owner), not project_id.
     # We retrieve the project owner to scope the query correctly.
     # -----------------------------------------------------------------------
     proj_result = await db.execute(select(Project).where(Project.id == workspace.project_id, Project.deleted_at.is_(None)))
     project = proj_result.scalar_one_or_none()
     project_owner_id = project.owner_id if project else current_user.id
 
-    daily_agg = await db.execute(
-        select(
-            func.coalesce(func.sum(DailyAnalytics.total_clicks), 0).label("total_clicks"),
-            func.coalesce(func.sum(DailyAnalytics.total_impressions), 0).label("total_impressions"),
-        ).where(
-            and_(
-                DailyAnalytics.user_id == project_owner_id,
-                DailyAnalytics.date >= body.period_start,
-                DailyAnalytics.date <= body.period_end,
-            )
-        )
-    )
+    daily_agg = await db.execute(site_totals(project_owner_id, body.period_start, body.period_end))
     daily_row = daily_agg.one()
-    total_clicks = int(daily_row.total_clicks)
-    total_impressions = int(daily_row.total_impressions)
+    total_clicks = int(daily_row.clicks)
+    total_impressions = int(daily_row.impressions)
 
     # -----------------------------------------------------------------------
     # Aggregate: conversions + revenue from ContentConversion
@@ -706,22 +695,10 @@ async def generate_report(
     total_revenue = float(conv_row.total_revenue)
 
     # -----------------------------------------------------------------------
-    # Top pages by clicks from PagePerformance
+    # Top pages by clicks
     # -----------------------------------------------------------------------
     pages_result = await db.execute(
-        select(
-            PagePerformance.page_url,
-            func.sum(PagePerformance.clicks).label("clicks"),
-            func.sum(PagePerformance.impressions).label("impressions"),
-        )
-        .where(
-            and_(
-                PagePerformance.user_id == project_owner_id,
-                PagePerformance.date >= body.period_start,
-                PagePerformance.date <= body.period_end,
-            )
-        )
-        .group_by(PagePerformance.page_url)
+        page_totals(project_owner_id, body.period_start, body.period_end)
         .order_by(desc("clicks"))
         .limit(10)
     )
@@ -735,25 +712,10 @@ async def generate_report(
     ]
 
     # -----------------------------------------------------------------------
-    # Top keywords by clicks from KeywordRanking
+    # Top keywords by clicks
     # -----------------------------------------------------------------------
-    from infrastructure.database.models.analytics import KeywordRanking
-
     keywords_result = await db.execute(
-        select(
-            KeywordRanking.keyword,
-            func.sum(KeywordRanking.clicks).label("clicks"),
-            func.sum(KeywordRanking.impressions).label("impressions"),
-            func.avg(KeywordRanking.position).label("avg_position"),
-        )
-        .where(
-            and_(
-                KeywordRanking.user_id == project_owner_id,
-                KeywordRanking.date >= body.period_start,
-                KeywordRanking.date <= body.period_end,
-            )
-        )
-        .group_by(KeywordRanking.keyword)
+        keyword_totals(project_owner_id, body.period_start, body.period_end)
         .order_by(desc("clicks"))
         .limit(10)
     )
@@ -912,12 +874,8 @@ async def get_portal_data(
     Accepts a portal_access_token and returns a limited 30-day analytics
     summary for the associated client workspace.
     """
-    from infrastructure.database.models.analytics import (
-        DailyAnalytics,
-        KeywordRanking,
-        PagePerformance,
-    )
     from infrastructure.database.models.revenue import ContentConversion
+    from services.analytics_rollups import keyword_totals, page_totals, site_totals
 
     # Look up the workspace by token
     ws_result = await db.execute(
@@ -983,24 +941,11 @@ async def get_portal_data(
     # AGY-05: Run all aggregation queries under a 10-second timeout so a slow DB
     # doesn't hang public portal requests indefinitely.
     async def _aggregate():
-        # Daily analytics aggregation
-        daily_agg = await db.execute(
-            select(
-                func.coalesce(func.sum(DailyAnalytics.total_clicks), 0).label("total_clicks"),
-                func.coalesce(func.sum(DailyAnalytics.total_impressions), 0).label(
-                    "total_impressions"
-                ),
-            ).where(
-                and_(
-                    DailyAnalytics.user_id == project_owner_id,
-                    DailyAnalytics.date >= period_start,
-                    DailyAnalytics.date <= period_end,
-                )
-            )
-        )
+        # Site analytics aggregation
+        daily_agg = await db.execute(site_totals(project_owner_id, period_start, period_end))
         daily_row = daily_agg.one()
-        _total_clicks = int(daily_row.total_clicks)
-        _total_impressions = int(daily_row.total_impressions)
+        _total_clicks = int(daily_row.clicks)
+        _total_impressions = int(daily_row.impressions)
 
         # Conversion aggregation
         conv_agg = await db.execute(
@@ -1023,21 +968,7 @@ async def get_portal_data(
 
         # Top pages
         pages_result = await db.execute(
-            select(
-                PagePerformance.page_url,
-                func.sum(PagePerformance.clicks).label("clicks"),
-                func.sum(PagePerformance.impressions).label("impressions"),
-            )
-            .where(
-                and_(
-                    PagePerformance.user_id == project_owner_id,
-                    PagePerformance.date >= period_start,
-                    PagePerformance.date <= period_end,
-                )
-            )
-            .group_by(PagePerformance.page_url)
-            .order_by(desc("clicks"))
-            .limit(5)
+            page_totals(project_owner_id, period_start, period_end).order_by(desc("clicks")).limit(5)
         )
         _top_pages = [
             {
@@ -1050,22 +981,7 @@ async def get_portal_data(
 
         # Top keywords
         keywords_result = await db.execute(
-            select(
-                KeywordRanking.keyword,
-                func.sum(KeywordRanking.clicks).label("clicks"),
-                func.sum(KeywordRanking.impressions).label("impressions"),
-                func.avg(KeywordRanking.position).label("avg_position"),
-            )
-            .where(
-                and_(
-                    KeywordRanking.user_id == project_owner_id,
-                    KeywordRanking.date >= period_start,
-                    KeywordRanking.date <= period_end,
-                )
-            )
-            .group_by(KeywordRanking.keyword)
-            .order_by(desc("clicks"))
-            .limit(5)
+            keyword_totals(project_owner_id, period_start, period_end).order_by(desc("clicks")).limit(5)
         )
         _top_keywords = [
             {
@@ -5,11 +5,11 @@ Analytics API routes for Google Search Console integration.
 import logging
 import math
 from datetime import UTC, date, datetime, timedelta
-from urllib.parse import urlencode, urlparse, urlunparse
+from urllib.parse import urlencode
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, delete, desc, func, select
+from sqlalchemy import Float, and_, cast, delete, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import require_tier
@@ -50,7 +50,9 @@ from api.schemas.analytics import (
     ImportConversionsResponse,
     KeywordOpportunity,
     KeywordRankingListResponse,
+    KeywordTotalsResponse,
     PagePerformanceListResponse,
+    PageTotalsResponse,
     RevenueByArticleListResponse,
     RevenueByKeywordListResponse,
     RevenueOverviewResponse,
@@ -73,25 +75,12 @@ from infrastructure.database.models.analytics import (
 )
 from infrastructure.database.models.content import Article
 from infrastructure.database.models.revenue import ContentConversion, ConversionGoal
+from services.analytics_rollups import keyword_totals, page_totals, site_totals
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
-# ANA-09: GSC data is typically delayed by this many days — use a named constant
-# ANA-35: TODO — expose data_lag_days in the GSC status response so the frontend can show "Data may be delayed by N days"
-GSC_DATA_LAG_DAYS = 3
-
-
-def _strip_query_from_url(url: str) -> str:
-    """Remove query string and fragment from a URL for consistent storage (ANA-10)."""
-    try:
-        p = urlparse(url)
-        return urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
-    except Exception:
-        return url
-
-
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -133,6 +122,21 @@ async def get_gsc_connection(
     return result.scalar_one_or_none()
 
 
+def _period_ctr(model):
+    """Click-through rate of *model*'s daily rows in an aggregate query."""
+    return func.coalesce(
+        cast(func.sum(model.clicks), Float) / func.nullif(func.sum(model.impressions), 0), 0.0
+    )
+
+
+def _period_position(model):
+    """Impression-weighted average position of *model*'s daily rows in an aggregate query."""
+    return func.coalesce(
+        func.sum(model.position * model.impressions) / func.nullif(func.sum(model.impressions), 0),
+        func.avg(model.position),
+    )
+
+
 # ============================================================================
 # GSC Connection Management Endpoints
 # ============================================================================
@@ -201,7 +205,7 @@ async def gsc_oauth_callback(
         gsc_adapter = GSCAdapter()
 
         # Exchange authorization code for tokens
-        credentials = gsc_adapter.exchange_code(code)
+        credentials = await gsc_adapter.exchange_code(code)
 
         # Encrypt the tokens before storing
         encrypted_access_token = encrypt_credential(credentials.access_token, settings.secret_key)
@@ -362,7 +366,7 @@ async def get_gsc_sites(
 
         # Initialize GSC adapter and fetch sites
         gsc_adapter = GSCAdapter()
-        sites_data, updated_creds = gsc_adapter.list_sites(credentials)
+        sites_data, updated_creds = await gsc_adapter.list_sites(credentials)
 
         # If tokens were refreshed, save them back to the database
         if updated_creds.access_token != decrypted_access_token:
@@ -426,14 +430,20 @@ async def select_gsc_site(
     )
 
 
-@router.post("/gsc/sync", response_model=GSCSyncResponse)
+@router.post(
+    "/gsc/sync", response_model=GSCSyncResponse, status_code=status.HTTP_202_ACCEPTED
+)
 async def sync_gsc_data(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Trigger a data sync from Google Search Console.
-    Fetches keyword rankings, page performance, and daily stats for the last 28 days.
+    Queue a data sync from Google Search Console.
+    The connection is made due now and the sync scheduler picks it up on its
+    next check, fetching per-day keyword rankings, page performance, and
+    daily stats for the days since the last sync (the last 90 days on the
+    first sync). Running it in the scheduler keeps a site from being synced
+    twice at once and long backfills out of the request.
     """
     require_tier("starter")(current_user)
     connection = await get_gsc_connection(current_user.id, db)
@@ -450,175 +460,14 @@ async def sync_gsc_data(
             detail="No site selected. Please select a site first.",
         )
 
-    try:
-        # Import required modules
-        from datetime import date as date_type
-
-        from sqlalchemy.dialects.postgresql import insert
-
-        from adapters.search.gsc_adapter import GSCAdapter, GSCCredentials
-        from core.security.encryption import decrypt_credential, encrypt_credential
-
-        # Decrypt the stored tokens
-        decrypted_access_token = decrypt_credential(
-            connection.access_token_encrypted, settings.secret_key
-        )
-        decrypted_refresh_token = decrypt_credential(
-            connection.refresh_token_encrypted, settings.secret_key
-        )
-
-        # Create credentials object
-        credentials = GSCCredentials(
-            access_token=decrypted_access_token,
-            refresh_token=decrypted_refresh_token,
-            token_expiry=connection.token_expiry,
-            site_url=connection.site_url,
-        )
-
-        # Initialize GSC adapter
-        gsc_adapter = GSCAdapter()
-
-        # ANA-03: Proactively refresh and persist token if expired, before any API calls.
-        token_expiry = connection.token_expiry
-        if token_expiry.tzinfo is None:
-            token_expiry = token_expiry.replace(tzinfo=UTC)
-        if datetime.now(UTC) >= token_expiry:
-            try:
-                credentials = gsc_adapter.refresh_tokens(credentials)
-                connection.access_token_encrypted = encrypt_credential(
-                    credentials.access_token, settings.secret_key
-                )
-                connection.token_expiry = credentials.token_expiry
-                await db.commit()
-                logger.info("GSC token refreshed and persisted for user %s", current_user.id)
-            except Exception as refresh_err:
-                logger.error(
-                    "Failed to refresh GSC token for user %s: %s", current_user.id, refresh_err
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="GSC token expired and refresh failed. Please reconnect Google Search Console.",
-                )
-
-        # Fetch keyword rankings (last 28 days)
-        keywords_data = gsc_adapter.get_keyword_rankings(
-            credentials=credentials,
-            site_url=connection.site_url,
-            days=28,
-        )
-
-        # Fetch page performance (last 28 days)
-        pages_data = gsc_adapter.get_page_performance(
-            credentials=credentials,
-            site_url=connection.site_url,
-            days=28,
-        )
-
-        # Fetch daily stats (last 28 days)
-        daily_data = gsc_adapter.get_daily_stats(
-            credentials=credentials,
-            site_url=connection.site_url,
-            days=28,
-        )
-
-        # Sync keyword rankings (upsert to avoid duplicates)
-        for keyword_item in keywords_data:
-            # Get the date from the data (GSC returns data with a lag; see GSC_DATA_LAG_DAYS)
-            end_date = date_type.today() - timedelta(days=GSC_DATA_LAG_DAYS)
-
-            stmt = insert(KeywordRanking).values(
-                user_id=current_user.id,
-                site_url=connection.site_url,
-                keyword=keyword_item["query"],
-                date=end_date,
-                clicks=keyword_item["clicks"],
-                impressions=keyword_item["impressions"],
-                ctr=keyword_item["ctr"],
-                position=keyword_item["position"],
-            )
-            stmt = stmt.on_conflict_do_update(
-                constraint="uq_keyword_ranking_user_site_keyword_date",
-                set_={
-                    "clicks": stmt.excluded.clicks,
-                    "impressions": stmt.excluded.impressions,
-                    "ctr": stmt.excluded.ctr,
-                    "position": stmt.excluded.position,
-                    "updated_at": datetime.now(UTC),
-                },
-            )
-            await db.execute(stmt)
+    from services.gsc_sync import request_sync
 
-        # Sync page performance (upsert to avoid duplicates)
-        for page_item in pages_data:
-            end_date = date_type.today() - timedelta(days=GSC_DATA_LAG_DAYS)
-
-            stmt = insert(PagePerformance).values(
-                user_id=current_user.id,
-                site_url=connection.site_url,
-                page_url=_strip_query_from_url(page_item["page"]),  # ANA-10: strip query strings
-                date=end_date,
-                clicks=page_item["clicks"],
-                impressions=page_item["impressions"],
-                ctr=page_item["ctr"],
-                position=page_item["position"],
-            )
-            stmt = stmt.on_conflict_do_update(
-                constraint="uq_page_performance_user_site_page_date",
-                set_={
-                    "clicks": stmt.excluded.clicks,
-                    "impressions": stmt.excluded.impressions,
-                    "ctr": stmt.excluded.ctr,
-                    "position": stmt.excluded.position,
-                    "updated_at": datetime.now(UTC),
-                },
-            )
-            await db.execute(stmt)
-
-        # Sync daily stats (upsert to avoid duplicates)
-        for daily_item in daily_data:
-            # Parse the date string (format: YYYY-MM-DD)
-            daily_date = date_type.fromisoformat(daily_item["date"])
-
-            stmt = insert(DailyAnalytics).values(
-                user_id=current_user.id,
-                site_url=connection.site_url,
-                date=daily_date,
-                total_clicks=daily_item["clicks"],
-                total_impressions=daily_item["impressions"],
-                avg_ctr=daily_item["ctr"],
-                avg_position=daily_item["position"],
-            )
-            stmt = stmt.on_conflict_do_update(
-                constraint="uq_daily_analytics_user_site_date",
-                set_={
-                    "total_clicks": stmt.excluded.total_clicks,
-                    "total_impressions": stmt.excluded.total_impressions,
-                    "avg_ctr": stmt.excluded.avg_ctr,
-                    "avg_position": stmt.excluded.avg_position,
-                    "updated_at": datetime.now(UTC),
-                },
-            )
-            await db.execute(stmt)
-
-        # Update last_sync timestamp
-        sync_completed_at = datetime.now(UTC)
-        connection.last_sync = sync_completed_at
-        await db.commit()
-
-        return GSCSyncResponse(
-            message=f"Successfully synced {len(keywords_data)} keywords, {len(pages_data)} pages, and {len(daily_data)} days of data",
-            site_url=connection.site_url,
-            sync_started_at=sync_completed_at,
-        )
-
-    except HTTPException:
-        raise
-    except Exception:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to sync GSC data",
-        )
+    requested_at = await request_sync(db, connection)
+    return GSCSyncResponse(
+        message="Sync started. New data will appear in a few minutes.",
+        site_url=connection.site_url,
+        sync_started_at=requested_at,
+    )
 
 
 # ============================================================================
@@ -809,7 +658,7 @@ async def get_device_breakdown(
     )
 
     gsc = GSCAdapter()
-    raw = gsc.get_device_breakdown(credentials=credentials, site_url=connection.site_url, days=days)
+    raw = await gsc.get_device_breakdown(credentials=credentials, site_url=connection.site_url, days=days)
     items = [DeviceBreakdownItem(**row) for row in raw]
     return DeviceBreakdownResponse(items=items)
 
@@ -848,7 +697,7 @@ async def get_country_breakdown(
     )
 
     gsc = GSCAdapter()
-    raw = gsc.get_country_breakdown(
+    raw = await gsc.get_country_breakdown(
         credentials=credentials,
         site_url=connection.site_url,
         days=days,
@@ -888,84 +737,36 @@ async def get_analytics_summary(
     previous_start = start_date - timedelta(days=period_length)
     previous_end = start_date - timedelta(days=1)
 
-    # Get current period aggregates
-    current_query = select(
-        func.sum(DailyAnalytics.total_clicks).label("total_clicks"),
-        func.sum(DailyAnalytics.total_impressions).label("total_impressions"),
-        func.avg(DailyAnalytics.avg_ctr).label("avg_ctr"),
-        func.avg(DailyAnalytics.avg_position).label("avg_position"),
-    ).where(
-        and_(
-            DailyAnalytics.user_id == current_user.id,
-            DailyAnalytics.date >= start_date,
-            DailyAnalytics.date <= end_date,
-        )
-    )
-
-    current_result = await db.execute(current_query)
-    current_data = current_result.first()
-
-    # Get previous period aggregates
-    previous_query = select(
-        func.sum(DailyAnalytics.total_clicks).label("total_clicks"),
-        func.sum(DailyAnalytics.total_impressions).label("total_impressions"),
-        func.avg(DailyAnalytics.avg_ctr).label("avg_ctr"),
-        func.avg(DailyAnalytics.avg_position).label("avg_position"),
-    ).where(
-        and_(
-            DailyAnalytics.user_id == current_user.id,
-            DailyAnalytics.date >= previous_start,
-            DailyAnalytics.date <= previous_end,
-        )
-    )
-
-    previous_result = await db.execute(previous_query)
-    previous_data = previous_result.first()
+    # Site totals for the current and previous period, from the weekly/monthly rollups
+    current_data = (await db.execute(site_totals(current_user.id, start_date, end_date))).one()
+    previous_data = (
+        await db.execute(site_totals(current_user.id, previous_start, previous_end))
+    ).one()
 
     # Calculate trends
-    current_clicks = current_data.total_clicks or 0
-    current_impressions = current_data.total_impressions or 0
+    current_clicks = current_data.clicks or 0
+    current_impressions = current_data.impressions or 0
     current_ctr = current_data.avg_ctr or 0.0
     current_position = current_data.avg_position or 0.0
 
-    previous_clicks = previous_data.total_clicks or 0
-    previous_impressions = previous_data.total_impressions or 0
+    previous_clicks = previous_data.clicks or 0
+    previous_impressions = previous_data.impressions or 0
     previous_ctr = previous_data.avg_ctr or 0.0
     previous_position = previous_data.avg_position or 0.0
 
-    # Get top keywords (top 10 by clicks in period)
-    top_keywords_query = (
-        select(KeywordRanking)
-        .where(
-            and_(
-                KeywordRanking.user_id == current_user.id,
-                KeywordRanking.date >= start_date,
-                KeywordRanking.date <= end_date,
-            )
+    # Top keywords and pages (top 10 by clicks) over the period
+    top_keywords = [
+        KeywordTotalsResponse.model_validate(row._mapping)
+        for row in await db.execute(
+            keyword_totals(current_user.id, start_date, end_date).order_by(desc("clicks")).limit(10)
         )
-        .order_by(desc(KeywordRanking.clicks))
-        .limit(10)
-    )
-
-    top_keywords_result = await db.execute(top_keywords_query)
-    top_keywords = top_keywords_result.scalars().all()
-
-    # Get top pages (top 10 by clicks in period)
-    top_pages_query = (
-        select(PagePerformance)
-        .where(
-            and_(
-                PagePerformance.user_id == current_user.id,
-                PagePerformance.date >= start_date,
-                PagePerformance.date <= end_date,
-            )
+    ]
+    top_pages = [
+        PageTotalsResponse.model_validate(row._mapping)
+        for row in await db.execute(
+            page_totals(current_user.id, start_date, end_date).order_by(desc("clicks")).limit(10)
         )
-        .order_by(desc(PagePerformance.clicks))
-        .limit(10)
-    )
-
-    top_pages_result = await db.execute(top_pages_query)
-    top_pages = top_pages_result.scalars().all()
+    ]
 
     return AnalyticsSummaryResponse(
         total_clicks=current_clicks,
@@ -1001,6 +802,11 @@ def normalize_url(url: str) -> str:
     return url
 
 
+def normalized_url_sql(column):
+    """SQL counterpart of normalize_url for filtering stored page URLs."""
+    return func.regexp_replace(func.lower(column), r"^https?://(www\.)?|/+$", "", "g")
+
+
 @router.get("/article-performance", response_model=ArticlePerformanceListResponse)
 async def get_article_performance(
     page: int = Query(1, ge=1),
@@ -1049,29 +855,12 @@ async def get_article_performance(
     )
     total_published = total_published_result.scalar() or 0
 
-    # Aggregate current-period performance per page_url in a single query
-    current_agg_result = await db.execute(
-        select(
-            PagePerformance.page_url,
-            func.sum(PagePerformance.clicks).label("total_clicks"),
-            func.sum(PagePerformance.impressions).label("total_impressions"),
-            func.avg(PagePerformance.ctr).label("avg_ctr"),
-            func.avg(PagePerformance.position).label("avg_position"),
-            func.count(PagePerformance.id).label("row_count"),
-        )
-        .where(
-            and_(
-                PagePerformance.user_id == current_user.id,
-                PagePerformance.date >= start_date,
-                PagePerformance.date <= end_date,
-            )
-        )
-        .group_by(PagePerformance.page_url)
-    )
+    # Current- and previous-period performance per page_url, from the rollups
+    current_agg_result = await db.execute(page_totals(current_user.id, start_date, end_date))
     current_agg: dict[str, dict] = {
         normalize_url(row.page_url): {
-            "total_clicks": row.total_clicks or 0,
-            "total_impressions": row.total_impressions or 0,
+            "total_clicks": row.clicks or 0,
+            "total_impressions": row.impressions or 0,
             "avg_ctr": float(row.avg_ctr or 0.0),
             "avg_position": float(row.avg_position or 0.0),
             "row_count": row.row_count,
@@ -1079,27 +868,13 @@ async def get_article_performance(
         for row in current_agg_result
     }
 
-    # Aggregate previous-period performance per page_url in a single query
     previous_agg_result = await db.execute(
-        select(
-            PagePerformance.page_url,
-            func.sum(PagePerformance.clicks).label("prev_clicks"),
-            func.avg(PagePerformance.position).label("prev_position"),
-            func.count(PagePerformance.id).label("row_count"),
-        )
-        .where(
-            and_(
-                PagePerformance.user_id == current_user.id,
-                PagePerformance.date >= previous_start,
-                PagePerformance.date <= previous_end,
-            )
-        )
-        .group_by(PagePerformance.page_url)
+        page_totals(current_user.id, previous_start, previous_end)
     )
     previous_agg: dict[str, dict] = {
         normalize_url(row.page_url): {
-            "prev_clicks": row.prev_clicks or 0,
-            "prev_position": float(row.prev_position or 0.0),
+            "prev_clicks": row.clicks or 0,
+            "prev_position": float(row.avg_position or 0.0),
             "row_count": row.row_count,
         }
         for row in previous_agg_result
@@ -1259,36 +1034,30 @@ async def get_article_performance_detail(
 
     norm_url = normalize_url(article.published_url)
 
-    # Fetch all page performance for this URL in date range
-    all_perf_query = (
-        select(PagePerformance)
-        .where(
-            and_(
-                PagePerformance.user_id == current_user.id,
-                PagePerformance.date >= start_date,
-                PagePerformance.date <= end_date,
+    # Daily performance of this URL (any scheme, www or trailing-slash variant)
+    def daily_performance(period_start: date, period_end: date):
+        return (
+            select(
+                PagePerformance.date,
+                func.sum(PagePerformance.clicks).label("clicks"),
+                func.sum(PagePerformance.impressions).label("impressions"),
+                _period_ctr(PagePerformance).label("ctr"),
+                _period_position(PagePerformance).label("position"),
             )
+            .where(
+                and_(
+                    PagePerformance.user_id == current_user.id,
+                    PagePerformance.date >= period_start,
+                    PagePerformance.date <= period_end,
+                    normalized_url_sql(PagePerformance.page_url) == norm_url,
+                )
+            )
+            .group_by(PagePerformance.date)
+            .order_by(PagePerformance.date)
         )
-        .order_by(PagePerformance.date)
-    )
-    all_perf_result = await db.execute(all_perf_query)
-    all_rows = all_perf_result.scalars().all()
-
-    # Filter by normalized URL
-    current_rows = [r for r in all_rows if normalize_url(r.page_url) == norm_url]
-
-    # Previous period
-    prev_perf_query = select(PagePerformance).where(
-        and_(
-            PagePerformance.user_id == current_user.id,
-            PagePerformance.date >= previous_start,
-            PagePerformance.date <= previous_end,
-        )
-    )
-    prev_perf_result = await db.execute(prev_perf_query)
-    prev_rows = [
-        r for r in prev_perf_result.scalars().all() if normalize_url(r.page_url) == norm_url
-    ]
+
+    current_rows = (await db.execute(daily_performance(start_date, end_date))).all()
+    prev_rows = (await db.execute(daily_performance(previous_start, previous_end))).all()
 
     # Build daily data
     daily_data = [
@@ -1401,7 +1170,7 @@ async def get_article_index_status(
     gsc_adapter = GSCAdapter()
 
     try:
-        result, updated_creds = gsc_adapter.inspect_url(
+        result, updated_creds = await gsc_adapter.inspect_url(
             credentials, article.published_url, connection.site_url
         )
 
@@ -1478,44 +1247,12 @@ async def get_content_opportunities(
     previous_start = start_date - timedelta(days=period_length)
     previous_end = start_date - timedelta(days=1)
 
-    # Fetch current period keywords aggregated
-    current_kw_query = (
-        select(
-            KeywordRanking.keyword,
-            func.sum(KeywordRanking.clicks).label("clicks"),
-            func.sum(KeywordRanking.impressions).label("impressions"),
-            func.avg(KeywordRanking.ctr).label("ctr"),
-            func.avg(KeywordRanking.position).label("position"),
-        )
-        .where(
-            and_(
-                KeywordRanking.user_id == current_user.id,
-                KeywordRanking.date >= start_date,
-                KeywordRanking.date <= end_date,
-            )
-        )
-        .group_by(KeywordRanking.keyword)
-    )
-    current_result = await db.execute(current_kw_query)
+    # Current-period keyword totals and previous-period positions, from the rollups
+    current_result = await db.execute(keyword_totals(current_user.id, start_date, end_date))
     current_keywords = {row.keyword: row for row in current_result.all()}
 
-    # Fetch previous period for comparison
-    prev_kw_query = (
-        select(
-            KeywordRanking.keyword,
-            func.avg(KeywordRanking.position).label("position"),
-        )
-        .where(
-            and_(
-                KeywordRanking.user_id == current_user.id,
-                KeywordRanking.date >= previous_start,
-                KeywordRanking.date <= previous_end,
-            )
-        )
-        .group_by(KeywordRanking.keyword)
-    )
-    prev_result = await db.execute(prev_kw_query)
-    prev_positions = {row.keyword: row.position for row in prev_result.all()}
+    prev_result = await db.execute(keyword_totals(current_user.id, previous_start, previous_end))
+    prev_positions = {row.keyword: row.avg_position for row in prev_result.all()}
 
     # Fetch existing articles to cross-reference
     articles_query = select(Article.id, Article.keyword).where(Article.user_id == current_user.id)
@@ -1529,8 +1266,8 @@ async def get_content_opportunities(
     for keyword, data in current_keywords.items():
         clicks = data.clicks or 0
         impressions = data.impressions or 0
-        ctr = data.ctr or 0.0
-        position = data.position or 0.0
+        ctr = data.avg_ctr or 0.0
+        position = data.avg_position or 0.0
         prev_pos = prev_positions.get(keyword, position)
         position_change = prev_pos - position  # positive = improved (lower position number)
 
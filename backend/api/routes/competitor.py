@@ -5,7 +5,7 @@ Competitor Analysis API routes.
 import asyncio
 import logging
 import math
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
@@ -18,6 +18,8 @@ from api.dependencies import require_tier
 from api.routes.auth import get_current_user
 from api.schemas.competitor import (
     AnalyzeCompetitorRequest,
+    CompetitorAlertListResponse,
+    CompetitorAlertResponse,
     CompetitorAnalysisResponse,
     CompetitorAnalysisDetailResponse,
     CompetitorAnalysisListResponse,
@@ -27,9 +29,14 @@ from api.schemas.competitor import (
     KeywordArticle,
     KeywordGapItem,
     KeywordGapResponse,
+    UpdateMonitoringRequest,
 )
 from infrastructure.database.connection import get_db
-from infrastructure.database.models.competitor import CompetitorAnalysis, CompetitorArticle
+from infrastructure.database.models.competitor import (
+    CompetitorAlert,
+    CompetitorAnalysis,
+    CompetitorArticle,
+)
 from infrastructure.database.models.user import User
 from services.competitor_analyzer import run_competitor_analysis, compute_keyword_gaps
 
@@ -59,7 +66,7 @@ async def analyze_competitor(
         select(CompetitorAnalysis).where(
             CompetitorAnalysis.user_id == current_user.id,
             CompetitorAnalysis.domain == domain,
-            CompetitorAnalysis.expires_at > datetime.now(timezone.utc),
+            CompetitorAnalysis.expires_at > datetime.now(UTC),
             CompetitorAnalysis.status.in_(["completed", "crawling", "scraping", "extracting", "pending"]),
         ).order_by(CompetitorAnalysis.created_at.desc()).limit(1)
     )
@@ -74,7 +81,7 @@ async def analyze_competitor(
         project_id=project_id,
         domain=domain,
         status="pending",
-        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        expires_at=datetime.now(UTC) + timedelta(days=7),
     )
     db.add(analysis)
     await db.commit()
@@ -172,6 +179,9 @@ async def delete_analysis(
     await db.execute(
         delete(CompetitorArticle).where(CompetitorArticle.analysis_id == analysis_id)
     )
+    await db.execute(
+        delete(CompetitorAlert).where(CompetitorAlert.analysis_id == analysis_id)
+    )
     await db.delete(analysis)
     await db.commit()
 
@@ -249,6 +259,8 @@ async def get_keyword_gaps(
         analysis_id=analysis_id,
         user_id=current_user.id,
         project_id=analysis.project_id,
+        use_cache=analysis.status == "completed",
+        revision=analysis.content_changed_at.isoformat() if analysis.content_changed_at else "",
     )
 
     return KeywordGapResponse(
@@ -257,3 +269,112 @@ async def get_keyword_gaps(
         total_your_keywords=gap_data["total_your_keywords"],
         total_gaps=gap_data["total_gaps"],
     )
+
+
+@router.put("/analyses/{analysis_id}/monitoring", response_model=CompetitorAnalysisResponse)
+@limiter.limit("10/minute")
+async def update_monitoring(
+    request: Request,
+    analysis_id: str,
+    body: UpdateMonitoringRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Enable or disable scheduled monitoring. Monitored analyses are re-checked
+    every interval_hours for new and changed competitor content.
+    """
+    require_tier("professional")(current_user)
+    result = await db.execute(
+        select(CompetitorAnalysis).where(
+            CompetitorAnalysis.id == analysis_id,
+            CompetitorAnalysis.user_id == current_user.id,
+        )
+    )
+    analysis = result.scalar_one_or_none()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    if body.enabled and analysis.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only completed analyses can be monitored",
+        )
+
+    if body.enabled and not analysis.monitoring_enabled:
+        # First run is due right away and records the sitemap baseline
+        analysis.next_monitor_at = datetime.now(UTC)
+    analysis.monitoring_enabled = body.enabled
+    analysis.monitor_interval_hours = body.interval_hours
+    await db.commit()
+    await db.refresh(analysis)
+    return analysis
+
+
+@router.get("/alerts", response_model=CompetitorAlertListResponse)
+async def list_alerts(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    unread_only: bool = Query(False),
+    analysis_id: str | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """List new competitor content found by monitoring, newest first."""
+    require_tier("professional")(current_user)
+    conditions = [CompetitorAlert.user_id == current_user.id]
+    if analysis_id:
+        conditions.append(CompetitorAlert.analysis_id == analysis_id)
+
+    unread = (
+        await db.execute(
+            select(func.count(CompetitorAlert.id)).where(
+                *conditions, CompetitorAlert.is_read.is_(False)
+            )
+        )
+    ).scalar() or 0
+    if unread_only:
+        conditions.append(CompetitorAlert.is_read.is_(False))
+        total = unread
+    else:
+        total = (
+            await db.execute(select(func.count(CompetitorAlert.id)).where(*conditions))
+        ).scalar() or 0
+
+    items_result = await db.execute(
+        select(CompetitorAlert)
+        .where(*conditions)
+        .order_by(CompetitorAlert.created_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    return CompetitorAlertListResponse(
+        items=[CompetitorAlertResponse.model_validate(a) for a in items_result.scalars().all()],
+        total=total,
+        unread=unread,
+        page=page,
+        page_size=page_size,
+        pages=max(1, math.ceil(total / page_size)),
+    )
+
+
+@router.post("/alerts/{alert_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_alert_read(
+    alert_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Mark a competitor alert as read."""
+    require_tier("professional")(current_user)
+    result = await db.execute(
+        select(CompetitorAlert).where(
+            CompetitorAlert.id == alert_id,
+            CompetitorAlert.user_id == current_user.id,
+        )
+    )
+    alert = result.scalar_one_or_none()
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+
+    alert.is_read = True
+    await db.commit()
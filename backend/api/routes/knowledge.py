@@ -23,6 +23,7 @@ from fastapi import (
 )
 from sqlalchemy import and_, delete, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from api.middleware.rate_limit import limiter
 from api.dependencies import require_tier
@@ -48,6 +49,7 @@ from infrastructure.database.models import (
     SourceStatus,
     User,
 )
+from services import knowledge_cache
 from services import knowledge_processor as kp
 
 logger = logging.getLogger(__name__)
@@ -133,23 +135,45 @@ async def _process_document(
             await db.commit()
             return
 
-        # 3. Delete any existing chunks for this source (reprocess scenario)
-        await db.execute(delete(KnowledgeChunk).where(KnowledgeChunk.source_id == source.id))
-
-        # 4. Persist new chunks
-        chunk_objects = []
-        for idx, chunk_text in enumerate(chunks):
-            chunk_objects.append(
-                KnowledgeChunk(
-                    id=str(uuid4()),
-                    source_id=source.id,
-                    chunk_index=idx,
-                    content=chunk_text,
-                    char_count=len(chunk_text),
-                    created_at=now,
+        # 3. Diff against the stored chunks by content hash (reprocess scenario):
+        #    unchanged chunks keep their rows, only changed ones are written.
+        new_hashes = [kp.chunk_hash(chunk_text) for chunk_text in chunks]
+        existing_result = await db.execute(
+            select(KnowledgeChunk)
+            .options(
+                load_only(
+                    KnowledgeChunk.id, KnowledgeChunk.chunk_index, KnowledgeChunk.content_hash
                 )
             )
-        db.add_all(chunk_objects)
+            .where(KnowledgeChunk.source_id == source.id)
+        )
+        existing_chunks = {c.id: c for c in existing_result.scalars().all()}
+        diff = kp.diff_chunks(
+            [(c.id, c.content_hash) for c in existing_chunks.values()],
+            new_hashes,
+            stored_metadata={c.id: {"chunk_index": c.chunk_index} for c in existing_chunks.values()},
+            new_metadata=[{"chunk_index": idx} for idx in range(len(chunks))],
+        )
+
+        if diff.remove:
+            await db.execute(delete(KnowledgeChunk).where(KnowledgeChunk.id.in_(diff.remove)))
+
+        # 4. Re-number moved chunks and persist new ones
+        for chunk_id, idx in diff.changed:
+            existing_chunks[chunk_id].chunk_index = idx
+
+        db.add_all(
+            KnowledgeChunk(
+                id=str(uuid4()),
+                source_id=source.id,
+                chunk_index=idx,
+                content=chunks[idx],
+                char_count=len(chunks[idx]),
+                content_hash=new_hashes[idx],
+                created_at=now,
+            )
+            for idx in diff.add
+        )
 
         # 5. Update source metadata
         source.chunk_count = len(chunks)
@@ -159,10 +183,14 @@ async def _process_document(
 
         await db.commit()
         logger.info(
-            "Processed knowledge source %s: %d chunks, %d chars",
+            "Processed knowledge source %s: %d chunks, %d chars "
+            "(%d kept, %d added, %d removed)",
             source.id,
             source.chunk_count,
             source.char_count,
+            len(diff.keep),
+            len(diff.add),
+            len(diff.remove),
         )
 
     except Exception as exc:  # pylint: disable=broad-except
@@ -279,6 +307,7 @@ async def upload_document(
     # Process the document immediately
     await _process_document(db, source, file_content)
     await db.refresh(source)
+    await knowledge_cache.bump_corpus_version(current_user.id, source.project_id)
 
     return SourceUploadResponse(
         id=source.id,
@@ -446,6 +475,7 @@ async def update_source(
 
     await db.commit()
     await db.refresh(source)
+    await knowledge_cache.bump_corpus_version(current_user.id, source.project_id)
 
     return KnowledgeSourceResponse(
         id=source.id,
@@ -517,8 +547,10 @@ async def delete_source(
         except Exception as path_err:
             logger.warning("Invalid file path for deletion %s: %s", source.file_url, path_err)
 
+    project_id = source.project_id
     await db.delete(source)
     await db.commit()
+    await knowledge_cache.bump_corpus_version(current_user.id, project_id)
 
 
 # ---------------------------------------------------------------------------
@@ -821,6 +853,7 @@ async def reprocess_source(
 
     await _process_document(db, source, file_content)
     await db.refresh(source)
+    await knowledge_cache.bump_corpus_version(current_user.id, source.project_id)
 
     return ReprocessResponse(
         source_id=source.id,
@@ -292,6 +292,9 @@ async def list_audit_pages(
             page_size_bytes=p.page_size_bytes,
             performance_score=p.performance_score,
             pagespeed_data=p.pagespeed_data,
+            pagerank=p.pagerank,
+            click_depth=p.click_depth,
+            link_cluster=p.link_cluster,
             issues=p.issues_json,
             created_at=p.created_at,
         ))
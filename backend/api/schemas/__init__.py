@@ -75,8 +75,10 @@ from .analytics import (
     GSCSyncResponse,
     KeywordRankingListResponse,
     KeywordRankingResponse,
+    KeywordTotalsResponse,
     PagePerformanceListResponse,
     PagePerformanceResponse,
+    PageTotalsResponse,
     TrendData,
 )
 from .auth import (
@@ -226,8 +228,10 @@ __all__ = [
     "GSCDisconnectResponse",
     "KeywordRankingResponse",
     "KeywordRankingListResponse",
+    "KeywordTotalsResponse",
     "PagePerformanceResponse",
     "PagePerformanceListResponse",
+    "PageTotalsResponse",
     "DailyAnalyticsResponse",
     "DailyAnalyticsListResponse",
     "AnalyticsSummaryResponse",
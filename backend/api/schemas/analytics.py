@@ -155,6 +155,32 @@ class DailyAnalyticsListResponse(BaseModel):
 # ============================================================================
 
 
+class KeywordTotalsResponse(BaseModel):
+    """A keyword's totals over a date range."""
+
+    keyword: str
+    date: date_type = Field(..., description="Last day in the range with data")
+    clicks: int
+    impressions: int
+    ctr: float
+    position: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PageTotalsResponse(BaseModel):
+    """A page's totals over a date range."""
+
+    page_url: str
+    date: date_type = Field(..., description="Last day in the range with data")
+    clicks: int
+    impressions: int
+    ctr: float
+    position: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TrendData(BaseModel):
     """Trend data for a metric."""
 
@@ -180,11 +206,11 @@ class AnalyticsSummaryResponse(BaseModel):
     position_trend: TrendData | None = Field(None, description="Position trend")
 
     # Top performers
-    top_keywords: list[KeywordRankingResponse] = Field(
+    top_keywords: list[KeywordTotalsResponse] = Field(
         default_factory=list,
         description="Top performing keywords",
     )
-    top_pages: list[PagePerformanceResponse] = Field(
+    top_pages: list[PageTotalsResponse] = Field(
         default_factory=list,
         description="Top performing pages",
     )
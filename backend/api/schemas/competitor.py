@@ -30,6 +30,12 @@ class AnalyzeCompetitorRequest(BaseModel):
         return d.rstrip(".")
 
 
+class UpdateMonitoringRequest(BaseModel):
+    """Enable or disable scheduled monitoring of a completed analysis."""
+    enabled: bool
+    interval_hours: int = Field(24, ge=6, le=168, description="Hours between monitoring runs")
+
+
 # Response schemas
 
 class CompetitorArticleResponse(BaseModel):
@@ -60,6 +66,10 @@ class CompetitorAnalysisResponse(BaseModel):
     created_at: datetime
     completed_at: datetime | None
     expires_at: datetime
+    monitoring_enabled: bool = False
+    monitor_interval_hours: int = 24
+    last_monitored_at: datetime | None = None
+    content_changed_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -110,3 +120,28 @@ class KeywordGapResponse(BaseModel):
     total_competitor_keywords: int
     total_your_keywords: int
     total_gaps: int
+
+
+class CompetitorAlertResponse(BaseModel):
+    """New competitor content found by monitoring."""
+    id: str
+    analysis_id: str
+    project_id: str | None
+    alert_type: str
+    url: str
+    title: str | None
+    extracted_keyword: str | None
+    is_read: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CompetitorAlertListResponse(BaseModel):
+    """Paginated list of competitor alerts."""
+    items: list[CompetitorAlertResponse]
+    total: int
+    unread: int
+    page: int
+    page_size: int
+    pages: int
@@ -73,6 +73,9 @@ class AuditPageResponse(BaseModel):
     page_size_bytes: int | None = None
     performance_score: int | None = None
     pagespeed_data: dict | None = None
+    pagerank: float | None = None
+    click_depth: int | None = None
+    link_cluster: int | None = None
     issues: list | None = None
     created_at: datetime
 
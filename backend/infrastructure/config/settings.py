@@ -166,6 +166,11 @@ class Settings(BaseSettings):
     chroma_persist_directory: str = "./data/chroma"
     chroma_collection_prefix: str = "knowledge_vault"
 
+    # Vector store backend: "chroma" (HTTP server) or "local" (in-process, memory-mapped)
+    vector_store_backend: str = "chroma"
+    local_vector_store_dir: str = "./data/vectors"
+    local_vector_ann_threshold: int = 20000  # rows above which queries use the IVF index
+
     # Embeddings
     embedding_model: str = "text-embedding-3-small"  # OpenAI model
     openai_api_key: str | None = None  # For embeddings and outline generation
@@ -178,6 +183,9 @@ class Settings(BaseSettings):
     # Google PageSpeed Insights
     google_pagespeed_api_key: str = ""
 
+    # Site audit / competitor crawling
+    html_parse_workers: int = 0  # HTML parsing processes; 0 = CPU count - 1 (max 4)
+
     # Pipeline feature flags
     enable_serp_analysis: bool = True  # Set False to skip SERP (e.g. bulk jobs)
     enable_research_step: bool = True
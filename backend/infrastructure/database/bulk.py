@@ -0,0 +1,96 @@
+"""Bulk write helpers for high-volume inserts, updates and upserts."""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# PostgreSQL/asyncpg accept at most 32,767 bind parameters per statement
+MAX_BIND_PARAMS = 32_000
+BULK_UPDATE_CHUNK = 1_000  # parameter sets per executemany batch
+
+
+def chunk_rows(
+    rows: Sequence[dict[str, Any]], chunk_size: int | None = None
+) -> Iterator[Sequence[dict[str, Any]]]:
+    """Split *rows* into chunks that keep each statement under MAX_BIND_PARAMS."""
+    if not rows:
+        return
+    size = chunk_size or max(1, MAX_BIND_PARAMS // max(1, len(rows[0])))
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    model: type,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> int:
+    """
+    Insert *rows* (dicts keyed by mapped attribute name) as multi-row
+    ``INSERT ... VALUES`` statements, one per chunk.
+
+    Bypasses the ORM unit of work, so no identity-map objects are built —
+    primary keys must be generated client-side. Every row must have the same
+    keys. Does not commit. Returns the number of rows inserted.
+    """
+    for chunk in chunk_rows(rows, chunk_size):
+        await db.execute(insert(model).values(list(chunk)))
+    return len(rows)
+
+
+async def bulk_update(
+    db: AsyncSession,
+    model: type,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = BULK_UPDATE_CHUNK,
+) -> int:
+    """
+    Update rows by primary key. Each dict holds the primary key plus the
+    columns to set (mapped attribute names); every chunk is sent as one
+    executemany of a single ``UPDATE ... WHERE pk = ?`` statement.
+    Does not commit. Returns the number of rows given.
+    """
+    for chunk in chunk_rows(rows, chunk_size):
+        await db.execute(update(model), list(chunk))
+    return len(rows)
+
+
+def _constraint_columns(model: type, constraint: str) -> list[str]:
+    for c in model.__table__.constraints:
+        if c.name == constraint:
+            return [col.key for col in c.columns]
+    raise ValueError(f"{model.__name__} has no constraint named {constraint!r}")
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: type,
+    rows: Sequence[dict[str, Any]],
+    constraint: str,
+    update_columns: Sequence[str],
+    chunk_size: int | None = None,
+) -> int:
+    """
+    Insert *rows*, updating *update_columns* (and ``updated_at``) of rows
+    that already exist under the unique *constraint*, as one multi-row
+    ``INSERT ... ON CONFLICT DO UPDATE`` per chunk (PostgreSQL).
+
+    A statement cannot update the same row twice, so rows repeating a
+    constraint key are collapsed first, the last one winning as it would
+    with row-by-row upserts. Primary keys must be generated client-side and
+    every row must have the same keys. Does not commit. Returns the number
+    of distinct rows written.
+    """
+    key_columns = _constraint_columns(model, constraint)
+    unique_rows = list({tuple(row[k] for k in key_columns): row for row in rows}.values())
+    for chunk in chunk_rows(unique_rows, chunk_size):
+        stmt = pg_insert(model).values(list(chunk))
+        set_ = {col: stmt.excluded[col] for col in update_columns}
+        if "updated_at" in model.__table__.columns:
+            set_["updated_at"] = func.now()
+        await db.execute(stmt.on_conflict_do_update(constraint=constraint, set_=set_))
+    return len(unique_rows)
@@ -0,0 +1,35 @@
+"""Add content_hash to knowledge_chunks for incremental re-indexing.
+
+Revision ID: 062
+Revises: 061
+"""
+
+from alembic import op
+
+revision = "062"
+down_revision = "061"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'knowledge_chunks'
+                AND column_name = 'content_hash'
+            ) THEN
+                ALTER TABLE knowledge_chunks ADD COLUMN content_hash VARCHAR(64);
+            END IF;
+        END $$;
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_chunks_source_hash "
+        "ON knowledge_chunks (source_id, content_hash)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_knowledge_chunks_source_hash")
+    op.drop_column("knowledge_chunks", "content_hash")
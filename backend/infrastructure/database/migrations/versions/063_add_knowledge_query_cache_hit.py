@@ -0,0 +1,31 @@
+"""Add cache_hit flag to knowledge_queries for the RAG answer cache.
+
+Revision ID: 063
+Revises: 062
+"""
+
+from alembic import op
+
+revision = "063"
+down_revision = "062"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'knowledge_queries'
+                AND column_name = 'cache_hit'
+            ) THEN
+                ALTER TABLE knowledge_queries
+                    ADD COLUMN cache_hit BOOLEAN NOT NULL DEFAULT FALSE;
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("knowledge_queries", "cache_hit")
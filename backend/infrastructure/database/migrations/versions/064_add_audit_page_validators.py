@@ -0,0 +1,39 @@
+"""Add HTTP validators, body hash and outlinks to audit_pages for incremental re-audits.
+
+Revision ID: 064
+Revises: 063
+"""
+
+from alembic import op
+
+revision = "064"
+down_revision = "063"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "etag": "VARCHAR(255)",
+    "last_modified": "VARCHAR(64)",
+    "content_hash": "VARCHAR(64)",
+    "internal_links": "JSONB",
+}
+
+
+def upgrade() -> None:
+    for column, ddl_type in _COLUMNS.items():
+        op.execute(f"""
+            DO $$ BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'audit_pages'
+                    AND column_name = '{column}'
+                ) THEN
+                    ALTER TABLE audit_pages ADD COLUMN {column} {ddl_type};
+                END IF;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    for column in reversed(list(_COLUMNS)):
+        op.drop_column("audit_pages", column)
@@ -0,0 +1,30 @@
+"""Add a SimHash content fingerprint to audit_pages for near-duplicate detection.
+
+Revision ID: 065
+Revises: 064
+"""
+
+from alembic import op
+
+revision = "065"
+down_revision = "064"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'audit_pages'
+                AND column_name = 'content_simhash'
+            ) THEN
+                ALTER TABLE audit_pages ADD COLUMN content_simhash VARCHAR(16);
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("audit_pages", "content_simhash")
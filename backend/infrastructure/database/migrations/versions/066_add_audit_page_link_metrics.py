@@ -0,0 +1,38 @@
+"""Add internal link graph metrics (PageRank, click depth, link cluster) to audit_pages.
+
+Revision ID: 066
+Revises: 065
+"""
+
+from alembic import op
+
+revision = "066"
+down_revision = "065"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "pagerank": "DOUBLE PRECISION",
+    "click_depth": "INTEGER",
+    "link_cluster": "INTEGER",
+}
+
+
+def upgrade() -> None:
+    for column, ddl_type in _COLUMNS.items():
+        op.execute(f"""
+            DO $$ BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'audit_pages'
+                    AND column_name = '{column}'
+                ) THEN
+                    ALTER TABLE audit_pages ADD COLUMN {column} {ddl_type};
+                END IF;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    for column in reversed(list(_COLUMNS)):
+        op.drop_column("audit_pages", column)
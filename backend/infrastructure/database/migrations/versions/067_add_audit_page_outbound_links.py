@@ -0,0 +1,30 @@
+"""Add outbound (not crawled) links to audit_pages for the link checker.
+
+Revision ID: 067
+Revises: 066
+"""
+
+from alembic import op
+
+revision = "067"
+down_revision = "066"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'audit_pages'
+                AND column_name = 'outbound_links'
+            ) THEN
+                ALTER TABLE audit_pages ADD COLUMN outbound_links JSONB;
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("audit_pages", "outbound_links")
@@ -0,0 +1,86 @@
+"""Add scheduled competitor monitoring: schedule columns, sitemap snapshot and lastmod, alerts.
+
+Revision ID: 068
+Revises: 067
+"""
+
+from alembic import op
+
+revision = "068"
+down_revision = "067"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'competitor_analyses'
+                AND column_name = 'monitoring_enabled'
+            ) THEN
+                ALTER TABLE competitor_analyses
+                    ADD COLUMN monitoring_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+                    ADD COLUMN monitor_interval_hours INTEGER NOT NULL DEFAULT 24,
+                    ADD COLUMN next_monitor_at TIMESTAMP WITH TIME ZONE,
+                    ADD COLUMN last_monitored_at TIMESTAMP WITH TIME ZONE,
+                    ADD COLUMN content_changed_at TIMESTAMP WITH TIME ZONE,
+                    ADD COLUMN sitemap_snapshot TEXT;
+            END IF;
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'competitor_articles'
+                AND column_name = 'lastmod'
+            ) THEN
+                ALTER TABLE competitor_articles ADD COLUMN lastmod TIMESTAMP WITH TIME ZONE;
+            END IF;
+        END $$;
+    """)
+
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'ix_comp_analysis_monitor_due') THEN
+                CREATE INDEX ix_comp_analysis_monitor_due ON competitor_analyses (next_monitor_at)
+                    WHERE monitoring_enabled;
+            END IF;
+        END $$;
+    """)
+
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE tablename = 'competitor_alerts') THEN
+                CREATE TABLE competitor_alerts (
+                    id UUID PRIMARY KEY,
+                    analysis_id UUID NOT NULL REFERENCES competitor_analyses(id) ON DELETE CASCADE,
+                    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                    project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+                    alert_type VARCHAR(50) NOT NULL,
+                    url VARCHAR(2048) NOT NULL,
+                    title VARCHAR(500),
+                    extracted_keyword VARCHAR(255),
+                    is_read BOOLEAN NOT NULL DEFAULT FALSE,
+                    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+                );
+                CREATE INDEX ix_competitor_alerts_analysis_id ON competitor_alerts (analysis_id);
+                CREATE INDEX ix_competitor_alerts_user_unread ON competitor_alerts (user_id, is_read);
+                CREATE INDEX ix_competitor_alerts_created ON competitor_alerts (created_at);
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS competitor_alerts")
+    op.execute("DROP INDEX IF EXISTS ix_comp_analysis_monitor_due")
+    op.drop_column("competitor_articles", "lastmod")
+    for column in (
+        "sitemap_snapshot",
+        "content_changed_at",
+        "last_monitored_at",
+        "next_monitor_at",
+        "monitor_interval_hours",
+        "monitoring_enabled",
+    ):
+        op.drop_column("competitor_analyses", column)
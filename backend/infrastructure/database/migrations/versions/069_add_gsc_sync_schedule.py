@@ -0,0 +1,50 @@
+"""Add scheduled GSC sync and reset keyword/page rows to a true daily series.
+
+Keyword and page rows used to hold 28-day aggregates stamped with the end
+date of the sync window, which read as a single day. They are removed and
+last_sync cleared so the scheduled sync backfills real per-day rows; existing
+connections are spread over the next 24 hours.
+
+Revision ID: 069
+Revises: 068
+"""
+
+from alembic import op
+
+revision = "069"
+down_revision = "068"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'gsc_connections'
+                AND column_name = 'next_sync_at'
+            ) THEN
+                ALTER TABLE gsc_connections ADD COLUMN next_sync_at TIMESTAMP WITH TIME ZONE;
+                UPDATE gsc_connections
+                    SET next_sync_at = NOW() + random() * INTERVAL '24 hours',
+                        last_sync = NULL;
+                DELETE FROM keyword_rankings;
+                DELETE FROM page_performances;
+            END IF;
+        END $$;
+    """)
+
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'ix_gsc_connections_sync_due') THEN
+                CREATE INDEX ix_gsc_connections_sync_due ON gsc_connections (next_sync_at)
+                    WHERE is_active;
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_gsc_connections_sync_due")
+    op.drop_column("gsc_connections", "next_sync_at")
@@ -0,0 +1,69 @@
+"""Add weekly and monthly rollup tables for keyword, page and site analytics.
+
+Revision ID: 070
+Revises: 069
+"""
+
+from alembic import op
+
+revision = "070"
+down_revision = "069"
+branch_labels = None
+depends_on = None
+
+# (rollup table, daily table, key column, clicks, impressions, ctr, position)
+_ROLLUPS = (
+    ("keyword_ranking_rollups", "keyword_rankings", "keyword VARCHAR(500) NOT NULL",
+     "keyword", "clicks", "impressions", "ctr", "position"),
+    ("page_performance_rollups", "page_performances", "page_url VARCHAR(1000) NOT NULL",
+     "page_url", "clicks", "impressions", "ctr", "position"),
+    ("daily_analytics_rollups", "daily_analytics", None,
+     None, "total_clicks", "total_impressions", "avg_ctr", "avg_position"),
+)
+
+
+def upgrade() -> None:
+    for table, daily, key_ddl, key, clicks, impressions, ctr, position in _ROLLUPS:
+        key_def = f"{key_ddl}," if key_ddl else ""
+        key_col = f"{key}," if key else ""
+        op.execute(f"""
+            DO $$ BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE tablename = '{table}') THEN
+                    CREATE TABLE {table} (
+                        id UUID PRIMARY KEY,
+                        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                        site_url VARCHAR(500) NOT NULL,
+                        {key_def}
+                        period VARCHAR(10) NOT NULL,
+                        period_start DATE NOT NULL,
+                        last_date DATE NOT NULL,
+                        clicks BIGINT NOT NULL DEFAULT 0,
+                        impressions BIGINT NOT NULL DEFAULT 0,
+                        ctr_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                        position_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                        position_impressions DOUBLE PRECISION NOT NULL DEFAULT 0,
+                        row_count INTEGER NOT NULL DEFAULT 0,
+                        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                        CONSTRAINT uq_{table[:-1]} UNIQUE (user_id, site_url, {key_col} period, period_start)
+                    );
+                    CREATE INDEX ix_{table}_user_period ON {table} (user_id, period, period_start);
+
+                    INSERT INTO {table} (
+                        id, user_id, site_url, {key_col} period, period_start, last_date,
+                        clicks, impressions, ctr_sum, position_sum, position_impressions, row_count
+                    )
+                    SELECT gen_random_uuid(), user_id, site_url, {key_col} p.period,
+                           date_trunc(p.period, date)::date, MAX(date),
+                           SUM({clicks}), SUM({impressions}), SUM({ctr}), SUM({position}),
+                           SUM({position} * {impressions}), COUNT(*)
+                    FROM {daily} CROSS JOIN (VALUES ('week'), ('month')) AS p(period)
+                    GROUP BY user_id, site_url, {key_col} p.period, date_trunc(p.period, date);
+                END IF;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    for table, *_ in _ROLLUPS:
+        op.execute(f"DROP TABLE IF EXISTS {table}")
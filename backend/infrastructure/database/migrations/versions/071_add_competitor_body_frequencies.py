@@ -0,0 +1,30 @@
+"""Add body n-gram document frequencies to competitor analyses.
+
+Revision ID: 071
+Revises: 070
+"""
+
+from alembic import op
+
+revision = "071"
+down_revision = "070"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'competitor_analyses'
+                AND column_name = 'body_frequencies'
+            ) THEN
+                ALTER TABLE competitor_analyses ADD COLUMN body_frequencies TEXT;
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("competitor_analyses", "body_frequencies")
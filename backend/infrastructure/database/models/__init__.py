@@ -8,14 +8,17 @@ from .agency import AgencyProfile, ClientWorkspace, GeneratedReport, ReportTempl
 from .analytics import (
     ContentDecayAlert,
     DailyAnalytics,
+    DailyAnalyticsRollup,
     GSCConnection,
     KeywordRanking,
+    KeywordRankingRollup,
     PagePerformance,
+    PagePerformanceRollup,
 )
 from .base import Base, TimestampMixin
 from .blog import BlogCategory, BlogPost, BlogPostStatus, BlogPostTag, BlogTag
 from .bulk import BulkJob, BulkJobItem, ContentTemplate
-from .competitor import CompetitorAnalysis, CompetitorArticle
+from .competitor import CompetitorAlert, CompetitorAnalysis, CompetitorArticle
 from .site_audit import AuditIssue, AuditPage, SiteAudit
 from .report import SEOReport
 from .tag import ArticleTag, OutlineTag, Tag
@@ -57,6 +60,9 @@ __all__ = [
     "KeywordRanking",
     "PagePerformance",
     "DailyAnalytics",
+    "KeywordRankingRollup",
+    "PagePerformanceRollup",
+    "DailyAnalyticsRollup",
     "ContentDecayAlert",
     "KnowledgeSource",
     "KnowledgeChunk",
@@ -95,6 +101,7 @@ __all__ = [
     "BlogPostTag",
     "BlogPost",
     "BlogPostStatus",
+    "CompetitorAlert",
     "CompetitorAnalysis",
     "CompetitorArticle",
     "SiteAudit",
@@ -2,11 +2,12 @@
 Analytics database models for Google Search Console integration.
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from uuid import uuid4
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Date,
     DateTime,
@@ -67,6 +68,8 @@ class GSCConnection(Base, TimestampMixin):
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
     )
     last_sync: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Scheduled incremental sync (see services.gsc_sync); NULL means due now
+    next_sync_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -235,6 +238,95 @@ class DailyAnalytics(Base, TimestampMixin):
         return f"<DailyAnalytics(date={self.date}, clicks={self.total_clicks}, impressions={self.total_impressions})>"
 
 
+class AnalyticsRollupMixin:
+    """
+    Weekly or monthly totals of daily GSC rows, maintained at sync time
+    (see services.analytics_rollups). Averages are kept as sums plus a row
+    count so rollups combine exactly with each other and with daily rows.
+    """
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    site_url: Mapped[str] = mapped_column(String(500), nullable=False)
+
+    # "week" (starting Monday) or "month"
+    period: Mapped[str] = mapped_column(String(10), nullable=False)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    clicks: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    impressions: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    ctr_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    position_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    position_impressions: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class KeywordRankingRollup(Base, AnalyticsRollupMixin, TimestampMixin):
+    """Weekly and monthly keyword totals rolled up from KeywordRanking."""
+
+    __tablename__ = "keyword_ranking_rollups"
+
+    keyword: Mapped[str] = mapped_column(String(500), nullable=False)
+
+    __table_args__ = (
+        Index("ix_keyword_ranking_rollups_user_period", "user_id", "period", "period_start"),
+        UniqueConstraint(
+            "user_id",
+            "site_url",
+            "keyword",
+            "period",
+            "period_start",
+            name="uq_keyword_ranking_rollup",
+        ),
+    )
+
+
+class PagePerformanceRollup(Base, AnalyticsRollupMixin, TimestampMixin):
+    """Weekly and monthly page totals rolled up from PagePerformance."""
+
+    __tablename__ = "page_performance_rollups"
+
+    page_url: Mapped[str] = mapped_column(String(1000), nullable=False)
+
+    __table_args__ = (
+        Index("ix_page_performance_rollups_user_period", "user_id", "period", "period_start"),
+        UniqueConstraint(
+            "user_id",
+            "site_url",
+            "page_url",
+            "period",
+            "period_start",
+            name="uq_page_performance_rollup",
+        ),
+    )
+
+
+class DailyAnalyticsRollup(Base, AnalyticsRollupMixin, TimestampMixin):
+    """Weekly and monthly site totals rolled up from DailyAnalytics."""
+
+    __tablename__ = "daily_analytics_rollups"
+
+    __table_args__ = (
+        Index("ix_daily_analytics_rollups_user_period", "user_id", "period", "period_start"),
+        UniqueConstraint(
+            "user_id",
+            "site_url",
+            "period",
+            "period_start",
+            name="uq_daily_analytics_rollup",
+        ),
+    )
+
+
 class ContentDecayAlert(Base, TimestampMixin):
     """Alert generated when content shows signs of declining performance."""
 
@@ -6,7 +6,17 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -67,6 +77,23 @@ class CompetitorAnalysis(Base, TimestampMixin):
         DateTime(timezone=True), nullable=False
     )
 
+    # Scheduled monitoring (incremental re-runs, see services.competitor_monitor)
+    monitoring_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    monitor_interval_hours: Mapped[int] = mapped_column(Integer, default=24, nullable=False)
+    next_monitor_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_monitored_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    content_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Hashes of every sitemap URL seen by the last monitoring run
+    sitemap_snapshot: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Body n-gram document frequencies of all articles, for scoring new ones
+    body_frequencies: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     # Relationships
     articles: Mapped[list["CompetitorArticle"]] = relationship(
         "CompetitorArticle",
@@ -77,6 +104,11 @@ class CompetitorAnalysis(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_comp_analysis_user_domain", "user_id", "domain"),
         Index("ix_comp_analysis_expires", "expires_at"),
+        Index(
+            "ix_comp_analysis_monitor_due",
+            "next_monitor_at",
+            postgresql_where=text("monitoring_enabled"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -121,6 +153,10 @@ class CompetitorArticle(Base, TimestampMixin):
     scraped_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Sitemap <lastmod> when last scraped; monitoring re-scrapes on a newer one
+    lastmod: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     analysis: Mapped[Optional["CompetitorAnalysis"]] = relationship(
@@ -130,3 +166,44 @@ class CompetitorArticle(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<CompetitorArticle(id={self.id}, url={self.url[:60]}, keyword={self.extracted_keyword})>"
+
+
+class CompetitorAlert(Base, TimestampMixin):
+    """Alert raised when monitoring finds new content on a competitor's site."""
+
+    __tablename__ = "competitor_alerts"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    analysis_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("competitor_analyses.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    project_id: Mapped[str | None] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    alert_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    extracted_keyword: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        Index("ix_competitor_alerts_user_unread", "user_id", "is_read"),
+        Index("ix_competitor_alerts_created", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<CompetitorAlert(type={self.alert_type}, url={self.url[:60]})>"
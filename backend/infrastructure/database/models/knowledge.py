@@ -134,7 +134,8 @@ class KnowledgeChunk(Base):
     A single text chunk extracted from a knowledge source document.
 
     Chunks are created during document processing and are the units
-    used for keyword-based search queries.
+    used for keyword-based search queries.  ``content_hash`` lets a reprocess
+    keep unchanged chunks and only insert/delete the ones that changed.
     """
 
     __tablename__ = "knowledge_chunks"
@@ -158,6 +159,7 @@ class KnowledgeChunk(Base):
     chunk_index: Mapped[int] = mapped_column(nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     char_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     # Timestamp (created_at only, no updated_at needed for immutable chunks)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -166,7 +168,10 @@ class KnowledgeChunk(Base):
     source = relationship("KnowledgeSource", back_populates="chunks")
 
     # Indexes
-    __table_args__ = (Index("ix_knowledge_chunks_source_index", "source_id", "chunk_index"),)
+    __table_args__ = (
+        Index("ix_knowledge_chunks_source_index", "source_id", "chunk_index"),
+        Index("ix_knowledge_chunks_source_hash", "source_id", "content_hash"),
+    )
 
     def __repr__(self) -> str:
         return (
@@ -223,6 +228,9 @@ class KnowledgeQuery(Base, TimestampMixin):
     success: Mapped[bool] = mapped_column(default=True, nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # True when the answer was served from the corpus-versioned answer cache
+    cache_hit: Mapped[bool] = mapped_column(default=False, server_default="false", nullable=False)
+
     # Indexes
     __table_args__ = (Index("ix_knowledge_queries_user_created", "user_id", "created_at"),)
 
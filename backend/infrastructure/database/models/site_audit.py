@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -139,6 +139,25 @@ class AuditPage(Base):
     performance_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     pagespeed_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
+    # HTTP validators and body hash, reused by the next audit of the same domain
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # 64-bit SimHash of the body text (hex), for near-duplicate detection
+    content_simhash: Mapped[str | None] = mapped_column(String(16), nullable=True)
+
+    # Same-domain links found on the page (needed to keep crawling past unchanged pages)
+    internal_links: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    # Links the crawl does not follow (other hosts, assets), for the link checker
+    outbound_links: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+
+    # Internal link graph: PageRank (sums to 1 per audit), clicks from the
+    # homepage (NULL if unreachable) and link cluster (0 = homepage's)
+    pagerank: Mapped[float | None] = mapped_column(Float, nullable=True)
+    click_depth: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    link_cluster: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     # Per-page issues snapshot
     issues_json: Mapped[dict | None] = mapped_column(
         "issues", JSONB, nullable=True
@@ -23,6 +23,7 @@ from infrastructure.database import close_db, init_db
 from infrastructure.redis import close_redis, get_redis
 from infrastructure.logging_config import setup_logging
 from services.error_logger import log_exception as log_system_exception
+from services.parse_pool import shutdown_parse_pool
 from services.post_queue import post_queue
 from services.social_scheduler import scheduler_service
 from services.task_queue import task_queue
@@ -186,6 +187,16 @@ async def lifespan(app: FastAPI):
     logger.info("Starting content calendar scheduler...")
     content_scheduler_task = asyncio.create_task(content_scheduler.start())
 
+    # Start scheduled competitor monitoring
+    from services.competitor_monitor import competitor_monitor
+    logger.info("Starting competitor monitor...")
+    competitor_monitor_task = asyncio.create_task(competitor_monitor.start())
+
+    # Start scheduled incremental Search Console sync
+    from services.gsc_sync import gsc_sync_scheduler
+    logger.info("Starting GSC sync scheduler...")
+    gsc_sync_task = asyncio.create_task(gsc_sync_scheduler.start())
+
     # Start periodic task-queue cleanup (runs every 30 minutes, removes tasks >1h old)
     async def _task_queue_cleanup_loop():
         while True:
@@ -261,6 +272,14 @@ async def lifespan(app: FastAPI):
         _site_audit_cleanup_loop(), name="site-audit-cleanup"
     )
 
+    # Resume site audits interrupted by the previous shutdown
+    from services.site_auditor import resume_interrupted_audits
+
+    try:
+        await resume_interrupted_audits()
+    except Exception as e:
+        logger.warning("Could not resume interrupted site audits: %s", e)
+
     # Email journey worker (sends scheduled journey emails + checks inactive users)
     from services.email_journey_worker import EmailJourneyWorker
 
@@ -312,6 +331,24 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # Stop GSC sync scheduler
+    logger.info("Stopping GSC sync scheduler...")
+    await gsc_sync_scheduler.stop()
+    gsc_sync_task.cancel()
+    try:
+        await asyncio.wait_for(asyncio.shield(gsc_sync_task), timeout=10.0)
+    except (TimeoutError, asyncio.CancelledError):
+        pass
+
+    # Stop competitor monitor
+    logger.info("Stopping competitor monitor...")
+    await competitor_monitor.stop()
+    competitor_monitor_task.cancel()
+    try:
+        await asyncio.wait_for(asyncio.shield(competitor_monitor_task), timeout=10.0)
+    except (TimeoutError, asyncio.CancelledError):
+        pass
+
     # Stop content scheduler
     logger.info("Stopping content scheduler...")
     await content_scheduler.stop()
@@ -334,6 +371,13 @@ async def lifespan(app: FastAPI):
     # Disconnect Redis post queue
     await post_queue.disconnect()
 
+    # Close the shared Search Console HTTP connection pool
+    from adapters.search.gsc_adapter import close_gsc_client
+    await close_gsc_client()
+
+    # Stop HTML parse worker processes
+    shutdown_parse_pool()
+
     # Close shared Redis connection pools
     await close_redis()
 
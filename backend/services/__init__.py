@@ -5,9 +5,14 @@ Service layer for business logic.
 from functools import lru_cache
 
 from adapters.ai.anthropic_adapter import AnthropicContentService
-from adapters.knowledge import ChromaAdapter, DocumentProcessor, EmbeddingService
+from adapters.knowledge import (
+    ChromaAdapter,
+    DocumentProcessor,
+    EmbeddingService,
+    LocalVectorStore,
+)
 from infrastructure.config.settings import settings
-from services.knowledge_service import KnowledgeService
+from services.knowledge_service import KnowledgeService, legacy_source_projects
 
 
 @lru_cache
@@ -18,10 +23,17 @@ def get_knowledge_service() -> KnowledgeService:
     Returns:
         Configured KnowledgeService instance
     """
-    # Initialize ChromaDB adapter
-    chroma = ChromaAdapter(
-        collection_prefix=settings.chroma_collection_prefix,
-    )
+    # Initialize vector store (ChromaDB server or in-process local index)
+    if settings.vector_store_backend == "local":
+        chroma = LocalVectorStore(
+            persist_directory=settings.local_vector_store_dir,
+            collection_prefix=settings.chroma_collection_prefix,
+        )
+    else:
+        chroma = ChromaAdapter(
+            collection_prefix=settings.chroma_collection_prefix,
+            legacy_source_projects=legacy_source_projects,
+        )
 
     # Initialize embedding service
     # Note: Requires OPENAI_API_KEY environment variable
@@ -0,0 +1,293 @@
+"""
+Weekly and monthly rollups of GSC analytics.
+
+Keyword, page and site totals are kept per week (starting Monday) and per
+calendar month in ``*_rollups`` tables beside the daily rows. A sync rebuilds
+the rollups of every week and month its window touches (``refresh_rollups``)
+from the daily rows of those periods only.
+
+Readers ask for totals over an arbitrary date range (``keyword_totals``,
+``page_totals``, ``site_totals``). The range is split into whole months,
+whole weeks and the few leftover days (``plan_range``); months and weeks are
+read from the rollups and only the leftover days from the daily rows, so a
+query touches at most a few dozen rows per keyword or page however long the
+range or the user's history.
+
+Averages are carried as sums plus a row count, so combined totals match
+averaging the daily rows directly:
+
+- ``avg_ctr`` / ``avg_position``: plain means over the daily rows
+- ``ctr`` / ``position``: click-through rate and impression-weighted position
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    Float,
+    Select,
+    String,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.models.analytics import (
+    DailyAnalytics,
+    DailyAnalyticsRollup,
+    KeywordRanking,
+    KeywordRankingRollup,
+    PagePerformance,
+    PagePerformanceRollup,
+)
+
+WEEK = "week"
+MONTH = "month"
+ROLLUP_PERIODS = (WEEK, MONTH)
+
+
+@dataclass(frozen=True)
+class _RollupSpec:
+    """How the daily rows of one table map onto its rollup table."""
+
+    daily: type
+    rollup: type
+    key: str | None  # grouping column besides user and site
+    clicks: str = "clicks"
+    impressions: str = "impressions"
+    ctr: str = "ctr"
+    position: str = "position"
+
+
+KEYWORDS = _RollupSpec(KeywordRanking, KeywordRankingRollup, "keyword")
+PAGES = _RollupSpec(PagePerformance, PagePerformanceRollup, "page_url")
+SITE = _RollupSpec(
+    DailyAnalytics,
+    DailyAnalyticsRollup,
+    None,
+    clicks="total_clicks",
+    impressions="total_impressions",
+    ctr="avg_ctr",
+    position="avg_position",
+)
+
+
+def period_start(period: str, day: date) -> date:
+    """First day of the week (Monday) or month containing *day*."""
+    if period == WEEK:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(period: str, start: date) -> date:
+    """Last day of the week or month starting on *start*."""
+    if period == WEEK:
+        return start + timedelta(days=6)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+@dataclass
+class RangePlan:
+    """A date range split into whole months, whole weeks and leftover day spans."""
+
+    months: list[date] = field(default_factory=list)
+    weeks: list[date] = field(default_factory=list)
+    days: list[tuple[date, date]] = field(default_factory=list)
+
+
+def plan_range(start_date: date, end_date: date) -> RangePlan:
+    """
+    Cover [start_date, end_date] with as many whole months as fit, then whole
+    weeks within the parts before and after them, then single days.
+    """
+    plan = RangePlan()
+    first_month = period_start(MONTH, start_date)
+    if first_month < start_date:
+        first_month = period_end(MONTH, first_month) + timedelta(days=1)
+    month = first_month
+    while month <= end_date and period_end(MONTH, month) <= end_date:
+        plan.months.append(month)
+        month = period_end(MONTH, month) + timedelta(days=1)
+
+    segments = [(start_date, end_date)]
+    if plan.months:
+        segments = [
+            (start_date, plan.months[0] - timedelta(days=1)),
+            (month, end_date),
+        ]
+    for seg_start, seg_end in segments:
+        if seg_start > seg_end:
+            continue
+        week = period_start(WEEK, seg_start)
+        if week < seg_start:
+            week += timedelta(days=7)
+        weeks = []
+        while period_end(WEEK, week) <= seg_end:
+            weeks.append(week)
+            week += timedelta(days=7)
+        if not weeks:
+            plan.days.append((seg_start, seg_end))
+            continue
+        plan.weeks.extend(weeks)
+        if weeks[0] > seg_start:
+            plan.days.append((seg_start, weeks[0] - timedelta(days=1)))
+        if week <= seg_end:
+            plan.days.append((week, seg_end))
+    return plan
+
+
+async def refresh_rollups(
+    db: AsyncSession, user_id: str, site_url: str, start_date: date, end_date: date
+) -> None:
+    """
+    Rebuild the weekly and monthly rollups of every period that overlaps
+    [start_date, end_date] from the daily rows. Does not commit.
+    """
+    for period in ROLLUP_PERIODS:
+        first = period_start(period, start_date)
+        last = period_start(period, end_date)
+        for spec in (KEYWORDS, PAGES, SITE):
+            daily, rollup = spec.daily, spec.rollup
+            await db.execute(
+                delete(rollup).where(
+                    rollup.user_id == user_id,
+                    rollup.site_url == site_url,
+                    rollup.period == period,
+                    rollup.period_start >= first,
+                    rollup.period_start <= last,
+                )
+            )
+            # A literal unit keeps date_trunc identical in SELECT and GROUP BY
+            starts = cast(func.date_trunc(literal_column(f"'{period}'"), daily.date), Date)
+            keys = [getattr(daily, spec.key)] if spec.key else []
+            clicks = getattr(daily, spec.clicks)
+            impressions = getattr(daily, spec.impressions)
+            position = getattr(daily, spec.position)
+            rows = (
+                select(
+                    func.gen_random_uuid(),
+                    daily.user_id,
+                    daily.site_url,
+                    *keys,
+                    literal(period, String),
+                    starts,
+                    func.max(daily.date),
+                    func.sum(clicks),
+                    func.sum(impressions),
+                    func.sum(getattr(daily, spec.ctr)),
+                    func.sum(position),
+                    func.sum(position * impressions),
+                    func.count(),
+                )
+                .where(
+                    daily.user_id == user_id,
+                    daily.site_url == site_url,
+                    daily.date >= first,
+                    daily.date <= period_end(period, last),
+                )
+                .group_by(daily.user_id, daily.site_url, *keys, starts)
+            )
+            columns = [
+                "id", "user_id", "site_url", *([spec.key] if spec.key else []),
+                "period", "period_start", "last_date", "clicks", "impressions",
+                "ctr_sum", "position_sum", "position_impressions", "row_count",
+            ]
+            await db.execute(insert(rollup).from_select(columns, rows))
+
+
+def _sources(spec: _RollupSpec, user_id: str, start_date: date, end_date: date):
+    """Rollup and daily rows that together cover the range exactly once."""
+    plan = plan_range(start_date, end_date)
+    daily, rollup = spec.daily, spec.rollup
+
+    def from_rollup(period: str, starts: list[date]):
+        return select(
+            *([getattr(rollup, spec.key).label("key")] if spec.key else []),
+            rollup.clicks,
+            rollup.impressions,
+            rollup.ctr_sum,
+            rollup.position_sum,
+            rollup.position_impressions,
+            rollup.row_count,
+            rollup.last_date,
+        ).where(
+            rollup.user_id == user_id,
+            rollup.period == period,
+            rollup.period_start.in_(starts),
+        )
+
+    position = getattr(daily, spec.position)
+    impressions = getattr(daily, spec.impressions)
+    # An empty range still needs one (empty) part to select from
+    day_spans = plan.days or ([] if plan.months or plan.weeks else [(start_date, end_date)])
+    parts = []
+    if plan.months:
+        parts.append(from_rollup(MONTH, plan.months))
+    if plan.weeks:
+        parts.append(from_rollup(WEEK, plan.weeks))
+    if day_spans:
+        parts.append(
+            select(
+                *([getattr(daily, spec.key).label("key")] if spec.key else []),
+                cast(getattr(daily, spec.clicks), BigInteger).label("clicks"),
+                cast(impressions, BigInteger).label("impressions"),
+                getattr(daily, spec.ctr).label("ctr_sum"),
+                position.label("position_sum"),
+                (position * impressions).label("position_impressions"),
+                literal(1).label("row_count"),
+                daily.date.label("last_date"),
+            ).where(
+                daily.user_id == user_id,
+                or_(*(and_(daily.date >= lo, daily.date <= hi) for lo, hi in day_spans)),
+            )
+        )
+    return union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+
+
+def _totals(spec: _RollupSpec, user_id: str, start_date: date, end_date: date) -> Select:
+    src = _sources(spec, user_id, start_date, end_date)
+    rows = func.sum(src.c.row_count)
+    clicks = func.coalesce(func.sum(src.c.clicks), 0)
+    impressions = func.coalesce(func.sum(src.c.impressions), 0)
+    stmt = select(
+        *([src.c.key.label(spec.key)] if spec.key else []),
+        cast(clicks, BigInteger).label("clicks"),
+        cast(impressions, BigInteger).label("impressions"),
+        (func.sum(src.c.ctr_sum) / func.nullif(rows, 0)).label("avg_ctr"),
+        (func.sum(src.c.position_sum) / func.nullif(rows, 0)).label("avg_position"),
+        func.coalesce(cast(clicks, Float) / func.nullif(impressions, 0), 0.0).label("ctr"),
+        func.coalesce(
+            func.sum(src.c.position_impressions) / func.nullif(impressions, 0),
+            func.sum(src.c.position_sum) / func.nullif(rows, 0),
+        ).label("position"),
+        cast(func.coalesce(rows, 0), BigInteger).label("row_count"),
+        func.max(src.c.last_date).label("date"),
+    )
+    if spec.key:
+        stmt = stmt.group_by(src.c.key)
+    return stmt
+
+
+def keyword_totals(user_id: str, start_date: date, end_date: date) -> Select:
+    """One row of totals per keyword over the range (see module docstring for columns)."""
+    return _totals(KEYWORDS, user_id, start_date, end_date)
+
+
+def page_totals(user_id: str, start_date: date, end_date: date) -> Select:
+    """One row of totals per page URL over the range."""
+    return _totals(PAGES, user_id, start_date, end_date)
+
+
+def site_totals(user_id: str, start_date: date, end_date: date) -> Select:
+    """A single row of site-wide totals over the range."""
+    return _totals(SITE, user_id, start_date, end_date)
@@ -6,23 +6,29 @@ across title, headings, URL slug, meta description, and body TF-IDF.
 """
 
 import asyncio
+import contextlib
 import logging
-import math
 import re
 import time
-from collections import Counter, defaultdict
+from collections import defaultdict
+from collections.abc import Collection
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
 from uuid import uuid4
 
 import httpx
 from bs4 import BeautifulSoup
-from lxml import etree
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.database.connection import async_session_maker
+from services.competitor_page_cache import CachedPage, get_cached_page, set_cached_page
+from services.keyword_extraction import extract_keywords_and_frequencies, tokenize
+from services.keyword_matching import find_uncovered, get_cached_gaps, set_cached_gaps
+from services.parse_pool import run_in_parse_pool
 from services.site_auditor import _is_safe_url
+from services.sitemaps import SitemapWalker
 from infrastructure.database.models.competitor import CompetitorAnalysis, CompetitorArticle
 from infrastructure.database.models.content import Article
 
@@ -34,40 +40,7 @@ DEFAULT_CRAWL_DELAY = 1.0
 MAX_CONCURRENCY = 3
 REQUEST_TIMEOUT = 15.0
 MAX_ANALYSIS_TIME = 600  # 10 minutes total analysis timeout
-
-# ============================================================================
-# English stop words (no external dependency needed)
-# ============================================================================
-
-STOP_WORDS: frozenset[str] = frozenset({
-    "a", "about", "above", "after", "again", "against", "all", "am", "an",
-    "and", "any", "are", "aren't", "as", "at", "be", "because", "been",
-    "before", "being", "below", "between", "both", "but", "by", "can",
-    "can't", "cannot", "could", "couldn't", "did", "didn't", "do", "does",
-    "doesn't", "doing", "don't", "down", "during", "each", "few", "for",
-    "from", "further", "get", "got", "had", "hadn't", "has", "hasn't",
-    "have", "haven't", "having", "he", "her", "here", "hers", "herself",
-    "him", "himself", "his", "how", "i", "if", "in", "into", "is", "isn't",
-    "it", "its", "itself", "just", "let", "let's", "like", "ll", "me",
-    "might", "more", "most", "mustn't", "my", "myself", "new", "no", "nor",
-    "not", "now", "of", "off", "on", "once", "only", "or", "other", "ought",
-    "our", "ours", "ourselves", "out", "over", "own", "re", "s", "same",
-    "shall", "shan't", "she", "should", "shouldn't", "so", "some", "such",
-    "t", "than", "that", "the", "their", "theirs", "them", "themselves",
-    "then", "there", "these", "they", "this", "those", "through", "to",
-    "too", "under", "until", "up", "us", "ve", "very", "was", "wasn't",
-    "we", "were", "weren't", "what", "when", "where", "which", "while",
-    "who", "whom", "why", "will", "with", "won't", "would", "wouldn't",
-    "you", "your", "yours", "yourself", "yourselves",
-    # Additional common web/blog words to filter
-    "blog", "post", "read", "click", "here", "also", "use", "using",
-    "used", "one", "two", "first", "best", "top", "way", "ways",
-    "make", "made", "know", "need", "want", "go", "going", "see",
-    "well", "back", "still", "even", "take", "come", "good", "great",
-    "many", "much", "may", "right", "look", "think", "every", "give",
-    "day", "find", "long", "say", "help", "thing", "things",
-})
-
+BODY_DIGEST_TOKENS = 10_000  # body tokens kept per page for the TF-IDF signal
 
 # ============================================================================
 # URL filtering patterns — skip non-article URLs
@@ -88,7 +61,7 @@ SKIP_EXTENSIONS = re.compile(r"\.(pdf|jpg|jpeg|png|gif|webp|svg|css|js|xml|zip|m
 
 async def _fetch_text(client: httpx.AsyncClient, url: str) -> str | None:
     """Fetch URL text content, return None on failure. Includes SSRF check."""
-    if not _is_safe_url(url):
+    if not await _is_safe_url(url):
         logger.debug("Blocked unsafe URL in competitor analyzer: %s", url)
         return None
     try:
@@ -122,33 +95,6 @@ def _parse_robots_txt(robots_text: str) -> tuple[list[str], float]:
     return sitemaps, crawl_delay
 
 
-def _extract_urls_from_sitemap_xml(xml_text: str) -> tuple[list[str], list[str]]:
-    """
-    Parse a sitemap XML. Returns (page_urls, child_sitemap_urls).
-    Handles both regular sitemaps and sitemap indexes.
-    """
-    page_urls: list[str] = []
-    child_sitemaps: list[str] = []
-    try:
-        root = etree.fromstring(xml_text.encode("utf-8"))
-        ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-
-        # Check for sitemap index
-        for sitemap_el in root.findall(".//sm:sitemap/sm:loc", ns):
-            if sitemap_el.text:
-                child_sitemaps.append(sitemap_el.text.strip())
-
-        # Check for regular URLs
-        for url_el in root.findall(".//sm:url/sm:loc", ns):
-            if url_el.text:
-                page_urls.append(url_el.text.strip())
-
-    except Exception as exc:
-        logger.warning("Failed to parse sitemap XML: %s", exc)
-
-    return page_urls, child_sitemaps
-
-
 def _is_article_url(url: str) -> bool:
     """Filter out non-article URLs (tags, categories, author pages, static assets, etc.)."""
     path = urlparse(url).path
@@ -161,14 +107,29 @@ def _is_article_url(url: str) -> bool:
     return len(segments) >= 1
 
 
-async def discover_urls(client: httpx.AsyncClient, domain: str) -> tuple[list[str], float]:
+@dataclass
+class SitemapDiscovery:
+    """Article URLs found in a competitor's sitemaps, with their <lastmod>."""
+
+    entries: dict[str, datetime | None]
+    crawl_delay: float
+    truncated: bool  # stopped at the limit, more URLs may exist
+
+
+async def discover_sitemap_entries(
+    client: httpx.AsyncClient, domain: str, limit: int = MAX_URLS
+) -> SitemapDiscovery:
     """
-    Discover article URLs from a competitor's sitemaps.
-    Returns (urls, crawl_delay).
+    Discover up to *limit* article URLs from a competitor's sitemaps
+    (robots.txt Sitemap lines plus the standard locations).
+
+    Best-effort: a sitemap that cannot be fetched or parsed is skipped, and
+    if the walk itself fails the URLs collected so far are still returned.
     """
     base_url = f"https://{domain}"
     crawl_delay = DEFAULT_CRAWL_DELAY
-    all_urls: set[str] = set()
+    entries: dict[str, datetime | None] = {}
+    truncated = False
 
     # Step 1: Check robots.txt
     robots_text = await _fetch_text(client, f"{base_url}/robots.txt")
@@ -185,44 +146,40 @@ async def discover_urls(client: httpx.AsyncClient, domain: str) -> tuple[list[st
         f"{base_url}/page-sitemap.xml",
     ])
     # Deduplicate while preserving order
-    seen = set()
-    unique_candidates = []
-    for s in sitemap_candidates:
-        if s not in seen:
-            seen.add(s)
-            unique_candidates.append(s)
-
-    # Step 3: Fetch and parse sitemaps (up to 2 levels deep)
-    visited_sitemaps: set[str] = set()
-
-    async def process_sitemap(sitemap_url: str, depth: int = 0):
-        if depth > 2 or sitemap_url in visited_sitemaps:
-            return
-        visited_sitemaps.add(sitemap_url)
+    unique_candidates = list(dict.fromkeys(sitemap_candidates))
 
-        xml_text = await _fetch_text(client, sitemap_url)
-        if not xml_text:
-            return
-
-        page_urls, child_sitemaps = _extract_urls_from_sitemap_xml(xml_text)
-        for u in page_urls:
-            if _is_article_url(u):
-                all_urls.add(u)
+    # Step 3: Stream sitemaps (up to 2 levels deep), fetching child sitemaps
+    # concurrently, and stop as soon as enough article URLs are collected
+    walker = SitemapWalker(client, _is_safe_url, max_depth=2)
+    try:
+        async with contextlib.aclosing(walker.entries(unique_candidates)) as stream:
+            async for entry in stream:
+                if _is_article_url(entry.loc):
+                    entries[entry.loc] = entry.lastmod
+                    if len(entries) >= limit:
+                        truncated = True
+                        break
+    except Exception as exc:
+        logger.warning(
+            "Sitemap discovery for %s stopped after %d URLs: %s", domain, len(entries), exc
+        )
 
-        for child in child_sitemaps:
-            if len(all_urls) >= MAX_URLS:
-                break
-            await process_sitemap(child, depth + 1)
+    return SitemapDiscovery(entries=entries, crawl_delay=crawl_delay, truncated=truncated)
 
-    for candidate in unique_candidates:
-        if len(all_urls) >= MAX_URLS:
-            break
-        await process_sitemap(candidate)
 
+async def discover_urls(client: httpx.AsyncClient, domain: str) -> tuple[list[str], float]:
+    """
+    Discover article URLs from a competitor's sitemaps.
+    Returns (urls, crawl_delay).
+    """
+    discovery = await discover_sitemap_entries(client, domain)
     # Cap at MAX_URLS
-    url_list = sorted(all_urls)[:MAX_URLS]
-    logger.info("Discovered %d article URLs for %s (from %d total)", len(url_list), domain, len(all_urls))
-    return url_list, crawl_delay
+    url_list = sorted(discovery.entries)[:MAX_URLS]
+    logger.info(
+        "Discovered %d article URLs for %s (from %d total)",
+        len(url_list), domain, len(discovery.entries),
+    )
+    return url_list, discovery.crawl_delay
 
 
 # ============================================================================
@@ -233,6 +190,10 @@ def _extract_page_data(html: str, url: str) -> dict:
     """
     Extract SEO-relevant data from an HTML page.
     Returns dict with title, meta_description, headings, url_slug, word_count, body_text.
+    body_text is a digest: the body's keyword tokens (stop words and
+    punctuation dropped, up to BODY_DIGEST_TOKENS), all the TF-IDF pass reads,
+    which keeps cached entries small.
+    Runs in the parse process pool (see scrape_pages).
     """
     soup = BeautifulSoup(html, "lxml")
 
@@ -279,7 +240,7 @@ def _extract_page_data(html: str, url: str) -> dict:
         "headings": headings,
         "url_slug": url_slug,
         "word_count": word_count,
-        "body_text": body_text,
+        "body_text": " ".join(tokenize(body_text)[:BODY_DIGEST_TOKENS]),
     }
 
 
@@ -288,34 +249,64 @@ async def scrape_pages(
     urls: list[str],
     crawl_delay: float,
     analysis_id: str,
+    track_progress: bool = True,
+    revalidate: Collection[str] = (),
 ) -> list[dict]:
     """
     Scrape a list of URLs with rate limiting and concurrency control.
-    Updates analysis.scraped_urls in the DB as pages are processed.
+    Pages in the shared page cache are reused while fresh and revalidated with
+    a conditional GET once stale, so only new or changed pages are parsed.
+    URLs in *revalidate* (known to have changed) are always revalidated, even
+    when their cache entry is fresh.
+    With track_progress, updates analysis.scraped_urls in the DB as pages are
+    processed.
     """
     semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
     results: list[dict] = []
     scraped_count = 0
+    cache_hits = 0
 
     async def scrape_one(url: str) -> dict | None:
-        nonlocal scraped_count
+        nonlocal scraped_count, cache_hits
+        cached = await get_cached_page(url)
+        if cached and cached.is_fresh() and url not in revalidate:
+            scraped_count += 1
+            cache_hits += 1
+            return {**cached.data, "url": url}
+
         async with semaphore:
-            if not _is_safe_url(url):
+            if not await _is_safe_url(url):
                 logger.debug("Blocked unsafe URL in scraper: %s", url)
                 return None
             try:
-                resp = await client.get(url, follow_redirects=True, timeout=REQUEST_TIMEOUT)
-                if resp.status_code != 200:
-                    logger.debug("Non-200 for %s: %d", url, resp.status_code)
-                    return None
-                # Only process HTML responses
-                ct = resp.headers.get("content-type", "")
-                if "text/html" not in ct:
-                    return None
-                data = _extract_page_data(resp.text, url)
-                data["url"] = url
+                resp = await client.get(
+                    url,
+                    headers=cached.conditional_headers() if cached else None,
+                    follow_redirects=True,
+                    timeout=REQUEST_TIMEOUT,
+                )
+                etag = resp.headers.get("etag")
+                last_modified = resp.headers.get("last-modified")
+                if resp.status_code == 304 and cached:
+                    data = cached.data
+                    etag = etag or cached.etag
+                    last_modified = last_modified or cached.last_modified
+                    cache_hits += 1
+                else:
+                    if resp.status_code != 200:
+                        logger.debug("Non-200 for %s: %d", url, resp.status_code)
+                        return None
+                    # Only process HTML responses
+                    ct = resp.headers.get("content-type", "")
+                    if "text/html" not in ct:
+                        return None
+                    # Parse in the process pool so large pages don't block the event loop
+                    data = await run_in_parse_pool(_extract_page_data, resp.text, url)
+                await set_cached_page(
+                    url, CachedPage(data=data, etag=etag, last_modified=last_modified)
+                )
                 scraped_count += 1
-                return data
+                return {**data, "url": url}
             except Exception as exc:
                 logger.debug("Failed to scrape %s: %s", url, exc)
                 return None
@@ -331,6 +322,8 @@ async def scrape_pages(
             if r is not None:
                 results.append(r)
 
+        if not track_progress:
+            continue
         # Update progress in DB
         try:
             async with async_session_maker() as session:
@@ -341,170 +334,13 @@ async def scrape_pages(
         except Exception:
             pass  # Non-critical progress update
 
-    logger.info("Scraped %d pages out of %d URLs for analysis %s", len(results), len(urls), analysis_id)
+    logger.info(
+        "Scraped %d pages out of %d URLs for analysis %s (%d from cache)",
+        len(results), len(urls), analysis_id, cache_hits,
+    )
     return results
 
 
-# ============================================================================
-# Keyword Extraction Algorithm
-# ============================================================================
-
-def _tokenize(text: str) -> list[str]:
-    """Lowercase, strip punctuation, split into word tokens."""
-    text = text.lower()
-    text = re.sub(r"[^\w\s-]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return [w for w in text.split() if len(w) > 1 and w not in STOP_WORDS]
-
-
-def _generate_ngrams(tokens: list[str], max_n: int = 4) -> list[str]:
-    """Generate n-grams (1 to max_n) from a token list."""
-    ngrams = []
-    for n in range(1, min(max_n + 1, len(tokens) + 1)):
-        for i in range(len(tokens) - n + 1):
-            gram = " ".join(tokens[i : i + n])
-            # Skip if any component is a stop word (for n > 1)
-            if n > 1 and any(t in STOP_WORDS for t in tokens[i : i + n]):
-                continue
-            # Skip if it's just numbers
-            if re.match(r"^[\d\s-]+$", gram):
-                continue
-            ngrams.append(gram)
-    return ngrams
-
-
-def _extract_keyword_for_article(page_data: dict) -> tuple[str | None, float]:
-    """
-    Extract the most likely target keyword for a single article.
-    Uses weighted scoring across title, H1, URL slug, meta description, and H2s.
-
-    Returns (keyword, confidence_score).
-    """
-    scores: Counter = Counter()
-
-    # Weight configuration
-    weights = {
-        "title": 3.0,
-        "h1": 2.5,
-        "slug": 2.0,
-        "meta": 1.5,
-        "h2": 1.0,
-    }
-
-    # Title
-    if page_data.get("title"):
-        tokens = _tokenize(page_data["title"])
-        for gram in _generate_ngrams(tokens, max_n=4):
-            scores[gram] += weights["title"]
-
-    # H1 headings
-    for h in (page_data.get("headings") or []):
-        if h["level"] == 1:
-            tokens = _tokenize(h["text"])
-            for gram in _generate_ngrams(tokens, max_n=4):
-                scores[gram] += weights["h1"]
-
-    # URL slug
-    if page_data.get("url_slug"):
-        slug_text = page_data["url_slug"].replace("-", " ").replace("_", " ")
-        tokens = _tokenize(slug_text)
-        for gram in _generate_ngrams(tokens, max_n=4):
-            scores[gram] += weights["slug"]
-
-    # Meta description
-    if page_data.get("meta_description"):
-        tokens = _tokenize(page_data["meta_description"])
-        for gram in _generate_ngrams(tokens, max_n=4):
-            scores[gram] += weights["meta"]
-
-    # H2 headings
-    for h in (page_data.get("headings") or []):
-        if h["level"] == 2:
-            tokens = _tokenize(h["text"])
-            for gram in _generate_ngrams(tokens, max_n=4):
-                scores[gram] += weights["h2"]
-
-    if not scores:
-        return None, 0.0
-
-    # Apply length bonus: 2-3 word phrases are most realistic as keywords
-    adjusted_scores: Counter = Counter()
-    for gram, score in scores.items():
-        word_count = len(gram.split())
-        if word_count in (2, 3):
-            adjusted_scores[gram] = score * 1.3
-        elif word_count == 4:
-            adjusted_scores[gram] = score * 1.1
-        else:
-            adjusted_scores[gram] = score
-
-    # Get top candidate
-    top_keyword, top_score = adjusted_scores.most_common(1)[0]
-
-    # Normalize confidence to 0-1 range
-    max_possible = sum(weights.values()) * 1.3  # All sources match, with length bonus
-    confidence = min(top_score / max_possible, 1.0)
-
-    return top_keyword, round(confidence, 3)
-
-
-def extract_keywords_with_tfidf(pages_data: list[dict]) -> list[tuple[str | None, float]]:
-    """
-    Extract keywords for all articles, with a TF-IDF body text boost.
-
-    First pass: positional scoring (title, H1, slug, meta, H2).
-    Second pass: compute IDF across all docs, add body TF-IDF signal.
-
-    Returns list of (keyword, confidence) tuples, one per page.
-    """
-    # First pass: get positional keywords
-    positional_results = [_extract_keyword_for_article(p) for p in pages_data]
-
-    # Compute document frequencies for body n-grams
-    num_docs = len(pages_data)
-    if num_docs < 3:
-        # Too few documents for meaningful IDF; return positional results
-        return positional_results
-
-    doc_freq: Counter = Counter()
-    doc_ngrams: list[Counter] = []
-
-    for page in pages_data:
-        body = page.get("body_text", "")
-        tokens = _tokenize(body)
-        # Only consider 1-3 grams for body TF
-        grams = _generate_ngrams(tokens[:500], max_n=3)  # Cap at 500 tokens for performance
-        gram_counts = Counter(grams)
-        doc_ngrams.append(gram_counts)
-        for gram in set(gram_counts.keys()):
-            doc_freq[gram] += 1
-
-    # Second pass: boost positional scores with body TF-IDF
-    final_results: list[tuple[str | None, float]] = []
-    body_weight = 0.5
-
-    for i, page in enumerate(pages_data):
-        keyword, confidence = positional_results[i]
-        if keyword is None:
-            final_results.append((None, 0.0))
-            continue
-
-        # Check if the positional keyword appears in body
-        tf = doc_ngrams[i].get(keyword, 0)
-        df = doc_freq.get(keyword, 1)
-        idf = math.log(num_docs / df) if df > 0 else 0
-
-        if tf > 0 and idf > 0:
-            # Boost confidence if the keyword also appears significantly in the body
-            tfidf_score = (tf * idf) / 100  # Normalize
-            boosted_confidence = min(confidence + (tfidf_score * body_weight), 1.0)
-            final_results.append((keyword, round(boosted_confidence, 3)))
-        else:
-            final_results.append((keyword, confidence))
-
-    return final_results
-
-
 # ============================================================================
 # Gap Analysis
 # ============================================================================
@@ -514,11 +350,31 @@ async def compute_keyword_gaps(
     analysis_id: str,
     user_id: str,
     project_id: str | None = None,
+    use_cache: bool = True,
+    revision: str = "",
 ) -> dict:
     """
-    Compare competitor keywords against the user's own articles.
-    Returns dict with gaps, total counts.
+    Compare competitor keywords against the user's own articles, treating
+    near-variants of a user keyword as covered (see services.keyword_matching).
+    Returns dict with gaps, total counts. With use_cache (finished analyses
+    only), results are cached per analysis, user keyword set and content
+    *revision*.
     """
+    # Get user's keywords
+    user_query = select(func.lower(Article.keyword)).where(
+        Article.user_id == user_id,
+        Article.keyword.isnot(None),
+    )
+    if project_id:
+        user_query = user_query.where(Article.project_id == project_id)
+
+    user_result = await db.execute(user_query)
+    user_keywords: set[str] = {row[0].strip() for row in user_result if row[0]}
+
+    user_keyword_list = sorted(user_keywords)
+    if use_cache and (cached := await get_cached_gaps(analysis_id, user_keyword_list, revision)) is not None:
+        return cached
+
     # Get competitor keywords with article counts
     comp_result = await db.execute(
         select(
@@ -540,33 +396,51 @@ async def compute_keyword_gaps(
             "urls": row.urls or [],
         }
 
-    # Get user's keywords
-    user_query = select(func.lower(Article.keyword)).where(
-        Article.user_id == user_id,
-        Article.keyword.isnot(None),
-    )
-    if project_id:
-        user_query = user_query.where(Article.project_id == project_id)
-
-    user_result = await db.execute(user_query)
-    user_keywords: set[str] = {row[0].strip() for row in user_result if row[0]}
-
-    # Compute gaps
+    # Compute gaps: competitor keywords no user keyword matches, near-variants included
+    ranked = sorted(competitor_keywords.items(), key=lambda x: x[1]["count"], reverse=True)
+    uncovered = set(await find_uncovered([kw for kw, _ in ranked], user_keyword_list))
     gaps = []
-    for kw, data in sorted(competitor_keywords.items(), key=lambda x: x[1]["count"], reverse=True):
-        if kw not in user_keywords:
+    for kw, data in ranked:
+        if kw in uncovered:
             gaps.append({
                 "keyword": kw,
                 "competitor_articles": data["count"],
                 "competitor_urls": data["urls"][:10],  # Cap URLs for response size
             })
 
-    return {
+    result = {
         "gaps": gaps,
         "total_competitor_keywords": len(competitor_keywords),
         "total_your_keywords": len(user_keywords),
         "total_gaps": len(gaps),
     }
+    if use_cache:
+        await set_cached_gaps(analysis_id, user_keyword_list, result, revision)
+    return result
+
+
+def build_competitor_article(
+    analysis_id: str,
+    page_data: dict,
+    keyword: str | None,
+    confidence: float,
+    lastmod: datetime | None = None,
+) -> CompetitorArticle:
+    """CompetitorArticle row for a scraped page and its extracted keyword."""
+    return CompetitorArticle(
+        id=str(uuid4()),
+        analysis_id=analysis_id,
+        url=page_data["url"],
+        title=page_data.get("title"),
+        meta_description=page_data.get("meta_description"),
+        headings=page_data.get("headings"),
+        url_slug=page_data.get("url_slug"),
+        word_count=page_data.get("word_count"),
+        extracted_keyword=keyword,
+        keyword_confidence=confidence,
+        scraped_at=datetime.now(timezone.utc),
+        lastmod=lastmod,
+    )
 
 
 # ============================================================================
@@ -593,7 +467,9 @@ async def _run_competitor_analysis_inner(analysis_id: str, start_time: float) ->
             follow_redirects=True,
             timeout=REQUEST_TIMEOUT,
         ) as client:
-            urls, crawl_delay = await discover_urls(client, domain)
+            discovery = await discover_sitemap_entries(client, domain)
+            urls = sorted(discovery.entries)[:MAX_URLS]
+            crawl_delay = discovery.crawl_delay
 
             if not urls:
                 analysis.status = "failed"
@@ -623,24 +499,16 @@ async def _run_competitor_analysis_inner(analysis_id: str, start_time: float) ->
         analysis.status = "extracting"
         await db.commit()
 
-        keyword_results = extract_keywords_with_tfidf(pages_data)
+        keyword_results, frequencies = await asyncio.to_thread(
+            extract_keywords_and_frequencies, pages_data
+        )
+        analysis.body_frequencies = frequencies.trimmed().pack()
 
         # Step 4: Save competitor articles
         for page_data, (keyword, confidence) in zip(pages_data, keyword_results):
-            article = CompetitorArticle(
-                id=str(uuid4()),
-                analysis_id=analysis_id,
-                url=page_data["url"],
-                title=page_data.get("title"),
-                meta_description=page_data.get("meta_description"),
-                headings=page_data.get("headings"),
-                url_slug=page_data.get("url_slug"),
-                word_count=page_data.get("word_count"),
-                extracted_keyword=keyword,
-                keyword_confidence=confidence,
-                scraped_at=datetime.now(timezone.utc),
-            )
-            db.add(article)
+            db.add(build_competitor_article(
+                analysis_id, page_data, keyword, confidence, discovery.entries.get(page_data["url"])
+            ))
 
         # Step 5: Finalize
         distinct_keywords = len({
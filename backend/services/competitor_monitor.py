@@ -0,0 +1,372 @@
+"""
+Scheduled competitor monitoring.
+
+An analysis with monitoring enabled is re-checked every
+``monitor_interval_hours``. A monitoring run does not repeat the full
+analysis; it diffs the competitor's sitemaps against what it already knows:
+
+- new URLs: article URLs that are neither stored articles nor in the
+  snapshot of sitemap URLs seen by the previous run (64-bit URL hashes);
+- changed URLs: stored articles whose sitemap ``<lastmod>`` is later than
+  the one recorded when they were scraped.
+
+Only those URLs are scraped (through the shared page cache), their keywords
+extracted against the body document frequencies of the whole analysis, new ``CompetitorArticle`` rows appended with a "new_content"
+``CompetitorAlert`` each, and changed articles updated in place. The first
+run of an analysis only records the snapshot, so URLs the initial analysis
+skipped past its URL cap are not reported as new.
+
+Due analyses are claimed with ``FOR UPDATE SKIP LOCKED`` by pushing their
+next_monitor_at forward, so several workers never run the same analysis.
+"""
+
+import asyncio
+import base64
+import logging
+from array import array
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import func, select, update
+
+from infrastructure.database.bulk import bulk_update
+from infrastructure.database.connection import async_session_maker
+from infrastructure.database.models.competitor import (
+    CompetitorAlert,
+    CompetitorAnalysis,
+    CompetitorArticle,
+)
+from services.competitor_analyzer import (
+    BOT_USER_AGENT,
+    MAX_ANALYSIS_TIME,
+    MAX_URLS,
+    REQUEST_TIMEOUT,
+    build_competitor_article,
+    discover_sitemap_entries,
+    scrape_pages,
+)
+from services.crawl_checkpoint import url_key
+from services.keyword_extraction import (
+    DocumentFrequencies,
+    extract_keywords_and_frequencies,
+    extract_keywords_with_tfidf,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_MONITORED_URLS = 5000  # sitemap URLs compared per run
+MAX_CONCURRENT_MONITORS = 3
+MONITOR_BATCH = 10  # analyses claimed per scheduler tick
+LASTMOD_SLACK = timedelta(days=1)  # sitemap lastmods are often date-only
+MONITORED_RETENTION = timedelta(days=7)  # monitored analyses never expire
+ALERT_NEW_CONTENT = "new_content"
+
+
+def pack_snapshot(urls: Iterable[str]) -> str:
+    """Encode the URL set of a sitemap as sorted 64-bit hashes, base64."""
+    return base64.b64encode(array("Q", sorted({url_key(u) for u in urls})).tobytes()).decode()
+
+
+def unpack_snapshot(raw: str | None) -> set[int] | None:
+    """Decode a snapshot from pack_snapshot; None when there is none yet."""
+    if raw is None:
+        return None
+    hashes = array("Q")
+    hashes.frombytes(base64.b64decode(raw))
+    return set(hashes)
+
+
+@dataclass
+class SitemapDiff:
+    """What changed on a competitor's sitemap since the last monitoring run."""
+
+    new_urls: list[str] = field(default_factory=list)
+    changed_urls: list[str] = field(default_factory=list)
+    # Stored articles that had no lastmod yet: record it, nothing to scrape
+    lastmod_baseline: dict[str, datetime] = field(default_factory=dict)
+
+
+def diff_sitemap(
+    entries: dict[str, datetime | None],
+    known: dict[str, datetime | None],
+    snapshot: set[int] | None,
+    truncated: bool = False,
+    since: datetime | None = None,
+) -> SitemapDiff:
+    """
+    Compare current sitemap *entries* (url -> lastmod) with the stored
+    articles (*known*, url -> lastmod) and the previous run's *snapshot*.
+
+    Without a snapshot no URL is new (baseline run). When discovery stopped
+    at its URL limit (*truncated*), a different subset of a large sitemap may
+    come back each run, so an unseen URL only counts as new when its lastmod
+    is later than the previous run (*since*).
+    """
+    diff = SitemapDiff()
+    newer_than = since - LASTMOD_SLACK if since else None
+    for url, lastmod in entries.items():
+        if url in known:
+            stored = known[url]
+            if lastmod is None:
+                continue
+            if stored is None:
+                diff.lastmod_baseline[url] = lastmod
+            elif lastmod > stored:
+                diff.changed_urls.append(url)
+        elif snapshot is not None and url_key(url) not in snapshot:
+            if truncated and (lastmod is None or newer_than is None or lastmod <= newer_than):
+                continue
+            diff.new_urls.append(url)
+
+    def newest_first(url: str) -> tuple[bool, datetime]:
+        lastmod = entries[url]
+        return lastmod is not None, lastmod or datetime.min.replace(tzinfo=UTC)
+
+    diff.new_urls.sort(key=newest_first, reverse=True)
+    diff.changed_urls.sort(key=newest_first, reverse=True)
+    return diff
+
+
+def extract_monitored_keywords(
+    pages_data: list[dict],
+    known_urls: Collection[str],
+    frequencies: DocumentFrequencies | None,
+) -> tuple[list[tuple[str | None, float]], DocumentFrequencies | None]:
+    """
+    Keywords of scraped pages, in order, with IDF taken against the stored
+    body frequencies of the analysis. New pages join those frequencies;
+    changed pages are already counted in them. Analyses from before
+    frequencies were stored score the pages among themselves.
+
+    Returns the keyword results and the updated frequencies, if any.
+    """
+    if frequencies is None:
+        return extract_keywords_with_tfidf(pages_data), None
+    is_new = [page["url"] not in known_urls for page in pages_data]
+    new_results, new_frequencies = extract_keywords_and_frequencies(
+        [page for page, new in zip(pages_data, is_new, strict=True) if new], frequencies
+    )
+    changed_results = extract_keywords_with_tfidf(
+        [page for page, new in zip(pages_data, is_new, strict=True) if not new], frequencies
+    )
+    new_iter, changed_iter = iter(new_results), iter(changed_results)
+    results = [next(new_iter) if new else next(changed_iter) for new in is_new]
+    return results, frequencies.merge(new_frequencies)
+
+
+@dataclass
+class MonitorResult:
+    """Outcome of one monitoring run."""
+
+    new_articles: int = 0
+    changed_articles: int = 0
+    baseline: bool = False
+
+
+async def monitor_analysis(analysis_id: str) -> MonitorResult:
+    """
+    Run one incremental monitoring pass over a completed analysis: discover
+    sitemap entries, scrape only new and changed URLs, append new articles
+    with alerts and refresh changed ones.
+    """
+    result = MonitorResult()
+    async with async_session_maker() as db:
+        analysis = await db.get(CompetitorAnalysis, analysis_id)
+        if not analysis or analysis.status != "completed":
+            return result
+
+        rows = await db.execute(
+            select(CompetitorArticle.id, CompetitorArticle.url, CompetitorArticle.lastmod)
+            .where(CompetitorArticle.analysis_id == analysis_id)
+        )
+        article_ids: dict[str, str] = {}
+        known: dict[str, datetime | None] = {}
+        for row in rows:
+            article_ids[row.url] = row.id
+            known[row.url] = row.lastmod
+
+        snapshot = unpack_snapshot(analysis.sitemap_snapshot)
+        result.baseline = snapshot is None
+
+        async with httpx.AsyncClient(
+            headers={"User-Agent": BOT_USER_AGENT},
+            follow_redirects=True,
+            timeout=REQUEST_TIMEOUT,
+        ) as client:
+            discovery = await discover_sitemap_entries(client, analysis.domain, limit=MAX_MONITORED_URLS)
+            now = datetime.now(UTC)
+            if not discovery.entries:
+                # Sitemap unreachable this time; keep the previous snapshot
+                analysis.last_monitored_at = now
+                await db.commit()
+                return result
+
+            diff = diff_sitemap(
+                discovery.entries, known, snapshot, discovery.truncated, analysis.last_monitored_at
+            )
+            to_scrape = (diff.new_urls + diff.changed_urls)[:MAX_URLS]
+            # New URLs past the cap are left out of the snapshot and retried next run
+            deferred = set(diff.new_urls[MAX_URLS:])
+            pages_data = []
+            if to_scrape:
+                # Changed pages bypass the shared cache's freshness window
+                pages_data = await scrape_pages(
+                    client,
+                    to_scrape,
+                    discovery.crawl_delay,
+                    analysis_id,
+                    track_progress=False,
+                    revalidate=set(diff.changed_urls),
+                )
+
+        keyword_results = []
+        if pages_data:
+            keyword_results, frequencies = await asyncio.to_thread(
+                extract_monitored_keywords,
+                pages_data,
+                article_ids.keys(),
+                DocumentFrequencies.unpack(analysis.body_frequencies),
+            )
+            if frequencies is not None:
+                analysis.body_frequencies = frequencies.pack()
+
+        baseline_rows = [
+            {"id": article_ids[url], "lastmod": lastmod}
+            for url, lastmod in diff.lastmod_baseline.items()
+        ]
+        changed_rows = []
+        for page_data, (keyword, confidence) in zip(pages_data, keyword_results, strict=True):
+            url = page_data["url"]
+            lastmod = discovery.entries.get(url)
+            if url in article_ids:
+                changed_rows.append({
+                    "id": article_ids[url],
+                    "title": page_data.get("title"),
+                    "meta_description": page_data.get("meta_description"),
+                    "headings": page_data.get("headings"),
+                    "url_slug": page_data.get("url_slug"),
+                    "word_count": page_data.get("word_count"),
+                    "extracted_keyword": keyword,
+                    "keyword_confidence": confidence,
+                    "scraped_at": now,
+                    "lastmod": lastmod,
+                })
+                result.changed_articles += 1
+                continue
+            db.add(build_competitor_article(analysis_id, page_data, keyword, confidence, lastmod))
+            db.add(CompetitorAlert(
+                id=str(uuid4()),
+                analysis_id=analysis_id,
+                user_id=analysis.user_id,
+                project_id=analysis.project_id,
+                alert_type=ALERT_NEW_CONTENT,
+                url=url,
+                title=page_data.get("title"),
+                extracted_keyword=keyword,
+            ))
+            result.new_articles += 1
+
+        await bulk_update(db, CompetitorArticle, baseline_rows)
+        await bulk_update(db, CompetitorArticle, changed_rows)
+        await db.flush()
+
+        analysis.sitemap_snapshot = pack_snapshot(u for u in discovery.entries if u not in deferred)
+        analysis.last_monitored_at = now
+        analysis.expires_at = max(analysis.expires_at, now + MONITORED_RETENTION)
+        if result.new_articles or result.changed_articles:
+            analysis.content_changed_at = now
+            analysis.total_urls += result.new_articles
+            analysis.scraped_urls += result.new_articles
+            analysis.total_keywords = await db.scalar(
+                select(func.count(func.distinct(CompetitorArticle.extracted_keyword)))
+                .where(CompetitorArticle.analysis_id == analysis_id)
+            ) or 0
+        await db.commit()
+
+    logger.info(
+        "Monitored competitor analysis %s (%s): %d new, %d changed%s",
+        analysis_id, analysis.domain, result.new_articles, result.changed_articles,
+        " (baseline run)" if result.baseline else "",
+    )
+    return result
+
+
+async def claim_due_analyses(limit: int = MONITOR_BATCH) -> list[str]:
+    """
+    Atomically claim up to *limit* analyses due for monitoring by moving
+    their next_monitor_at one interval ahead; rows locked by another worker
+    are skipped.
+    """
+    now = datetime.now(UTC)
+    due = (
+        select(CompetitorAnalysis.id)
+        .where(
+            CompetitorAnalysis.monitoring_enabled.is_(True),
+            CompetitorAnalysis.status == "completed",
+            CompetitorAnalysis.next_monitor_at <= now,
+        )
+        .order_by(CompetitorAnalysis.next_monitor_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with async_session_maker() as db:
+        claimed = await db.execute(
+            update(CompetitorAnalysis)
+            .where(CompetitorAnalysis.id.in_(due.scalar_subquery()))
+            .values(
+                next_monitor_at=func.now() + CompetitorAnalysis.monitor_interval_hours * timedelta(hours=1)
+            )
+            .returning(CompetitorAnalysis.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed_ids = [row[0] for row in claimed.fetchall()]
+        await db.commit()
+    return claimed_ids
+
+
+class CompetitorMonitorService:
+    """Runs incremental monitoring for competitor analyses as they fall due."""
+
+    def __init__(self):
+        self.is_running = False
+        self.check_interval = 300  # Check every 5 minutes
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_MONITORS)
+
+    async def start(self):
+        """Start the monitoring background loop."""
+        if self.is_running:
+            return
+        self.is_running = True
+        logger.info("Competitor monitor started — checking every %ds", self.check_interval)
+
+        while self.is_running:
+            try:
+                await self._process_due_analyses()
+            except Exception as e:
+                logger.error("Competitor monitor error: %s", e, exc_info=True)
+            await asyncio.sleep(self.check_interval)
+
+    async def stop(self):
+        self.is_running = False
+        logger.info("Competitor monitor stopped")
+
+    async def _process_due_analyses(self):
+        """Claim due analyses and monitor them, a few at a time."""
+        claimed_ids = await claim_due_analyses()
+        if not claimed_ids:
+            return
+        logger.info("Claimed %d competitor analyses for monitoring", len(claimed_ids))
+        await asyncio.gather(*(self._monitor_one(analysis_id) for analysis_id in claimed_ids))
+
+    async def _monitor_one(self, analysis_id: str):
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(monitor_analysis(analysis_id), timeout=MAX_ANALYSIS_TIME)
+            except Exception as e:
+                logger.error("Monitoring failed for competitor analysis %s: %s", analysis_id, e, exc_info=True)
+
+
+competitor_monitor = CompetitorMonitorService()
@@ -0,0 +1,92 @@
+"""
+Shared cache of scraped competitor pages.
+
+Competitor analyses by different users often cover the same domains, so the
+data extracted from each page (title, meta description, headings, slug,
+word count and the body-text digest used for TF-IDF) is cached globally by
+URL, together with the response's ETag / Last-Modified validators. Entries
+younger than PAGE_FRESH_FOR are used as-is; older ones are revalidated with
+a conditional GET, and a 304 reuses the cached data without re-parsing.
+Entries expire after PAGE_CACHE_TTL. Keys carry PAGE_CACHE_VERSION, which is
+bumped whenever the extracted data changes shape, so older entries are
+neither served nor revalidated.
+
+Only public page content is stored, never anything user-specific, so
+sharing entries across tenants is safe.
+
+All helpers fail open: when Redis is unavailable lookups miss and writes are
+skipped, and pages are scraped uncached.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from infrastructure.redis import get_redis_text, redis_key
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_TTL = 7 * 86400  # 7 days
+PAGE_FRESH_FOR = 6 * 3600  # served without revalidation for 6 hours
+# v2: body_text digest grew from 500 to BODY_DIGEST_TOKENS (10,000) tokens
+PAGE_CACHE_VERSION = 2
+
+
+@dataclass
+class CachedPage:
+    """Extracted page data plus the HTTP validators it was fetched with."""
+
+    data: dict[str, Any]
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) - self.fetched_at < PAGE_FRESH_FOR
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _page_key(url: str) -> str:
+    digest = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return redis_key(f"competitor:page:v{PAGE_CACHE_VERSION}:{digest}")
+
+
+async def get_cached_page(url: str) -> CachedPage | None:
+    """Return the cached entry for *url*, or None on miss / Redis failure."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return None
+        raw = await r.get(_page_key(url))
+        return CachedPage(**json.loads(raw)) if raw else None
+    except Exception as e:
+        logger.debug("Could not read cached page %s: %s", url, e)
+        return None
+
+
+async def set_cached_page(url: str, page: CachedPage) -> None:
+    """Store *page* for *url* with the standard TTL."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        payload = {
+            "data": page.data,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": page.fetched_at,
+        }
+        await r.setex(_page_key(url), PAGE_CACHE_TTL, json.dumps(payload))
+    except Exception as e:
+        logger.debug("Could not cache page %s: %s", url, e)
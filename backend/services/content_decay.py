@@ -13,11 +13,9 @@ from sqlalchemy import and_, func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from infrastructure.database.models.analytics import (
-    ContentDecayAlert,
-    KeywordRanking,
-)
+from infrastructure.database.models.analytics import ContentDecayAlert
 from infrastructure.database.models.content import Article
+from services.analytics_rollups import keyword_totals
 
 logger = logging.getLogger(__name__)
 
@@ -48,46 +46,11 @@ async def detect_keyword_decay(
     prev_end = start_date - timedelta(days=1)
     prev_start = prev_end - timedelta(days=period_days - 1)
 
-    # Current period aggregates
-    current_q = (
-        select(
-            KeywordRanking.keyword,
-            func.sum(KeywordRanking.clicks).label("clicks"),
-            func.sum(KeywordRanking.impressions).label("impressions"),
-            func.avg(KeywordRanking.ctr).label("ctr"),
-            func.avg(KeywordRanking.position).label("position"),
-        )
-        .where(
-            and_(
-                KeywordRanking.user_id == user_id,
-                KeywordRanking.date >= start_date,
-                KeywordRanking.date <= end_date,
-            )
-        )
-        .group_by(KeywordRanking.keyword)
-    )
-    current_result = await db.execute(current_q)
+    # Per-keyword totals for both periods, from the weekly/monthly rollups
+    current_result = await db.execute(keyword_totals(user_id, start_date, end_date))
     current_data = {row.keyword: row for row in current_result.all()}
 
-    # Previous period aggregates
-    prev_q = (
-        select(
-            KeywordRanking.keyword,
-            func.sum(KeywordRanking.clicks).label("clicks"),
-            func.sum(KeywordRanking.impressions).label("impressions"),
-            func.avg(KeywordRanking.ctr).label("ctr"),
-            func.avg(KeywordRanking.position).label("position"),
-        )
-        .where(
-            and_(
-                KeywordRanking.user_id == user_id,
-                KeywordRanking.date >= prev_start,
-                KeywordRanking.date <= prev_end,
-            )
-        )
-        .group_by(KeywordRanking.keyword)
-    )
-    prev_result = await db.execute(prev_q)
+    prev_result = await db.execute(keyword_totals(user_id, prev_start, prev_end))
     prev_data = {row.keyword: row for row in prev_result.all()}
 
     # ANA-29: No N+1 here — keywords and articles are each loaded in a single batch query.
@@ -120,11 +83,11 @@ async def detect_keyword_decay(
 
         curr_clicks = curr.clicks or 0
         prev_clicks = prev.clicks or 0
-        curr_position = float(curr.position or 0)
-        prev_position = float(prev.position or 0)
+        curr_position = float(curr.avg_position or 0)
+        prev_position = float(prev.avg_position or 0)
         curr_impressions = curr.impressions or 0
-        curr_ctr = float(curr.ctr or 0)
-        prev_ctr = float(prev.ctr or 0)
+        curr_ctr = float(curr.avg_ctr or 0)
+        prev_ctr = float(prev.avg_ctr or 0)
 
         # ANA-31: Truncate excessively long keywords before any DB or dict operations
         if keyword and len(keyword) > 200:
@@ -0,0 +1,209 @@
+"""
+Crawl checkpoints for resumable site audits.
+
+A running audit periodically snapshots its crawl state to Redis — the
+pending frontier (URLs queued, being fetched, or buffered but not yet
+committed), the visited set as 64-bit URL hashes, and its counters — so a
+restarted server can pick the audit up where it stopped instead of failing
+it. Pages already committed to audit_pages are the source of truth for
+finished work; the checkpoint only has to cover what is still outstanding.
+
+A lease key, renewed in the background while the audit runs, marks it as
+owned by a live process so that only audits whose worker died are resumed.
+
+Checkpoint helpers fail open: without Redis nothing is saved and loads
+miss. Leases do not: without Redis they fall back to a Postgres advisory
+lock held on a dedicated connection for the run, which the database
+releases if the process dies.
+"""
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import socket
+import zlib
+from array import array
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+
+from infrastructure.database.connection import engine
+from infrastructure.redis import get_redis_text, redis_key
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_INTERVAL = 30.0  # seconds between checkpoints of a running crawl
+CHECKPOINT_TTL = 86400  # audits idle for a day are not resumed
+LEASE_TTL = int(CHECKPOINT_INTERVAL * 3)
+
+_INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def url_key(url: str) -> int:
+    """64-bit hash of *url* used for the compact visited set."""
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "big")
+
+
+@dataclass
+class CrawlCheckpoint:
+    """Outstanding crawl state of one audit."""
+
+    pending: list[tuple[int, int, str]] = field(default_factory=list)  # (tier, order, url)
+    seen: set[int] = field(default_factory=set)
+    discovered_order: int = 0
+    pages_discovered: int = 0
+    pages_analyzed: int = 0
+    crawl_seconds: float = 0.0
+    has_sitemap: bool | None = None
+
+    def dumps(self) -> str:
+        """Serialize to a compressed, base64-encoded JSON string."""
+        seen = array("Q", sorted(self.seen)).tobytes()
+        payload = {
+            "pending": self.pending,
+            "seen": base64.b64encode(seen).decode(),
+            "discovered_order": self.discovered_order,
+            "pages_discovered": self.pages_discovered,
+            "pages_analyzed": self.pages_analyzed,
+            "crawl_seconds": self.crawl_seconds,
+            "has_sitemap": self.has_sitemap,
+        }
+        return base64.b64encode(zlib.compress(json.dumps(payload).encode())).decode()
+
+    @classmethod
+    def loads(cls, raw: str) -> "CrawlCheckpoint":
+        payload = json.loads(zlib.decompress(base64.b64decode(raw)))
+        seen = array("Q")
+        seen.frombytes(base64.b64decode(payload["seen"]))
+        return cls(
+            pending=[(tier, order, url) for tier, order, url in payload["pending"]],
+            seen=set(seen),
+            discovered_order=payload["discovered_order"],
+            pages_discovered=payload["pages_discovered"],
+            pages_analyzed=payload["pages_analyzed"],
+            crawl_seconds=payload["crawl_seconds"],
+            has_sitemap=payload["has_sitemap"],
+        )
+
+
+def _checkpoint_key(audit_id: str) -> str:
+    return redis_key(f"site_audit:checkpoint:{audit_id}")
+
+
+def _lease_key(audit_id: str) -> str:
+    return redis_key(f"site_audit:lease:{audit_id}")
+
+
+async def save_checkpoint(audit_id: str, checkpoint: CrawlCheckpoint) -> None:
+    """Store *checkpoint*, replacing the previous one."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        await r.setex(_checkpoint_key(audit_id), CHECKPOINT_TTL, checkpoint.dumps())
+    except Exception as e:
+        logger.warning("Could not checkpoint site audit %s: %s", audit_id, e)
+
+
+async def load_checkpoint(audit_id: str) -> CrawlCheckpoint | None:
+    """Return the last checkpoint of an audit, or None if there is none."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return None
+        raw = await r.get(_checkpoint_key(audit_id))
+        return CrawlCheckpoint.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning("Could not load checkpoint for site audit %s: %s", audit_id, e)
+        return None
+
+
+async def clear_checkpoint(audit_id: str) -> None:
+    """Drop the checkpoint of a finished (or failed) audit."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        await r.delete(_checkpoint_key(audit_id))
+    except Exception as e:
+        logger.warning("Could not clear checkpoint for site audit %s: %s", audit_id, e)
+
+
+async def _renew_lease(audit_id: str) -> None:
+    while True:
+        await asyncio.sleep(CHECKPOINT_INTERVAL)
+        try:
+            r = await get_redis_text()
+            if r is not None:
+                await r.setex(_lease_key(audit_id), LEASE_TTL, _INSTANCE_ID)
+        except Exception as e:
+            logger.warning("Could not renew lease for site audit %s: %s", audit_id, e)
+
+
+@contextlib.asynccontextmanager
+async def _db_lease(audit_id: str) -> AsyncIterator[bool]:
+    """Lease through a session-level Postgres advisory lock, for when Redis is down."""
+    if engine.dialect.name != "postgresql":
+        yield True  # local development database, single process
+        return
+    lock_id = url_key(f"site_audit:{audit_id}") - 2**63  # signed bigint
+    conn = engine.connect()
+    try:
+        await conn.start()
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(lock_id))))
+        await conn.commit()
+    except Exception as e:
+        logger.warning("Could not lock site audit %s in the database: %s", audit_id, e)
+        await conn.close()
+        yield False
+        return
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with contextlib.suppress(Exception):
+                await conn.scalar(select(func.pg_advisory_unlock(lock_id)))
+                await conn.commit()
+        await conn.close()
+
+
+@contextlib.asynccontextmanager
+async def audit_lease(audit_id: str) -> AsyncIterator[bool]:
+    """
+    Claim an audit for this process, yielding False while another live
+    process still holds it. The lease is renewed until the block exits.
+    """
+    try:
+        r = await get_redis_text()
+        acquired = None if r is None else bool(
+            await r.set(_lease_key(audit_id), _INSTANCE_ID, nx=True, ex=LEASE_TTL)
+        )
+    except Exception as e:
+        logger.warning("Could not acquire lease for site audit %s from Redis: %s", audit_id, e)
+        r, acquired = None, None
+
+    if acquired is None:
+        async with _db_lease(audit_id) as acquired:
+            yield acquired
+        return
+
+    if not acquired:
+        yield False
+        return
+
+    renewer = asyncio.create_task(_renew_lease(audit_id))
+    try:
+        yield True
+    finally:
+        renewer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await renewer
+        if r is not None:
+            with contextlib.suppress(Exception):
+                await r.delete(_lease_key(audit_id))
@@ -0,0 +1,188 @@
+"""
+Per-host politeness and adaptive concurrency for crawlers.
+
+Each host gets:
+
+- a token bucket limiting the request *rate* — pinned to robots.txt
+  ``Crawl-delay`` (no bursts) when the site declares one, otherwise
+  starting at DEFAULT_HOST_RATE requests/second;
+- an AIMD concurrency limit — grown additively (+1 per window of
+  successful responses) and cut multiplicatively on 429/5xx gateway
+  responses, transport errors, or response times well above the host's
+  observed baseline.
+
+Retry-After headers pause the host entirely for the advertised time.
+Callers wrap each request in ``async with scheduler.slot(host) as slot``
+and report the outcome with ``slot.record(...)``; an exception inside the
+block is recorded as a failure automatically.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_HOST_CONCURRENCY = 16
+DEFAULT_HOST_RATE = 10.0  # requests/second when robots.txt sets no Crawl-delay
+MIN_HOST_RATE = 0.2
+MAX_HOST_RATE = 20.0
+RATE_INCREASE = 0.25  # requests/second added per successful response
+BACKOFF_FACTOR = 0.5  # multiplicative decrease on overload signals
+SLOW_FACTOR = 3.0  # latency above baseline * SLOW_FACTOR counts as congestion
+SLOW_BACKOFF_FACTOR = 0.8
+MIN_BASELINE_LATENCY = 0.25  # seconds; keeps a lucky fast first response from pinning the baseline
+MAX_RETRY_AFTER = 60.0
+EWMA_ALPHA = 0.2
+
+OVERLOAD_STATUSES = frozenset({429, 502, 503, 504})
+
+
+@dataclass
+class _HostState:
+    limit: float
+    rate: float
+    min_rate: float
+    max_rate: float
+    burst: float
+    tokens: float
+    updated: float
+    in_flight: int = 0
+    baseline_latency: float | None = None
+    ewma_latency: float | None = None
+    paused_until: float = 0.0
+    cond: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class HostSlot:
+    """Outcome recorder for a single request made under a host slot."""
+
+    def __init__(self) -> None:
+        self.status_code: int | None = None
+        self.elapsed: float | None = None
+        self.retry_after: float | None = None
+        self.recorded = False
+
+    def record(
+        self,
+        status_code: int | None,
+        elapsed: float,
+        retry_after: str | None = None,
+    ) -> None:
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.retry_after = _parse_retry_after(retry_after)
+        self.recorded = True
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a delta-seconds Retry-After header (HTTP-date values are ignored)."""
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        return None
+
+
+class HostScheduler:
+    """Token-bucket rate limiting plus AIMD concurrency, tracked per host."""
+
+    def __init__(self, crawl_delay: float = 0.0, max_concurrency: int = MAX_HOST_CONCURRENCY):
+        # A robots.txt Crawl-delay fixes the ceiling; we never go faster than it allows
+        if crawl_delay > 0:
+            self._max_rate = min(MAX_HOST_RATE, 1.0 / crawl_delay)
+            self._start_rate = self._max_rate
+            self._burst = 1.0
+        else:
+            self._max_rate = MAX_HOST_RATE
+            self._start_rate = DEFAULT_HOST_RATE
+            self._burst = float(INITIAL_CONCURRENCY)
+        self._min_rate = min(MIN_HOST_RATE, self._max_rate)
+        self._max_concurrency = max(MIN_CONCURRENCY, max_concurrency)
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(
+                limit=float(min(INITIAL_CONCURRENCY, self._max_concurrency)),
+                rate=self._start_rate,
+                min_rate=self._min_rate,
+                max_rate=self._max_rate,
+                burst=self._burst,
+                tokens=self._burst,
+                updated=time.monotonic(),
+            )
+            self._hosts[host] = state
+        return state
+
+    def concurrency(self, host: str) -> int:
+        """Current concurrency limit for *host*."""
+        return max(MIN_CONCURRENCY, int(self._state(host).limit))
+
+    def rate(self, host: str) -> float:
+        """Current request rate (requests/second) for *host*."""
+        return self._state(host).rate
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[HostSlot]:
+        """Wait for a concurrency slot and a rate token for *host*."""
+        state = self._state(host)
+        async with state.cond:
+            while state.in_flight >= max(MIN_CONCURRENCY, int(state.limit)):
+                await state.cond.wait()
+            state.in_flight += 1
+
+        slot = HostSlot()
+        try:
+            delay = self._reserve_token(state)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield slot
+        finally:
+            if not slot.recorded:
+                slot.record(None, 0.0)
+            self._update(state, slot)
+            async with state.cond:
+                state.in_flight -= 1
+                state.cond.notify_all()
+
+    def _reserve_token(self, state: _HostState) -> float:
+        """Take a token, returning how long to wait until it is actually available."""
+        now = time.monotonic()
+        state.tokens = min(state.burst, state.tokens + (now - state.updated) * state.rate)
+        state.updated = now
+        # Tokens may go negative: each waiter reserves its turn in arrival order
+        state.tokens -= 1.0
+        delay = -state.tokens / state.rate if state.tokens < 0 else 0.0
+        return max(delay, state.paused_until - now)
+
+    def _update(self, state: _HostState, slot: HostSlot) -> None:
+        status = slot.status_code
+        if status is None or status in OVERLOAD_STATUSES:
+            state.limit = max(float(MIN_CONCURRENCY), state.limit * BACKOFF_FACTOR)
+            state.rate = max(state.min_rate, state.rate * BACKOFF_FACTOR)
+            if slot.retry_after:
+                state.paused_until = max(state.paused_until, time.monotonic() + slot.retry_after)
+            return
+
+        elapsed = slot.elapsed or 0.0
+        if state.baseline_latency is None or elapsed < state.baseline_latency:
+            state.baseline_latency = elapsed
+        if state.ewma_latency is None:
+            state.ewma_latency = elapsed
+        else:
+            state.ewma_latency += EWMA_ALPHA * (elapsed - state.ewma_latency)
+
+        baseline = max(state.baseline_latency, MIN_BASELINE_LATENCY)
+        if state.ewma_latency > baseline * SLOW_FACTOR:
+            # Server is slowing down under our load: back off gently
+            state.limit = max(float(MIN_CONCURRENCY), state.limit * SLOW_BACKOFF_FACTOR)
+            return
+
+        # Additive increase: roughly +1 slot per window of successful responses
+        state.limit = min(float(self._max_concurrency), state.limit + 1.0 / state.limit)
+        state.rate = min(state.max_rate, state.rate + RATE_INCREASE)
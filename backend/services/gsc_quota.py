@@ -0,0 +1,89 @@
+"""
+Google Search Console API quota governor.
+
+Search Analytics queries are limited to 1,200 per minute per site and
+40,000 per minute per Cloud project. Every worker counts its requests in
+shared one-minute Redis windows, per site and for the whole project, and
+waits for the next window once either budget (kept below the published
+limits) is spent. A site that still hits a quota error is put on cooldown
+so scheduled syncs leave it alone for a while.
+
+Without Redis the governor fails open and requests are not throttled.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+
+from infrastructure.redis import get_redis_text, redis_key
+
+logger = logging.getLogger(__name__)
+
+SITE_QPM = 1000  # published limit: 1,200 queries/minute per site
+PROJECT_QPM = 30000  # published limit: 40,000 queries/minute per project
+QUOTA_COOLDOWN = 900  # seconds a site is left alone after a quota error
+_WINDOW = 60
+
+
+def _site_digest(site_url: str) -> str:
+    return hashlib.sha256(site_url.encode()).hexdigest()[:16]
+
+
+def _cooldown_key(site_url: str) -> str:
+    return redis_key(f"gsc:quota:cooldown:{_site_digest(site_url)}")
+
+
+class GSCQuotaGovernor:
+    """Shared per-site and per-project request budgets for the Search Console API."""
+
+    def __init__(self, site_qpm: int = SITE_QPM, project_qpm: int = PROJECT_QPM):
+        self.site_qpm = site_qpm
+        self.project_qpm = project_qpm
+
+    async def acquire(self, site_url: str) -> None:
+        """Wait until one more request for *site_url* fits in the current minute."""
+        while True:
+            window = int(time.time() // _WINDOW)
+            site_key = redis_key(f"gsc:quota:site:{_site_digest(site_url)}:{window}")
+            project_key = redis_key(f"gsc:quota:project:{window}")
+            try:
+                r = await get_redis_text()
+                if r is None:
+                    return
+                async with r.pipeline(transaction=False) as pipe:
+                    pipe.incr(site_key)
+                    pipe.expire(site_key, 2 * _WINDOW)
+                    pipe.incr(project_key)
+                    pipe.expire(project_key, 2 * _WINDOW)
+                    site_count, _, project_count, _ = await pipe.execute()
+            except Exception as e:
+                logger.warning("GSC quota governor unavailable, not throttling: %s", e)
+                return
+            if site_count <= self.site_qpm and project_count <= self.project_qpm:
+                return
+            # Budget spent: wait for the next window, staggered so workers don't stampede
+            await asyncio.sleep(_WINDOW - time.time() % _WINDOW + random.uniform(0, 1))
+
+    async def cool_down(self, site_url: str, seconds: int = QUOTA_COOLDOWN) -> None:
+        """Keep scheduled syncs away from *site_url* after a quota error."""
+        try:
+            r = await get_redis_text()
+            if r is not None:
+                await r.setex(_cooldown_key(site_url), seconds, "1")
+        except Exception as e:
+            logger.warning("Could not record GSC quota cooldown: %s", e)
+
+    async def cooldown_remaining(self, site_url: str) -> int:
+        """Seconds left on *site_url*'s cooldown, 0 when there is none."""
+        try:
+            r = await get_redis_text()
+            if r is None:
+                return 0
+            return max(await r.ttl(_cooldown_key(site_url)), 0)
+        except Exception:
+            return 0
+
+
+gsc_quota_governor = GSCQuotaGovernor()
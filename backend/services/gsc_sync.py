@@ -0,0 +1,457 @@
+"""
+Google Search Console data sync.
+
+Keyword and page metrics are stored as a true daily series: the Search
+Analytics API is queried with the ``date`` dimension alongside ``query`` or
+``page``, so every row is one keyword or page on one day. A sync only fetches
+the days since the connection's last sync (see ``sync_window``), replacing
+the stored rows of that window: rows are upserted in place, and only once
+every page has arrived are the window's rows the sync did not touch (ones
+that dropped out of GSC) deleted. A sync that fails or times out part-way
+therefore leaves the previous data in place, updated by the pages it did
+commit, and the window's rollups are still rebuilt to match.
+
+Rows are streamed one page at a time (see
+``GSCAdapter.iter_search_analytics``), walking ``startRow`` until the data
+is exhausted, and each page is upserted with a few multi-row
+``INSERT ... ON CONFLICT DO UPDATE`` statements (see ``bulk_upsert``) and
+committed as it arrives; the keyword and page streams run concurrently, each
+through its own session. Memory stays flat however many queries and pages a
+site has, nothing is dropped at the API's 25,000-row page size, and progress
+is reported after every page.
+
+``GSCSyncService`` runs the sync for every active connection once a day;
+manual syncs only move a connection's next_sync_at forward (see
+``request_sync``), so a site is never synced by two workers at once.
+Each run reschedules its connection a day ahead, give or take SYNC_JITTER,
+so syncs stay spread across the day, and all requests go through the shared
+quota governor (see ``services.gsc_quota``).
+"""
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+from urllib.parse import urlparse, urlunparse
+from uuid import uuid4
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from adapters.search.gsc_adapter import (
+    MAX_ROW_LIMIT,
+    GSCAdapter,
+    GSCAuthError,
+    GSCCredentials,
+    GSCQuotaError,
+)
+from core.security.encryption import decrypt_credential, encrypt_credential
+from infrastructure.config.settings import settings
+from infrastructure.database.bulk import bulk_upsert
+from infrastructure.database.connection import async_session_maker
+from infrastructure.database.models.analytics import (
+    DailyAnalytics,
+    GSCConnection,
+    KeywordRanking,
+    PagePerformance,
+)
+from services.analytics_rollups import refresh_rollups
+from services.gsc_quota import gsc_quota_governor
+
+logger = logging.getLogger(__name__)
+
+# ANA-09: GSC data is typically delayed by this many days — use a named constant
+# ANA-35: TODO — expose data_lag_days in the GSC status response so the frontend can show "Data may be delayed by N days"
+GSC_DATA_LAG_DAYS = 3
+BACKFILL_DAYS = 90  # days fetched for a site that has never been synced
+RESYNC_DAYS = 2  # trailing days of the previous sync fetched again; GSC revises fresh data
+
+SYNC_INTERVAL = timedelta(hours=24)
+SYNC_JITTER = timedelta(hours=2)  # next sync lands within +/- this of the interval
+SYNC_BATCH = 10  # connections claimed per scheduler tick
+MAX_CONCURRENT_SYNCS = 3
+MAX_SYNC_TIME = 1800  # seconds
+
+
+def strip_query_from_url(url: str) -> str:
+    """Remove query string and fragment from a URL for consistent storage (ANA-10)."""
+    try:
+        p = urlparse(url)
+        return urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
+    except Exception:
+        return url
+
+
+def sync_window(
+    last_sync: datetime | None, today: date | None = None, backfill_days: int = BACKFILL_DAYS
+) -> tuple[date, date]:
+    """
+    First and last day to fetch: from RESYNC_DAYS before the last day the
+    previous sync covered, or the last *backfill_days* days when there was
+    none (or it is older than that), up to the newest day GSC has published.
+    """
+    end_date = (today or date.today()) - timedelta(days=GSC_DATA_LAG_DAYS)
+    earliest = end_date - timedelta(days=backfill_days - 1)
+    if last_sync is None:
+        return earliest, end_date
+    last_synced_day = last_sync.date() - timedelta(days=GSC_DATA_LAG_DAYS)
+    start_date = last_synced_day - timedelta(days=RESYNC_DAYS - 1)
+    return min(max(start_date, earliest), end_date), end_date
+
+
+@dataclass
+class GSCSyncProgress:
+    """Rows synced so far; passed to the progress callback after every page."""
+
+    keywords: int = 0
+    pages: int = 0
+    days: int = 0
+    batches: int = 0
+
+
+ProgressCallback = Callable[[GSCSyncProgress], Awaitable[None] | None]
+
+
+_METRIC_COLUMNS = ("clicks", "impressions", "ctr", "position")
+
+
+async def _upsert_keyword_rows(
+    db: AsyncSession, user_id: str, site_url: str, rows: list[dict[str, Any]]
+) -> None:
+    await bulk_upsert(
+        db,
+        KeywordRanking,
+        [
+            {
+                "id": str(uuid4()),
+                "user_id": user_id,
+                "site_url": site_url,
+                "keyword": row["keys"][1],
+                "date": date.fromisoformat(row["keys"][0]),
+                "clicks": row["clicks"],
+                "impressions": row["impressions"],
+                "ctr": row["ctr"],
+                "position": row["position"],
+            }
+            for row in rows
+        ],
+        constraint="uq_keyword_ranking_user_site_keyword_date",
+        update_columns=_METRIC_COLUMNS,
+    )
+
+
+async def _upsert_page_rows(
+    db: AsyncSession, user_id: str, site_url: str, rows: list[dict[str, Any]]
+) -> None:
+    await bulk_upsert(
+        db,
+        PagePerformance,
+        [
+            {
+                "id": str(uuid4()),
+                "user_id": user_id,
+                "site_url": site_url,
+                "page_url": strip_query_from_url(row["keys"][1]),  # ANA-10: strip query strings
+                "date": date.fromisoformat(row["keys"][0]),
+                "clicks": row["clicks"],
+                "impressions": row["impressions"],
+                "ctr": row["ctr"],
+                "position": row["position"],
+            }
+            for row in rows
+        ],
+        constraint="uq_page_performance_user_site_page_date",
+        update_columns=_METRIC_COLUMNS,
+    )
+
+
+async def _upsert_daily_rows(
+    db: AsyncSession, user_id: str, site_url: str, rows: list[dict[str, Any]]
+) -> None:
+    await bulk_upsert(
+        db,
+        DailyAnalytics,
+        [
+            {
+                "id": str(uuid4()),
+                "user_id": user_id,
+                "site_url": site_url,
+                "date": date.fromisoformat(row["keys"][0]),
+                "total_clicks": row["clicks"],
+                "total_impressions": row["impressions"],
+                "avg_ctr": row["ctr"],
+                "avg_position": row["position"],
+            }
+            for row in rows
+        ],
+        constraint="uq_daily_analytics_user_site_date",
+        update_columns=("total_clicks", "total_impressions", "avg_ctr", "avg_position"),
+    )
+
+
+async def sync_search_analytics(
+    db: AsyncSession,
+    adapter: GSCAdapter,
+    credentials: GSCCredentials,
+    user_id: str,
+    site_url: str,
+    last_sync: datetime | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> GSCSyncProgress:
+    """
+    Sync per-day keyword rankings, page performance and daily stats for the
+    days since *last_sync* (see ``sync_window``). Keyword and page rows of
+    those days are replaced, so ones that dropped out of GSC don't linger,
+    and the weekly and monthly rollups of those days are rebuilt. Commits
+    after every page of rows; if the sync fails or is cancelled after
+    committing some, the rollups are rebuilt from what was committed before
+    the error is raised.
+    """
+    start_date, end_date = sync_window(last_sync)
+    progress = GSCSyncProgress()
+
+    async def report() -> None:
+        progress.batches += 1
+        logger.info(
+            "GSC sync for %s (%s to %s): %d keywords, %d pages, %d days so far",
+            site_url, start_date, end_date, progress.keywords, progress.pages, progress.days,
+        )
+        if on_progress is not None:
+            result = on_progress(progress)
+            if inspect.isawaitable(result):
+                await result
+
+    async def stream(dimension: str, upsert: Callable[..., Awaitable[None]]) -> None:
+        # Each stream commits through its own session so both run at once
+        async with async_session_maker() as session:
+            async for rows in adapter.iter_search_analytics(
+                credentials, site_url, start_date, end_date, ["date", dimension]
+            ):
+                await upsert(session, user_id, site_url, rows)
+                await session.commit()
+                if dimension == "query":
+                    progress.keywords += len(rows)
+                else:
+                    progress.pages += len(rows)
+                await report()
+
+    # Upserts stamp updated_at with the database clock; rows of the window
+    # still older than this at the end were not returned by this sync
+    sync_started = await db.scalar(select(func.now()))
+    await db.commit()  # don't hold a transaction open while the streams run
+
+    tasks = [
+        asyncio.ensure_future(stream("query", _upsert_keyword_rows)),
+        asyncio.ensure_future(stream("page", _upsert_page_rows)),
+        # Daily totals are one row per day
+        asyncio.ensure_future(adapter.get_search_analytics(
+            credentials, site_url, start_date, end_date, ["date"], row_limit=MAX_ROW_LIMIT
+        )),
+    ]
+    try:
+        try:
+            _, _, daily_rows = await asyncio.gather(*tasks)
+        finally:
+            # On failure, stop the other streams before rolling up what they committed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        await _upsert_daily_rows(db, user_id, site_url, daily_rows)
+        for model in (KeywordRanking, PagePerformance):
+            await db.execute(
+                delete(model).where(
+                    model.user_id == user_id,
+                    model.site_url == site_url,
+                    model.date >= start_date,
+                    model.date <= end_date,
+                    model.updated_at < sync_started,
+                )
+            )
+        await refresh_rollups(db, user_id, site_url, start_date, end_date)
+        await db.commit()
+    except (Exception, asyncio.CancelledError):
+        # Also on cancellation (the scheduler's MAX_SYNC_TIME timeout): the
+        # committed pages must not be left without their rollups
+        await db.rollback()
+        if progress.batches:
+            await _refresh_partial_sync(db, user_id, site_url, start_date, end_date)
+        raise
+
+    progress.days = len(daily_rows)
+    await report()
+    return progress
+
+
+async def _refresh_partial_sync(
+    db: AsyncSession, user_id: str, site_url: str, start_date: date, end_date: date
+) -> None:
+    """Rebuild the window's rollups after a failed sync committed some pages."""
+    try:
+        await refresh_rollups(db, user_id, site_url, start_date, end_date)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning("Could not refresh rollups for %s after a failed sync: %s", site_url, e)
+
+
+async def load_credentials(
+    db: AsyncSession, connection: GSCConnection, adapter: GSCAdapter
+) -> GSCCredentials:
+    """
+    Decrypt the connection's OAuth tokens. An expired access token is
+    refreshed and persisted before any API call (ANA-03).
+
+    Raises:
+        GSCAuthError: If the token cannot be refreshed
+    """
+    credentials = GSCCredentials(
+        access_token=decrypt_credential(connection.access_token_encrypted, settings.secret_key),
+        refresh_token=decrypt_credential(connection.refresh_token_encrypted, settings.secret_key),
+        token_expiry=connection.token_expiry,
+        site_url=connection.site_url,
+    )
+    token_expiry = connection.token_expiry
+    if token_expiry.tzinfo is None:
+        token_expiry = token_expiry.replace(tzinfo=UTC)
+    if datetime.now(UTC) >= token_expiry:
+        credentials = await adapter.refresh_tokens(credentials)
+        connection.access_token_encrypted = encrypt_credential(
+            credentials.access_token, settings.secret_key
+        )
+        connection.token_expiry = credentials.token_expiry
+        await db.commit()
+        logger.info("GSC token refreshed and persisted for user %s", connection.user_id)
+    return credentials
+
+
+async def sync_connection(connection_id: str) -> GSCSyncProgress | None:
+    """
+    Run one scheduled incremental sync of a connection. A site on quota
+    cooldown is pushed back until the cooldown ends; one that hits a quota
+    error is put on cooldown. Returns None when nothing was synced.
+    """
+    async with async_session_maker() as db:
+        connection = await db.get(GSCConnection, connection_id)
+        if not connection or not connection.is_active or not connection.site_url:
+            return None
+
+        site_url = connection.site_url
+        cooldown = await gsc_quota_governor.cooldown_remaining(site_url)
+        if cooldown:
+            connection.next_sync_at = datetime.now(UTC) + timedelta(seconds=cooldown)
+            await db.commit()
+            return None
+
+        adapter = GSCAdapter(quota_governor=gsc_quota_governor)
+        try:
+            credentials = await load_credentials(db, connection, adapter)
+            progress = await sync_search_analytics(
+                db, adapter, credentials, connection.user_id, site_url,
+                last_sync=connection.last_sync,
+            )
+        except GSCQuotaError:
+            await db.rollback()
+            await gsc_quota_governor.cool_down(site_url)
+            logger.warning("GSC quota exceeded syncing %s; cooling down", site_url)
+            return None
+        except GSCAuthError as e:
+            await db.rollback()
+            logger.warning("GSC sync skipped for connection %s: %s", connection_id, e)
+            return None
+
+        connection.last_sync = datetime.now(UTC)
+        await db.commit()
+    return progress
+
+
+async def request_sync(db: AsyncSession, connection: GSCConnection) -> datetime:
+    """
+    Make *connection* due now so the scheduler claims and syncs it on its
+    next tick, instead of syncing inline. Returns the time it was requested.
+    """
+    requested_at = datetime.now(UTC)
+    connection.next_sync_at = requested_at
+    await db.commit()
+    return requested_at
+
+
+async def claim_due_connections(limit: int = SYNC_BATCH) -> list[str]:
+    """
+    Atomically claim up to *limit* connections due for a sync by moving
+    their next_sync_at a jittered interval ahead; rows locked by another
+    worker are skipped.
+    """
+    due = (
+        select(GSCConnection.id)
+        .where(
+            GSCConnection.is_active.is_(True),
+            GSCConnection.site_url != "",
+            or_(GSCConnection.next_sync_at.is_(None), GSCConnection.next_sync_at <= func.now()),
+        )
+        .order_by(GSCConnection.next_sync_at.asc().nulls_first())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with async_session_maker() as db:
+        claimed = await db.execute(
+            update(GSCConnection)
+            .where(GSCConnection.id.in_(due.scalar_subquery()))
+            .values(
+                next_sync_at=func.now() + (SYNC_INTERVAL - SYNC_JITTER)
+                + func.random() * (2 * SYNC_JITTER)
+            )
+            .returning(GSCConnection.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed_ids = [row[0] for row in claimed.fetchall()]
+        await db.commit()
+    return claimed_ids
+
+
+class GSCSyncService:
+    """Runs the incremental GSC sync for connections as they fall due."""
+
+    def __init__(self):
+        self.is_running = False
+        self.check_interval = 300  # Check every 5 minutes
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYNCS)
+
+    async def start(self):
+        """Start the sync background loop."""
+        if self.is_running:
+            return
+        self.is_running = True
+        logger.info("GSC sync scheduler started — checking every %ds", self.check_interval)
+
+        while self.is_running:
+            try:
+                await self._process_due_connections()
+            except Exception as e:
+                logger.error("GSC sync scheduler error: %s", e, exc_info=True)
+            await asyncio.sleep(self.check_interval)
+
+    async def stop(self):
+        self.is_running = False
+        logger.info("GSC sync scheduler stopped")
+
+    async def _process_due_connections(self):
+        """Claim due connections and sync them, a few at a time."""
+        claimed_ids = await claim_due_connections()
+        if not claimed_ids:
+            return
+        logger.info("Claimed %d GSC connections for sync", len(claimed_ids))
+        await asyncio.gather(*(self._sync_one(connection_id) for connection_id in claimed_ids))
+
+    async def _sync_one(self, connection_id: str):
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(sync_connection(connection_id), timeout=MAX_SYNC_TIME)
+            except Exception as e:
+                logger.error("GSC sync failed for connection %s: %s", connection_id, e, exc_info=True)
+
+
+gsc_sync_scheduler = GSCSyncService()
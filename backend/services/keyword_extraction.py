@@ -0,0 +1,411 @@
+"""
+Vectorized keyword extraction for competitor articles.
+
+Every page contributes text segments: the positional fields (title, H1s, URL
+slug, meta description, H2s) and the body. All segments of all pages are
+tokenized once into a single array of token ids over a shared vocabulary,
+and n-grams are interned level by level: the id of an n-gram is the rank of
+(id of its first n-1 tokens, id of its last token) among all such pairs, so
+each level is one ``np.unique`` over int64 keys rather than a string join
+per window.
+
+Scoring is then a few passes over sparse (page, n-gram) arrays in COO form:
+
+- positional score: weighted occurrence counts per field, times a length
+  bonus for 2-4 word phrases; each page's top phrase is its keyword;
+- body document-term matrix: n-gram counts (1-3 words) over the full body,
+  giving term frequencies and document frequencies for the IDF boost.
+
+Results are identical to scoring each page with Counters, ties included
+(the phrase seen first wins).
+
+Pages scraped after an analysis (competitor monitoring) are few, so their
+IDF is taken against the body document frequencies of the whole analysis,
+kept as ``DocumentFrequencies`` keyed by 64-bit n-gram hashes.
+"""
+
+import base64
+import hashlib
+import itertools
+import math
+import re
+import zlib
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# English stop words (no external dependency needed)
+STOP_WORDS: frozenset[str] = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "am", "an",
+    "and", "any", "are", "aren't", "as", "at", "be", "because", "been",
+    "before", "being", "below", "between", "both", "but", "by", "can",
+    "can't", "cannot", "could", "couldn't", "did", "didn't", "do", "does",
+    "doesn't", "doing", "don't", "down", "during", "each", "few", "for",
+    "from", "further", "get", "got", "had", "hadn't", "has", "hasn't",
+    "have", "haven't", "having", "he", "her", "here", "hers", "herself",
+    "him", "himself", "his", "how", "i", "if", "in", "into", "is", "isn't",
+    "it", "its", "itself", "just", "let", "let's", "like", "ll", "me",
+    "might", "more", "most", "mustn't", "my", "myself", "new", "no", "nor",
+    "not", "now", "of", "off", "on", "once", "only", "or", "other", "ought",
+    "our", "ours", "ourselves", "out", "over", "own", "re", "s", "same",
+    "shall", "shan't", "she", "should", "shouldn't", "so", "some", "such",
+    "t", "than", "that", "the", "their", "theirs", "them", "themselves",
+    "then", "there", "these", "they", "this", "those", "through", "to",
+    "too", "under", "until", "up", "us", "ve", "very", "was", "wasn't",
+    "we", "were", "weren't", "what", "when", "where", "which", "while",
+    "who", "whom", "why", "will", "with", "won't", "would", "wouldn't",
+    "you", "your", "yours", "yourself", "yourselves",
+    # Additional common web/blog words to filter
+    "blog", "post", "read", "click", "also", "use", "using",
+    "used", "one", "two", "first", "best", "top", "way", "ways",
+    "make", "made", "know", "need", "want", "go", "going", "see",
+    "well", "back", "still", "even", "take", "come", "good", "great",
+    "many", "much", "may", "right", "look", "think", "every", "give",
+    "day", "find", "long", "say", "help", "thing", "things",
+})
+
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "h1": 2.5,
+    "slug": 2.0,
+    "meta": 1.5,
+    "h2": 1.0,
+}
+# Score multiplier by phrase length: 2-3 word phrases are most realistic as keywords
+LENGTH_BONUS = np.array([0.0, 1.0, 1.3, 1.3, 1.1])
+MAX_FIELD_NGRAM = 4
+MAX_BODY_NGRAM = 3
+BODY_WEIGHT = 0.5
+MIN_DOCS_FOR_IDF = 3  # fewer documents give no meaningful IDF
+MAX_STORED_FREQUENCIES = 50_000  # most common body n-grams kept per analysis
+MAX_POSITIONAL_SCORE = sum(FIELD_WEIGHTS.values()) * 1.3  # all fields match, with length bonus
+
+_PUNCT_RE = re.compile(r"[^\w\s-]")
+_NUMERIC_TOKEN_RE = re.compile(r"[\d-]+")
+_BODY = -1  # field index of body segments
+_HASH_PRIME = np.uint64(0x100000001B3)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, strip punctuation, split into word tokens (stop words dropped)."""
+    return [
+        w for w in _PUNCT_RE.sub(" ", text.lower()).split()
+        if len(w) > 1 and w not in STOP_WORDS
+    ]
+
+
+@dataclass
+class _Corpus:
+    """Word ids of every text segment, flattened, with per-segment metadata."""
+
+    vocab: defaultdict[str, int] = field(default_factory=lambda: defaultdict(itertools.count().__next__))
+    word_ids: list[int] = field(default_factory=list)
+    segment_length: list[int] = field(default_factory=list)
+    segment_doc: list[int] = field(default_factory=list)
+    segment_field: list[int] = field(default_factory=list)
+
+    def add(self, doc: int, field_index: int, text: str | None) -> None:
+        if not text:
+            return
+        words = _PUNCT_RE.sub(" ", text.lower()).split()
+        if not words:
+            return
+        self.word_ids.extend(map(self.vocab.__getitem__, words))
+        self.segment_length.append(len(words))
+        self.segment_doc.append(doc)
+        self.segment_field.append(field_index)
+
+    def tokens(self) -> tuple[np.ndarray, np.ndarray, list[str]]:
+        """
+        Token ids (stop words and single characters dropped, renumbered
+        densely), the segment of each token, and the word of each token id.
+        """
+        vocab = list(self.vocab)
+        keep = np.fromiter(
+            (len(w) > 1 and w not in STOP_WORDS for w in vocab), dtype=bool, count=len(vocab)
+        )
+        word_ids = np.asarray(self.word_ids, dtype=np.int64)
+        segment = np.repeat(np.arange(len(self.segment_length)), self.segment_length)
+        mask = keep[word_ids]
+        present, tokens = np.unique(word_ids[mask], return_inverse=True)
+        return tokens, segment[mask], [vocab[i] for i in present]
+
+
+def _build_corpus(pages: Sequence[dict]) -> _Corpus:
+    corpus = _Corpus()
+    fields = list(FIELD_WEIGHTS)
+    title, h1, slug, meta, h2 = (fields.index(f) for f in ("title", "h1", "slug", "meta", "h2"))
+    for doc, page in enumerate(pages):
+        headings = page.get("headings") or []
+        # Segment order is the scoring order, which decides ties
+        corpus.add(doc, title, page.get("title"))
+        for h in headings:
+            if h["level"] == 1:
+                corpus.add(doc, h1, h["text"])
+        if page.get("url_slug"):
+            corpus.add(doc, slug, page["url_slug"].replace("-", " ").replace("_", " "))
+        corpus.add(doc, meta, page.get("meta_description"))
+        for h in headings:
+            if h["level"] == 2:
+                corpus.add(doc, h2, h["text"])
+        corpus.add(doc, _BODY, page.get("body_text"))
+    return corpus
+
+
+@dataclass
+class _NGrams:
+    """All n-gram windows of the corpus with globally interned ids."""
+
+    start: np.ndarray  # window start position
+    length: np.ndarray  # n
+    gram: np.ndarray  # interned n-gram id
+    id_start: np.ndarray  # per n-gram id: a start position, for decoding
+    id_length: np.ndarray  # per n-gram id: its n
+
+
+def _ngrams(
+    tokens: np.ndarray, token_segment: np.ndarray, numeric: np.ndarray, segment_max_n: np.ndarray
+) -> _NGrams:
+    """
+    N-grams of every segment up to its own maximum length, so body segments
+    never produce the 4-grams only the positional fields use.
+    """
+    n_tokens = len(tokens)
+    vocab_size = int(tokens.max()) + 1 if n_tokens else 1
+    numeric_cum = np.concatenate(([0], np.cumsum(numeric)))
+    max_n = segment_max_n[token_segment]
+    starts, lengths, grams, id_starts, id_lengths = [], [], [], [], []
+    offset = 0
+    # Start positions still extended at this level, and their (n-1)-gram ids
+    pos = np.arange(n_tokens)
+    level_ids = tokens
+    count = vocab_size
+    for n in range(1, int(segment_max_n.max(initial=0)) + 1):
+        if n > 1:
+            extend = (pos + n - 1 < n_tokens) & (max_n[pos] >= n)
+            pos, level_ids = pos[extend], level_ids[extend]
+            keys = level_ids * vocab_size + tokens[pos + n - 1]
+            unique_keys, level_ids = np.unique(keys, return_inverse=True)
+            count = len(unique_keys)
+        if not len(pos):
+            break
+        # Any occurrence will do for decoding an id back to its words
+        first = np.empty(count, dtype=np.int64)
+        first[level_ids] = pos
+        id_starts.append(first)
+        id_lengths.append(np.full(count, n, dtype=np.int8))
+
+        within_segment = token_segment[pos] == token_segment[pos + n - 1]
+        all_numeric = numeric_cum[pos + n] - numeric_cum[pos] == n
+        keep = within_segment & ~all_numeric
+        starts.append(pos[keep])
+        lengths.append(np.full(int(keep.sum()), n, dtype=np.int8))
+        grams.append(level_ids[keep] + offset)
+        offset += count
+
+    def cat(parts, dtype):
+        return np.concatenate(parts).astype(dtype, copy=False) if parts else np.zeros(0, dtype)
+
+    return _NGrams(
+        start=cat(starts, np.int64),
+        length=cat(lengths, np.int8),
+        gram=cat(grams, np.int64),
+        id_start=cat(id_starts, np.int64),
+        id_length=cat(id_lengths, np.int8),
+    )
+
+
+def _empty_keys() -> np.ndarray:
+    return np.zeros(0, dtype=np.uint64)
+
+
+def _empty_counts() -> np.ndarray:
+    return np.zeros(0, dtype=np.int64)
+
+
+@dataclass
+class DocumentFrequencies:
+    """
+    Body document frequencies of a set of pages: how many of ``num_docs``
+    bodies contain each n-gram, by sorted 64-bit n-gram hash.
+    """
+
+    num_docs: int = 0
+    keys: np.ndarray = field(default_factory=_empty_keys)
+    counts: np.ndarray = field(default_factory=_empty_counts)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Document frequency of each n-gram hash in *keys* (0 when unseen)."""
+        if not len(self.keys):
+            return np.zeros(len(keys), dtype=np.int64)
+        i = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[i] == keys, self.counts[i], 0)
+
+    def merge(self, other: "DocumentFrequencies") -> "DocumentFrequencies":
+        """Frequencies of both sets of pages together, trimmed for storage."""
+        keys, inverse = np.unique(np.concatenate((self.keys, other.keys)), return_inverse=True)
+        counts = np.bincount(
+            inverse, weights=np.concatenate((self.counts, other.counts)), minlength=len(keys)
+        ).astype(np.int64)
+        return DocumentFrequencies(self.num_docs + other.num_docs, keys, counts).trimmed()
+
+    def trimmed(self) -> "DocumentFrequencies":
+        """
+        Drop n-grams found in a single body (they count as unseen) and keep
+        at most MAX_STORED_FREQUENCIES of the most common ones.
+        """
+        keep = np.flatnonzero(self.counts >= 2)
+        if len(keep) > MAX_STORED_FREQUENCIES:
+            by_count = np.argsort(-self.counts[keep], kind="stable")
+            keep = np.sort(keep[by_count[:MAX_STORED_FREQUENCIES]])
+        return DocumentFrequencies(self.num_docs, self.keys[keep], self.counts[keep])
+
+    def pack(self) -> str:
+        """Encode as 64-bit document count and keys then 32-bit counts, zlib, base64."""
+        data = (
+            np.asarray([self.num_docs], dtype="<u8").tobytes()
+            + self.keys.astype("<u8").tobytes()
+            + self.counts.astype("<u4").tobytes()
+        )
+        return base64.b64encode(zlib.compress(data)).decode()
+
+    @classmethod
+    def unpack(cls, raw: str | None) -> "DocumentFrequencies | None":
+        """Decode frequencies from pack; None when there are none yet."""
+        if raw is None:
+            return None
+        data = zlib.decompress(base64.b64decode(raw))
+        n = (len(data) - 8) // 12
+        keys = np.frombuffer(data, dtype="<u8", count=n + 1)
+        counts = np.frombuffer(data, dtype="<u4", offset=8 * (n + 1), count=n)
+        return cls(int(keys[0]), keys[1:].astype(np.uint64), counts.astype(np.int64))
+
+
+def _gram_hashes(grams: _NGrams, ids: np.ndarray, tokens: np.ndarray, words: list[str]) -> np.ndarray:
+    """
+    64-bit hashes of n-gram *ids*, stable across corpora: a polynomial over
+    the blake2b hashes of their words, in wrapping uint64 arithmetic.
+    """
+    word_hash = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big") for w in words),
+        dtype=np.uint64,
+        count=len(words),
+    )
+    starts, lengths = grams.id_start[ids], grams.id_length[ids]
+    hashes = np.zeros(len(ids), dtype=np.uint64)
+    for i in range(int(lengths.max()) if len(ids) else 0):
+        has = lengths > i
+        hashes[has] = hashes[has] * _HASH_PRIME + word_hash[tokens[starts[has] + i]]
+    return hashes
+
+
+def extract_keywords_with_tfidf(
+    pages_data: Sequence[dict],
+    idf_context: DocumentFrequencies | None = None,
+) -> list[tuple[str | None, float]]:
+    """
+    Extract each page's target keyword with a positional score (title, H1,
+    slug, meta, H2) boosted by the keyword's TF-IDF weight in the page body.
+
+    With *idf_context*, document frequencies are those of the pages plus the
+    context's corpus, so a handful of pages still gets a meaningful IDF.
+
+    Returns one (keyword, confidence) tuple per page; keyword is None when a
+    page has no usable text.
+    """
+    return _extract(pages_data, idf_context, collect=False)[0]
+
+
+def extract_keywords_and_frequencies(
+    pages_data: Sequence[dict],
+    idf_context: DocumentFrequencies | None = None,
+) -> tuple[list[tuple[str | None, float]], DocumentFrequencies]:
+    """
+    Like extract_keywords_with_tfidf, also returning the body document
+    frequencies of *pages_data* (untrimmed, without the context's).
+    """
+    return _extract(pages_data, idf_context, collect=True)
+
+
+def _extract(
+    pages_data: Sequence[dict],
+    idf_context: DocumentFrequencies | None,
+    collect: bool,
+) -> tuple[list[tuple[str | None, float]], DocumentFrequencies]:
+    num_docs = len(pages_data)
+    frequencies = DocumentFrequencies(num_docs)
+    corpus = _build_corpus(pages_data)
+    tokens, token_segment, words = corpus.tokens()
+    if not len(tokens):
+        return [(None, 0.0)] * num_docs, frequencies
+
+    segment_doc = np.asarray(corpus.segment_doc, dtype=np.int64)
+    segment_field = np.asarray(corpus.segment_field, dtype=np.int64)
+    numeric = np.fromiter(
+        (bool(_NUMERIC_TOKEN_RE.fullmatch(w)) for w in words), dtype=bool, count=len(words)
+    )[tokens]
+
+    segment_max_n = np.where(segment_field == _BODY, MAX_BODY_NGRAM, MAX_FIELD_NGRAM)
+    grams = _ngrams(tokens, token_segment, numeric, segment_max_n)
+    segment = token_segment[grams.start]
+    doc = segment_doc[segment]
+    field_index = segment_field[segment]
+    n_grams = int(grams.id_start.size)
+
+    # Positional scores per (page, n-gram), with first-seen order for ties
+    in_field = field_index != _BODY
+    weights = np.asarray(list(FIELD_WEIGHTS.values()))
+    f_doc, f_gram = doc[in_field], grams.gram[in_field]
+    f_weight = weights[field_index[in_field]]
+    seen_order = np.lexsort((grams.start[in_field], grams.length[in_field], segment[in_field]))
+    rank = np.empty_like(seen_order)
+    rank[seen_order] = np.arange(len(seen_order))
+
+    pair_keys, pair_index = np.unique(f_doc * n_grams + f_gram, return_inverse=True)
+    score = np.bincount(pair_index, weights=f_weight, minlength=len(pair_keys))
+    first_seen = np.full(len(pair_keys), len(rank), dtype=np.int64)
+    np.minimum.at(first_seen, pair_index, rank)
+    pair_doc, pair_gram = np.divmod(pair_keys, n_grams)
+    score *= LENGTH_BONUS[grams.id_length[pair_gram]]
+
+    best = np.lexsort((first_seen, -score, pair_doc))
+    is_top = np.ones(len(best), dtype=bool)
+    is_top[1:] = pair_doc[best][1:] != pair_doc[best][:-1]
+    top = best[is_top]
+
+    # Body document-term matrix (1-3 word n-grams, full body text)
+    in_body = ~in_field
+    body_keys, tf = np.unique(doc[in_body] * n_grams + grams.gram[in_body], return_counts=True)
+    df = np.bincount(body_keys % n_grams, minlength=n_grams)
+    if collect:
+        body_grams = np.flatnonzero(df)
+        keys, inverse = np.unique(_gram_hashes(grams, body_grams, tokens, words), return_inverse=True)
+        counts = np.bincount(inverse, weights=df[body_grams], minlength=len(keys)).astype(np.int64)
+        frequencies = DocumentFrequencies(num_docs, keys, counts)
+
+    total_docs = num_docs
+    context_df = np.zeros(len(top), dtype=np.int64)
+    if idf_context is not None:
+        total_docs += idf_context.num_docs
+        context_df = idf_context.lookup(_gram_hashes(grams, pair_gram[top], tokens, words))
+
+    results: list[tuple[str | None, float]] = [(None, 0.0)] * num_docs
+    for page, gram, top_score, prior_df in zip(
+        pair_doc[top], pair_gram[top], score[top], context_df, strict=True
+    ):
+        start, length = grams.id_start[gram], grams.id_length[gram]
+        keyword = " ".join(words[t] for t in tokens[start : start + length])
+        confidence = round(min(float(top_score) / MAX_POSITIONAL_SCORE, 1.0), 3)
+
+        if total_docs >= MIN_DOCS_FOR_IDF and df[gram] > 0:
+            key = page * n_grams + gram
+            i = np.searchsorted(body_keys, key)
+            term_freq = int(tf[i]) if i < len(body_keys) and body_keys[i] == key else 0
+            idf = math.log(total_docs / (df[gram] + prior_df))
+            if term_freq > 0 and idf > 0:
+                tfidf_score = (term_freq * idf) / 100  # Normalize
+                confidence = round(min(confidence + tfidf_score * BODY_WEIGHT, 1.0), 3)
+        results[page] = (keyword, confidence)
+    return results, frequencies
@@ -0,0 +1,193 @@
+"""
+Near-variant keyword matching for competitor keyword gaps.
+
+A competitor keyword is covered by the user when one of the user's article
+keywords matches it in either of two stages:
+
+1. Normalized form: tokens (stop words and punctuation dropped, see
+   ``keyword_extraction.tokenize``), lightly stemmed and compared as a set,
+   so "best running shoes", "running shoe" and "shoes for running" agree.
+2. Embedding similarity: the keywords still unmatched are embedded and
+   compared with every user keyword in one batched cosine-similarity matrix
+   product; a best similarity of at least SIMILARITY_THRESHOLD counts.
+
+Embeddings are cached in Redis per keyword text, so an analysis's keywords
+are embedded once however often its gaps are viewed, and the gap result of
+an analysis is cached against the exact set of user keywords and the
+analysis content revision (changed by monitoring) it was computed for.
+Without an embedding API key (mock embeddings carry no meaning) or when the
+API fails, matching falls back to the normalized stage. All cache helpers
+fail open.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from adapters.knowledge.embedding_service import EmbeddingError, embedding_service
+from infrastructure.redis import get_redis_text, redis_key
+from services.keyword_extraction import tokenize
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_THRESHOLD = 0.85  # cosine similarity of near-variant keyword phrases
+EMBED_BATCH = 500  # keywords per embedding API request
+MATCH_BLOCK = 1024  # competitor rows per similarity block, bounds memory
+EMBEDDING_CACHE_TTL = 30 * 86400
+GAP_CACHE_TTL = 3600
+
+_VOWELS = frozenset("aeiou")
+
+
+def stem(word: str) -> str:
+    """
+    Strip common English inflections from *word*: plurals, then -ing / -ed,
+    then a final silent e, so "guides" / "guide" and "running" / "run" agree.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "shes", "ches", "xes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        base = word[: -len(suffix)]
+        if word.endswith(suffix) and len(base) >= 3 and _VOWELS & set(base):
+            if len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+                base = base[:-1]  # running -> run
+            word = base
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Order-insensitive normal form of *keyword*: its sorted, stemmed token set
+    (the lowercased keyword itself when it is made of stop words only).
+    """
+    forms = sorted({stem(t) for t in tokenize(keyword)})
+    return " ".join(forms) if forms else keyword.lower().strip()
+
+
+def best_similarity(queries: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    Highest cosine similarity of each row of *queries* to any row of
+    *candidates*, computed block by block as normalized matrix products.
+    """
+    if not len(queries) or not len(candidates):
+        return np.zeros(len(queries), dtype=np.float32)
+    q = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    c = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    best = np.empty(len(q), dtype=np.float32)
+    for start in range(0, len(q), MATCH_BLOCK):
+        best[start : start + MATCH_BLOCK] = (q[start : start + MATCH_BLOCK] @ c.T).max(axis=1)
+    return best
+
+
+def _embedding_key(text: str) -> str:
+    digest = hashlib.sha256(text.encode()).hexdigest()[:32]
+    return redis_key(f"kw_embedding:{embedding_service.model}:{digest}")
+
+
+async def embed_keywords(texts: Sequence[str]) -> np.ndarray | None:
+    """
+    Embedding matrix (float32, one row per text) from the Redis cache and the
+    embedding API, or None when real embeddings are unavailable.
+    """
+    if not embedding_service.api_key:
+        return None
+    vectors: dict[str, np.ndarray] = {}
+    r = None
+    try:
+        r = await get_redis_text()
+        if r is not None and texts:
+            cached = await r.mget([_embedding_key(t) for t in texts])
+            for text, raw in zip(texts, cached, strict=True):
+                if raw:
+                    vectors[text] = np.frombuffer(base64.b64decode(raw), dtype=np.float16)
+    except Exception as e:
+        logger.warning("Could not read cached keyword embeddings: %s", e)
+
+    missing = [t for t in dict.fromkeys(texts) if t not in vectors]
+    try:
+        for start in range(0, len(missing), EMBED_BATCH):
+            batch = missing[start : start + EMBED_BATCH]
+            embedded = await embedding_service.embed_texts(batch)
+            if len(embedded) != len(batch):
+                raise EmbeddingError("embedding count does not match input count")
+            for text, vector in zip(batch, embedded, strict=True):
+                vectors[text] = np.asarray(vector, dtype=np.float16)
+    except EmbeddingError as e:
+        logger.warning("Keyword embeddings unavailable, matching without them: %s", e)
+        return None
+
+    if r is not None and missing:
+        try:
+            async with r.pipeline(transaction=False) as pipe:
+                for text in missing:
+                    encoded = base64.b64encode(vectors[text].tobytes()).decode()
+                    pipe.setex(_embedding_key(text), EMBEDDING_CACHE_TTL, encoded)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Could not cache keyword embeddings: %s", e)
+
+    return np.stack([vectors[t] for t in texts]).astype(np.float32)
+
+
+async def find_uncovered(competitor_keywords: Sequence[str], user_keywords: Sequence[str]) -> list[str]:
+    """Competitor keywords that no user keyword matches, in input order."""
+    user_forms = {normalize_keyword(kw) for kw in user_keywords}
+    uncovered = [kw for kw in competitor_keywords if normalize_keyword(kw) not in user_forms]
+    if not uncovered or not user_keywords:
+        return uncovered
+
+    user_list = list(user_keywords)
+    embeddings = await embed_keywords(uncovered + user_list)
+    if embeddings is None:
+        return uncovered
+    similarity = best_similarity(embeddings[: len(uncovered)], embeddings[len(uncovered) :])
+    return [kw for kw, sim in zip(uncovered, similarity, strict=True) if sim < SIMILARITY_THRESHOLD]
+
+
+def _gap_key(analysis_id: str, user_keywords: Sequence[str], revision: str) -> str:
+    digest = hashlib.sha256("\x1f".join([revision, *sorted(user_keywords)]).encode()).hexdigest()[:32]
+    return redis_key(f"competitor:gaps:{analysis_id}:{digest}")
+
+
+async def get_cached_gaps(
+    analysis_id: str, user_keywords: Sequence[str], revision: str = ""
+) -> dict[str, Any] | None:
+    """
+    Return the cached gap result for this analysis, user keyword set and
+    analysis content *revision*, or None.
+    """
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return None
+        raw = await r.get(_gap_key(analysis_id, user_keywords, revision))
+        return json.loads(raw) if raw else None
+    except Exception:
+        return None
+
+
+async def set_cached_gaps(
+    analysis_id: str, user_keywords: Sequence[str], result: dict[str, Any], revision: str = ""
+) -> None:
+    """Cache a gap result for this analysis, user keyword set and content revision."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        await r.setex(_gap_key(analysis_id, user_keywords, revision), GAP_CACHE_TTL, json.dumps(result))
+    except Exception:
+        pass
@@ -0,0 +1,109 @@
+"""
+Knowledge vault answer cache.
+
+Every knowledge scope (a project, or a user's personal vault) has a corpus
+version counter in Redis that is bumped whenever a source is added, updated,
+reprocessed or deleted.  RAG answers are cached under a key that includes the
+current corpus version, so a changed knowledge base never serves stale
+answers and old entries simply age out via their TTL — no explicit
+invalidation is needed.
+
+All helpers fail open: when Redis is unavailable lookups miss and writes are
+skipped, and the query runs uncached.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any
+
+from infrastructure.redis import get_redis_text, redis_key
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_TTL = 7 * 86400  # 7 days; version bumps make older entries unreachable
+
+
+def _scope(user_id: str, project_id: str | None) -> str:
+    """Corpus scope: the project when there is one, otherwise the user's personal vault."""
+    if project_id and project_id != "personal":
+        return f"project:{project_id}"
+    return f"user:{user_id}"
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace so near-identical questions share a key."""
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+def _version_key(user_id: str, project_id: str | None) -> str:
+    return redis_key(f"kv:corpus_version:{_scope(user_id, project_id)}")
+
+
+def answer_cache_key(
+    user_id: str,
+    project_id: str | None,
+    query: str,
+    corpus_version: int,
+    model: str,
+    source_ids: list[str] | None = None,
+    max_results: int = 5,
+) -> str:
+    """Build the answer cache key for a query against a given corpus version."""
+    parts = [
+        user_id,
+        normalize_query(query),
+        model,
+        ",".join(sorted(source_ids or [])),
+        str(max_results),
+    ]
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+    return redis_key(f"kv:answer:{_scope(user_id, project_id)}:v{corpus_version}:{digest}")
+
+
+async def get_corpus_version(user_id: str, project_id: str | None = None) -> int | None:
+    """Return the current corpus version (0 if never bumped), or None if Redis is unavailable."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return None
+        raw = await r.get(_version_key(user_id, project_id))
+        return int(raw) if raw else 0
+    except Exception as e:
+        logger.warning("Could not read knowledge corpus version: %s", e)
+        return None
+
+
+async def bump_corpus_version(user_id: str, project_id: str | None = None) -> None:
+    """Invalidate all cached answers for a scope by advancing its corpus version."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        await r.incr(_version_key(user_id, project_id))
+    except Exception as e:
+        logger.warning("Could not bump knowledge corpus version: %s", e)
+
+
+async def get_cached_answer(key: str) -> dict[str, Any] | None:
+    """Return a cached answer payload, or None on miss / Redis failure."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return None
+        raw = await r.get(key)
+        return json.loads(raw) if raw else None
+    except Exception:
+        return None
+
+
+async def set_cached_answer(key: str, payload: dict[str, Any]) -> None:
+    """Store an answer payload under *key* with the standard TTL."""
+    try:
+        r = await get_redis_text()
+        if r is None:
+            return
+        await r.setex(key, ANSWER_CACHE_TTL, json.dumps(payload))
+    except Exception:
+        pass
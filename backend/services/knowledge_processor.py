@@ -7,11 +7,18 @@ fully functional feature that replaces the previous placeholder implementation.
 """
 
 import csv
+import hashlib
 import io
 import json
 import logging
 import re
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+from adapters.knowledge.document_processor import is_content_boundary
 
 logger = logging.getLogger(__name__)
 
@@ -208,8 +215,11 @@ def split_into_chunks(text: str, words_per_chunk: int = WORDS_PER_CHUNK) -> list
 
     Strategy:
     1. Split on double newlines (paragraph boundaries) first.
-    2. If a paragraph is still too large, split it by sentence-ish boundaries.
-    3. Accumulate paragraphs into a chunk until the word budget is exhausted.
+    2. If a paragraph is larger than the budget, slice it into budget-sized pieces.
+    3. Accumulate paragraphs into a chunk until one marks a content-defined
+       boundary (``is_content_boundary``) or the chunk would grow past twice
+       the budget. Boundaries depend on the paragraph text alone, so an edit
+       only re-chunks the text around it.
     """
     if not text.strip():
         return []
@@ -218,48 +228,112 @@ def split_into_chunks(text: str, words_per_chunk: int = WORDS_PER_CHUNK) -> list
     text = re.sub(r"\r\n", "\n", text)
     text = re.sub(r"\n{3,}", "\n\n", text)
 
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    units: list[list[str]] = []
+    for para in text.split("\n\n"):
+        para_words = para.split()
+        for i in range(0, len(para_words), words_per_chunk):
+            units.append(para_words[i : i + words_per_chunk])
 
+    min_words = words_per_chunk // 4
+    target = words_per_chunk - min_words
     chunks: list[str] = []
     current_words: list[str] = []
-    current_count = 0
-
-    for para in paragraphs:
-        para_words = para.split()
-        para_count = len(para_words)
-
-        if para_count == 0:
-            continue
-
-        # If adding this paragraph would exceed the budget and we already have
-        # content, flush the current chunk first.
-        if current_count > 0 and current_count + para_count > words_per_chunk * 1.2:
-            chunk_text = " ".join(current_words)
-            if len(chunk_text) >= MIN_CHUNK_CHARS:
-                chunks.append(chunk_text)
-            current_words = []
-            current_count = 0
-
-        # If the paragraph itself is larger than the budget, slice it.
-        if para_count > words_per_chunk * 1.2:
-            for i in range(0, para_count, words_per_chunk):
-                slice_words = para_words[i : i + words_per_chunk]
-                slice_text = " ".join(slice_words)
-                if len(slice_text) >= MIN_CHUNK_CHARS:
-                    chunks.append(slice_text)
-        else:
-            current_words.extend(para_words)
-            current_count += para_count
 
-    # Flush remainder
-    if current_words:
+    def flush() -> None:
         chunk_text = " ".join(current_words)
         if len(chunk_text) >= MIN_CHUNK_CHARS:
             chunks.append(chunk_text)
+        current_words.clear()
+
+    for words in units:
+        if current_words and len(current_words) + len(words) > words_per_chunk * 2:
+            flush()
+        current_words.extend(words)
+        if len(current_words) >= min_words and is_content_boundary(" ".join(words), len(words), target):
+            flush()
+
+    # Flush remainder
+    if current_words:
+        flush()
 
     return chunks
 
 
+# ---------------------------------------------------------------------------
+# Incremental re-indexing
+# ---------------------------------------------------------------------------
+
+
+def chunk_hash(text: str) -> str:
+    """Return the stable content hash (SHA-256 hex) used to diff chunks."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ChunkDiff:
+    """
+    Result of diffing a source's stored chunks against a fresh chunking.
+
+    ``keep`` pairs an existing chunk id with its index in the new chunk list,
+    ``changed`` is the part of ``keep`` whose stored metadata differs from the
+    new chunk's (a shifted ``chunk_index``, a renamed source), ``add`` lists
+    indexes of new chunks that have no stored counterpart, and ``remove``
+    lists existing chunk ids that no longer appear in the document.
+    """
+
+    keep: list[tuple[str, int]] = field(default_factory=list)
+    changed: list[tuple[str, int]] = field(default_factory=list)
+    add: list[int] = field(default_factory=list)
+    remove: list[str] = field(default_factory=list)
+
+
+def diff_chunks(
+    existing: list[tuple[str, str | None]],
+    new_hashes: list[str],
+    stored_metadata: Mapping[str, Mapping[str, Any]] | None = None,
+    new_metadata: Sequence[Mapping[str, Any]] | None = None,
+) -> ChunkDiff:
+    """
+    Match stored chunks to freshly produced chunks by content hash.
+
+    ``existing`` is a list of (chunk_id, content_hash).  Rows without a hash
+    (indexed before hashing existed) never match and are scheduled for
+    removal.  Repeated identical chunks are matched one-to-one, so a
+    document with the same paragraph twice keeps two stored chunks.
+
+    ``stored_metadata`` (by chunk id) and ``new_metadata`` (by new index)
+    decide which kept chunks are ``changed``; without them every kept chunk
+    counts as changed.
+    """
+    available: dict[str, list[str]] = defaultdict(list)
+    diff = ChunkDiff()
+    for chunk_id, content_hash in existing:
+        if content_hash:
+            available[content_hash].append(chunk_id)
+        else:
+            diff.remove.append(chunk_id)
+
+    for idx, content_hash in enumerate(new_hashes):
+        ids = available.get(content_hash)
+        if ids:
+            diff.keep.append((ids.pop(0), idx))
+        else:
+            diff.add.append(idx)
+
+    for ids in available.values():
+        diff.remove.extend(ids)
+
+    if stored_metadata is None or new_metadata is None:
+        diff.changed = list(diff.keep)
+    else:
+        diff.changed = [
+            (chunk_id, idx)
+            for chunk_id, idx in diff.keep
+            if stored_metadata.get(chunk_id) != new_metadata[idx]
+        ]
+    return diff
+
+
 # ---------------------------------------------------------------------------
 # Keyword search
 # ---------------------------------------------------------------------------
@@ -7,21 +7,46 @@ import time
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
+from uuid import uuid4
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from adapters.ai.anthropic_adapter import AnthropicContentService
-from adapters.knowledge import ChromaAdapter, DocumentProcessor, EmbeddingService
+from adapters.knowledge import (
+    ChromaAdapter,
+    DocumentProcessor,
+    EmbeddingService,
+    LocalVectorStore,
+)
+from infrastructure.database.connection import async_session_maker
 from infrastructure.database.models.knowledge import (
     KnowledgeQuery,
     KnowledgeSource,
     SourceStatus,
 )
+from services import knowledge_cache
+from services import knowledge_processor as kp
 
 logger = logging.getLogger(__name__)
 
 
+async def legacy_source_projects(user_id: str) -> dict[str, str]:
+    """
+    Map each of a user's live knowledge sources to the project collection its
+    vectors belong in, so ChromaAdapter can route legacy (pre-CHROMA-C1)
+    documents to the project recorded on their source.
+    """
+    async with async_session_maker() as db:
+        rows = await db.execute(
+            select(KnowledgeSource.id, KnowledgeSource.project_id).where(
+                KnowledgeSource.user_id == user_id,
+                KnowledgeSource.deleted_at.is_(None),
+            )
+        )
+        return {source_id: project_id or "personal" for source_id, project_id in rows}
+
+
 class KnowledgeService:
     """
     Service for knowledge vault operations.
@@ -31,7 +56,7 @@ class KnowledgeService:
 
     def __init__(
         self,
-        chroma_adapter: ChromaAdapter,
+        chroma_adapter: ChromaAdapter | LocalVectorStore,
         embedding_service: EmbeddingService,
         document_processor: DocumentProcessor,
         anthropic_adapter: AnthropicContentService,
@@ -40,7 +65,7 @@ class KnowledgeService:
         Initialize knowledge service.
 
         Args:
-            chroma_adapter: ChromaDB adapter for vector storage
+            chroma_adapter: Vector store (ChromaDB adapter or in-process LocalVectorStore)
             embedding_service: Service for generating embeddings
             document_processor: Processor for chunking documents
             anthropic_adapter: Anthropic AI for answer generation
@@ -61,6 +86,9 @@ class KnowledgeService:
         """
         Process a document: extract text, chunk, embed, store in ChromaDB.
 
+        Re-processing an already indexed source is incremental: chunks are
+        matched by content hash and only new or changed ones are embedded.
+
         Updates KnowledgeSource status throughout the process.
 
         Args:
@@ -119,33 +147,76 @@ class KnowledgeService:
 
             logger.info("Extracted %s chunks from document", len(chunks))
 
-            # 4. Generate embeddings for all chunks
-            chunk_texts = [chunk.content for chunk in chunks]
-            embeddings = await self.embeddings.embed_texts(chunk_texts)
+            # 4. Diff against the vectors already stored for this source so a
+            #    reprocess only embeds new/changed chunks. Unchanged chunks keep
+            #    their ids and vectors; only those that moved (or whose source
+            #    metadata changed) get their metadata rewritten.
+            for chunk in chunks:
+                chunk.metadata["content_hash"] = kp.chunk_hash(chunk.content)
 
-            logger.info("Generated %s embeddings", len(embeddings))
+            stored = dict(await self.chroma.get_source_chunks(
+                user_id=user_id,
+                source_id=source_id,
+                project_id=resolved_project_id,
+            ))
+            diff = kp.diff_chunks(
+                [(doc_id, metadata.get("content_hash")) for doc_id, metadata in stored.items()],
+                [chunk.metadata["content_hash"] for chunk in chunks],
+                stored_metadata=stored,
+                new_metadata=[chunk.metadata for chunk in chunks],
+            )
+
+            logger.info(
+                "Chunk diff for %s: %s kept (%s changed), %s added, %s removed",
+                source_id, len(diff.keep), len(diff.changed), len(diff.add), len(diff.remove),
+            )
 
-            # 5. Store in ChromaDB
+            # 5. Embed and store only the new chunks, then drop the stale ones
             from adapters.knowledge.chroma_adapter import Document as ChromaDocument
 
-            chroma_docs = [
-                ChromaDocument(
-                    id=f"{source_id}_chunk_{i}",
-                    content=chunk.content,
-                    metadata=chunk.metadata,
+            if diff.add:
+                new_chunks = [chunks[i] for i in diff.add]
+                embeddings = await self.embeddings.embed_texts(
+                    [chunk.content for chunk in new_chunks]
                 )
-                for i, chunk in enumerate(chunks)
-            ]
 
-            await self.chroma.add_documents(
-                user_id=user_id,
-                documents=chroma_docs,
-                embeddings=embeddings,
-                project_id=resolved_project_id,
-            )
+                logger.info("Generated %s embeddings", len(embeddings))
+
+                chroma_docs = [
+                    ChromaDocument(
+                        id=f"{source_id}_chunk_{uuid4().hex}",
+                        content=chunk.content,
+                        metadata=chunk.metadata,
+                    )
+                    for chunk in new_chunks
+                ]
+
+                await self.chroma.add_documents(
+                    user_id=user_id,
+                    documents=chroma_docs,
+                    embeddings=embeddings,
+                    project_id=resolved_project_id,
+                )
+
+            if diff.changed:
+                await self.chroma.update_metadata(
+                    user_id=user_id,
+                    document_ids=[doc_id for doc_id, _ in diff.changed],
+                    metadatas=[chunks[i].metadata for _, i in diff.changed],
+                    project_id=resolved_project_id,
+                )
+
+            if diff.remove:
+                await self.chroma.delete_documents(
+                    user_id=user_id,
+                    document_ids=diff.remove,
+                    project_id=resolved_project_id,
+                )
 
             logger.info("Stored %s chunks in ChromaDB", len(chunks))
 
+            await knowledge_cache.bump_corpus_version(user_id, resolved_project_id)
+
             # 6. Update KnowledgeSource with statistics
             total_chars = sum(len(chunk.content) for chunk in chunks)
             source.chunk_count = len(chunks)
@@ -211,11 +282,47 @@ class KnowledgeService:
                 - answer: Generated answer
                 - sources: List of source chunks used
                 - query_time_ms: Time taken to process query
+                - cache_hit: Whether the answer was served from the answer cache
         """
         resolved_project_id = project_id or "personal"
         start_time = time.time()
 
         try:
+            # 0. Serve repeated questions against an unchanged corpus from cache
+            cache_key = None
+            corpus_version = await knowledge_cache.get_corpus_version(user_id, project_id)
+            if corpus_version is not None:
+                cache_key = knowledge_cache.answer_cache_key(
+                    user_id=user_id,
+                    project_id=project_id,
+                    query=query,
+                    corpus_version=corpus_version,
+                    model=f"{getattr(self.ai, '_model', '')}:{self.embeddings.model}",
+                    source_ids=source_ids,
+                    max_results=max_results,
+                )
+                cached = await knowledge_cache.get_cached_answer(cache_key)
+                if cached is not None:
+                    query_time_ms = int((time.time() - start_time) * 1000)
+                    if db:
+                        await self._log_query(
+                            db,
+                            user_id=user_id,
+                            query=query,
+                            answer=cached["answer"],
+                            sources=cached["sources"],
+                            query_time_ms=query_time_ms,
+                            chunks_retrieved=cached.get("chunks_retrieved", len(cached["sources"])),
+                            cache_hit=True,
+                        )
+                    return {
+                        "query": query,
+                        "answer": cached["answer"],
+                        "sources": cached["sources"],
+                        "query_time_ms": query_time_ms,
+                        "cache_hit": True,
+                    }
+
             # 1. Generate query embedding
             query_embedding = await self.embeddings.embed_text(query)
 
@@ -287,31 +394,32 @@ Answer:"""
             # 5. Calculate query time
             query_time_ms = int((time.time() - start_time) * 1000)
 
-            # 6. Log query (if db provided)
-            if db:
-                try:
-                    query_record = KnowledgeQuery(
-                        user_id=user_id,
-                        query_text=query,
-                        response_text=answer,
-                        sources_used=sources,
-                        query_time_ms=query_time_ms,
-                        chunks_retrieved=len(results),
-                        success=True,
-                    )
-                    db.add(query_record)
-                    await db.commit()
+            # 6. Cache the answer for this corpus version
+            if cache_key:
+                await knowledge_cache.set_cached_answer(
+                    cache_key,
+                    {"answer": answer, "sources": sources, "chunks_retrieved": len(results)},
+                )
 
-                except Exception as e:
-                    logger.error("Failed to log query: %s", e)
-                    # Don't fail the query if logging fails
-                    await db.rollback()
+            # 7. Log query (if db provided)
+            if db:
+                await self._log_query(
+                    db,
+                    user_id=user_id,
+                    query=query,
+                    answer=answer,
+                    sources=sources,
+                    query_time_ms=query_time_ms,
+                    chunks_retrieved=len(results),
+                    cache_hit=False,
+                )
 
             return {
                 "query": query,
                 "answer": answer,
                 "sources": sources,
                 "query_time_ms": query_time_ms,
+                "cache_hit": False,
             }
 
         except Exception as e:
@@ -348,6 +456,36 @@ Answer:"""
                 "query_time_ms": query_time_ms,
             }
 
+    async def _log_query(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        query: str,
+        answer: str,
+        sources: list[dict[str, Any]],
+        query_time_ms: int,
+        chunks_retrieved: int,
+        cache_hit: bool,
+    ) -> None:
+        """Record a successful query; logging failures never fail the query."""
+        try:
+            query_record = KnowledgeQuery(
+                user_id=user_id,
+                query_text=query,
+                response_text=answer,
+                sources_used=sources,
+                query_time_ms=query_time_ms,
+                chunks_retrieved=chunks_retrieved,
+                success=True,
+                cache_hit=cache_hit,
+            )
+            db.add(query_record)
+            await db.commit()
+
+        except Exception as e:
+            logger.error("Failed to log query: %s", e)
+            await db.rollback()
+
     async def delete_source(
         self,
         source_id: str,
@@ -395,6 +533,8 @@ Answer:"""
 
             logger.info("Deleted chunks from ChromaDB for source %s", source_id)
 
+            await knowledge_cache.bump_corpus_version(user_id, resolved_project_id)
+
             # 3. Delete file from storage (if exists)
             if source.file_url:
                 try:
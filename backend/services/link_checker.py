@@ -0,0 +1,136 @@
+"""
+Link checking for site audits.
+
+Checks link targets with a HEAD request, falling back to a one-byte ranged
+GET for servers that reject HEAD. Requests share the audit's pooled client
+and go through per-host slots (HostScheduler), with the audited site kept
+to its robots.txt Crawl-delay and other hosts to a few concurrent requests
+each. Results are cached for the lifetime of the checker, so each target is
+requested at most once per audit however many pages link to it.
+
+Timeouts are recorded as unknown rather than broken: a slow or saturated
+host says nothing about whether the link works.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from urllib.parse import urlparse
+
+import httpx
+
+from services.crawl_scheduler import HostScheduler
+
+logger = logging.getLogger(__name__)
+
+# Per-request timeout; waiting for a pooled connection is not counted against it
+LINK_CHECK_TIMEOUT = httpx.Timeout(5.0, pool=None)
+LINK_CHECK_WORKERS = 16  # keep at or below the shared client's connection pool
+EXTERNAL_HOST_CONCURRENCY = 4
+# Servers that refuse or mishandle HEAD; retried with a ranged GET
+HEAD_FALLBACK_STATUSES = frozenset({400, 403, 405, 406, 501})
+# Auth walls and bot blocking (LinkedIn answers 999) are not broken links
+IGNORED_STATUSES = frozenset({401, 403, 429, 999})
+
+
+def is_broken(status: int | None) -> bool:
+    """Whether a check result means the link is broken (None = unreachable)."""
+    return status is None or (status >= 400 and status not in IGNORED_STATUSES)
+
+
+class LinkChecker:
+    """
+    Per-audit link status cache backed by pooled HEAD/ranged-GET checks.
+
+    ``results`` maps each checked URL to its final status code, or None
+    when the host could not be reached. URLs whose check timed out go to
+    ``unknown`` instead and are neither broken nor healthy. URLs rejected by
+    *is_safe* (SSRF guard) are never requested and stay absent from both.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        domain: str,
+        is_safe: Callable[[str], Awaitable[bool]],
+        crawl_delay: float = 0.0,
+        workers: int = LINK_CHECK_WORKERS,
+    ):
+        self.client = client
+        self.domain = domain
+        self.is_safe = is_safe
+        self.workers = workers
+        self.results: dict[str, int | None] = {}
+        self.unknown: set[str] = set()
+        self._site = HostScheduler(crawl_delay=crawl_delay)
+        self._external = HostScheduler(max_concurrency=EXTERNAL_HOST_CONCURRENCY)
+
+    def seed(self, url: str, status: int | None) -> None:
+        """Record a status already known (e.g. a crawled page) without requesting it."""
+        self.results[url] = status
+
+    async def check_all(self, urls: Iterable[str], timeout: float) -> dict[str, int | None]:
+        """
+        Check every uncached URL in *urls* (in order) until done or *timeout*
+        seconds pass; URLs not reached in time are left unchecked.
+        """
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for url in dict.fromkeys(urls):
+            if url not in self.results and url not in self.unknown:
+                queue.put_nowait(url)
+        if queue.empty() or timeout <= 0:
+            return self.results
+
+        async def worker() -> None:
+            while not queue.empty():
+                url = queue.get_nowait()
+                if not await self.is_safe(url):
+                    continue
+                try:
+                    self.results[url] = await self._check(url)
+                except httpx.TimeoutException as exc:
+                    logger.debug("Link check timed out for %s: %s", url, exc)
+                    self.unknown.add(url)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.workers, queue.qsize()))
+        ]
+        _done, pending = await asyncio.wait(workers, timeout=timeout)
+        if pending:
+            logger.info(
+                "Link check for %s stopped at the time budget with %d links unchecked",
+                self.domain, queue.qsize() + len(pending),
+            )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        return self.results
+
+    async def _check(self, url: str) -> int | None:
+        """Final status of *url*, None if unreachable; raises httpx.TimeoutException."""
+        host = urlparse(url).hostname or ""
+        scheduler = self._site if host == self.domain else self._external
+        try:
+            async with scheduler.slot(host) as slot:
+                t0 = time.monotonic()
+                resp = await self.client.head(
+                    url, follow_redirects=True, timeout=LINK_CHECK_TIMEOUT
+                )
+                if resp.status_code in HEAD_FALLBACK_STATUSES:
+                    async with self.client.stream(
+                        "GET",
+                        url,
+                        headers={"Range": "bytes=0-0"},
+                        follow_redirects=True,
+                        timeout=LINK_CHECK_TIMEOUT,
+                    ) as resp:
+                        pass  # status line is enough; the body is never read
+                slot.record(resp.status_code, time.monotonic() - t0, resp.headers.get("retry-after"))
+            return resp.status_code
+        except httpx.TimeoutException:
+            raise
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            logger.debug("Link check failed for %s: %s", url, exc)
+            return None
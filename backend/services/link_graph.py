@@ -0,0 +1,132 @@
+"""
+Internal link graph analytics for site audits.
+
+The crawled pages and their same-site links form a directed graph, stored
+sparsely as parallel numpy arrays of edge sources and targets (COO form).
+Every metric is a handful of vectorized passes over those arrays, so a
+10k-page site with hundreds of thousands of links takes well under a second:
+
+- PageRank by power iteration (dangling pages redistribute uniformly);
+- click depth by breadth-first search from the homepage, one frontier per pass;
+- weakly connected components ("link clusters") by min-label propagation.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-8  # L1 change between iterations
+PAGERANK_MAX_ITER = 100
+UNREACHABLE = -1
+
+
+@dataclass
+class LinkGraphMetrics:
+    """Per-page metrics, aligned with ``urls``."""
+
+    urls: list[str]
+    pagerank: np.ndarray  # float64, sums to 1
+    click_depth: np.ndarray  # int32, UNREACHABLE when no link path from the homepage
+    cluster: np.ndarray  # int32, 0 = the homepage's cluster, then by size
+
+
+def build_edges(pages: Sequence[dict]) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    Index crawled pages and keep links between them (self-links dropped).
+    Each page dict needs ``url`` and ``internal_links``.
+    """
+    urls = [p["url"] for p in pages]
+    index = {url: i for i, url in enumerate(urls)}
+    src: list[int] = []
+    dst: list[int] = []
+    for i, page in enumerate(pages):
+        for link in page.get("internal_links") or ():
+            j = index.get(link)
+            if j is not None and j != i:
+                src.append(i)
+                dst.append(j)
+    return urls, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+
+
+def pagerank(
+    src: np.ndarray,
+    dst: np.ndarray,
+    n: int,
+    damping: float = DAMPING,
+    tol: float = PAGERANK_TOLERANCE,
+    max_iter: int = PAGERANK_MAX_ITER,
+) -> np.ndarray:
+    """PageRank of *n* nodes by power iteration over the edge arrays."""
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.bincount(src, minlength=n).astype(np.float64)
+    dangling = out_degree == 0
+    # Edge weight 1/out_degree(source), computed once
+    weight = 1.0 / out_degree[src]
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = np.bincount(dst, weights=rank[src] * weight, minlength=n)
+        updated = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        delta = np.abs(updated - rank).sum()
+        rank = updated
+        if delta < tol:
+            break
+    return rank
+
+
+def click_depths(src: np.ndarray, dst: np.ndarray, n: int, root: int | None) -> np.ndarray:
+    """Minimum number of clicks from *root* to every node (UNREACHABLE if none)."""
+    depth = np.full(n, UNREACHABLE, dtype=np.int32)
+    if root is None:
+        return depth
+    depth[root] = 0
+    frontier = np.zeros(n, dtype=bool)
+    frontier[root] = True
+    level = 0
+    while frontier.any():
+        level += 1
+        reached = np.zeros(n, dtype=bool)
+        reached[dst[frontier[src]]] = True
+        frontier = reached & (depth == UNREACHABLE)
+        depth[frontier] = level
+    return depth
+
+
+def weak_components(src: np.ndarray, dst: np.ndarray, n: int, root: int | None) -> np.ndarray:
+    """
+    Weakly connected component of every node, numbered 0 for the root's
+    component and then by decreasing size.
+    """
+    labels = np.arange(n)
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, src, labels[dst])
+        np.minimum.at(updated, dst, labels[src])
+        updated = updated[updated]  # pointer jumping speeds up long chains
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    roots, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.argsort(-sizes, kind="stable")
+    if root is not None:
+        root_component = inverse[root]
+        order = np.concatenate(([root_component], order[order != root_component]))
+    rank_of = np.empty(len(roots), dtype=np.int32)
+    rank_of[order] = np.arange(len(roots), dtype=np.int32)
+    return rank_of[inverse]
+
+
+def analyze_link_graph(pages: Sequence[dict], root_url: str) -> LinkGraphMetrics:
+    """PageRank, click depth from *root_url* and link clusters for crawled pages."""
+    urls, src, dst = build_edges(pages)
+    n = len(urls)
+    root = urls.index(root_url) if root_url in urls else None
+    return LinkGraphMetrics(
+        urls=urls,
+        pagerank=pagerank(src, dst, n),
+        click_depth=click_depths(src, dst, n, root),
+        cluster=weak_components(src, dst, n, root),
+    )
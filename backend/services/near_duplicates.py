@@ -0,0 +1,93 @@
+"""
+Near-duplicate content detection with SimHash.
+
+Each page's body text is reduced to a 64-bit SimHash over word shingles;
+pages whose fingerprints differ in at most MAX_DISTANCE bits are near
+duplicates. Instead of comparing every pair of pages, fingerprints are
+split into MAX_DISTANCE + 1 bands and only pages sharing an identical band
+are compared — by the pigeonhole principle any two fingerprints within
+MAX_DISTANCE bits agree on at least one band, so no pair is missed while the
+work stays roughly linear in the number of pages.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from collections.abc import Mapping
+
+import numpy as np
+
+SHINGLE_SIZE = 3  # words per shingle
+MIN_WORDS = 50  # shorter pages give unstable fingerprints
+MAX_DISTANCE = 3  # Hamming distance for 64-bit fingerprints of near-identical text
+FINGERPRINT_BITS = 64
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> str | None:
+    """
+    64-bit SimHash of *text* as 16 hex digits, or None when the text has
+    fewer than MIN_WORDS words.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < max(MIN_WORDS, shingle_size):
+        return None
+    shingles = {" ".join(words[i : i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+            for s in shingles
+        ),
+        dtype="<u8",
+        count=len(shingles),
+    )
+    # One row of 64 bits per shingle; a fingerprint bit is set when most shingles set it
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    fingerprint = int(np.packbits(majority, bitorder="little").view("<u8")[0])
+    return f"{fingerprint:016x}"
+
+
+def near_duplicate_clusters(
+    fingerprints: Mapping[str, str], max_distance: int = MAX_DISTANCE
+) -> list[list[str]]:
+    """
+    Group URLs whose fingerprints are within *max_distance* bits of each
+    other (transitively). Returns clusters of two or more URLs, largest first.
+    """
+    # Identical fingerprints collapse up front so duplicate-heavy sites stay cheap
+    urls_by_fp: dict[int, list[str]] = defaultdict(list)
+    for url, fp in fingerprints.items():
+        if fp:
+            urls_by_fp[int(fp, 16)].append(url)
+    unique = list(urls_by_fp)
+    parent = list(range(len(unique)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = max_distance + 1
+    bounds = [FINGERPRINT_BITS * b // bands for b in range(bands + 1)]
+    for band in range(bands):
+        start, end = bounds[band], bounds[band + 1]
+        mask = (1 << (end - start)) - 1
+        buckets: dict[int, list[int]] = defaultdict(list)
+        for i, fp in enumerate(unique):
+            buckets[(fp >> start) & mask].append(i)
+        for members in buckets.values():
+            for n, a in enumerate(members):
+                for b in members[n + 1 :]:
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b and (unique[a] ^ unique[b]).bit_count() <= max_distance:
+                        parent[root_b] = root_a
+
+    groups: dict[int, list[str]] = defaultdict(list)
+    for i, fp in enumerate(unique):
+        groups[find(i)].extend(urls_by_fp[fp])
+    clusters = [sorted(urls) for urls in groups.values() if len(urls) >= 2]
+    clusters.sort(key=lambda urls: (-len(urls), urls[0]))
+    return clusters
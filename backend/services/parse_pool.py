@@ -0,0 +1,74 @@
+"""
+Process pool for CPU-bound HTML parsing.
+
+BeautifulSoup parsing and on-page SEO analysis are pure CPU work. Run on the
+event loop, a single large page stalls every request the worker is serving,
+so the site auditor and competitor scraper submit their parse functions here
+instead. Submitted callables must be module-level functions with picklable
+arguments and return values (plain dicts, lists, sets and strings).
+
+The pool is created lazily on first use and shut down from the application
+lifespan.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from infrastructure.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_AUTO_WORKERS = 4
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _worker_count() -> int:
+    configured = get_settings().html_parse_workers
+    if configured > 0:
+        return configured
+    return max(1, min(MAX_AUTO_WORKERS, (os.cpu_count() or 2) - 1))
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Return the shared parse pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        workers = _worker_count()
+        # spawn: never fork the API process with its event loop and client threads
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("HTML parse pool started with %d workers", workers)
+    return _executor
+
+
+async def run_in_parse_pool(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run *fn(*args)* in the parse pool and await the result.
+    A pool broken by a crashed worker is replaced once and the call retried.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_parse_executor(), fn, *args)
+    except BrokenProcessPool:
+        logger.warning("HTML parse pool is broken; restarting it")
+        shutdown_parse_pool(wait=False)
+        return await loop.run_in_executor(get_parse_executor(), fn, *args)
+
+
+def shutdown_parse_pool(wait: bool = True) -> None:
+    """Stop the parse pool's worker processes (no-op if it was never started)."""
+    global _executor
+    if _executor is not None:
+        executor, _executor = _executor, None
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,37 +1,70 @@
 """
 Site Audit Service — crawls a user's website and detects SEO issues.
 
-BFS crawler with concurrency control, robots.txt compliance, and
-comprehensive on-page SEO analysis. Runs as a background task with
-its own DB session via async_session_maker.
+Adaptive crawler with per-host politeness, robots.txt compliance, and
+comprehensive on-page SEO analysis. Pages are analyzed as soon as they
+are fetched and persisted in batches, so memory does not grow with the
+size of the site. Runs as a background task with its own DB session
+via async_session_maker; crawl progress is checkpointed so audits
+interrupted by a restart resume instead of failing.
 """
 
 import asyncio
+import contextlib
+import hashlib
+import heapq
 import ipaddress
 import logging
 import re
 import socket
+import sys
 import time
-from collections import defaultdict, deque
-from datetime import UTC, datetime
-from urllib.parse import urljoin, urlparse, urlunparse
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from urllib.parse import urldefrag, urljoin, urlparse, urlunparse
 from uuid import uuid4
 
 import httpx
+import numpy as np
 from bs4 import BeautifulSoup
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.plans import PLANS
+from infrastructure.database.bulk import bulk_insert, bulk_update
 from infrastructure.database.connection import async_session_maker
 from infrastructure.database.models.site_audit import AuditIssue, AuditPage, SiteAudit
+from services.crawl_checkpoint import (
+    CHECKPOINT_INTERVAL,
+    CHECKPOINT_TTL,
+    LEASE_TTL,
+    CrawlCheckpoint,
+    audit_lease,
+    clear_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+    url_key,
+)
+from services.crawl_scheduler import HostScheduler
+from services.link_checker import LinkChecker, is_broken
+from services.link_graph import UNREACHABLE, LinkGraphMetrics, analyze_link_graph
+from services.near_duplicates import near_duplicate_clusters, simhash
+from services.parse_pool import run_in_parse_pool
+from services.sitemaps import SitemapWalker
+
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 BOT_USER_AGENT = "A-Stats-SiteAudit/1.0 (+https://a-stats.app/bot)"
-MAX_CONCURRENCY = 5
+MAX_CONCURRENCY = 16  # crawl workers; per-host limits adapt below this
 REQUEST_TIMEOUT = 10.0
 MAX_CRAWL_TIME = 1800  # 30 minutes
-CRAWL_DELAY = 0.5  # seconds between requests per slot
 
 
 # ============================================================================
@@ -143,19 +176,20 @@ def _normalize_url(url: str, base_url: str) -> str | None:
 
 async def _fetch_robots_txt(
     client: httpx.AsyncClient, domain: str
-) -> tuple[list[str], float, bool]:
+) -> tuple[list[str], float, bool, list[str]]:
     """
-    Fetch /robots.txt and parse Disallow rules + Crawl-delay.
-    Returns (disallowed_paths, crawl_delay, robots_txt_exists).
+    Fetch /robots.txt and parse Disallow rules, Crawl-delay and Sitemap entries.
+    Returns (disallowed_paths, crawl_delay, robots_txt_exists, sitemap_urls).
     """
     disallowed: list[str] = []
+    sitemaps: list[str] = []
     crawl_delay = 0.0
     url = f"https://{domain}/robots.txt"
 
     try:
         resp = await client.get(url, follow_redirects=True, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
-            return disallowed, crawl_delay, False
+            return disallowed, crawl_delay, False, sitemaps
 
         current_agent: str | None = None
         applies_to_us = False
@@ -166,7 +200,12 @@ async def _fetch_robots_txt(
                 continue
 
             lower = line.lower()
-            if lower.startswith("user-agent:"):
+            if lower.startswith("sitemap:"):
+                # Sitemap lines apply regardless of the current user-agent group
+                sitemap_url = line.split(":", 1)[1].strip()
+                if sitemap_url:
+                    sitemaps.append(sitemap_url)
+            elif lower.startswith("user-agent:"):
                 agent = line.split(":", 1)[1].strip().lower()
                 current_agent = agent
                 applies_to_us = agent == "*" or "a-stats" in agent
@@ -183,9 +222,9 @@ async def _fetch_robots_txt(
 
     except Exception as exc:
         logger.debug("Failed to fetch robots.txt for %s: %s", domain, exc)
-        return disallowed, crawl_delay, False
+        return disallowed, crawl_delay, False, sitemaps
 
-    return disallowed, crawl_delay, True
+    return disallowed, crawl_delay, True, sitemaps
 
 
 def _is_path_allowed(path: str, disallowed: list[str]) -> bool:
@@ -203,6 +242,17 @@ def _is_path_allowed(path: str, disallowed: list[str]) -> bool:
 # Page Analysis — single page
 # ============================================================================
 
+def _response_time_issues(response_time_ms: int) -> list[dict]:
+    """Issues that depend only on the fetch timing (re-evaluated even for unchanged pages)."""
+    if response_time_ms > 3000:
+        return [{
+            "issue_type": "slow_response",
+            "severity": "warning",
+            "message": f"Slow page response ({response_time_ms}ms)",
+        }]
+    return []
+
+
 def _analyze_page(
     url: str,
     status_code: int,
@@ -220,7 +270,7 @@ def _analyze_page(
     """
     issues: list[dict] = []
     if soup is None:
-        soup = BeautifulSoup(html_body, "html.parser")
+        soup = BeautifulSoup(html_body, "lxml")
     is_https = url.startswith("https://")
 
     # --- Title tag ---
@@ -383,12 +433,7 @@ def _analyze_page(
         })
 
     # --- Performance ---
-    if response_time_ms > 3000:
-        issues.append({
-            "issue_type": "slow_response",
-            "severity": "warning",
-            "message": f"Slow page response ({response_time_ms}ms)",
-        })
+    issues.extend(_response_time_issues(response_time_ms))
 
     # --- Mixed content ---
     if is_https:
@@ -469,6 +514,8 @@ def _analyze_page(
         "has_robots_meta": has_robots_meta,
         "page_size_bytes": page_size,
         "redirect_chain": redirect_chain,
+        # Error pages share templates; only real content is fingerprinted
+        "content_simhash": simhash(body_text) if status_code == 200 else None,
         "issues": issues_summary,
     }
 
@@ -479,6 +526,9 @@ def _analyze_page(
 # Cross-page (site-wide) analysis
 # ============================================================================
 
+MAX_DUPLICATE_CLUSTERS = 50  # near-duplicate clusters reported, largest first
+
+
 def _analyze_site_wide(pages_data: list[dict]) -> list[dict]:
     """
     Detect site-wide issues across all crawled pages.
@@ -540,6 +590,152 @@ def _analyze_site_wide(pages_data: list[dict]) -> list[dict]:
             "details": {"urls": sorted(orphans)[:50]},
         })
 
+    # --- Near-duplicate body content (SimHash + LSH banding) ---
+    clusters = near_duplicate_clusters(
+        {p["url"]: p["content_simhash"] for p in pages_data if p.get("content_simhash")}
+    )
+    for urls in clusters[:MAX_DUPLICATE_CLUSTERS]:
+        issues.append({
+            "issue_type": "near_duplicate_content",
+            "severity": "warning",
+            "message": f"Near-duplicate content found on {len(urls)} pages",
+            "details": {"urls": urls[:20], "cluster_size": len(urls)},
+        })
+
+    return issues
+
+
+MAX_CLICK_DEPTH = 4  # pages deeper than this are hard to reach for users and crawlers
+
+
+def _link_graph_issues(metrics: LinkGraphMetrics) -> list[dict]:
+    """Site-wide issues from the internal link graph (deep pages, isolated clusters)."""
+    issues: list[dict] = []
+
+    deep = np.flatnonzero(metrics.click_depth > MAX_CLICK_DEPTH)
+    if deep.size:
+        deepest = deep[np.argsort(-metrics.click_depth[deep], kind="stable")]
+        issues.append({
+            "issue_type": "deep_pages",
+            "severity": "warning",
+            "message": (
+                f"Found {deep.size} pages more than {MAX_CLICK_DEPTH} clicks from the homepage"
+            ),
+            "details": {
+                "urls": [metrics.urls[i] for i in deepest[:50]],
+                "max_depth": int(metrics.click_depth.max()),
+            },
+        })
+
+    # Clusters apart from the homepage's; single-page ones are already orphans
+    sizes = np.bincount(metrics.cluster) if metrics.urls else np.zeros(0, dtype=np.int64)
+    isolated = [c for c in range(1, len(sizes)) if sizes[c] >= 2]
+    if isolated:
+        members: dict[int, list[str]] = defaultdict(list)
+        for url, cluster in zip(metrics.urls, metrics.cluster.tolist(), strict=True):
+            if cluster in isolated[:10] and len(members[cluster]) < 10:
+                members[cluster].append(url)
+        issues.append({
+            "issue_type": "isolated_link_clusters",
+            "severity": "info",
+            "message": f"Found {len(isolated)} groups of pages not linked from the rest of the site",
+            "details": {
+                "clusters": [
+                    {"size": int(sizes[c]), "urls": members[c]} for c in isolated[:10]
+                ],
+            },
+        })
+
+    return issues
+
+
+def _link_metric_rows(metrics: LinkGraphMetrics, page_ids: dict[str, str]) -> list[dict]:
+    """AuditPage update rows (by primary key) carrying each page's link metrics."""
+    return [
+        {
+            "id": page_ids[url],
+            "pagerank": rank,
+            "click_depth": depth if depth != UNREACHABLE else None,
+            "link_cluster": cluster,
+        }
+        for url, rank, depth, cluster in zip(
+            metrics.urls,
+            metrics.pagerank.tolist(),
+            metrics.click_depth.tolist(),
+            metrics.cluster.tolist(),
+            strict=True,
+        )
+        if url in page_ids
+    ]
+
+
+# ============================================================================
+# Link checking
+# ============================================================================
+
+MAX_LINK_CHECKS = 5000  # unique link targets requested per audit
+MAX_BROKEN_LINKS_LISTED = 20  # per source page
+# Page-level issues added after page analysis; never carried over by incremental re-audits
+POST_ANALYSIS_ISSUE_TYPES = ("broken_links",)
+
+
+async def _check_links(
+    client: httpx.AsyncClient,
+    domain: str,
+    disallowed_paths: list[str],
+    crawl_delay: float,
+    summaries: list[dict],
+    timeout: float,
+) -> dict[str, dict]:
+    """
+    Check every link found on the crawled pages and return a broken_links
+    issue per source page that has any: {source_url: issue}.
+
+    Crawled pages already have a status, so only links the crawl did not
+    follow (other hosts, assets, pages beyond the budget or time limit) are
+    requested — each target once, most-linked first, for at most *timeout*
+    seconds.
+    """
+    checker = LinkChecker(
+        client, domain, _is_safe_url, crawl_delay=crawl_delay, workers=MAX_CONCURRENCY
+    )
+    link_counts: Counter[str] = Counter()
+    for summary in summaries:
+        checker.seed(summary["url"], summary.get("status_code"))
+        link_counts.update(summary["internal_links"])
+        link_counts.update(summary.get("outbound_links") or ())
+
+    targets: list[str] = []
+    for url, _count in link_counts.most_common():
+        if len(targets) >= MAX_LINK_CHECKS:
+            break
+        if url in checker.results:
+            continue
+        parsed = urlparse(url)
+        if parsed.hostname == domain and not _is_path_allowed(parsed.path or "/", disallowed_paths):
+            continue
+        targets.append(url)
+
+    results = await checker.check_all(targets, timeout)
+    logger.info(
+        "Link check for %s: %d links checked, %d timed out (not reported)",
+        domain, len(targets), len(checker.unknown),
+    )
+
+    issues: dict[str, dict] = {}
+    for summary in summaries:
+        broken = [
+            {"url": link, "status_code": results[link]}
+            for link in (*summary["internal_links"], *(summary.get("outbound_links") or ()))
+            if link in results and is_broken(results[link])
+        ]
+        if broken:
+            issues[summary["url"]] = {
+                "issue_type": "broken_links",
+                "severity": "warning",
+                "message": f"{len(broken)} broken link(s) on this page",
+                "details": {"links": broken[:MAX_BROKEN_LINKS_LISTED], "count": len(broken)},
+            }
     return issues
 
 
@@ -548,25 +744,27 @@ def _analyze_site_wide(pages_data: list[dict]) -> list[dict]:
 # ============================================================================
 
 async def _check_site_essentials(
-    client: httpx.AsyncClient, domain: str, has_robots_txt: bool = True
+    client: httpx.AsyncClient,
+    domain: str,
+    has_robots_txt: bool = True,
+    has_sitemap: bool | None = None,
 ) -> list[dict]:
     """Check for sitemap.xml and robots.txt presence.
-    Pass has_robots_txt from the earlier _fetch_robots_txt call to avoid a duplicate request."""
+    Pass has_robots_txt from the earlier _fetch_robots_txt call, and has_sitemap
+    from frontier seeding, to avoid duplicate requests."""
     issues: list[dict] = []
     base = f"https://{domain}"
 
     # Sitemap
-    try:
-        resp = await client.get(
-            f"{base}/sitemap.xml", follow_redirects=True, timeout=REQUEST_TIMEOUT
-        )
-        if resp.status_code != 200:
-            issues.append({
-                "issue_type": "missing_sitemap",
-                "severity": "warning",
-                "message": "Missing sitemap.xml",
-            })
-    except Exception:
+    if has_sitemap is None:
+        try:
+            resp = await client.get(
+                f"{base}/sitemap.xml", follow_redirects=True, timeout=REQUEST_TIMEOUT
+            )
+            has_sitemap = resp.status_code == 200
+        except Exception:
+            has_sitemap = False
+    if not has_sitemap:
         issues.append({
             "issue_type": "missing_sitemap",
             "severity": "warning",
@@ -585,9 +783,562 @@ async def _check_site_essentials(
 
 
 # ============================================================================
-# BFS Crawl Loop
+# Per-page processing — parse once, extract links, analyze
+# ============================================================================
+
+_STATIC_ASSET_RE = re.compile(
+    r"\.(pdf|jpg|jpeg|png|gif|webp|svg|css|js|xml|zip|mp4|mp3)$", re.IGNORECASE
+)
+
+
+MAX_OUTBOUND_LINKS = 200  # per page, kept for the link checker
+
+
+def _extract_links(soup: BeautifulSoup, base_url: str, domain: str) -> tuple[set[str], set[str]]:
+    """
+    Collect (internal, outbound) links from a parsed page. Internal links are
+    normalized same-domain, non-asset URLs to crawl; outbound links are every
+    other http(s) target (other hosts and same-domain assets), kept as
+    written minus the fragment so the link checker requests the real URL.
+    """
+    links: set[str] = set()
+    outbound: set[str] = set()
+    for a_tag in soup.find_all("a", href=True):
+        normalized = _normalize_url(a_tag["href"], base_url)
+        if normalized is None:
+            continue
+        link_parsed = urlparse(normalized)
+        if (link_parsed.hostname or "") != domain or _STATIC_ASSET_RE.search(link_parsed.path):
+            outbound.add(urldefrag(urljoin(base_url, a_tag["href"].strip())).url)
+            continue
+        links.add(normalized)
+    return links, outbound
+
+
+def _non_html_page_data(raw: dict) -> dict:
+    """Minimal page record for responses that are not HTML documents."""
+    return {
+        "url": raw["url"],
+        "status_code": raw["status_code"],
+        "response_time_ms": raw["response_time_ms"],
+        "content_type": raw.get("content_type", ""),
+        "word_count": 0,
+        "title": None,
+        "meta_description": None,
+        "h1_count": 0,
+        "has_canonical": False,
+        "has_og_tags": False,
+        "has_structured_data": False,
+        "has_robots_meta": False,
+        "page_size_bytes": raw["page_size"],
+        "redirect_chain": raw["redirect_chain"],
+        "issues": [],
+    }
+
+
+def _process_page(raw: dict, domain: str) -> tuple[dict, list[dict], set[str]]:
+    """
+    Reduce a fetched page to its compact record.
+    Parses the HTML once with lxml, extracts internal links before analysis
+    (which strips boilerplate tags from the tree) and returns
+    (page_data, issues, internal_links). The raw HTML can be dropped afterwards.
+    Runs in the parse process pool, so it must stay a picklable module-level function.
+    """
+    if not (raw["html"] and "text/html" in raw.get("content_type", "")):
+        page_data = _non_html_page_data(raw)
+        _attach_validators(page_data, raw)
+        return page_data, [], set()
+
+    soup = BeautifulSoup(raw["html"], "lxml")
+    try:
+        links, outbound = _extract_links(soup, raw["final_url"], domain)
+    except Exception as exc:
+        logger.debug("Link extraction error on %s: %s", raw["url"], exc)
+        links, outbound = set(), set()
+
+    page_data, issues = _analyze_page(
+        url=raw["url"],
+        status_code=raw["status_code"],
+        response_time_ms=raw["response_time_ms"],
+        html_body=raw["html"],
+        headers=raw["headers"],
+        page_size=raw["page_size"],
+        redirect_chain=raw["redirect_chain"],
+        soup=soup,
+    )
+    page_data["outbound_links"] = sorted(outbound)[:MAX_OUTBOUND_LINKS]
+    _attach_validators(page_data, raw)
+    return page_data, issues, links
+
+
+def _attach_validators(page_data: dict, raw: dict) -> None:
+    page_data["etag"] = raw.get("etag")
+    page_data["last_modified"] = raw.get("last_modified")
+    page_data["content_hash"] = raw.get("content_hash")
+
+
+# ============================================================================
+# Incremental re-audits — reuse unchanged pages from the previous audit
+# ============================================================================
+
+async def _load_previous_pages(db: AsyncSession, audit: SiteAudit) -> dict[str, dict]:
+    """
+    Load the last completed audit of the same domain as {url: prior record}.
+    Only successful pages that carry a body hash are included; each record
+    holds the compact page data, its page-level issues, its internal links
+    and the ETag/Last-Modified validators for conditional requests.
+    """
+    previous_id = (
+        await db.execute(
+            select(SiteAudit.id)
+            .where(
+                SiteAudit.user_id == audit.user_id,
+                SiteAudit.domain == audit.domain,
+                SiteAudit.status == "completed",
+                SiteAudit.id != audit.id,
+            )
+            .order_by(SiteAudit.completed_at.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    if previous_id is None:
+        return {}
+
+    page_rows = await db.execute(
+        select(
+            AuditPage.id,
+            AuditPage.url,
+            AuditPage.status_code,
+            AuditPage.content_type,
+            AuditPage.word_count,
+            AuditPage.title,
+            AuditPage.meta_description,
+            AuditPage.h1_count,
+            AuditPage.has_canonical,
+            AuditPage.has_og_tags,
+            AuditPage.has_structured_data,
+            AuditPage.has_robots_meta,
+            AuditPage.page_size_bytes,
+            AuditPage.redirect_chain,
+            AuditPage.etag,
+            AuditPage.last_modified,
+            AuditPage.content_hash,
+            AuditPage.content_simhash,
+            AuditPage.internal_links,
+            AuditPage.outbound_links,
+        ).where(
+            AuditPage.audit_id == previous_id,
+            AuditPage.status_code == 200,
+            AuditPage.content_hash.isnot(None),
+        )
+    )
+    previous: dict[str, dict] = {}
+    by_page_id: dict[str, dict] = {}
+    for row in page_rows:
+        record = {
+            "page_data": {
+                "url": row.url,
+                "status_code": row.status_code,
+                "content_type": row.content_type or "",
+                "word_count": row.word_count or 0,
+                "title": row.title,
+                "meta_description": row.meta_description,
+                "h1_count": row.h1_count,
+                "has_canonical": row.has_canonical,
+                "has_og_tags": row.has_og_tags,
+                "has_structured_data": row.has_structured_data,
+                "has_robots_meta": row.has_robots_meta,
+                "page_size_bytes": row.page_size_bytes,
+                "redirect_chain": row.redirect_chain or [],
+                "content_simhash": row.content_simhash,
+                "outbound_links": row.outbound_links or [],
+            },
+            "issues": [],
+            "links": row.internal_links or [],
+            "etag": row.etag,
+            "last_modified": row.last_modified,
+            "content_hash": row.content_hash,
+        }
+        previous[row.url] = record
+        by_page_id[row.id] = record
+
+    issue_rows = await db.execute(
+        select(
+            AuditIssue.page_id,
+            AuditIssue.issue_type,
+            AuditIssue.severity,
+            AuditIssue.message,
+            AuditIssue.details,
+        ).where(
+            AuditIssue.audit_id == previous_id,
+            AuditIssue.page_id.isnot(None),
+            # Found after page analysis and found afresh by this audit's link check
+            AuditIssue.issue_type.notin_(POST_ANALYSIS_ISSUE_TYPES),
+        )
+    )
+    for row in issue_rows:
+        record = by_page_id.get(row.page_id)
+        if record is not None:
+            issue = {"issue_type": row.issue_type, "severity": row.severity, "message": row.message}
+            if row.details is not None:
+                issue["details"] = row.details
+            record["issues"].append(issue)
+
+    logger.info(
+        "Loaded %d pages from previous audit %s of %s for incremental re-audit",
+        len(previous), previous_id, audit.domain,
+    )
+    return previous
+
+
+def _is_unchanged(prior: dict | None, raw: dict) -> bool:
+    """True when the server answered 304 or returned the exact same body as last time."""
+    if prior is None:
+        return False
+    return raw.get("not_modified", False) or (
+        raw["status_code"] == 200 and raw.get("content_hash") == prior["content_hash"]
+    )
+
+
+def _reuse_previous(prior: dict, raw: dict) -> tuple[dict, list[dict], set[str]]:
+    """
+    Carry an unchanged page's previous analysis forward, refreshing timing-based
+    issues. Post-analysis issues (broken links) are left for this audit to recompute.
+    """
+    skipped = {"slow_response", *POST_ANALYSIS_ISSUE_TYPES}
+    issues = [i for i in prior["issues"] if i["issue_type"] not in skipped]
+    issues.extend(_response_time_issues(raw["response_time_ms"]))
+
+    page_data = dict(prior["page_data"])
+    page_data["response_time_ms"] = raw["response_time_ms"]
+    page_data["issues"] = [{"type": i["issue_type"], "severity": i["severity"]} for i in issues]
+    page_data["etag"] = raw.get("etag") or prior["etag"]
+    page_data["last_modified"] = raw.get("last_modified") or prior["last_modified"]
+    page_data["content_hash"] = prior["content_hash"]
+    return page_data, issues, set(prior["links"])
+
+
+# ============================================================================
+# Batched page persistence
+# ============================================================================
+
+PAGE_FLUSH_BATCH = 200
+
+
+class _AuditPageWriter:
+    """
+    Buffers compact page records and writes AuditPage/AuditIssue rows in
+    batches (multi-row INSERTs via bulk_insert) while the crawl continues.
+
+    At most one batch is being written while the next one fills, so memory
+    is bounded by the batch size rather than the site size. Only the small
+    per-page summary needed for site-wide analysis is kept for the whole run.
+    ``on_commit`` is called with the URLs of each batch once it is durable.
+    """
+
+    def __init__(self, audit_id: str, batch_size: int = PAGE_FLUSH_BATCH):
+        self.audit_id = audit_id
+        self.batch_size = batch_size
+        self.pages_discovered = 0
+        self.page_ids: dict[str, str] = {}
+        self.summaries: list[dict] = []
+        self.severity_counts: dict[str, int] = {"critical": 0, "warning": 0, "info": 0}
+        self.pages_reused = 0
+        self.on_commit: Callable[[list[str]], None] | None = None
+        self._buffer: list[tuple[str, dict, list[dict], list[str]]] = []
+        self._pending: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pages_analyzed(self) -> int:
+        return len(self.summaries)
+
+    def count_issues(self, issues: list[dict]) -> None:
+        for iss in issues:
+            sev = iss.get("severity", "info")
+            key = sev if sev in ("critical", "warning") else "info"
+            self.severity_counts[key] += 1
+
+    async def restore(self, db: AsyncSession) -> None:
+        """Reload the pages an interrupted run of this audit already committed."""
+        rows = await db.execute(
+            select(
+                AuditPage.id,
+                AuditPage.url,
+                AuditPage.status_code,
+                AuditPage.title,
+                AuditPage.meta_description,
+                AuditPage.internal_links,
+                AuditPage.outbound_links,
+                AuditPage.content_simhash,
+            ).where(AuditPage.audit_id == self.audit_id)
+        )
+        for row in rows:
+            self.page_ids[row.url] = row.id
+            self.summaries.append({
+                "url": row.url,
+                "status_code": row.status_code,
+                "title": row.title,
+                "meta_description": row.meta_description,
+                "internal_links": row.internal_links or [],
+                "outbound_links": [sys.intern(u) for u in row.outbound_links or ()],
+                "content_simhash": row.content_simhash,
+            })
+
+        counts = await db.execute(
+            select(AuditIssue.severity, func.count())
+            .where(AuditIssue.audit_id == self.audit_id, AuditIssue.page_id.is_not(None))
+            .group_by(AuditIssue.severity)
+        )
+        for sev, count in counts:
+            key = sev if sev in ("critical", "warning") else "info"
+            self.severity_counts[key] += count
+
+    async def add(self, page_data: dict, issues: list[dict], internal_links: set[str]) -> None:
+        """Queue one analyzed page; flushes in the background once a batch is full."""
+        page_id = str(uuid4())
+        self.page_ids[page_data["url"]] = page_id
+        links = sorted(internal_links)
+        self.summaries.append({
+            "url": page_data["url"],
+            "status_code": page_data.get("status_code"),
+            "title": page_data.get("title"),
+            "meta_description": page_data.get("meta_description"),
+            "internal_links": links,
+            # Interned: the same nav/footer links repeat on every page
+            "outbound_links": [sys.intern(u) for u in page_data.get("outbound_links") or ()],
+            "content_simhash": page_data.get("content_simhash"),
+        })
+        self.count_issues(issues)
+        self._buffer.append((page_id, page_data, issues, links))
+        if len(self._buffer) >= self.batch_size:
+            await self._flush()
+
+    async def close(self) -> None:
+        """Write any buffered pages and wait for the in-flight batch."""
+        await self._flush()
+        async with self._flush_lock:
+            if self._pending is not None:
+                pending, self._pending = self._pending, None
+                await pending
+
+    async def _flush(self) -> None:
+        # Crawl workers call add() concurrently; serialise so only one batch is in flight
+        async with self._flush_lock:
+            if self._pending is not None:
+                # Surfaces errors from the previous write
+                pending, self._pending = self._pending, None
+                await pending
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            self._pending = asyncio.create_task(
+                self._write(batch, self.pages_analyzed, self.pages_discovered)
+            )
+
+    async def _write(
+        self,
+        batch: list[tuple[str, dict, list[dict], list[str]]],
+        pages_crawled: int,
+        pages_discovered: int,
+    ) -> None:
+        page_rows: list[dict] = []
+        issue_rows: list[dict] = []
+        for page_id, pdata, page_issues, links in batch:
+            page_rows.append({
+                "id": page_id,
+                "audit_id": self.audit_id,
+                "url": pdata["url"],
+                "status_code": pdata["status_code"],
+                "response_time_ms": pdata["response_time_ms"],
+                "content_type": pdata.get("content_type", ""),
+                "word_count": pdata.get("word_count", 0),
+                "title": pdata.get("title"),
+                "meta_description": pdata.get("meta_description"),
+                "h1_count": pdata.get("h1_count", 0),
+                "has_canonical": pdata.get("has_canonical", False),
+                "has_og_tags": pdata.get("has_og_tags", False),
+                "has_structured_data": pdata.get("has_structured_data", False),
+                "has_robots_meta": pdata.get("has_robots_meta", False),
+                "page_size_bytes": pdata.get("page_size_bytes"),
+                "redirect_chain": pdata.get("redirect_chain") or None,
+                "etag": pdata.get("etag"),
+                "last_modified": pdata.get("last_modified"),
+                "content_hash": pdata.get("content_hash"),
+                "content_simhash": pdata.get("content_simhash"),
+                "internal_links": links or None,
+                "outbound_links": pdata.get("outbound_links") or None,
+                "issues_json": pdata.get("issues"),
+            })
+            issue_rows.extend(_issue_rows(self.audit_id, page_id, page_issues))
+
+        async with async_session_maker() as db:
+            # Multi-row INSERTs; pages first for the issues' page_id foreign key
+            await bulk_insert(db, AuditPage, page_rows)
+            await bulk_insert(db, AuditIssue, issue_rows)
+
+            # Progress update rides along with the batch commit
+            await db.execute(
+                update(SiteAudit)
+                .where(SiteAudit.id == self.audit_id)
+                .values(pages_crawled=pages_crawled, pages_discovered=pages_discovered)
+            )
+            await db.commit()
+
+        if self.on_commit is not None:
+            self.on_commit([pdata["url"] for _page_id, pdata, _issues, _links in batch])
+
+
+def _issue_rows(audit_id: str, page_id: str | None, issues: list[dict]) -> list[dict]:
+    """AuditIssue insert rows with client-side ids (page_id None for site-wide issues)."""
+    return [
+        {
+            "id": str(uuid4()),
+            "audit_id": audit_id,
+            "page_id": page_id,
+            "issue_type": iss["issue_type"],
+            "severity": iss["severity"],
+            "message": iss["message"],
+            "details": iss.get("details"),
+        }
+        for iss in issues
+    ]
+
+
+# ============================================================================
+# Sitemap seeding
+# ============================================================================
+
+MAX_SITEMAP_SCAN = 200_000  # sitemap entries examined per audit
+
+
+async def _seed_from_sitemaps(
+    client: httpx.AsyncClient,
+    domain: str,
+    sitemap_urls: list[str],
+    limit: int,
+) -> tuple[list[str], bool]:
+    """
+    Stream the site's sitemaps (robots.txt Sitemap: entries, else /sitemap.xml)
+    and return up to *limit* same-domain page URLs, most recently modified
+    first, plus whether any sitemap was found.
+    Only the top *limit* entries are kept while scanning (bounded heap), so
+    50k-URL sitemaps never sit in memory.
+    """
+    roots = sitemap_urls or [f"https://{domain}/sitemap.xml"]
+    walker = SitemapWalker(client, _is_safe_url)
+    # Min-heap on (lastmod timestamp, arrival order): the oldest entry is evicted first
+    heap: list[tuple[float, int, str]] = []
+    in_heap: set[str] = set()
+    scanned = 0
+
+    async with contextlib.aclosing(walker.entries(roots)) as entries:
+        async for entry in entries:
+            scanned += 1
+            if scanned > MAX_SITEMAP_SCAN:
+                break
+            url = _normalize_url(entry.loc, entry.loc)
+            if url is None or url in in_heap:
+                continue
+            parsed = urlparse(url)
+            if (parsed.hostname or "") != domain or _STATIC_ASSET_RE.search(parsed.path):
+                continue
+            # Undated entries rank below every dated one; earlier ones win ties
+            ts = entry.lastmod.timestamp() if entry.lastmod else float("-inf")
+            item = (ts, -scanned, url)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+                in_heap.add(url)
+            elif item > heap[0]:
+                evicted = heapq.heapreplace(heap, item)
+                in_heap.discard(evicted[2])
+                in_heap.add(url)
+
+    seeds = [url for _ts, _order, url in sorted(heap, reverse=True)]
+    logger.info(
+        "Seeded %d URLs for %s from %d sitemaps (%d entries scanned)",
+        len(seeds), domain, walker.sitemaps_fetched, scanned,
+    )
+    return seeds, walker.sitemaps_fetched > 0
+
+
+# ============================================================================
+# Crawl Loop — continuous frontier with per-host politeness
 # ============================================================================
 
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    scheduler: HostScheduler,
+    page_url: str,
+    disallowed_paths: list[str],
+    prior: dict | None = None,
+) -> dict | None:
+    """
+    Fetch a single page under its host's slot, respecting SSRF and robots rules.
+    With a *prior* record from the previous audit the request is conditional;
+    a 304 comes back as ``not_modified`` with no body.
+    """
+    # SSRF check
+    if not await _is_safe_url(page_url):
+        logger.debug("Blocked unsafe URL: %s", page_url)
+        return None
+
+    # Robots check
+    parsed = urlparse(page_url)
+    if not _is_path_allowed(parsed.path or "/", disallowed_paths):
+        logger.debug("Robots.txt disallows: %s", page_url)
+        return None
+
+    conditional: dict[str, str] = {}
+    if prior:
+        if prior.get("etag"):
+            conditional["If-None-Match"] = prior["etag"]
+        if prior.get("last_modified"):
+            conditional["If-Modified-Since"] = prior["last_modified"]
+
+    try:
+        async with scheduler.slot(parsed.hostname or "") as slot:
+            t0 = time.monotonic()
+            resp = await client.get(
+                page_url,
+                headers=conditional or None,
+                follow_redirects=True,
+                timeout=REQUEST_TIMEOUT,
+            )
+            elapsed = time.monotonic() - t0
+            slot.record(resp.status_code, elapsed, resp.headers.get("retry-after"))
+    except Exception as exc:
+        logger.debug("Crawl error for %s: %s", page_url, exc)
+        return None
+
+    # Build redirect chain from history
+    chain: list[str] = [str(r.url) for r in resp.history]
+    if chain:
+        chain.append(str(resp.url))
+
+    not_modified = bool(prior) and resp.status_code == 304
+    html_body = ""
+    ct = resp.headers.get("content-type", "")
+    if "text/html" in ct and not not_modified:
+        html_body = resp.text
+
+    return {
+        "url": page_url,
+        "final_url": str(resp.url),
+        "status_code": resp.status_code,
+        "response_time_ms": int(elapsed * 1000),
+        "html": html_body,
+        "headers": dict(resp.headers),
+        "page_size": len(resp.content),
+        "redirect_chain": chain,
+        "content_type": ct,
+        "not_modified": not_modified,
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+        "content_hash": hashlib.sha256(resp.content).hexdigest() if not not_modified else None,
+    }
+
+
 async def _crawl_site(
     audit_id: str,
     domain: str,
@@ -595,153 +1346,250 @@ async def _crawl_site(
     disallowed_paths: list[str],
     crawl_delay: float,
     client: httpx.AsyncClient,
-) -> tuple[list[dict], dict[str, set[str]]]:
+    writer: _AuditPageWriter,
+    previous_pages: dict[str, dict] | None = None,
+    seed_urls: list[str] | None = None,
+    resume: CrawlCheckpoint | None = None,
+    has_sitemap: bool | None = None,
+) -> dict[str, set[str]]:
     """
-    BFS crawl starting from domain root. Returns:
-    - list of raw page result dicts (url, status_code, response_time_ms, html, headers, size, redirect_chain)
-    - internal_links_map: {source_url: set of linked urls}
+    Crawl starting from domain root with a pool of workers pulling from a
+    shared priority frontier, so a slow page only occupies its own worker.
+    The homepage goes first, then *seed_urls* (sitemap entries, most recently
+    modified first), then links discovered while crawling in BFS order.
+    Request pacing and per-host concurrency come from HostScheduler
+    (robots Crawl-delay, AIMD on response times and 429/503s).
+    Each page is processed in the parse pool as soon as it arrives and
+    handed to *writer*; raw HTML is dropped immediately afterwards.
+    Pages found unchanged against *previous_pages* (304 or identical body
+    hash) reuse their previous analysis and are not parsed at all.
+
+    The outstanding frontier and visited set are checkpointed every
+    CHECKPOINT_INTERVAL seconds (and on cancellation). Passing the last
+    checkpoint as *resume*, with *writer* restored from the committed
+    pages, continues an interrupted crawl without refetching those pages.
+    *has_sitemap* is only carried in the checkpoints, so a resumed audit
+    need not walk the sitemaps again.
+    Returns internal_links_map: {source_url: set of linked urls}.
     """
     start_url = f"https://{domain}"
-    queue: deque[str] = deque([start_url])
-    visited: set[str] = set()
-    results: list[dict] = []
-    internal_links_map: dict[str, set[str]] = defaultdict(set)
-    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
-    crawl_start = time.monotonic()
-    pages_discovered = 1  # root is already discovered
-
-    async def fetch_page(page_url: str) -> dict | None:
-        """Fetch a single page, respecting concurrency and SSRF."""
-        async with semaphore:
-            # SSRF check
-            if not await _is_safe_url(page_url):
-                logger.debug("Blocked unsafe URL: %s", page_url)
-                return None
-
-            # Robots check
-            parsed_path = urlparse(page_url).path or "/"
-            if not _is_path_allowed(parsed_path, disallowed_paths):
-                logger.debug("Robots.txt disallows: %s", page_url)
-                return None
+    # (tier, order, url): 0 = homepage, 1 = sitemap seeds, 2 = discovered links
+    frontier: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+    # Queued, in-flight and not-yet-committed URLs: what a restart would lose
+    pending: dict[str, tuple[int, int]] = {}
+    seen: set[int] = {url_key(url) for url in writer.page_ids}
+    discovered_order = 0
+    crawl_seconds = 0.0
+    internal_links_map: dict[str, set[str]] = {}
+
+    def enqueue(tier: int, order: int, url: str) -> None:
+        seen.add(url_key(url))
+        if url in writer.page_ids:  # committed before a restart
+            return
+        pending[url] = (tier, order)
+        frontier.put_nowait((tier, order, url))
+
+    if resume is not None:
+        seen.update(resume.seen)
+        discovered_order = resume.discovered_order
+        crawl_seconds = resume.crawl_seconds
+        for tier, order, url in resume.pending:
+            enqueue(tier, order, url)
+    else:
+        enqueue(0, 0, start_url)
+    for rank, seed in enumerate(seed_urls or []):
+        if url_key(seed) not in seen:
+            enqueue(1, rank, seed)
+    # Pages restored from an interrupted run may have links found after the checkpoint
+    for summary in writer.summaries:
+        if summary["internal_links"]:
+            internal_links_map[summary["url"]] = set(summary["internal_links"])
+        for link in summary["internal_links"]:
+            if url_key(link) not in seen and len(seen) < max_pages * 3:
+                discovered_order += 1
+                enqueue(2, discovered_order, link)
+
+    scheduler = HostScheduler(crawl_delay=crawl_delay, max_concurrency=MAX_CONCURRENCY)
+    budget_reached = asyncio.Event()
+    previous_pages = previous_pages or {}
+    # Root, sitemap seeds and restored state
+    writer.pages_discovered = max(len(seen), resume.pages_discovered if resume else 0)
+    started = time.monotonic()
+
+    def settle(urls: list[str]) -> None:
+        for url in urls:
+            pending.pop(url, None)
+
+    writer.on_commit = settle
+
+    def snapshot() -> CrawlCheckpoint:
+        return CrawlCheckpoint(
+            pending=[(tier, order, url) for url, (tier, order) in pending.items()],
+            seen=set(seen),
+            discovered_order=discovered_order,
+            pages_discovered=writer.pages_discovered,
+            pages_analyzed=writer.pages_analyzed,
+            crawl_seconds=crawl_seconds + time.monotonic() - started,
+            has_sitemap=has_sitemap,
+        )
 
+    async def checkpointer() -> None:
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL)
+            await save_checkpoint(audit_id, snapshot())
+
+    async def worker() -> None:
+        nonlocal discovered_order
+        while True:
+            _tier, _order, page_url = await frontier.get()
+            handed_off = False
             try:
-                t0 = time.monotonic()
-                resp = await client.get(
-                    page_url,
-                    follow_redirects=True,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                elapsed_ms = int((time.monotonic() - t0) * 1000)
-
-                # Build redirect chain from history
-                chain: list[str] = [str(r.url) for r in resp.history]
-                if chain:
-                    chain.append(str(resp.url))
-
-                html_body = ""
-                ct = resp.headers.get("content-type", "")
-                if "text/html" in ct:
-                    html_body = resp.text
-
-                return {
-                    "url": page_url,
-                    "final_url": str(resp.url),
-                    "status_code": resp.status_code,
-                    "response_time_ms": elapsed_ms,
-                    "html": html_body,
-                    "headers": dict(resp.headers),
-                    "page_size": len(resp.content),
-                    "redirect_chain": chain,
-                    "content_type": ct,
-                }
-            except Exception as exc:
-                logger.debug("Crawl error for %s: %s", page_url, exc)
-                return None
+                if writer.pages_analyzed >= max_pages:
+                    budget_reached.set()
+                    continue
+
+                prior = previous_pages.get(page_url)
+                raw = await _fetch_page(client, scheduler, page_url, disallowed_paths, prior)
+                if raw is None:
+                    continue
+
+                if _is_unchanged(prior, raw):
+                    page_data, page_issues, links = _reuse_previous(prior, raw)
+                    writer.pages_reused += 1
+                else:
+                    # Parse and analyze off the event loop, in the parse pool
+                    page_data, page_issues, links = await run_in_parse_pool(
+                        _process_page, raw, domain
+                    )
+                del raw
+
+                if writer.pages_analyzed >= max_pages:
+                    budget_reached.set()
+                    continue
+
+                if links:
+                    internal_links_map[page_url] = links
+                for link in links:
+                    if url_key(link) not in seen and len(seen) < max_pages * 3:
+                        discovered_order += 1
+                        enqueue(2, discovered_order, link)
+                        writer.pages_discovered += 1
+
+                # Stays pending until the writer commits it
+                handed_off = True
+                await writer.add(page_data, page_issues, links)
+                if writer.pages_analyzed >= max_pages:
+                    budget_reached.set()
             finally:
-                await asyncio.sleep(crawl_delay)
-
-    batch_counter = 0
-
-    while queue and len(results) < max_pages:
-        # Time limit
-        if time.monotonic() - crawl_start > MAX_CRAWL_TIME:
+                if not handed_off:
+                    pending.pop(page_url, None)
+                frontier.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(MAX_CONCURRENCY)]
+    drained = asyncio.create_task(frontier.join())
+    budget = asyncio.create_task(budget_reached.wait())
+    checkpoints = asyncio.create_task(checkpointer())
+    try:
+        # Workers only finish on error; the crawl ends when the frontier
+        # drains, the page budget is spent, or the time limit hits
+        done, _ = await asyncio.wait(
+            {drained, budget, *workers},
+            timeout=max(0.0, MAX_CRAWL_TIME - crawl_seconds),
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if not done:
             logger.warning("Crawl time limit reached for audit %s", audit_id)
-            break
+        for task in workers:
+            if task.done() and not task.cancelled() and task.exception():
+                raise task.exception()
+    except asyncio.CancelledError:
+        # Shutting down: leave the freshest possible checkpoint to resume from
+        await save_checkpoint(audit_id, snapshot())
+        raise
+    finally:
+        for task in (*workers, drained, budget, checkpoints):
+            task.cancel()
+        await asyncio.gather(*workers, drained, budget, checkpoints, return_exceptions=True)
+
+    logger.info(
+        "Crawl of %s finished: %d pages (%d unchanged), final concurrency %d, rate %.1f req/s",
+        domain,
+        writer.pages_analyzed,
+        writer.pages_reused,
+        scheduler.concurrency(domain),
+        scheduler.rate(domain),
+    )
+    return internal_links_map
 
-        # Drain up to MAX_CONCURRENCY URLs from queue
-        batch: list[str] = []
-        while queue and len(batch) < MAX_CONCURRENCY:
-            candidate = queue.popleft()
-            if candidate not in visited:
-                visited.add(candidate)
-                batch.append(candidate)
-
-        if not batch:
-            break
-
-        # Fetch batch concurrently
-        fetch_results = await asyncio.gather(*[fetch_page(u) for u in batch])
-
-        for result in fetch_results:
-            if result is None:
-                continue
-            results.append(result)
-
-            # Extract internal links from HTML pages
-            if result["html"] and "text/html" in result.get("content_type", ""):
-                try:
-                    link_soup = BeautifulSoup(result["html"], "html.parser")
-                    result["_soup"] = link_soup  # Cache for reuse in _analyze_page
-                    for a_tag in link_soup.find_all("a", href=True):
-                        href = a_tag["href"]
-                        normalized = _normalize_url(href, result["final_url"])
-                        if normalized is None:
-                            continue
-                        link_parsed = urlparse(normalized)
-                        link_domain = link_parsed.hostname or ""
-                        if link_domain != domain:
-                            continue
-                        # Skip static assets
-                        if re.search(
-                            r"\.(pdf|jpg|jpeg|png|gif|webp|svg|css|js|xml|zip|mp4|mp3)$",
-                            link_parsed.path,
-                            re.IGNORECASE,
-                        ):
-                            continue
-
-                        internal_links_map[result["url"]].add(normalized)
-
-                        if normalized not in visited and len(visited) + len(queue) < max_pages * 3:
-                            queue.append(normalized)
-                            pages_discovered += 1
-                except Exception as exc:
-                    logger.debug("Link extraction error on %s: %s", result["url"], exc)
-
-        batch_counter += len(batch)
-
-        # Update progress every 5 pages
-        if batch_counter % 5 < MAX_CONCURRENCY:
-            try:
-                async with async_session_maker() as progress_db:
-                    audit = await progress_db.get(SiteAudit, audit_id)
-                    if audit:
-                        audit.pages_crawled = len(results)
-                        audit.pages_discovered = pages_discovered
-                        await progress_db.commit()
-            except Exception:
-                pass  # Non-critical progress update
-
-    return results, internal_links_map
 
 
 # ============================================================================
 # Main Pipeline Orchestrator
 # ============================================================================
 
+RESUMABLE_STATUSES = ("crawling", "analyzing")
+
+
 async def run_site_audit(audit_id: str) -> None:
     """
     Background task that orchestrates the full site audit pipeline.
-    Uses its own DB session (not the request session).
+    Holds the audit's lease for the whole run so that a restarting server
+    only resumes audits nobody is working on.
+    """
+    async with audit_lease(audit_id) as owned:
+        if not owned:
+            logger.info("Site audit %s is already running in another process", audit_id)
+            return
+        await _run_audit_pipeline(audit_id)
+
+
+async def _resume_site_audit(audit_id: str) -> None:
+    # A crashed process keeps its lease until it expires, so retry once after that
+    for attempt in range(2):
+        if attempt:
+            await asyncio.sleep(LEASE_TTL)
+        async with audit_lease(audit_id) as owned:
+            if owned:
+                await _run_audit_pipeline(audit_id, resume=True)
+                return
+    logger.info("Site audit %s is still held by another process; not resuming", audit_id)
+
+
+async def resume_interrupted_audits() -> None:
+    """
+    Startup hook: resume audits a previous process left crawling or
+    analyzing. Audits started longer ago than the checkpoint TTL are
+    failed instead.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=CHECKPOINT_TTL)
+    async with async_session_maker() as db:
+        stale = await db.execute(
+            update(SiteAudit)
+            .where(
+                SiteAudit.status.in_(RESUMABLE_STATUSES),
+                SiteAudit.started_at < cutoff,
+            )
+            .values(status="failed", error_message="Server restarted during the audit")
+        )
+        result = await db.execute(
+            select(SiteAudit.id).where(SiteAudit.status.in_(RESUMABLE_STATUSES))
+        )
+        audit_ids = list(result.scalars().all())
+        await db.commit()
+
+    if stale.rowcount:
+        logger.warning("Failed %d site audits interrupted too long ago to resume", stale.rowcount)
+    for audit_id in audit_ids:
+        logger.info("Resuming interrupted site audit %s", audit_id)
+        asyncio.create_task(_resume_site_audit(audit_id))
+
+
+async def _run_audit_pipeline(audit_id: str, resume: bool = False) -> None:
+    """
+    Run the audit pipeline with its own DB session (not the request
+    session); page rows are written incrementally by _AuditPageWriter
+    during the crawl. With *resume*, continues an interrupted run from its
+    committed pages and last crawl checkpoint.
     """
     start_time = time.monotonic()
     _dns_cache.clear()
@@ -753,14 +1601,26 @@ async def run_site_audit(audit_id: str) -> None:
             if not audit:
                 logger.error("Site audit %s not found", audit_id)
                 return
+            if resume and audit.status not in RESUMABLE_STATUSES:
+                return
 
             domain = audit.domain
             user_id = audit.user_id
-            logger.info("Starting site audit for %s (id: %s)", domain, audit_id)
-
-            audit.status = "crawling"
-            audit.started_at = datetime.now(UTC)
-            await db.commit()
+            crawl_done = resume and audit.status == "analyzing"
+            writer = _AuditPageWriter(audit_id)
+            checkpoint = None
+            if resume:
+                await writer.restore(db)
+                checkpoint = await load_checkpoint(audit_id)
+                logger.info(
+                    "Resuming site audit for %s (id: %s) with %d pages already crawled",
+                    domain, audit_id, writer.pages_analyzed,
+                )
+            else:
+                logger.info("Starting site audit for %s (id: %s)", domain, audit_id)
+                audit.status = "crawling"
+                audit.started_at = datetime.now(UTC)
+                await db.commit()
 
             # ----- Step 2: Determine user tier → page cap -----
             from infrastructure.database.models.user import User
@@ -785,26 +1645,56 @@ async def run_site_audit(audit_id: str) -> None:
                 await db.commit()
                 return
 
-            # ----- Step 3: Robots.txt -----
+            # ----- Step 3: Previous audit of this domain (incremental re-audit) -----
+            previous_pages = {} if crawl_done else await _load_previous_pages(db, audit)
+
+            # ----- Step 4: Robots.txt and sitemap seeds -----
             async with httpx.AsyncClient(
                 headers={"User-Agent": BOT_USER_AGENT},
                 follow_redirects=True,
                 timeout=REQUEST_TIMEOUT,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=MAX_CONCURRENCY),
             ) as client:
-                disallowed_paths, robots_delay, has_robots_txt = await _fetch_robots_txt(client, domain)
-                crawl_delay = max(CRAWL_DELAY, robots_delay)
-
-                # ----- Step 4: BFS Crawl -----
-                raw_results, internal_links_map = await _crawl_site(
-                    audit_id=audit_id,
-                    domain=domain,
-                    max_pages=max_pages,
-                    disallowed_paths=disallowed_paths,
-                    crawl_delay=crawl_delay,
-                    client=client,
-                )
+                (
+                    disallowed_paths,
+                    crawl_delay,
+                    has_robots_txt,
+                    sitemap_urls,
+                ) = await _fetch_robots_txt(client, domain)
+
+                # ----- Step 5: Crawl + per-page analysis, persisted in batches -----
+                if crawl_done:
+                    # Interrupted while analyzing: every page is already stored
+                    has_sitemap = checkpoint.has_sitemap if checkpoint else None
+                else:
+                    if checkpoint is not None and checkpoint.has_sitemap is not None:
+                        # The sitemap seeds are already in the checkpointed frontier
+                        seed_urls, has_sitemap = [], checkpoint.has_sitemap
+                    else:
+                        # Seed the frontier from the sitemaps so deep pages fit the budget
+                        seed_urls, has_sitemap = await _seed_from_sitemaps(
+                            client, domain, sitemap_urls, limit=max_pages
+                        )
+                    try:
+                        await _crawl_site(
+                            audit_id=audit_id,
+                            domain=domain,
+                            max_pages=max_pages,
+                            disallowed_paths=disallowed_paths,
+                            crawl_delay=crawl_delay,
+                            client=client,
+                            writer=writer,
+                            previous_pages=previous_pages,
+                            seed_urls=seed_urls,
+                            resume=checkpoint,
+                            has_sitemap=has_sitemap,
+                        )
+                    finally:
+                        await writer.close()
+                previous_pages.clear()
 
-                if not raw_results:
+                if not writer.pages_analyzed:
                     await db.refresh(audit)
                     audit.status = "failed"
                     audit.error_message = (
@@ -812,100 +1702,62 @@ async def run_site_audit(audit_id: str) -> None:
                         "The site may be unreachable or blocking automated access."
                     )
                     await db.commit()
+                    await clear_checkpoint(audit_id)
                     return
 
-                # ----- Step 5: Analyzing -----
+                # ----- Step 6: Analyzing (site-wide stages) -----
                 await db.refresh(audit)
                 audit.status = "analyzing"
-                audit.pages_crawled = len(raw_results)
+                audit.pages_crawled = writer.pages_analyzed
                 await db.commit()
 
-                # ----- Step 6: Analyze each page -----
-                all_page_data: list[dict] = []
-                all_page_issues: list[tuple[int, list[dict]]] = []  # (page_index, issues)
-
-                for idx, raw in enumerate(raw_results):
-                    if raw["html"] and "text/html" in raw.get("content_type", ""):
-                        page_data, page_issues = _analyze_page(
-                            url=raw["url"],
-                            status_code=raw["status_code"],
-                            response_time_ms=raw["response_time_ms"],
-                            html_body=raw["html"],
-                            headers=raw["headers"],
-                            page_size=raw["page_size"],
-                            redirect_chain=raw["redirect_chain"],
-                            soup=raw.pop("_soup", None),
-                        )
-                        # Free HTML from memory after analysis
-                        raw["html"] = ""
-                    else:
-                        # Non-HTML page — store minimal data
-                        page_data = {
-                            "url": raw["url"],
-                            "status_code": raw["status_code"],
-                            "response_time_ms": raw["response_time_ms"],
-                            "content_type": raw.get("content_type", ""),
-                            "word_count": 0,
-                            "title": None,
-                            "meta_description": None,
-                            "h1_count": 0,
-                            "has_canonical": False,
-                            "has_og_tags": False,
-                            "has_structured_data": False,
-                            "has_robots_meta": False,
-                            "page_size_bytes": raw["page_size"],
-                            "redirect_chain": raw["redirect_chain"],
-                            "issues": [],
-                        }
-                        page_issues = []
-
-                    # Attach internal links for orphan detection
-                    page_data["internal_links"] = list(internal_links_map.get(raw["url"], set()))
-                    all_page_data.append(page_data)
-                    all_page_issues.append((idx, page_issues))
-
-                # ----- Step 7: Site-wide cross-page analysis -----
-                site_wide_issues = _analyze_site_wide(all_page_data)
-
-                # ----- Step 8: Site essentials (sitemap, robots) -----
-                essentials_issues = await _check_site_essentials(client, domain, has_robots_txt)
-
-            # ----- Step 8b: PageSpeed Insights on top pages -----
+                # ----- Step 7: Site-wide cross-page analysis + internal link graph -----
+                site_wide_issues = _analyze_site_wide(writer.summaries)
+                link_metrics = await asyncio.to_thread(
+                    analyze_link_graph, writer.summaries, f"https://{domain}"
+                )
+                site_wide_issues.extend(_link_graph_issues(link_metrics))
+                await bulk_update(db, AuditPage, _link_metric_rows(link_metrics, writer.page_ids))
+
+                # ----- Step 8: Link check, within what is left of the crawl time budget -----
+                time_left = (
+                    MAX_CRAWL_TIME
+                    - (checkpoint.crawl_seconds if checkpoint else 0.0)
+                    - (time.monotonic() - start_time)
+                )
+                link_issues = await _check_links(
+                    client, domain, disallowed_paths, crawl_delay, writer.summaries, time_left
+                )
+
+                # ----- Step 9: Site essentials (sitemap, robots) -----
+                essentials_issues = await _check_site_essentials(
+                    client, domain, has_robots_txt, has_sitemap
+                )
+
+            # ----- Step 10: PageSpeed Insights on top pages -----
             try:
                 from services.pagespeed import fetch_pagespeed
 
-                # Pick homepage + top 4 most-linked pages for PageSpeed analysis
-                inbound_counts: dict[str, int] = {}
-                for _source_url, targets in internal_links_map.items():
-                    for target in targets:
-                        inbound_counts[target] = inbound_counts.get(target, 0) + 1
-
+                # Pick homepage + top 4 pages by internal PageRank for PageSpeed analysis
                 homepage = f"https://{domain}"
                 pagespeed_urls = [homepage]
-                sorted_by_inbound = sorted(
-                    ((url, count) for url, count in inbound_counts.items() if url != homepage),
-                    key=lambda x: x[1],
-                    reverse=True,
-                )
-                for ps_url, _ in sorted_by_inbound[:4]:
-                    pagespeed_urls.append(ps_url)
+                for i in np.argsort(-link_metrics.pagerank, kind="stable"):
+                    if len(pagespeed_urls) >= 5:
+                        break
+                    if link_metrics.urls[i] != homepage:
+                        pagespeed_urls.append(link_metrics.urls[i])
 
                 logger.info("Running PageSpeed Insights on %d pages", len(pagespeed_urls))
 
-                # Build a URL→page_data lookup for O(1) matching
-                page_data_by_url = {p["url"]: p for p in all_page_data}
-
                 # Run PageSpeed calls concurrently (max 3 at a time)
                 ps_semaphore = asyncio.Semaphore(3)
+                pagespeed_results: dict[str, dict] = {}
 
                 async def _run_pagespeed(ps_url: str) -> None:
                     async with ps_semaphore:
                         ps_result = await fetch_pagespeed(ps_url)
                         if ps_result:
-                            pdata = page_data_by_url.get(ps_url)
-                            if pdata:
-                                pdata["performance_score"] = ps_result["performance_score"]
-                                pdata["pagespeed_data"] = ps_result
+                            pagespeed_results[ps_url] = ps_result
                             logger.info(
                                 "PageSpeed for %s: score=%s",
                                 ps_url, ps_result["performance_score"],
@@ -913,99 +1765,56 @@ async def run_site_audit(audit_id: str) -> None:
 
                 await asyncio.gather(*[_run_pagespeed(u) for u in pagespeed_urls])
 
+                # Pages are already persisted — attach scores to their rows
+                for ps_url, ps_result in pagespeed_results.items():
+                    page_row_id = writer.page_ids.get(ps_url)
+                    if page_row_id:
+                        await db.execute(
+                            update(AuditPage)
+                            .where(AuditPage.id == page_row_id)
+                            .values(
+                                performance_score=ps_result["performance_score"],
+                                pagespeed_data=ps_result,
+                            )
+                        )
+
             except Exception as ps_err:
                 logger.warning("PageSpeed analysis failed: %s", ps_err)
 
-            # ----- Step 9: Compute score -----
-            critical_count = 0
-            warning_count = 0
-            info_count = 0
-
-            # Count all issues (page-level + site-wide + essentials)
-            all_issues_flat = [iss for _idx, pi in all_page_issues for iss in pi]
-            all_issues_flat.extend(site_wide_issues)
-            all_issues_flat.extend(essentials_issues)
-
-            for iss in all_issues_flat:
-                sev = iss.get("severity", "info")
-                if sev == "critical":
-                    critical_count += 1
-                elif sev == "warning":
-                    warning_count += 1
-                else:
-                    info_count += 1
+            # ----- Step 11: Compute score -----
+            # Page-level issues were counted as pages streamed through the writer
+            writer.count_issues(list(link_issues.values()))
+            writer.count_issues(site_wide_issues)
+            writer.count_issues(essentials_issues)
+            critical_count = writer.severity_counts["critical"]
+            warning_count = writer.severity_counts["warning"]
+            info_count = writer.severity_counts["info"]
 
             total_issues = critical_count + warning_count + info_count
             score = max(0, round(100 - critical_count * 3 - warning_count * 1 - info_count * 0.2))
 
-            # ----- Step 10: Bulk create AuditPage rows -----
-            page_id_map: dict[int, str] = {}  # index -> page row ID
-
-            for idx, pdata in enumerate(all_page_data):
-                page_row_id = str(uuid4())
-                page_id_map[idx] = page_row_id
-                audit_page = AuditPage(
-                    id=page_row_id,
-                    audit_id=audit_id,
-                    url=pdata["url"],
-                    status_code=pdata["status_code"],
-                    response_time_ms=pdata["response_time_ms"],
-                    content_type=pdata.get("content_type", ""),
-                    word_count=pdata.get("word_count", 0),
-                    title=pdata.get("title"),
-                    meta_description=pdata.get("meta_description"),
-                    h1_count=pdata.get("h1_count", 0),
-                    has_canonical=pdata.get("has_canonical", False),
-                    has_og_tags=pdata.get("has_og_tags", False),
-                    has_structured_data=pdata.get("has_structured_data", False),
-                    has_robots_meta=pdata.get("has_robots_meta", False),
-                    page_size_bytes=pdata.get("page_size_bytes"),
-                    redirect_chain=pdata.get("redirect_chain") or None,
-                    performance_score=pdata.get("performance_score"),
-                    pagespeed_data=pdata.get("pagespeed_data"),
-                    issues_json=pdata.get("issues"),
-                )
-                db.add(audit_page)
-
-            # ----- Step 11: Bulk create AuditIssue rows -----
-            # Page-level issues
-            for idx, page_issues in all_page_issues:
-                page_row_id = page_id_map.get(idx)
-                for iss in page_issues:
-                    db.add(AuditIssue(
-                        id=str(uuid4()),
-                        audit_id=audit_id,
-                        page_id=page_row_id,
-                        issue_type=iss["issue_type"],
-                        severity=iss["severity"],
-                        message=iss["message"],
-                        details=iss.get("details"),
-                    ))
-
-            # Site-wide issues (no page_id)
-            for iss in site_wide_issues + essentials_issues:
-                db.add(AuditIssue(
-                    id=str(uuid4()),
-                    audit_id=audit_id,
-                    page_id=None,
-                    issue_type=iss["issue_type"],
-                    severity=iss["severity"],
-                    message=iss["message"],
-                    details=iss.get("details"),
-                ))
-
-            # ----- Step 12: Finalize audit -----
+            # ----- Step 12: Broken-link rows per source page, site-wide rows (no page_id) -----
+            link_issue_rows: list[dict] = []
+            for source_url, issue in link_issues.items():
+                link_issue_rows.extend(_issue_rows(audit_id, writer.page_ids.get(source_url), [issue]))
+            await bulk_insert(db, AuditIssue, link_issue_rows)
+            await bulk_insert(
+                db, AuditIssue, _issue_rows(audit_id, None, site_wide_issues + essentials_issues)
+            )
+
+            # ----- Step 13: Finalize audit -----
             await db.refresh(audit)
             audit.total_issues = total_issues
             audit.critical_issues = critical_count
             audit.warning_issues = warning_count
             audit.info_issues = info_count
             audit.score = score
-            audit.pages_crawled = len(raw_results)
-            audit.pages_discovered = len(all_page_data)
+            audit.pages_crawled = writer.pages_analyzed
+            audit.pages_discovered = writer.pages_analyzed
             audit.status = "completed"
             audit.completed_at = datetime.now(UTC)
             await db.commit()
+            await clear_checkpoint(audit_id)
 
             try:
                 from services.email_journey import EmailJourneyService
@@ -1022,7 +1831,7 @@ async def run_site_audit(audit_id: str) -> None:
             logger.info(
                 "Site audit completed for %s: %d pages, %d issues (C:%d W:%d I:%d), score=%d in %.1fs",
                 domain,
-                len(raw_results),
+                writer.pages_analyzed,
                 total_issues,
                 critical_count,
                 warning_count,
@@ -1042,3 +1851,4 @@ async def run_site_audit(audit_id: str) -> None:
                     await db.commit()
         except Exception:
             logger.exception("Failed to mark audit %s as failed", audit_id)
+        await clear_checkpoint(audit_id)
@@ -0,0 +1,225 @@
+"""
+Streaming sitemap parsing.
+
+A sitemap may list 50,000 URLs (and a sitemap index 50,000 child sitemaps),
+often gzip-compressed. Entries are parsed incrementally from the response
+stream with lxml's pull parser and each element is discarded once read, so
+memory stays flat regardless of sitemap size and callers can stop reading
+as soon as they have enough URLs. Child sitemaps of an index are fetched
+concurrently under a per-host limit.
+"""
+
+import asyncio
+import logging
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from urllib.parse import urlparse
+
+import httpx
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 15.0
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024  # protocol limit for an uncompressed sitemap
+MAX_SITEMAP_DEPTH = 2  # index -> child sitemap -> urls
+MAX_SITEMAPS = 50  # child sitemaps fetched per walk
+SITEMAP_CONCURRENCY = 8  # sitemaps fetched at once per walk
+SITEMAP_HOST_CONCURRENCY = 4  # ... of which at most this many from one host
+_ENTRY_BUFFER = 1000  # parsed entries waiting for the consumer
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True)
+class SitemapEntry:
+    """A <url> entry, or a <sitemap> entry of a sitemap index (is_index=True)."""
+
+    loc: str
+    lastmod: datetime | None = None
+    is_index: bool = False
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """Parse a W3C datetime lastmod (date-only values are taken as midnight UTC)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _local(tag: object) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+async def stream_sitemap(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: float = REQUEST_TIMEOUT,
+    on_fetched: Callable[[], None] | None = None,
+) -> AsyncIterator[SitemapEntry]:
+    """
+    Yield entries from one sitemap or sitemap index as they are parsed.
+    Gzip bodies (``.xml.gz`` served without Content-Encoding) are detected by
+    their magic bytes. Yields nothing more once the sitemap turns out to be
+    missing, malformed or corrupt; raises httpx errors only for transport
+    failures. *on_fetched* is called when the whole sitemap was read, even
+    if it lists no entries.
+    """
+    async with client.stream("GET", url, follow_redirects=True, timeout=timeout) as resp:
+        if resp.status_code != 200:
+            return
+
+        parser = etree.XMLPullParser(
+            events=("end",), resolve_entities=False, no_network=True, recover=True
+        )
+        decompressor = None
+        first = True
+        total = 0
+
+        async for chunk in resp.aiter_bytes():
+            if first:
+                first = False
+                if chunk.startswith(_GZIP_MAGIC):
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                data = decompressor.decompress(chunk) if decompressor else chunk
+            except zlib.error as exc:
+                logger.debug("Sitemap %s is not valid gzip: %s", url, exc)
+                return
+            total += len(data)
+            if total > MAX_SITEMAP_BYTES:
+                logger.warning("Sitemap %s exceeds %d bytes; truncating", url, MAX_SITEMAP_BYTES)
+                break
+
+            try:
+                parser.feed(data)
+            except etree.XMLSyntaxError as exc:
+                logger.debug("Sitemap %s is not valid XML: %s", url, exc)
+                return
+
+            for _event, el in parser.read_events():
+                name = _local(el.tag)
+                if name not in ("url", "sitemap"):
+                    continue
+                loc = lastmod = None
+                for child in el:
+                    child_name = _local(child.tag)
+                    if child_name == "loc" and child.text:
+                        loc = child.text.strip()
+                    elif child_name == "lastmod" and child.text:
+                        lastmod = child.text
+                # Free the parsed element and any already-processed siblings
+                el.clear()
+                parent = el.getparent()
+                if parent is not None:
+                    while el.getprevious() is not None:
+                        del parent[0]
+                if loc:
+                    yield SitemapEntry(loc=loc, lastmod=parse_lastmod(lastmod), is_index=name == "sitemap")
+
+        if on_fetched is not None:
+            on_fetched()
+
+
+class SitemapWalker:
+    """
+    Walks sitemaps and sitemap indexes, yielding page entries.
+
+    Sitemaps are fetched by up to ``concurrency`` workers at once (at most
+    ``per_host`` per host), so a sitemap index with hundreds of children is
+    not fetched one child at a time. Entries are handed over through a
+    bounded queue: when the consumer stops iterating, the workers stall and
+    are cancelled, so nothing beyond what was asked for is downloaded.
+
+    ``is_safe`` is awaited for every sitemap URL before it is fetched (SSRF
+    guard). A sitemap that fails to fetch or parse is logged and skipped.
+    After a walk, ``sitemaps_fetched`` counts the sitemaps that were read
+    in full, including empty ones.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        is_safe: Callable[[str], Awaitable[bool]],
+        max_depth: int = MAX_SITEMAP_DEPTH,
+        max_sitemaps: int = MAX_SITEMAPS,
+        concurrency: int = SITEMAP_CONCURRENCY,
+        per_host: int = SITEMAP_HOST_CONCURRENCY,
+    ):
+        self.client = client
+        self.is_safe = is_safe
+        self.max_depth = max_depth
+        self.max_sitemaps = max_sitemaps
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.sitemaps_fetched = 0
+        self._visited: set[str] = set()
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def entries(self, roots: list[str]) -> AsyncIterator[SitemapEntry]:
+        todo: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        out: asyncio.Queue[SitemapEntry | BaseException | None] = asyncio.Queue(
+            maxsize=_ENTRY_BUFFER
+        )
+        for root in roots:
+            self._schedule(todo, root, 0)
+
+        async def worker() -> None:
+            while True:
+                url, depth = await todo.get()
+                try:
+                    await self._walk(url, depth, todo, out)
+                except Exception as exc:
+                    await out.put(exc)
+                finally:
+                    todo.task_done()
+
+        async def finish() -> None:
+            await todo.join()
+            await out.put(None)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.create_task(finish()))
+        try:
+            while (item := await out.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _schedule(self, todo: asyncio.Queue, url: str, depth: int) -> None:
+        if url in self._visited or len(self._visited) >= self.max_sitemaps:
+            return
+        self._visited.add(url)
+        todo.put_nowait((url, depth))
+
+    async def _walk(
+        self, url: str, depth: int, todo: asyncio.Queue, out: asyncio.Queue
+    ) -> None:
+        try:
+            if not await self.is_safe(url):
+                logger.debug("Blocked unsafe sitemap URL: %s", url)
+                return
+            host = urlparse(url).hostname or ""
+            slot = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+            async with slot:
+                async for entry in stream_sitemap(self.client, url, on_fetched=self._count_fetched):
+                    if not entry.is_index:
+                        await out.put(entry)
+                    elif depth < self.max_depth:
+                        self._schedule(todo, entry.loc, depth + 1)
+        except httpx.HTTPError as exc:
+            logger.debug("Failed to fetch sitemap %s: %s", url, exc)
+        except Exception as exc:
+            logger.warning("Skipping sitemap %s: %s", url, exc)
+
+    def _count_fetched(self) -> None:
+        self.sitemaps_fetched += 1
@@ -0,0 +1,206 @@
+"""
+Competitor keyword extraction benchmark.
+
+Generates synthetic competitor article sets (titles, headings, slugs, meta
+descriptions and full-length bodies over a Zipf-like vocabulary) and times
+the vectorized ``extract_keywords_with_tfidf`` against the per-page Counter
+reference implementation below, which mirrors the original algorithm. The
+reference takes a body token cap so it can be timed both as it shipped (500
+tokens) and on full bodies; with the same cap both give identical results.
+
+Usage (from backend/):
+
+    python -m tests.benchmarks.keyword_bench --pages 500 2000
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from services.keyword_extraction import (
+    BODY_WEIGHT,
+    FIELD_WEIGHTS,
+    MAX_BODY_NGRAM,
+    MAX_FIELD_NGRAM,
+    MAX_POSITIONAL_SCORE,
+    MIN_DOCS_FOR_IDF,
+    STOP_WORDS,
+    extract_keywords_with_tfidf,
+    tokenize,
+)
+
+VOCABULARY_SIZE = 20_000
+BODY_WORDS = 1500
+REFERENCE_BODY_CAP = 500  # body tokens read by the original implementation
+
+_TOPICS = [
+    "seo", "content", "keyword", "backlink", "ranking", "audit", "crawl",
+    "schema", "sitemap", "analytics", "conversion", "competitor", "snippet",
+]
+
+
+@dataclass
+class BenchResult:
+    """Timings for one page-set size."""
+
+    pages: int
+    body_tokens: int
+    vectorized_s: float
+    reference_capped_s: float
+    reference_full_s: float | None
+
+
+def make_pages(n_pages: int, body_words: int = BODY_WORDS, seed: int = 0) -> list[dict]:
+    """Generate *n_pages* synthetic scraped competitor articles."""
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice(_TOPICS)}{i}" for i in range(VOCABULARY_SIZE)]
+    weights = [1.0 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    fillers = sorted(STOP_WORDS)[:40]
+
+    def phrase(k: int) -> str:
+        return " ".join(rng.choices(vocabulary, weights=weights, k=k))
+
+    pages = []
+    for i in range(n_pages):
+        topic = phrase(3)
+        body = " ".join(
+            rng.choice(fillers) if rng.random() < 0.3 else word
+            for word in (topic + " " + phrase(body_words)).split()
+        )
+        pages.append({
+            "url": f"https://competitor.example/blog/{topic.replace(' ', '-')}-{i}",
+            "title": f"{topic.title()} | Example",
+            "meta_description": f"Learn {topic} with {phrase(6)}.",
+            "headings": [{"level": 1, "text": topic}]
+            + [{"level": 2, "text": phrase(4)} for _ in range(4)],
+            "url_slug": topic.replace(" ", "-"),
+            "body_text": body,
+        })
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (per-page Counters, as originally written)
+# ---------------------------------------------------------------------------
+
+def _reference_ngrams(tokens: list[str], max_n: int) -> list[str]:
+    ngrams = []
+    for n in range(1, min(max_n + 1, len(tokens) + 1)):
+        for i in range(len(tokens) - n + 1):
+            gram = " ".join(tokens[i : i + n])
+            if re.match(r"^[\d\s-]+$", gram):
+                continue
+            ngrams.append(gram)
+    return ngrams
+
+
+def _reference_positional(page: dict) -> tuple[str | None, float]:
+    texts: list[tuple[str, str]] = []
+    if page.get("title"):
+        texts.append(("title", page["title"]))
+    texts += [("h1", h["text"]) for h in page.get("headings") or [] if h["level"] == 1]
+    if page.get("url_slug"):
+        texts.append(("slug", page["url_slug"].replace("-", " ").replace("_", " ")))
+    if page.get("meta_description"):
+        texts.append(("meta", page["meta_description"]))
+    texts += [("h2", h["text"]) for h in page.get("headings") or [] if h["level"] == 2]
+
+    scores: Counter = Counter()
+    for field_name, text in texts:
+        for gram in _reference_ngrams(tokenize(text), MAX_FIELD_NGRAM):
+            scores[gram] += FIELD_WEIGHTS[field_name]
+    if not scores:
+        return None, 0.0
+    bonus = {2: 1.3, 3: 1.3, 4: 1.1}
+    adjusted = Counter({g: s * bonus.get(len(g.split()), 1.0) for g, s in scores.items()})
+    keyword, top_score = adjusted.most_common(1)[0]
+    return keyword, round(min(top_score / MAX_POSITIONAL_SCORE, 1.0), 3)
+
+
+def reference_extract(pages: list[dict], body_cap: int | None = REFERENCE_BODY_CAP) -> list[tuple[str | None, float]]:
+    """Original Counter-based extraction; *body_cap* limits body tokens (None = full body)."""
+    positional = [_reference_positional(p) for p in pages]
+    if len(pages) < MIN_DOCS_FOR_IDF:
+        return positional
+    doc_freq: Counter = Counter()
+    doc_grams: list[Counter] = []
+    for page in pages:
+        tokens = tokenize(page.get("body_text") or "")[:body_cap]
+        counts = Counter(_reference_ngrams(tokens, MAX_BODY_NGRAM))
+        doc_grams.append(counts)
+        doc_freq.update(counts.keys())
+
+    results = []
+    for counts, (keyword, confidence) in zip(doc_grams, positional, strict=True):
+        if keyword is None:
+            results.append((None, 0.0))
+            continue
+        tf = counts.get(keyword, 0)
+        idf = math.log(len(pages) / doc_freq.get(keyword, 1))
+        if tf > 0 and idf > 0:
+            confidence = round(min(confidence + tf * idf / 100 * BODY_WEIGHT, 1.0), 3)
+        results.append((keyword, confidence))
+    return results
+
+
+def _timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(n_pages: int, body_words: int = BODY_WORDS, full_reference: bool = True) -> BenchResult:
+    """Time vectorized and reference extraction on *n_pages* synthetic pages."""
+    pages = make_pages(n_pages, body_words)
+    body_tokens = sum(len(tokenize(p["body_text"])) for p in pages)
+    vectorized_s, _ = _timed(extract_keywords_with_tfidf, pages)
+    capped_s, _ = _timed(reference_extract, pages)
+    full_s = _timed(reference_extract, pages, None)[0] if full_reference else None
+    return BenchResult(
+        pages=n_pages,
+        body_tokens=body_tokens,
+        vectorized_s=round(vectorized_s, 3),
+        reference_capped_s=round(capped_s, 3),
+        reference_full_s=round(full_s, 3) if full_s is not None else None,
+    )
+
+
+def format_results(results: list[BenchResult]) -> str:
+    """Render results as a fixed-width text table."""
+    lines = [
+        f"{'pages':>6} {'body tokens':>12} {'vectorized s':>13} "
+        f"{'ref (500 tok) s':>16} {'ref (full) s':>13}"
+    ]
+    for r in results:
+        full = f"{r.reference_full_s:>13.3f}" if r.reference_full_s is not None else f"{'-':>13}"
+        lines.append(
+            f"{r.pages:>6} {r.body_tokens:>12} {r.vectorized_s:>13.3f} "
+            f"{r.reference_capped_s:>16.3f} {full}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Competitor keyword extraction benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--body-words", type=int, default=BODY_WORDS)
+    parser.add_argument("--skip-full-reference", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    results = [
+        run_benchmark(n, args.body_words, not args.skip_full_reference) for n in args.pages
+    ]
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
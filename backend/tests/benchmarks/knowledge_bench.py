@@ -0,0 +1,312 @@
+"""
+Knowledge-base benchmark and scale harness.
+
+Generates synthetic corpora, embeds them through the mock embedding path
+(no OpenAI key required) and measures, per corpus size:
+
+- ingestion throughput into a vector store (chunks/s, embedding time excluded)
+- query latency percentiles for keyword ``search_chunks``, raw vector search
+  and the full ``KnowledgeService.query_knowledge`` RAG path (AI stubbed)
+- peak traced memory (tracemalloc) and process max RSS
+
+Runs fully offline against the in-process ``LocalVectorStore``; pass
+``--chroma-host`` to also benchmark a local ChromaDB server.
+
+Usage (from backend/):
+
+    python -m tests.benchmarks.knowledge_bench --sizes 1000 10000 100000
+    python -m tests.benchmarks.knowledge_bench --sizes 10000 --chroma-host localhost --chroma-port 8001
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from adapters.knowledge.chroma_adapter import Document
+from adapters.knowledge.embedding_service import EmbeddingService
+from adapters.knowledge.local_vector_store import LocalVectorStore
+from services import knowledge_cache
+from services import knowledge_processor as kp
+
+INGEST_BATCH = 1000
+WORDS_PER_CHUNK = 120
+VOCABULARY_SIZE = 5000
+
+_TOPICS = [
+    "search", "content", "keyword", "backlink", "ranking", "audit", "crawl",
+    "schema", "sitemap", "analytics", "conversion", "competitor", "snippet",
+]
+
+
+@dataclass
+class LatencyStats:
+    """Latency percentiles in milliseconds."""
+
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one backend at one corpus size."""
+
+    backend: str
+    corpus_size: int
+    embed_seconds: float = 0.0
+    ingest_chunks_per_s: float = 0.0
+    peak_traced_mb: float = 0.0
+    max_rss_mb: float = 0.0
+    latencies: dict[str, LatencyStats] = field(default_factory=dict)
+
+
+class _StubAI:
+    """Stands in for AnthropicContentService so only retrieval cost is measured."""
+
+    _model = "benchmark-stub"
+
+    async def generate_text(self, prompt: str, max_tokens: int = 1024, **_: Any) -> str:
+        return f"stub answer ({len(prompt)} prompt chars)"
+
+
+def make_corpus(n_chunks: int, seed: int = 0) -> list[str]:
+    """Generate *n_chunks* synthetic chunk texts with a Zipf-like word distribution."""
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice(_TOPICS)}{i}" for i in range(VOCABULARY_SIZE)]
+    weights = [1.0 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    return [
+        " ".join(rng.choices(vocabulary, weights=weights, k=WORDS_PER_CHUNK))
+        for _ in range(n_chunks)
+    ]
+
+
+def make_queries(corpus: list[str], n_queries: int, seed: int = 1) -> list[str]:
+    """Build queries from word windows of random corpus chunks."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        words = rng.choice(corpus).split()
+        start = rng.randrange(0, max(1, len(words) - 6))
+        queries.append(" ".join(words[start : start + 6]))
+    return queries
+
+
+def latency_stats(samples_ms: list[float]) -> LatencyStats:
+    """Summarise latency samples as percentiles."""
+    ordered = sorted(samples_ms)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    else:
+        cuts = ordered * 99
+    return LatencyStats(
+        count=len(ordered),
+        p50_ms=round(cuts[49], 3),
+        p95_ms=round(cuts[94], 3),
+        p99_ms=round(cuts[98], 3),
+        max_ms=round(ordered[-1], 3),
+    )
+
+
+async def _timed(calls: list[Callable[[], Awaitable[Any]]]) -> LatencyStats:
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return latency_stats(samples)
+
+
+@contextlib.contextmanager
+def _without_answer_cache():
+    """Disable the Redis answer cache so every query pays the full retrieval cost."""
+
+    async def _no_redis():
+        return None
+
+    original = knowledge_cache.get_redis_text
+    knowledge_cache.get_redis_text = _no_redis
+    try:
+        yield
+    finally:
+        knowledge_cache.get_redis_text = original
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def bench_search_chunks(corpus: list[str], queries: list[str]) -> LatencyStats:
+    """Keyword search over the whole corpus (the route caps this at 50 chunks)."""
+    tuples = [(str(i), "src", "Source", i, text) for i, text in enumerate(corpus)]
+
+    async def run(q: str) -> None:
+        kp.search_chunks(tuples, q, top_k=5)
+
+    return await _timed([lambda q=q: run(q) for q in queries])
+
+
+async def bench_vector_store(
+    store: Any,
+    backend: str,
+    corpus: list[str],
+    queries: list[str],
+    embeddings: EmbeddingService,
+    user_id: str,
+) -> BenchResult:
+    """Ingest *corpus* into *store*, then measure vector and RAG query latency."""
+    result = BenchResult(backend=backend, corpus_size=len(corpus))
+    tracemalloc.start()
+
+    embed_seconds = 0.0
+    ingest_seconds = 0.0
+    for start in range(0, len(corpus), INGEST_BATCH):
+        batch = corpus[start : start + INGEST_BATCH]
+        t0 = time.perf_counter()
+        vectors = await embeddings.embed_texts(batch)
+        embed_seconds += time.perf_counter() - t0
+
+        docs = [
+            Document(
+                id=f"bench_{start + i}",
+                content=text,
+                metadata={
+                    "source_id": f"src_{(start + i) // 100}",
+                    "title": "Bench",
+                    "chunk_index": start + i,
+                },
+            )
+            for i, text in enumerate(batch)
+        ]
+        t0 = time.perf_counter()
+        await store.add_documents(user_id=user_id, documents=docs, embeddings=vectors)
+        ingest_seconds += time.perf_counter() - t0
+
+    result.embed_seconds = round(embed_seconds, 3)
+    result.ingest_chunks_per_s = round(len(corpus) / ingest_seconds, 1) if ingest_seconds else 0.0
+
+    query_vectors = [await embeddings.embed_text(q) for q in queries]
+    result.latencies["vector_query"] = await _timed(
+        [
+            lambda v=v: store.query(user_id=user_id, query_embedding=v, n_results=5)
+            for v in query_vectors
+        ]
+    )
+
+    from services.knowledge_service import KnowledgeService
+
+    service = KnowledgeService(
+        chroma_adapter=store,
+        embedding_service=embeddings,
+        document_processor=None,
+        anthropic_adapter=_StubAI(),
+    )
+    with _without_answer_cache():
+        result.latencies["query_knowledge"] = await _timed(
+            [lambda q=q: service.query_knowledge(user_id=user_id, query=q) for q in queries]
+        )
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result.peak_traced_mb = round(peak / (1024 * 1024), 1)
+    result.max_rss_mb = round(_max_rss_mb(), 1)
+    return result
+
+
+async def run_benchmarks(
+    sizes: list[int],
+    n_queries: int = 100,
+    chroma_host: str | None = None,
+    chroma_port: int = 8001,
+) -> list[BenchResult]:
+    """Run every benchmark for each corpus size and return the results."""
+    embeddings = EmbeddingService(api_key=None)
+    embeddings.api_key = None  # force the mock path even if OPENAI_API_KEY is set
+    results: list[BenchResult] = []
+
+    for size in sizes:
+        corpus = make_corpus(size)
+        queries = make_queries(corpus, n_queries)
+
+        keyword = BenchResult(backend="search_chunks", corpus_size=size)
+        tracemalloc.start()
+        keyword.latencies["keyword_search"] = await bench_search_chunks(corpus, queries)
+        keyword.peak_traced_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+        keyword.max_rss_mb = round(_max_rss_mb(), 1)
+        results.append(keyword)
+
+        tmp_dir = tempfile.mkdtemp(prefix="kv_bench_")
+        try:
+            store = LocalVectorStore(persist_directory=tmp_dir, collection_prefix="bench")
+            results.append(
+                await bench_vector_store(store, "local", corpus, queries, embeddings, "bench-user")
+            )
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if chroma_host:
+            from adapters.knowledge.chroma_adapter import ChromaAdapter
+
+            prefix = f"bench_{uuid4().hex[:8]}"
+            store = ChromaAdapter(host=chroma_host, port=chroma_port, collection_prefix=prefix)
+            try:
+                results.append(
+                    await bench_vector_store(store, "chroma", corpus, queries, embeddings, "bench-user")
+                )
+            finally:
+                await store.delete_collection("bench-user")
+
+    return results
+
+
+def format_results(results: list[BenchResult]) -> str:
+    """Render results as a fixed-width text table."""
+    lines = [
+        f"{'backend':<14} {'chunks':>8} {'operation':<16} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'ingest/s':>10} {'peak MB':>8} {'rss MB':>8}"
+    ]
+    for r in results:
+        for op, lat in r.latencies.items():
+            lines.append(
+                f"{r.backend:<14} {r.corpus_size:>8} {op:<16} {lat.p50_ms:>9.3f} {lat.p95_ms:>9.3f} "
+                f"{lat.p99_ms:>9.3f} {r.ingest_chunks_per_s:>10.1f} {r.peak_traced_mb:>8.1f} "
+                f"{r.max_rss_mb:>8.1f}"
+            )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Knowledge-base benchmark harness")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--chroma-host", default=None)
+    parser.add_argument("--chroma-port", type=int, default=8001)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run_benchmarks(args.sizes, args.queries, args.chroma_host, args.chroma_port)
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Keyword extraction benchmark smoke tests.
+
+Small page sets always run and check the vectorized engine against the
+Counter reference; the 2,000-page timing run is opt-in:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks/test_keyword_bench.py -s
+"""
+
+import os
+
+import pytest
+
+from services.keyword_extraction import extract_keywords_with_tfidf
+from tests.benchmarks.keyword_bench import (
+    format_results,
+    make_pages,
+    reference_extract,
+    run_benchmark,
+)
+
+run_scale = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS=1 to run scale benchmarks"
+)
+
+
+def test_page_generation_is_deterministic():
+    assert make_pages(3, body_words=50) == make_pages(3, body_words=50)
+
+
+@pytest.mark.parametrize(("n_pages", "body_words"), [(2, 40), (20, 200), (100, 800)])
+def test_matches_reference_on_full_bodies(n_pages, body_words):
+    pages = make_pages(n_pages, body_words)
+
+    assert extract_keywords_with_tfidf(pages) == reference_extract(pages, body_cap=None)
+
+
+def test_harness_smoke():
+    results = [run_benchmark(30, body_words=100)]
+
+    assert results[0].vectorized_s >= 0
+    assert "30" in format_results(results)
+
+
+@run_scale
+@pytest.mark.parametrize("n_pages", [500, 2_000])
+def test_scale(n_pages):
+    print("\n" + format_results([run_benchmark(n_pages)]))
@@ -0,0 +1,56 @@
+"""
+Knowledge-base benchmark smoke tests.
+
+A small corpus always runs to keep the harness working; the 1k/10k/100k
+scale runs are opt-in because they take minutes:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -s
+"""
+
+import os
+
+import pytest
+
+from tests.benchmarks.knowledge_bench import (
+    format_results,
+    latency_stats,
+    make_corpus,
+    make_queries,
+    run_benchmarks,
+)
+
+run_scale = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS=1 to run scale benchmarks"
+)
+
+
+def test_corpus_generation_is_deterministic():
+    assert make_corpus(5) == make_corpus(5)
+    assert len(make_queries(make_corpus(5), 3)) == 3
+
+
+def test_latency_stats_percentiles():
+    stats = latency_stats([float(i) for i in range(1, 101)])
+    assert stats.count == 100
+    assert stats.p50_ms == pytest.approx(50.5)
+    assert stats.max_ms == 100.0
+
+
+@pytest.mark.asyncio
+async def test_harness_smoke():
+    results = await run_benchmarks([200], n_queries=10)
+
+    backends = {r.backend for r in results}
+    assert backends == {"search_chunks", "local"}
+    local = next(r for r in results if r.backend == "local")
+    assert local.ingest_chunks_per_s > 0
+    assert set(local.latencies) == {"vector_query", "query_knowledge"}
+    assert "local" in format_results(results)
+
+
+@run_scale
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1_000, 10_000, 100_000])
+async def test_scale(size):
+    results = await run_benchmarks([size], n_queries=100)
+    print("\n" + format_results(results))
@@ -0,0 +1,137 @@
+"""
+Unit tests for weekly and monthly analytics rollups.
+
+Tests cover:
+- Week (Monday) and month boundaries
+- plan_range covers every day of a range exactly once, preferring months and weeks
+- refresh_rollups rebuilds every overlapping week and month of each rollup table
+- Totals read whole periods from the rollups and only leftover days from daily rows
+- Totals rows carry exactly the fields of the totals response schemas
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from api.schemas.analytics import KeywordTotalsResponse, PageTotalsResponse
+from services.analytics_rollups import (
+    MONTH,
+    WEEK,
+    keyword_totals,
+    page_totals,
+    period_end,
+    period_start,
+    plan_range,
+    refresh_rollups,
+    site_totals,
+)
+
+
+class _FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _covered_days(start: date, end: date) -> list[date]:
+    plan = plan_range(start, end)
+    days = []
+    for month in plan.months:
+        days += [month + timedelta(days=i) for i in range((period_end(MONTH, month) - month).days + 1)]
+    for week in plan.weeks:
+        days += [week + timedelta(days=i) for i in range(7)]
+    for lo, hi in plan.days:
+        days += [lo + timedelta(days=i) for i in range((hi - lo).days + 1)]
+    return sorted(days)
+
+
+def test_period_boundaries():
+    assert period_start(WEEK, date(2024, 3, 14)) == date(2024, 3, 11)  # Thursday -> Monday
+    assert period_end(WEEK, date(2024, 3, 11)) == date(2024, 3, 17)
+    assert period_start(MONTH, date(2024, 2, 14)) == date(2024, 2, 1)
+    assert period_end(MONTH, date(2024, 2, 1)) == date(2024, 2, 29)
+    assert period_end(MONTH, date(2024, 12, 1)) == date(2024, 12, 31)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (date(2024, 1, 1), date(2024, 1, 1)),
+        (date(2024, 1, 3), date(2024, 1, 9)),
+        (date(2024, 1, 10), date(2024, 4, 20)),
+        (date(2023, 12, 30), date(2024, 12, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+    ],
+)
+def test_plan_range_covers_each_day_once(start, end):
+    expected = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    assert _covered_days(start, end) == expected
+
+
+def test_plan_range_prefers_months_and_weeks():
+    plan = plan_range(date(2024, 1, 10), date(2024, 4, 20))
+
+    assert plan.months == [date(2024, 2, 1), date(2024, 3, 1)]
+    assert plan.weeks == [date(2024, 1, 15), date(2024, 1, 22), date(2024, 4, 1), date(2024, 4, 8)]
+    assert plan.days == [
+        (date(2024, 1, 10), date(2024, 1, 14)),
+        (date(2024, 1, 29), date(2024, 1, 31)),
+        (date(2024, 4, 15), date(2024, 4, 20)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_rebuilds_overlapping_periods():
+    db = _FakeSession()
+
+    await refresh_rollups(db, "u1", "https://example.com/", date(2024, 1, 30), date(2024, 2, 2))
+
+    assert [(type(s).__name__, s.table.name) for s in db.statements] == [
+        (kind, table)
+        for table in ("keyword_ranking_rollups", "page_performance_rollups", "daily_analytics_rollups")
+        for kind in ("Delete", "Insert")
+    ] * 2
+    week_delete = db.statements[0].compile(dialect=postgresql.dialect()).params
+    assert (week_delete["period_1"], week_delete["period_start_1"], week_delete["period_start_2"]) == (
+        WEEK, date(2024, 1, 29), date(2024, 1, 29),
+    )
+    month_delete = db.statements[6].compile(dialect=postgresql.dialect()).params
+    assert (month_delete["period_start_1"], month_delete["period_start_2"]) == (
+        date(2024, 1, 1), date(2024, 2, 1),
+    )
+    assert "date_trunc('week', keyword_rankings.date)" in _sql(db.statements[1])
+    assert "GROUP BY" in _sql(db.statements[7])
+
+
+def test_totals_read_rollups_and_leftover_days():
+    sql = _sql(keyword_totals("u1", date(2024, 1, 10), date(2024, 4, 20)))
+
+    assert "UNION ALL" in sql
+    assert "FROM keyword_ranking_rollups" in sql
+    assert "FROM keyword_rankings" in sql
+    assert "GROUP BY" in sql
+
+
+def test_totals_columns_match_response_schemas():
+    for stmt, schema in (
+        (keyword_totals("u1", date(2024, 1, 1), date(2024, 3, 31)), KeywordTotalsResponse),
+        (page_totals("u1", date(2024, 1, 1), date(2024, 3, 31)), PageTotalsResponse),
+    ):
+        columns = set(stmt.selected_columns.keys())
+        assert set(schema.model_fields) <= columns
+        assert not {"id", "created_at"} & columns
+
+
+def test_short_range_reads_daily_rows_only():
+    sql = _sql(site_totals("u1", date(2024, 1, 3), date(2024, 1, 5)))
+
+    assert "daily_analytics_rollups" not in sql
+    assert "FROM daily_analytics" in sql
@@ -0,0 +1,140 @@
+"""
+Unit tests for the bulk insert helpers.
+
+Covers:
+- Chunk sizing under the PostgreSQL bind-parameter limit
+- One multi-row INSERT statement per chunk
+- Primary-key bulk UPDATEs sent as executemany batches
+- Multi-row upserts with ON CONFLICT DO UPDATE, collapsing repeated keys
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from infrastructure.database.bulk import (
+    MAX_BIND_PARAMS,
+    bulk_insert,
+    bulk_update,
+    bulk_upsert,
+    chunk_rows,
+)
+from infrastructure.database.models.analytics import KeywordRanking
+from infrastructure.database.models.site_audit import AuditIssue, AuditPage
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.params = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        self.params.append(params)
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "audit_id": "00000000-0000-0000-0000-000000000000",
+            "page_id": None,
+            "issue_type": "missing_h1",
+            "severity": "critical",
+            "message": "Missing H1 heading",
+            "details": None,
+        }
+        for i in range(n)
+    ]
+
+
+def test_chunks_stay_under_bind_param_limit():
+    rows = _rows(10_000)
+    chunks = list(chunk_rows(rows))
+
+    assert sum(len(c) for c in chunks) == 10_000
+    assert all(len(c) * len(rows[0]) <= MAX_BIND_PARAMS for c in chunks)
+    assert list(chunk_rows([])) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_emits_one_statement_per_chunk():
+    db = _RecordingSession()
+
+    inserted = await bulk_insert(db, AuditIssue, _rows(5), chunk_size=2)
+
+    assert inserted == 5
+    assert len(db.statements) == 3
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO audit_issues")
+    assert sql.count("), (") == 1  # two rows in one VALUES clause
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_batches_parameter_sets():
+    db = _RecordingSession()
+    rows = [{"id": f"p{i}", "click_depth": i} for i in range(5)]
+
+    updated = await bulk_update(db, AuditPage, rows, chunk_size=2)
+
+    assert updated == 5
+    assert [len(p) for p in db.params] == [2, 2, 1]
+    assert db.params[2] == [{"id": "p4", "click_depth": 4}]
+    assert str(db.statements[0].compile(dialect=postgresql.dialect())).startswith(
+        "UPDATE audit_pages"
+    )
+
+
+def _ranking(i: int, keyword: str, clicks: int) -> dict:
+    return {
+        "id": f"r{i}",
+        "user_id": "u1",
+        "site_url": "https://example.com/",
+        "keyword": keyword,
+        "date": date(2024, 1, 1),
+        "clicks": clicks,
+        "impressions": 10,
+        "ctr": 0.1,
+        "position": 2.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_on_conflict():
+    db = _RecordingSession()
+    rows = [_ranking(i, f"kw{i}", i) for i in range(5)]
+
+    written = await bulk_upsert(
+        db, KeywordRanking, rows, "uq_keyword_ranking_user_site_keyword_date", ["clicks", "position"],
+        chunk_size=2,
+    )
+
+    assert written == 5
+    assert len(db.statements) == 3
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.count("), (") == 1
+    assert "ON CONFLICT ON CONSTRAINT uq_keyword_ranking_user_site_keyword_date DO UPDATE" in sql
+    assert "clicks = excluded.clicks" in sql
+    assert "updated_at = now()" in sql
+    assert "impressions = excluded" not in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_collapses_repeated_keys():
+    db = _RecordingSession()
+    rows = [_ranking(0, "a", 1), _ranking(1, "b", 2), _ranking(2, "a", 3)]
+
+    written = await bulk_upsert(
+        db, KeywordRanking, rows, "uq_keyword_ranking_user_site_keyword_date", ["clicks"]
+    )
+
+    assert written == 2
+    params = db.statements[0].compile(dialect=postgresql.dialect()).params
+    assert sorted(v for k, v in params.items() if k.startswith("clicks")) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_unknown_constraint():
+    with pytest.raises(ValueError):
+        await bulk_upsert(_RecordingSession(), KeywordRanking, [], "no_such_constraint", ["clicks"])
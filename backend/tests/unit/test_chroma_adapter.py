@@ -6,7 +6,7 @@ Tests cover:
 - Document operations (add, query, delete)
 - Metadata filtering
 - Error handling
-- CHROMA-C1 legacy collection fallback
+- CHROMA-C1 legacy collection fallback and one-time migration per user
 """
 
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -172,6 +172,124 @@ class TestLegacyFallback:
         assert stats["document_count"] == 10
         assert stats["legacy_docs"] == 0
 
+class TestCollectionCacheAndBatching:
+    """Collection handle LRU, single-round-trip queries, batched upserts, legacy migration."""
+
+    async def test_collection_handle_is_cached(self):
+        adapter, _, _ = _make_adapter(3, 0, _MOCK_RESULTS)
+
+        adapter.get_collection("user-1", "p1")
+        adapter.get_collection("user-1", "p1")
+
+        adapter.client.get_or_create_collection.assert_called_once()
+
+    async def test_populated_collection_queries_in_one_round_trip(self):
+        adapter, new_col, _ = _make_adapter(3, 5, _MOCK_RESULTS)
+
+        await adapter.query(user_id="user-1", query_embedding=[0.1], n_results=5)
+        await adapter.query(user_id="user-1", query_embedding=[0.1], n_results=5)
+
+        assert new_col.count.call_count == 1
+        assert new_col.query.call_count == 2
+        adapter.client.get_collection.assert_not_called()
+
+    async def test_delete_collection_invalidates_handle(self):
+        adapter, _, _ = _make_adapter(3, 0, _MOCK_RESULTS)
+        adapter.get_collection("user-1", "p1")
+
+        await adapter.delete_collection("user-1", "p1")
+        adapter.get_collection("user-1", "p1")
+
+        assert adapter.client.get_or_create_collection.call_count == 2
+
+    async def test_add_documents_upserts_in_max_batch_chunks(self):
+        from adapters.knowledge.chroma_adapter import Document
+
+        adapter, new_col, _ = _make_adapter(0, 0, _EMPTY_RESULTS)
+        adapter.client.get_max_batch_size = Mock(return_value=2)
+        docs = [Document(id=f"d{i}", content="c", metadata={"source_id": "s"}) for i in range(5)]
+
+        ids = await adapter.add_documents("user-1", docs, [[0.1]] * 5)
+
+        assert ids == [f"d{i}" for i in range(5)]
+        assert [len(c.kwargs["ids"]) for c in new_col.upsert.call_args_list] == [2, 2, 1]
+
+    async def test_legacy_collection_is_migrated_once(self):
+        adapter, new_col, legacy_col = _make_adapter(0, 2, _MOCK_RESULTS)
+        adapter.client.get_max_batch_size = Mock(return_value=100)
+        legacy_col.get = Mock(
+            return_value={
+                "ids": ["a", "b"],
+                "documents": ["A", "B"],
+                "embeddings": [[0.1], [0.2]],
+                "metadatas": [{}, {}],
+            }
+        )
+
+        await adapter.query(user_id="user-1", query_embedding=[0.1], n_results=5)
+        await adapter._migrations["user-1"]
+        await adapter.query(user_id="user-1", query_embedding=[0.1], n_results=5)
+
+        new_col.upsert.assert_called_once()
+        assert new_col.upsert.call_args.kwargs["ids"] == ["a", "b"]
+        # Renamed so no later process migrates it again
+        legacy_col.modify.assert_called_once_with(name="kv_user-1_migrated")
+        # Legacy probed once; after migration the project collection is queried directly
+        adapter.client.get_collection.assert_called_once()
+        legacy_col.query.assert_called_once()
+        new_col.query.assert_called_once()
+
+    async def test_legacy_documents_go_only_to_their_sources_projects(self):
+        adapter, _, legacy_col = _make_adapter(0, 3, _MOCK_RESULTS)
+        adapter.client.get_max_batch_size = Mock(return_value=100)
+        collections: dict[str, Mock] = {}
+
+        def get_or_create(name, metadata=None):
+            return collections.setdefault(
+                name, Mock(count=Mock(return_value=0), query=Mock(return_value=_EMPTY_RESULTS))
+            )
+
+        adapter.client.get_or_create_collection = Mock(side_effect=get_or_create)
+        adapter.legacy_source_projects = AsyncMock(
+            return_value={"s-personal": "proj-home", "s-team": "proj-team"}
+        )
+        legacy_col.get = Mock(
+            return_value={
+                "ids": ["a", "b", "c"],
+                "documents": ["A", "B", "C"],
+                "embeddings": [[0.1], [0.2], [0.3]],
+                "metadatas": [
+                    {"source_id": "s-personal"},
+                    {"source_id": "s-team"},
+                    {"source_id": "s-deleted"},
+                ],
+            }
+        )
+
+        # A project that owns no legacy sources neither falls back nor migrates
+        await adapter.query(user_id="user-1", query_embedding=[0.1], n_results=5, project_id="proj-new")
+        legacy_col.query.assert_not_called()
+        assert adapter._migrations == {}
+
+        await adapter.query(
+            user_id="user-1", query_embedding=[0.1], n_results=5,
+            filter_metadata={"title": "t"}, project_id="proj-home",
+        )
+        assert legacy_col.query.call_args.kwargs["where"] == {
+            "$and": [{"title": "t"}, {"source_id": {"$in": ["s-personal"]}}]
+        }
+        await adapter._migrations["user-1"]
+
+        upserts = {
+            name: col.upsert.call_args.kwargs["ids"]
+            for name, col in collections.items()
+            if col.upsert.called
+        }
+        assert upserts == {"kv_user-1_proj-home": ["a"], "kv_user-1_proj-team": ["b"]}
+        legacy_col.get.assert_called_once()
+        legacy_col.modify.assert_called_once()
+
+
 # Skip if adapter not implemented yet
 pytest.importorskip(
     "adapters.knowledge.chroma_adapter", reason="ChromaDB adapter not yet implemented"
@@ -0,0 +1,106 @@
+"""
+Unit tests for incremental competitor monitoring.
+
+Tests cover:
+- Sitemap snapshot packing round trip
+- diff_sitemap: baseline runs, new URLs against the snapshot, changed
+  lastmods, lastmod baselines, truncated discovery, newest-first order
+- Monitored keywords: IDF against stored frequencies, only new pages added
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from services.competitor_monitor import (
+    diff_sitemap,
+    extract_monitored_keywords,
+    pack_snapshot,
+    unpack_snapshot,
+)
+from services.keyword_extraction import extract_keywords_and_frequencies
+
+NOW = datetime(2026, 10, 1, tzinfo=UTC)
+BASE = "https://competitor.example/blog"
+
+
+def test_snapshot_round_trip():
+    urls = [f"{BASE}/post-{i}" for i in range(1000)]
+    snapshot = unpack_snapshot(pack_snapshot(urls + urls[:10]))
+
+    assert len(snapshot) == 1000
+    assert unpack_snapshot(None) is None
+    assert unpack_snapshot(pack_snapshot([])) == set()
+
+
+def test_baseline_run_reports_nothing_new():
+    entries = {f"{BASE}/a": NOW, f"{BASE}/b": None}
+
+    diff = diff_sitemap(entries, known={}, snapshot=None)
+
+    assert diff.new_urls == [] and diff.changed_urls == []
+
+
+def test_new_urls_are_unseen_and_unknown():
+    old = [f"{BASE}/old-{i}" for i in range(5)]
+    entries = dict.fromkeys(old, NOW - timedelta(days=30))
+    entries[f"{BASE}/stored"] = None
+    entries[f"{BASE}/fresh"] = NOW
+    entries[f"{BASE}/fresh-undated"] = None
+    entries[f"{BASE}/fresher"] = NOW + timedelta(hours=1)
+
+    diff = diff_sitemap(entries, known={f"{BASE}/stored": None}, snapshot=unpack_snapshot(pack_snapshot(old)))
+
+    assert diff.new_urls == [f"{BASE}/fresher", f"{BASE}/fresh", f"{BASE}/fresh-undated"]
+
+
+def test_changed_urls_need_a_later_lastmod():
+    known = {
+        f"{BASE}/edited": NOW - timedelta(days=2),
+        f"{BASE}/same": NOW - timedelta(days=2),
+        f"{BASE}/undated": None,
+        f"{BASE}/dropped-lastmod": NOW,
+    }
+    entries = {
+        f"{BASE}/edited": NOW,
+        f"{BASE}/same": NOW - timedelta(days=2),
+        f"{BASE}/undated": NOW,
+        f"{BASE}/dropped-lastmod": None,
+    }
+
+    diff = diff_sitemap(entries, known, snapshot=unpack_snapshot(pack_snapshot(entries)))
+
+    assert diff.changed_urls == [f"{BASE}/edited"]
+    assert diff.lastmod_baseline == {f"{BASE}/undated": NOW}
+    assert diff.new_urls == []
+
+
+def test_truncated_discovery_requires_recent_lastmod():
+    since = NOW - timedelta(days=1)
+    entries = {
+        f"{BASE}/recent": NOW,
+        f"{BASE}/resurfaced": NOW - timedelta(days=90),
+        f"{BASE}/undated": None,
+    }
+
+    diff = diff_sitemap(entries, known={}, snapshot=set(), truncated=True, since=since)
+
+    assert diff.new_urls == [f"{BASE}/recent"]
+    assert len(diff_sitemap(entries, known={}, snapshot=set(), truncated=False, since=since).new_urls) == 3
+
+
+def test_monitored_keywords_keep_order_and_add_only_new_pages():
+    corpus = [
+        {"url": f"{BASE}/{slug}", "title": slug, "body_text": f"{slug} cold brew"}
+        for slug in ("latte", "mocha", "cortado")
+    ]
+    _, stored = extract_keywords_and_frequencies(corpus)
+    stored = stored.trimmed()
+    scraped = [
+        {"url": f"{BASE}/new", "title": "Cold brew", "body_text": "cold brew " * 5},
+        {"url": f"{BASE}/mocha", "title": "Mocha", "body_text": "mocha"},
+    ]
+
+    results, frequencies = extract_monitored_keywords(scraped, {f"{BASE}/mocha"}, stored)
+
+    assert [keyword for keyword, _ in results] == ["cold brew", "mocha"]
+    assert frequencies.num_docs == 4
+    assert extract_monitored_keywords(scraped, set(), None)[1] is None
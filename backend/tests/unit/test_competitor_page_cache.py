@@ -0,0 +1,177 @@
+"""
+Unit tests for the shared competitor page cache.
+
+Tests cover:
+- Round trip of extracted data and HTTP validators through Redis
+- Freshness window and conditional request headers
+- scrape_pages serving fresh entries without a request, reusing data on 304
+  and re-parsing (and re-caching) changed pages
+- Forced revalidation of fresh entries for pages known to have changed
+- Fail-open behaviour without Redis
+- Entries from an older cache version are misses
+"""
+
+import time
+
+import httpx
+import pytest
+
+from services import competitor_analyzer, competitor_page_cache
+from services.competitor_page_cache import PAGE_FRESH_FOR, CachedPage
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get():
+        return redis
+
+    monkeypatch.setattr(competitor_page_cache, "get_redis_text", _get)
+    return redis
+
+
+@pytest.fixture
+def offline_scraper(monkeypatch):
+    async def _safe(url):
+        return True
+
+    async def _inline_parse(fn, *args):
+        return fn(*args)
+
+    def _no_db():
+        raise RuntimeError("no database in unit tests")
+
+    monkeypatch.setattr(competitor_analyzer, "_is_safe_url", _safe)
+    monkeypatch.setattr(competitor_analyzer, "run_in_parse_pool", _inline_parse)
+    monkeypatch.setattr(competitor_analyzer, "async_session_maker", _no_db)
+
+
+def _html(title: str) -> str:
+    return f"<html><head><title>{title}</title></head><body><h1>{title}</h1><p>Body text</p></body></html>"
+
+
+def _page(title: str, fetched_at: float | None = None) -> CachedPage:
+    return CachedPage(
+        data={"title": title, "headings": [{"level": 1, "text": title}]},
+        etag='"v1"',
+        last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+        fetched_at=time.time() if fetched_at is None else fetched_at,
+    )
+
+
+def test_freshness_and_conditional_headers():
+    page = _page("A")
+
+    assert page.is_fresh()
+    assert not page.is_fresh(now=page.fetched_at + PAGE_FRESH_FOR + 1)
+    assert page.conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert CachedPage(data={}).conditional_headers() == {}
+
+
+@pytest.mark.asyncio
+async def test_round_trip(fake_redis):
+    await competitor_page_cache.set_cached_page("https://a.com/x", _page("A"))
+
+    cached = await competitor_page_cache.get_cached_page("https://a.com/x")
+    assert cached == _page("A", fetched_at=cached.fetched_at)
+    assert await competitor_page_cache.get_cached_page("https://a.com/y") is None
+
+
+@pytest.mark.asyncio
+async def test_older_cache_version_is_a_miss(fake_redis, monkeypatch):
+    current = competitor_page_cache.PAGE_CACHE_VERSION
+    monkeypatch.setattr(competitor_page_cache, "PAGE_CACHE_VERSION", current - 1)
+    await competitor_page_cache.set_cached_page("https://a.com/x", _page("A"))
+    monkeypatch.setattr(competitor_page_cache, "PAGE_CACHE_VERSION", current)
+
+    assert len(fake_redis.store) == 1
+    assert await competitor_page_cache.get_cached_page("https://a.com/x") is None
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis(monkeypatch):
+    async def _none():
+        return None
+
+    monkeypatch.setattr(competitor_page_cache, "get_redis_text", _none)
+    await competitor_page_cache.set_cached_page("https://a.com/x", _page("A"))
+
+    assert await competitor_page_cache.get_cached_page("https://a.com/x") is None
+
+
+@pytest.mark.asyncio
+async def test_scrape_pages_uses_and_revalidates_cache(fake_redis, offline_scraper):
+    stale = time.time() - PAGE_FRESH_FOR - 60
+    await competitor_page_cache.set_cached_page("https://a.com/fresh", _page("Fresh"))
+    await competitor_page_cache.set_cached_page("https://a.com/same", _page("Same", stale))
+    await competitor_page_cache.set_cached_page("https://a.com/changed", _page("Old", stale))
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/same":
+            assert request.headers["If-None-Match"] == '"v1"'
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"v2"'},
+            content=_html("New").encode(),
+        )
+
+    urls = ["https://a.com/fresh", "https://a.com/same", "https://a.com/changed"]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pages = await competitor_analyzer.scrape_pages(client, urls, 0.0, "analysis-1")
+
+    by_url = {p["url"]: p for p in pages}
+    assert by_url["https://a.com/fresh"]["title"] == "Fresh"
+    assert by_url["https://a.com/same"]["title"] == "Same"
+    assert by_url["https://a.com/changed"]["title"] == "New"
+    # The fresh entry never hit the network
+    assert sorted(r.url.path for r in requests) == ["/changed", "/same"]
+
+    changed = await competitor_page_cache.get_cached_page("https://a.com/changed")
+    assert changed.etag == '"v2"' and changed.is_fresh()
+    same = await competitor_page_cache.get_cached_page("https://a.com/same")
+    assert same.etag == '"v1"' and same.is_fresh()
+
+
+@pytest.mark.asyncio
+async def test_scrape_pages_revalidates_fresh_entries_on_request(fake_redis, offline_scraper):
+    await competitor_page_cache.set_cached_page("https://a.com/fresh", _page("Fresh"))
+    await competitor_page_cache.set_cached_page("https://a.com/edited", _page("Old"))
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"v2"'},
+            content=_html("Edited").encode(),
+        )
+
+    urls = ["https://a.com/fresh", "https://a.com/edited"]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pages = await competitor_analyzer.scrape_pages(
+            client, urls, 0.0, "analysis-1", revalidate={"https://a.com/edited"}
+        )
+
+    by_url = {p["url"]: p for p in pages}
+    assert by_url["https://a.com/fresh"]["title"] == "Fresh"
+    assert by_url["https://a.com/edited"]["title"] == "Edited"
+    assert [r.url.path for r in requests] == ["/edited"]
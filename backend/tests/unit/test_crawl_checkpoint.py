@@ -0,0 +1,170 @@
+"""
+Unit tests for site audit crawl checkpoints.
+
+Tests cover:
+- Checkpoint serialization round trip (frontier, hashed visited set, counters)
+- Save / load / clear through Redis
+- Audit leases excluding a second owner until released
+- Fail-open checkpoints without Redis; leases fall back to a database lock
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services import crawl_checkpoint
+from services.crawl_checkpoint import CrawlCheckpoint, url_key
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get():
+        return redis
+
+    monkeypatch.setattr(crawl_checkpoint, "get_redis_text", _get)
+    return redis
+
+
+class _FakeEngine:
+    """Postgres engine whose connections share one advisory-lock table."""
+
+    def __init__(self):
+        self.dialect = SimpleNamespace(name="postgresql")
+        self.locks: set[int] = set()
+
+    def connect(self):
+        return _FakeConnection(self.locks)
+
+
+class _FakeConnection:
+    def __init__(self, locks: set[int]):
+        self.locks = locks
+        self.closed = False
+
+    async def start(self):
+        return self
+
+    async def scalar(self, stmt):
+        fn = stmt.selected_columns[0]
+        lock_id = fn.clauses.clauses[0].value
+        if fn.name == "pg_try_advisory_lock":
+            if lock_id in self.locks:
+                return False
+            self.locks.add(lock_id)
+            return True
+        self.locks.discard(lock_id)
+        return True
+
+    async def commit(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def _get():
+        return None
+
+    monkeypatch.setattr(crawl_checkpoint, "get_redis_text", _get)
+    engine = _FakeEngine()
+    monkeypatch.setattr(crawl_checkpoint, "engine", engine)
+    return engine
+
+
+def _checkpoint() -> CrawlCheckpoint:
+    return CrawlCheckpoint(
+        pending=[(0, 0, "https://example.com"), (2, 7, "https://example.com/a")],
+        seen={url_key(f"https://example.com/{i}") for i in range(1000)},
+        discovered_order=7,
+        pages_discovered=1002,
+        pages_analyzed=42,
+        crawl_seconds=12.5,
+        has_sitemap=True,
+    )
+
+
+def test_url_key_is_stable_64_bit():
+    key = url_key("https://example.com/a")
+    assert key == url_key("https://example.com/a")
+    assert key != url_key("https://example.com/b")
+    assert 0 <= key < 2**64
+
+
+def test_round_trip():
+    checkpoint = _checkpoint()
+    restored = CrawlCheckpoint.loads(checkpoint.dumps())
+
+    assert restored == checkpoint
+
+
+def test_visited_set_is_compact():
+    # 8 bytes per visited URL before compression and base64
+    assert len(_checkpoint().dumps()) < 1000 * 8 * 1.5
+
+
+@pytest.mark.asyncio
+async def test_save_load_clear(fake_redis):
+    await crawl_checkpoint.save_checkpoint("a1", _checkpoint())
+
+    assert await crawl_checkpoint.load_checkpoint("a1") == _checkpoint()
+    assert await crawl_checkpoint.load_checkpoint("a2") is None
+
+    await crawl_checkpoint.clear_checkpoint("a1")
+    assert await crawl_checkpoint.load_checkpoint("a1") is None
+
+
+@pytest.mark.asyncio
+async def test_lease_excludes_second_owner(fake_redis):
+    async with crawl_checkpoint.audit_lease("a1") as owned:
+        assert owned
+        async with crawl_checkpoint.audit_lease("a1") as second:
+            assert not second
+
+    async with crawl_checkpoint.audit_lease("a1") as owned_again:
+        assert owned_again
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_fail_open_without_redis(no_redis):
+    await crawl_checkpoint.save_checkpoint("a1", _checkpoint())
+
+    assert await crawl_checkpoint.load_checkpoint("a1") is None
+
+
+@pytest.mark.asyncio
+async def test_lease_falls_back_to_database_lock_without_redis(no_redis):
+    async with crawl_checkpoint.audit_lease("a1") as owned:
+        assert owned
+        async with crawl_checkpoint.audit_lease("a1") as second:
+            assert not second
+        async with crawl_checkpoint.audit_lease("a2") as other_audit:
+            assert other_audit
+
+    assert no_redis.locks == set()
+    async with crawl_checkpoint.audit_lease("a1") as owned_again:
+        assert owned_again
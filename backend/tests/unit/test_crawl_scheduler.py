@@ -0,0 +1,139 @@
+"""
+Unit tests for the per-host crawl scheduler.
+
+Tests cover:
+- Additive concurrency increase on fast successful responses
+- Multiplicative decrease on 429/503 and transport errors
+- Retry-After pausing a host
+- robots.txt Crawl-delay pinning the request rate
+- Concurrency limit enforcement
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services import crawl_scheduler
+from services.crawl_scheduler import HostScheduler
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record scheduler sleeps instead of waiting them out."""
+    recorded: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def _sleep(delay):
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(crawl_scheduler.asyncio, "sleep", _sleep)
+    return recorded
+
+
+async def _request(
+    scheduler: HostScheduler,
+    host: str,
+    status: int | None,
+    elapsed: float = 0.1,
+    retry_after: str | None = None,
+) -> None:
+    async with scheduler.slot(host) as slot:
+        if status is not None:
+            slot.record(status, elapsed, retry_after)
+
+
+class TestHostScheduler:
+    async def test_successes_grow_concurrency(self, sleeps):
+        scheduler = HostScheduler()
+        start = scheduler.concurrency("a.com")
+
+        for _ in range(20):
+            await _request(scheduler, "a.com", 200)
+
+        assert scheduler.concurrency("a.com") > start
+        assert scheduler.rate("a.com") > crawl_scheduler.DEFAULT_HOST_RATE
+
+    async def test_overload_halves_limits(self, sleeps):
+        scheduler = HostScheduler()
+        for _ in range(20):
+            await _request(scheduler, "a.com", 200)
+        before = scheduler.concurrency("a.com")
+        rate_before = scheduler.rate("a.com")
+
+        await _request(scheduler, "a.com", 503)
+
+        assert scheduler.concurrency("a.com") <= max(1, before // 2 + 1)
+        assert scheduler.rate("a.com") == pytest.approx(rate_before / 2)
+
+    async def test_exception_counts_as_failure(self):
+        scheduler = HostScheduler()
+        rate_before = scheduler.rate("a.com")
+
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot("a.com"):
+                raise RuntimeError("boom")
+
+        assert scheduler.rate("a.com") < rate_before
+
+    async def test_hosts_are_independent(self):
+        scheduler = HostScheduler()
+        await _request(scheduler, "a.com", 429)
+
+        assert scheduler.rate("b.com") == crawl_scheduler.DEFAULT_HOST_RATE
+
+    async def test_slow_responses_back_off(self, sleeps):
+        scheduler = HostScheduler()
+        for _ in range(10):
+            await _request(scheduler, "a.com", 200, elapsed=0.3)
+        grown = scheduler.concurrency("a.com")
+
+        for _ in range(10):
+            await _request(scheduler, "a.com", 200, elapsed=5.0)
+
+        assert scheduler.concurrency("a.com") < grown
+
+    async def test_retry_after_pauses_host(self, sleeps):
+        scheduler = HostScheduler()
+
+        await _request(scheduler, "a.com", 429, retry_after="7")
+        await _request(scheduler, "a.com", 200)
+
+        assert sleeps == [pytest.approx(7, abs=0.5)]
+
+    async def test_crawl_delay_pins_rate(self):
+        scheduler = HostScheduler(crawl_delay=0.05)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await _request(scheduler, "a.com", 200)
+        elapsed = time.monotonic() - start
+
+        assert scheduler.rate("a.com") == pytest.approx(20.0)
+        assert elapsed >= 0.1  # first request is free, the rest wait ~50ms each
+
+    async def test_long_crawl_delay_is_not_clamped(self):
+        scheduler = HostScheduler(crawl_delay=30)
+
+        assert scheduler.rate("a.com") == pytest.approx(1 / 30)
+
+    async def test_concurrency_limit_is_enforced(self):
+        scheduler = HostScheduler(max_concurrency=2)
+        active = 0
+        peak = 0
+
+        async def _one():
+            nonlocal active, peak
+            async with scheduler.slot("a.com") as slot:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                slot.record(200, 0.01)
+
+        await asyncio.gather(*[_one() for _ in range(8)])
+
+        assert peak == 2
@@ -6,9 +6,11 @@ Tests cover:
 - Text extraction from various formats
 - Text chunking with overlap
 - Sentence boundary preservation
+- Content-defined boundaries: an early edit re-chunks only nearby text
 - Error handling
 """
 
+import random
 from unittest.mock import Mock, patch
 
 import pytest
@@ -170,6 +172,39 @@ class TestTextChunking:
         assert len(chunks) == 0 or all(not chunk.strip() for chunk in chunks)
 
 
+class TestContentDefinedChunking:
+    """Chunk boundaries depend on nearby text only."""
+
+    @staticmethod
+    def _sentences(rng: random.Random, n: int) -> list[str]:
+        vocab = [f"word{i}" for i in range(300)]
+        return [" ".join(rng.choice(vocab) for _ in range(rng.randint(5, 30))) + "." for _ in range(n)]
+
+    def test_chunks_cover_text_with_overlap(self):
+        processor = DocumentProcessor(chunk_size=1000, chunk_overlap=200)
+        text = " ".join(self._sentences(random.Random(1), 500))
+
+        chunks = processor.chunk_text(text)
+
+        assert len(chunks) > 10
+        assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert chunks[0].start_char == 0 and chunks[-1].end_char == len(text)
+        for prev, chunk in zip(chunks, chunks[1:], strict=False):
+            assert prev.end_char - 200 <= chunk.start_char < prev.end_char
+        assert all(len(c.content) <= 2200 for c in chunks)
+
+    def test_early_insert_changes_constant_chunks(self):
+        rng = random.Random(0)
+        processor = DocumentProcessor(chunk_size=1000, chunk_overlap=200)
+        sentences = self._sentences(rng, 1500)
+        before = [c.content for c in processor.chunk_text(" ".join(sentences))]
+        edited = sentences[:10] + self._sentences(rng, 1) + sentences[10:]
+        after = [c.content for c in processor.chunk_text(" ".join(edited))]
+
+        assert len(before) > 100
+        assert len(set(after) - set(before)) <= 2
+
+
 @pytest.mark.skip(
     reason="Tests written for earlier DocumentProcessor API; need rewrite to match current async API signatures"
 )
@@ -2,14 +2,19 @@
 Tests for Google Search Console OAuth adapter.
 """
 
+import asyncio
+import json
 from datetime import UTC, date, datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from urllib.parse import parse_qs, urlparse
 
+import httpx
 import pytest
 
+from adapters.search import gsc_adapter
 from adapters.search.gsc_adapter import (
     GSCAdapter,
+    GSCAPIError,
     GSCAuthError,
     GSCCredentials,
     GSCQuotaError,
@@ -17,6 +22,58 @@ from adapters.search.gsc_adapter import (
 )
 
 
+class _FakeGoogle:
+    """MockTransport handler answering token, sites, query and inspect calls."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.responses: dict[str, list] = {}
+
+    def respond(self, route: str, *responses) -> None:
+        """Queue responses for a route; the last one repeats."""
+        self.responses[route] = list(responses)
+
+    @staticmethod
+    def route(request: httpx.Request) -> str:
+        path = request.url.path
+        if request.url.host == "oauth2.googleapis.com":
+            return "token"
+        if path.endswith("/searchAnalytics/query"):
+            return "query"
+        if path.endswith("index:inspect"):
+            return "inspect"
+        return "sites"
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        queue = self.responses[self.route(request)]
+        response = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(response, Exception):
+            raise response
+        if callable(response):
+            return await response(request)
+        return response
+
+
+def _token_response(access_token: str) -> httpx.Response:
+    return httpx.Response(200, json={"access_token": access_token, "expires_in": 3600})
+
+
+def _rows_response(rows: list[tuple]) -> httpx.Response:
+    return httpx.Response(200, json={"rows": [
+        {"keys": keys, "clicks": clicks, "impressions": impressions, "ctr": ctr, "position": position}
+        for keys, clicks, impressions, ctr, position in rows
+    ]})
+
+
+@pytest.fixture
+def google(monkeypatch):
+    """Fake Google OAuth and Search Console API, with fresh token caches."""
+    monkeypatch.setattr(gsc_adapter, "_fresh_credentials", {})
+    monkeypatch.setattr(gsc_adapter, "_refresh_locks", {})
+    return _FakeGoogle()
+
+
 class TestGSCCredentials:
     """Tests for GSCCredentials dataclass."""
 
@@ -79,6 +136,16 @@ class TestGSCAdapter:
             redirect_uri="http://localhost:8000/callback",
         )
 
+    @pytest.fixture
+    def api_adapter(self, google):
+        """GSCAdapter whose HTTP calls are answered by the fake Google API."""
+        return GSCAdapter(
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            redirect_uri="http://localhost:8000/callback",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(google)),
+        )
+
     @pytest.fixture
     def mock_credentials(self):
         """Create mock credentials."""
@@ -147,87 +214,73 @@ class TestGSCAdapter:
         with pytest.raises(GSCAuthError, match="not configured"):
             adapter.get_authorization_url("test_state")
 
-    @patch("httpx.post")
-    def test_exchange_code_success(self, mock_post, adapter):
+    @pytest.mark.asyncio
+    async def test_exchange_code_success(self, google, api_adapter):
         """Test successful authorization code exchange."""
-        # Mock successful token response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        google.respond("token", httpx.Response(200, json={
             "access_token": "new_access_token",
             "refresh_token": "new_refresh_token",
             "expires_in": 3600,
             "token_type": "Bearer",
-        }
-        mock_post.return_value = mock_response
+        }))
 
-        credentials = adapter.exchange_code("test_auth_code")
+        credentials = await api_adapter.exchange_code("test_auth_code")
 
         assert credentials.access_token == "new_access_token"
         assert credentials.refresh_token == "new_refresh_token"
         assert credentials.site_url == ""  # Not set yet
 
         # Verify the token request was made correctly
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert call_args[0][0] == "https://oauth2.googleapis.com/token"
-        assert call_args[1]["data"]["code"] == "test_auth_code"
-        assert call_args[1]["data"]["client_id"] == "test_client_id"
-        assert call_args[1]["data"]["grant_type"] == "authorization_code"
-
-    @patch("httpx.post")
-    def test_exchange_code_http_error(self, mock_post, adapter):
+        assert len(google.requests) == 1
+        request = google.requests[0]
+        assert str(request.url) == "https://oauth2.googleapis.com/token"
+        form = parse_qs(request.content.decode())
+        assert form["code"] == ["test_auth_code"]
+        assert form["client_id"] == ["test_client_id"]
+        assert form["grant_type"] == ["authorization_code"]
+
+    @pytest.mark.asyncio
+    async def test_exchange_code_http_error(self, google, api_adapter):
         """Test authorization code exchange with HTTP error."""
-        import httpx
-
-        mock_post.side_effect = httpx.HTTPError("Connection failed")
+        google.respond("token", httpx.ConnectError("Connection failed"))
 
         with pytest.raises(GSCAuthError, match="Failed to exchange"):
-            adapter.exchange_code("test_auth_code")
+            await api_adapter.exchange_code("test_auth_code")
 
-    @patch("httpx.post")
-    def test_exchange_code_invalid_response(self, mock_post, adapter):
+    @pytest.mark.asyncio
+    async def test_exchange_code_invalid_response(self, google, api_adapter):
         """Test authorization code exchange with invalid response."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"invalid": "response"}
-        mock_post.return_value = mock_response
+        google.respond("token", httpx.Response(200, json={"invalid": "response"}))
 
         with pytest.raises(GSCAuthError, match="Invalid token response"):
-            adapter.exchange_code("test_auth_code")
+            await api_adapter.exchange_code("test_auth_code")
 
-    @patch("httpx.post")
-    def test_refresh_tokens_success(self, mock_post, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_refresh_tokens_success(self, google, api_adapter, mock_credentials):
         """Test successful token refresh."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "access_token": "refreshed_access_token",
-            "expires_in": 3600,
-            "token_type": "Bearer",
-        }
-        mock_post.return_value = mock_response
+        google.respond("token", _token_response("refreshed_access_token"))
 
-        new_credentials = adapter.refresh_tokens(mock_credentials)
+        new_credentials = await api_adapter.refresh_tokens(mock_credentials)
 
         assert new_credentials.access_token == "refreshed_access_token"
         assert new_credentials.refresh_token == "test_refresh_token"  # Kept
         assert new_credentials.site_url == "https://example.com"
 
         # Verify the refresh request
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert call_args[1]["data"]["refresh_token"] == "test_refresh_token"
-        assert call_args[1]["data"]["grant_type"] == "refresh_token"
+        form = parse_qs(google.requests[0].content.decode())
+        assert form["refresh_token"] == ["test_refresh_token"]
+        assert form["grant_type"] == ["refresh_token"]
 
-    @patch("httpx.post")
-    def test_refresh_tokens_http_error(self, mock_post, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_refresh_tokens_http_error(self, google, api_adapter, mock_credentials):
         """Test token refresh with HTTP error."""
-        import httpx
-
-        mock_post.side_effect = httpx.HTTPError("Connection failed")
+        google.respond("token", httpx.Response(400, json={"error": "invalid_grant"}))
 
         with pytest.raises(GSCAuthError, match="Failed to refresh"):
-            adapter.refresh_tokens(mock_credentials)
+            await api_adapter.refresh_tokens(mock_credentials)
 
-    def test_refresh_tokens_no_refresh_token(self, adapter):
+    @pytest.mark.asyncio
+    async def test_refresh_tokens_no_refresh_token(self, adapter):
         """Test token refresh fails without refresh token."""
         credentials = GSCCredentials(
             access_token="test_token",
@@ -237,138 +290,95 @@ class TestGSCAdapter:
         )
 
         with pytest.raises(GSCAuthError, match="No refresh token"):
-            adapter.refresh_tokens(credentials)
+            await adapter.refresh_tokens(credentials)
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_service(self, mock_creds_class, mock_build, adapter, mock_credentials):
-        """Test getting authenticated API service."""
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+    @pytest.mark.asyncio
+    async def test_expired_token_refreshed_before_request(self, google, api_adapter, expired_credentials):
+        """Test that expired tokens are refreshed before calling the API."""
+        google.respond("token", _token_response("refreshed_token"))
+        google.respond("sites", httpx.Response(200, json={"siteEntry": []}))
 
-        service, updated_creds = adapter._get_service(mock_credentials)
+        _, updated_creds = await api_adapter.list_sites(expired_credentials)
 
-        assert service == mock_service
-        assert updated_creds == mock_credentials
-
-        # Verify credentials were created correctly
-        mock_creds_class.assert_called_once_with(
-            token="test_access_token",
-            refresh_token="test_refresh_token",
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id="test_client_id",
-            client_secret="test_client_secret",
+        assert updated_creds.access_token == "refreshed_token"
+        assert [google.route(r) for r in google.requests] == ["token", "sites"]
+        assert google.requests[1].headers["Authorization"] == "Bearer refreshed_token"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_refresh(self, google, api_adapter, expired_credentials):
+        """Test that concurrent calls with the same stale token refresh it once."""
+        google.respond("token", _token_response("refreshed_token"))
+        google.respond("query", httpx.Response(200, json={"rows": []}))
+
+        await asyncio.gather(
+            api_adapter.get_keyword_rankings(expired_credentials, "https://example.com"),
+            api_adapter.get_page_performance(expired_credentials, "https://example.com"),
+            api_adapter.get_daily_stats(expired_credentials, "https://example.com"),
         )
 
-        # Verify service was built
-        mock_build.assert_called_once_with(
-            "searchconsole",
-            "v1",
-            credentials=mock_creds_class.return_value,
-            cache_discovery=False,
+        routes = [google.route(r) for r in google.requests]
+        assert routes.count("token") == 1
+        assert routes.count("query") == 3
+        assert all(
+            r.headers["Authorization"] == "Bearer refreshed_token"
+            for r in google.requests if google.route(r) == "query"
         )
 
-    @patch("httpx.post")
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_service_refreshes_expired_token(
-        self, mock_creds_class, mock_build, mock_post, adapter, expired_credentials
-    ):
-        """Test that expired tokens are refreshed when getting service."""
-        # Mock refresh response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "access_token": "refreshed_token",
-            "expires_in": 3600,
-        }
-        mock_post.return_value = mock_response
-
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+    @pytest.mark.asyncio
+    async def test_rejected_token_refreshed_and_retried(self, google, api_adapter, mock_credentials):
+        """Test that a 401 response triggers one refresh and retry."""
+        google.respond("token", _token_response("refreshed_token"))
+        google.respond(
+            "sites",
+            httpx.Response(401, json={"error": {"message": "Invalid Credentials"}}),
+            httpx.Response(200, json={"siteEntry": [{"siteUrl": "https://example.com"}]}),
+        )
 
-        service, updated_creds = adapter._get_service(expired_credentials)
+        sites, updated_creds = await api_adapter.list_sites(mock_credentials)
 
-        # Verify token was refreshed
-        mock_post.assert_called_once()
+        assert sites == [{"siteUrl": "https://example.com"}]
         assert updated_creds.access_token == "refreshed_token"
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_list_sites(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_list_sites(self, google, api_adapter, mock_credentials):
         """Test listing verified sites."""
-        # Mock API response
-        mock_service = Mock()
-        mock_sites_list = Mock()
-        mock_sites_list.execute.return_value = {
+        google.respond("sites", httpx.Response(200, json={
             "siteEntry": [
                 {"siteUrl": "https://example.com", "permissionLevel": "siteOwner"},
                 {"siteUrl": "https://example2.com", "permissionLevel": "siteFullUser"},
             ]
-        }
-        mock_service.sites.return_value.list.return_value = mock_sites_list
-        mock_build.return_value = mock_service
+        }))
 
-        sites, updated_creds = adapter.list_sites(mock_credentials)
+        sites, updated_creds = await api_adapter.list_sites(mock_credentials)
 
         assert len(sites) == 2
         assert sites[0]["siteUrl"] == "https://example.com"
         assert sites[1]["siteUrl"] == "https://example2.com"
+        assert updated_creds == mock_credentials
+        assert google.requests[0].headers["Authorization"] == "Bearer test_access_token"
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_list_sites_quota_error(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_list_sites_quota_error(self, google, api_adapter, mock_credentials):
         """Test quota error when listing sites."""
-        from googleapiclient.errors import HttpError
-
-        mock_service = Mock()
-        mock_response = Mock()
-        mock_response.status = 403
-        mock_service.sites.return_value.list.return_value.execute.side_effect = HttpError(
-            mock_response, b"Quota exceeded"
-        )
-        mock_build.return_value = mock_service
+        google.respond("sites", httpx.Response(403, json={"error": {"message": "Quota exceeded"}}))
 
         with pytest.raises(GSCQuotaError, match="quota exceeded"):
-            adapter.list_sites(mock_credentials)
+            await api_adapter.list_sites(mock_credentials)
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_search_analytics(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_search_analytics(self, google, api_adapter, mock_credentials):
         """Test fetching search analytics data."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["keyword1"],
-                    "clicks": 100,
-                    "impressions": 1000,
-                    "ctr": 0.1,
-                    "position": 5.5,
-                },
-                {
-                    "keys": ["keyword2"],
-                    "clicks": 50,
-                    "impressions": 500,
-                    "ctr": 0.1,
-                    "position": 7.2,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
-
-        start_date = date(2024, 1, 1)
-        end_date = date(2024, 1, 31)
-        dimensions = ["query"]
+        google.respond("query", _rows_response([
+            (["keyword1"], 100, 1000, 0.1, 5.5),
+            (["keyword2"], 50, 500, 0.1, 7.2),
+        ]))
 
-        rows = adapter.get_search_analytics(
+        rows = await api_adapter.get_search_analytics(
             credentials=mock_credentials,
-            site_url="https://example.com",
-            start_date=start_date,
-            end_date=end_date,
-            dimensions=dimensions,
+            site_url="https://example.com/",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+            dimensions=["query"],
             row_limit=1000,
         )
 
@@ -378,46 +388,109 @@ class TestGSCAdapter:
         assert rows[1]["keys"] == ["keyword2"]
 
         # Verify API was called correctly
-        mock_service.searchanalytics.return_value.query.assert_called_once_with(
-            siteUrl="https://example.com",
-            body={
-                "startDate": "2024-01-01",
-                "endDate": "2024-01-31",
-                "dimensions": ["query"],
-                "rowLimit": 1000,
-                "startRow": 0,
-            },
+        request = google.requests[0]
+        assert request.url.raw_path == (
+            b"/webmasters/v3/sites/https%3A%2F%2Fexample.com%2F/searchAnalytics/query"
         )
+        assert json.loads(request.content) == {
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-31",
+            "dimensions": ["query"],
+            "rowLimit": 1000,
+            "startRow": 0,
+        }
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_keyword_rankings(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_search_analytics_api_error(self, google, api_adapter, mock_credentials):
+        """Test API errors are raised as GSCAPIError."""
+        google.respond("query", httpx.Response(500, json={"error": {"message": "Backend Error"}}))
+
+        with pytest.raises(GSCAPIError, match="Backend Error"):
+            await api_adapter.get_search_analytics(
+                mock_credentials, "https://example.com", date(2024, 1, 1), date(2024, 1, 31), ["query"]
+            )
+
+    @pytest.mark.asyncio
+    async def test_iter_search_analytics_walks_start_row(self, google, api_adapter, mock_credentials):
+        """Test that pagination continues until a short page."""
+        total = 7
+
+        async def paged(request):
+            body = json.loads(request.content)
+            start, limit = body["startRow"], body["rowLimit"]
+            keys = range(start, min(start + limit, total))
+            return _rows_response([([f"kw{i}"], 1, 10, 0.1, 3.0) for i in keys])
+
+        google.respond("query", paged)
+
+        batches = [
+            batch async for batch in api_adapter.iter_search_analytics(
+                mock_credentials, "https://example.com", date(2024, 1, 1), date(2024, 1, 31),
+                ["query"], page_size=3,
+            )
+        ]
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert [row["keys"][0] for b in batches for row in b] == [f"kw{i}" for i in range(total)]
+        assert [json.loads(r.content)["startRow"] for r in google.requests] == [0, 3, 6]
+
+    @pytest.mark.asyncio
+    async def test_iter_search_analytics_exact_multiple(self, google, api_adapter, mock_credentials):
+        """Test that a final empty page ends the stream without an empty batch."""
+        google.respond(
+            "query",
+            _rows_response([(["a"], 1, 1, 1.0, 1.0), (["b"], 1, 1, 1.0, 1.0)]),
+            _rows_response([]),
+        )
+
+        batches = [
+            batch async for batch in api_adapter.iter_search_analytics(
+                mock_credentials, "https://example.com", date(2024, 1, 1), date(2024, 1, 31),
+                ["page"], page_size=2,
+            )
+        ]
+
+        assert [len(b) for b in batches] == [2]
+        assert len(google.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_analytics_acquires_quota(self, google, mock_credentials):
+        """Test that every search analytics page waits on the quota governor."""
+
+        class _Governor:
+            def __init__(self):
+                self.sites: list[str] = []
+
+            async def acquire(self, site_url):
+                self.sites.append(site_url)
+
+        governor = _Governor()
+        adapter = GSCAdapter(
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            redirect_uri="http://localhost:8000/callback",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(google)),
+            quota_governor=governor,
+        )
+        google.respond("query", _rows_response([(["a"], 1, 1, 1.0, 1.0)] * 2), _rows_response([]))
+
+        async for _ in adapter.iter_search_analytics(
+            mock_credentials, "https://example.com", date(2024, 1, 1), date(2024, 1, 31),
+            ["date", "query"], page_size=2,
+        ):
+            pass
+
+        assert governor.sites == ["https://example.com"] * 2
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_rankings(self, google, api_adapter, mock_credentials):
         """Test getting keyword rankings."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["keyword1"],
-                    "clicks": 100,
-                    "impressions": 1000,
-                    "ctr": 0.1,
-                    "position": 5.5,
-                },
-                {
-                    "keys": ["keyword2"],
-                    "clicks": 150,  # Higher clicks
-                    "impressions": 800,
-                    "ctr": 0.1875,
-                    "position": 3.2,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
+        google.respond("query", _rows_response([
+            (["keyword1"], 100, 1000, 0.1, 5.5),
+            (["keyword2"], 150, 800, 0.1875, 3.2),  # Higher clicks
+        ]))
 
-        keywords = adapter.get_keyword_rankings(
+        keywords = await api_adapter.get_keyword_rankings(
             credentials=mock_credentials,
             site_url="https://example.com",
             days=28,
@@ -430,35 +503,15 @@ class TestGSCAdapter:
         assert keywords[1]["query"] == "keyword1"
         assert keywords[1]["clicks"] == 100
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_page_performance(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_page_performance(self, google, api_adapter, mock_credentials):
         """Test getting page-level performance."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["https://example.com/page1"],
-                    "clicks": 200,
-                    "impressions": 2000,
-                    "ctr": 0.1,
-                    "position": 4.0,
-                },
-                {
-                    "keys": ["https://example.com/page2"],
-                    "clicks": 50,
-                    "impressions": 500,
-                    "ctr": 0.1,
-                    "position": 8.5,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
+        google.respond("query", _rows_response([
+            (["https://example.com/page1"], 200, 2000, 0.1, 4.0),
+            (["https://example.com/page2"], 50, 500, 0.1, 8.5),
+        ]))
 
-        pages = adapter.get_page_performance(
+        pages = await api_adapter.get_page_performance(
             credentials=mock_credentials,
             site_url="https://example.com",
             days=28,
@@ -470,35 +523,15 @@ class TestGSCAdapter:
         assert pages[0]["clicks"] == 200
         assert pages[1]["page"] == "https://example.com/page2"
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_daily_stats(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_daily_stats(self, google, api_adapter, mock_credentials):
         """Test getting daily aggregated statistics."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["2024-01-02"],
-                    "clicks": 150,
-                    "impressions": 1500,
-                    "ctr": 0.1,
-                    "position": 6.0,
-                },
-                {
-                    "keys": ["2024-01-01"],
-                    "clicks": 100,
-                    "impressions": 1000,
-                    "ctr": 0.1,
-                    "position": 5.5,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
+        google.respond("query", _rows_response([
+            (["2024-01-02"], 150, 1500, 0.1, 6.0),
+            (["2024-01-01"], 100, 1000, 0.1, 5.5),
+        ]))
 
-        daily_stats = adapter.get_daily_stats(
+        daily_stats = await api_adapter.get_daily_stats(
             credentials=mock_credentials,
             site_url="https://example.com",
             days=7,
@@ -509,42 +542,16 @@ class TestGSCAdapter:
         assert daily_stats[0]["date"] == "2024-01-01"
         assert daily_stats[1]["date"] == "2024-01-02"
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_device_breakdown(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_device_breakdown(self, google, api_adapter, mock_credentials):
         """Test getting device breakdown."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["MOBILE"],
-                    "clicks": 500,
-                    "impressions": 5000,
-                    "ctr": 0.1,
-                    "position": 5.0,
-                },
-                {
-                    "keys": ["DESKTOP"],
-                    "clicks": 300,
-                    "impressions": 3000,
-                    "ctr": 0.1,
-                    "position": 6.0,
-                },
-                {
-                    "keys": ["TABLET"],
-                    "clicks": 50,
-                    "impressions": 500,
-                    "ctr": 0.1,
-                    "position": 7.0,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
+        google.respond("query", _rows_response([
+            (["MOBILE"], 500, 5000, 0.1, 5.0),
+            (["DESKTOP"], 300, 3000, 0.1, 6.0),
+            (["TABLET"], 50, 500, 0.1, 7.0),
+        ]))
 
-        devices = adapter.get_device_breakdown(
+        devices = await api_adapter.get_device_breakdown(
             credentials=mock_credentials,
             site_url="https://example.com",
             days=28,
@@ -555,35 +562,15 @@ class TestGSCAdapter:
         assert devices[1]["device"] == "DESKTOP"
         assert devices[2]["device"] == "TABLET"
 
-    @patch("adapters.search.gsc_adapter.build")
-    @patch("adapters.search.gsc_adapter.Credentials")
-    def test_get_country_breakdown(self, mock_creds_class, mock_build, adapter, mock_credentials):
+    @pytest.mark.asyncio
+    async def test_get_country_breakdown(self, google, api_adapter, mock_credentials):
         """Test getting country breakdown."""
-        # Mock API response
-        mock_service = Mock()
-        mock_query = Mock()
-        mock_query.execute.return_value = {
-            "rows": [
-                {
-                    "keys": ["usa"],
-                    "clicks": 800,
-                    "impressions": 8000,
-                    "ctr": 0.1,
-                    "position": 5.0,
-                },
-                {
-                    "keys": ["gbr"],
-                    "clicks": 200,
-                    "impressions": 2000,
-                    "ctr": 0.1,
-                    "position": 6.0,
-                },
-            ]
-        }
-        mock_service.searchanalytics.return_value.query.return_value = mock_query
-        mock_build.return_value = mock_service
+        google.respond("query", _rows_response([
+            (["usa"], 800, 8000, 0.1, 5.0),
+            (["gbr"], 200, 2000, 0.1, 6.0),
+        ]))
 
-        countries = adapter.get_country_breakdown(
+        countries = await api_adapter.get_country_breakdown(
             credentials=mock_credentials,
             site_url="https://example.com",
             days=28,
@@ -596,6 +583,68 @@ class TestGSCAdapter:
         assert countries[0]["clicks"] == 800
         assert countries[1]["country"] == "gbr"
 
+    @pytest.mark.asyncio
+    async def test_dimension_queries_run_concurrently(self, google, mock_credentials):
+        """Test that dimension queries overlap, bounded by max_concurrency."""
+        in_flight = peak = 0
+
+        async def slow_query(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return _rows_response([])
+
+        google.respond("query", slow_query)
+        adapter = GSCAdapter(
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            redirect_uri="http://localhost:8000/callback",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(google)),
+            max_concurrency=3,
+        )
+
+        await asyncio.gather(
+            adapter.get_keyword_rankings(mock_credentials, "https://example.com"),
+            adapter.get_page_performance(mock_credentials, "https://example.com"),
+            adapter.get_daily_stats(mock_credentials, "https://example.com"),
+            adapter.get_device_breakdown(mock_credentials, "https://example.com"),
+            adapter.get_country_breakdown(mock_credentials, "https://example.com"),
+        )
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_inspect_url(self, google, api_adapter, mock_credentials):
+        """Test URL inspection result mapping."""
+        google.respond("inspect", httpx.Response(200, json={
+            "inspectionResult": {
+                "indexStatusResult": {"verdict": "PASS", "coverageState": "Submitted and indexed"},
+                "mobileUsabilityResult": {"verdict": "PASS"},
+            }
+        }))
+
+        result, _ = await api_adapter.inspect_url(
+            mock_credentials, "https://example.com/post", "https://example.com/"
+        )
+
+        assert result["verdict"] == "PASS"
+        assert result["coverage_state"] == "Submitted and indexed"
+        assert result["rich_results_verdict"] == "VERDICT_UNSPECIFIED"
+        assert json.loads(google.requests[0].content) == {
+            "inspectionUrl": "https://example.com/post",
+            "siteUrl": "https://example.com/",
+        }
+
+    @pytest.mark.asyncio
+    async def test_inspect_url_rate_limited(self, google, api_adapter, mock_credentials):
+        """Test URL inspection rate limiting."""
+        google.respond("inspect", httpx.Response(429))
+
+        with pytest.raises(GSCQuotaError, match="rate limited"):
+            await api_adapter.inspect_url(mock_credentials, "https://example.com/post", "https://example.com/")
+
     def test_create_gsc_adapter_factory(self):
         """Test factory function for creating adapter."""
         adapter = create_gsc_adapter(
@@ -0,0 +1,139 @@
+"""
+Unit tests for the Google Search Console quota governor.
+
+Tests cover:
+- Requests within the per-site and per-project budgets go straight through
+- A spent budget waits for the next one-minute window
+- Site cooldowns after quota errors
+- Failing open without Redis
+"""
+
+import pytest
+
+from services import gsc_quota
+from services.gsc_quota import GSCQuotaGovernor
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key))
+
+    async def execute(self):
+        results = []
+        for op, key in self.ops:
+            if op == "incr":
+                self.redis.store[key] = self.redis.store.get(key, 0) + 1
+                results.append(self.redis.store[key])
+            else:
+                results.append(True)
+        return results
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_020.0
+        self.sleeps: list[float] = []
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get():
+        return redis
+
+    monkeypatch.setattr(gsc_quota, "get_redis_text", _get)
+    return redis
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(gsc_quota.time, "time", clock.time)
+    monkeypatch.setattr(gsc_quota.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_next_window(fake_redis, clock):
+    governor = GSCQuotaGovernor(site_qpm=2, project_qpm=100)
+
+    for _ in range(3):
+        await governor.acquire("https://a.example/")
+
+    assert len(clock.sleeps) == 1
+    assert int(clock.now // 60) == 1_000_020 // 60 + 1
+    # Other sites share only the project budget
+    await governor.acquire("https://b.example/")
+    assert len(clock.sleeps) == 1
+
+
+@pytest.mark.asyncio
+async def test_project_budget_spans_sites(fake_redis, clock):
+    governor = GSCQuotaGovernor(site_qpm=100, project_qpm=2)
+
+    for site in ("https://a.example/", "https://b.example/", "https://c.example/"):
+        await governor.acquire(site)
+
+    assert len(clock.sleeps) == 1
+
+
+@pytest.mark.asyncio
+async def test_cooldown(fake_redis):
+    governor = GSCQuotaGovernor()
+
+    assert await governor.cooldown_remaining("https://a.example/") == 0
+    await governor.cool_down("https://a.example/", seconds=600)
+
+    assert await governor.cooldown_remaining("https://a.example/") == 600
+    assert await governor.cooldown_remaining("https://b.example/") == 0
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis(monkeypatch, clock):
+    async def _none():
+        return None
+
+    monkeypatch.setattr(gsc_quota, "get_redis_text", _none)
+    governor = GSCQuotaGovernor(site_qpm=0, project_qpm=0)
+
+    await governor.acquire("https://a.example/")
+
+    assert clock.sleeps == []
+    assert await governor.cooldown_remaining("https://a.example/") == 0
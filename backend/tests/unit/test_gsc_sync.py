@@ -0,0 +1,303 @@
+"""
+Unit tests for the streaming Google Search Console sync.
+
+Tests cover:
+- Incremental sync windows: backfill, days since the last sync, resync overlap
+- Every page of per-day keyword and page rows is upserted and committed as it arrives
+- The keyword and page streams run concurrently
+- The window's keyword and page rows are upserted, then rows the sync did not
+  touch are deleted and the rollups rebuilt
+- A failed or cancelled sync keeps the stored rows and rebuilds rollups for
+  the committed pages
+- Progress is reported after every page
+- Each page is written as one multi-row upsert
+- Page URLs are stored without query strings
+- Scheduled syncs put a site on cooldown after a quota error
+- Manual syncs are handed to the scheduler
+"""
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from adapters.search.gsc_adapter import GSCCredentials, GSCQuotaError
+from services import gsc_sync
+from services.gsc_sync import (
+    BACKFILL_DAYS,
+    GSC_DATA_LAG_DAYS,
+    strip_query_from_url,
+    sync_search_analytics,
+    sync_window,
+)
+
+
+class _FakeAdapter:
+    """Serves *pages* of rows per dimension after ``date``."""
+
+    def __init__(self, pages: dict[str, list[list[dict]]], daily: list[dict]):
+        self.pages = pages
+        self.daily = daily
+        self.requests = []
+
+    async def iter_search_analytics(self, credentials, site_url, start_date, end_date, dimensions):
+        self.requests.append((start_date, end_date, dimensions))
+        for batch in self.pages[dimensions[1]]:
+            yield batch
+
+    async def get_search_analytics(self, credentials, site_url, start_date, end_date, dimensions, row_limit):
+        self.requests.append((start_date, end_date, dimensions))
+        return self.daily
+
+
+class _FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def scalar(self, stmt):
+        return datetime(2024, 1, 5, tzinfo=UTC)
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """One fake session, also handed to the streams as their own sessions."""
+    session = _FakeSession()
+    monkeypatch.setattr(gsc_sync, "async_session_maker", lambda: session)
+    return session
+
+
+def _rows(prefix: str, n: int, day: str = "2024-01-01") -> list[dict]:
+    return [
+        {"keys": [day, f"{prefix}{i}"], "clicks": i, "impressions": 10 * i, "ctr": 0.1, "position": 2.0}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def credentials():
+    return GSCCredentials(
+        access_token="token",
+        refresh_token="refresh",
+        token_expiry=datetime.now(UTC) + timedelta(hours=1),
+        site_url="https://example.com/",
+    )
+
+
+def test_strip_query_from_url():
+    assert strip_query_from_url("https://example.com/a?utm=1#top") == "https://example.com/a"
+
+
+def test_sync_window():
+    today = date(2024, 3, 31)
+    newest = today - timedelta(days=GSC_DATA_LAG_DAYS)
+
+    # Never synced: backfill
+    assert sync_window(None, today) == (newest - timedelta(days=BACKFILL_DAYS - 1), newest)
+    # Synced two days ago: the new days plus the trailing day of the last sync
+    last = datetime(2024, 3, 29, 6, tzinfo=UTC)
+    assert sync_window(last, today) == (date(2024, 3, 25), newest)
+    # Synced earlier today: only the resync overlap
+    assert sync_window(datetime(2024, 3, 31, tzinfo=UTC), today) == (newest - timedelta(days=1), newest)
+    # Synced long ago: capped at the backfill window
+    assert sync_window(datetime(2023, 1, 1, tzinfo=UTC), today)[0] == sync_window(None, today)[0]
+
+
+@pytest.mark.asyncio
+async def test_sync_streams_every_page(credentials, db):
+    adapter = _FakeAdapter(
+        pages={
+            "query": [_rows("kw", 3), _rows("kw", 3), _rows("kw", 1)],
+            "page": [_rows("https://example.com/p?x=", 2)],
+        },
+        daily=[{"keys": ["2024-01-01"], "clicks": 1, "impressions": 2, "ctr": 0.5, "position": 1.0}],
+    )
+    reports = []
+
+    progress = await sync_search_analytics(
+        db, adapter, credentials, user_id="u1", site_url="https://example.com/",
+        on_progress=lambda p: reports.append((p.keywords, p.pages, p.days)),
+    )
+
+    assert (progress.keywords, progress.pages, progress.days) == (7, 2, 1)
+    assert reports == [(3, 0, 0), (6, 0, 0), (7, 0, 0), (7, 2, 0), (7, 2, 1)]
+    # The sync start time, every page, then the sweep and rollups
+    assert db.commits == 6
+    assert sorted(dims for _, _, dims in adapter.requests) == [["date"], ["date", "page"], ["date", "query"]]
+    # One multi-row upsert per page of rows, then the rows left untouched are deleted
+    assert [(type(s).__name__, s.table.name) for s in db.statements] == (
+        [("Insert", "keyword_rankings")] * 3
+        + [("Insert", "page_performances"), ("Insert", "daily_analytics")]
+        + [("Delete", "keyword_rankings"), ("Delete", "page_performances")]
+        # then the window's weekly and monthly rollups are rebuilt
+        + [
+            (kind, table)
+            for table in ("keyword_ranking_rollups", "page_performance_rollups", "daily_analytics_rollups")
+            for kind in ("Delete", "Insert")
+        ]
+        * 2
+    )
+    keyword_params = db.statements[0].compile(dialect=postgresql.dialect()).params
+    assert keyword_params["date_m0"] == date(2024, 1, 1)
+    # Stripped page URLs collapse to one row
+    page_params = db.statements[3].compile(dialect=postgresql.dialect()).params
+    assert {v for k, v in page_params.items() if k.startswith("page_url")} == {"https://example.com/p"}
+
+    sweep = db.statements[5].compile(dialect=postgresql.dialect()).params
+    assert sweep["updated_at_1"] == datetime(2024, 1, 5, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_rows_and_refreshes_rollups(credentials, db):
+    class _FailingAdapter(_FakeAdapter):
+        async def iter_search_analytics(self, credentials, site_url, start_date, end_date, dimensions):
+            if dimensions[1] == "query":
+                yield _rows("kw", 2)
+                raise GSCQuotaError("quota exceeded")
+
+    adapter = _FailingAdapter(pages={}, daily=[])
+
+    with pytest.raises(GSCQuotaError):
+        await sync_search_analytics(
+            db, adapter, credentials, user_id="u1", site_url="https://example.com/"
+        )
+
+    kinds = [(type(s).__name__, s.table.name) for s in db.statements]
+    # Nothing stored is deleted; the committed page is rolled up
+    assert kinds[0] == ("Insert", "keyword_rankings")
+    assert ("Delete", "keyword_rankings") not in kinds
+    assert [table for kind, table in kinds[1:] if kind == "Insert"] == [
+        "keyword_ranking_rollups", "page_performance_rollups", "daily_analytics_rollups",
+    ] * 2
+    assert db.rollbacks == 1 and db.commits == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sync_refreshes_rollups(credentials, db):
+    stalled = asyncio.Event()
+
+    class _StallingAdapter(_FakeAdapter):
+        async def iter_search_analytics(self, credentials, site_url, start_date, end_date, dimensions):
+            if dimensions[1] == "query":
+                yield _rows("kw", 2)
+                stalled.set()
+                await asyncio.Event().wait()
+
+    sync = asyncio.ensure_future(sync_search_analytics(
+        db, _StallingAdapter(pages={}, daily=[]), credentials,
+        user_id="u1", site_url="https://example.com/",
+    ))
+    await stalled.wait()
+    sync.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await sync
+
+    kinds = [(type(s).__name__, s.table.name) for s in db.statements]
+    assert ("Delete", "keyword_rankings") not in kinds
+    assert ("Insert", "keyword_ranking_rollups") in kinds
+    assert db.rollbacks == 1 and db.commits == 3
+
+
+@pytest.mark.asyncio
+async def test_keyword_and_page_streams_run_concurrently(credentials, db):
+    pages_started = asyncio.Event()
+
+    class _InterleavedAdapter(_FakeAdapter):
+        async def iter_search_analytics(self, credentials, site_url, start_date, end_date, dimensions):
+            if dimensions[1] == "query":
+                # Only finishes if the page stream runs meanwhile
+                await asyncio.wait_for(pages_started.wait(), timeout=1)
+                yield _rows("kw", 1)
+            else:
+                pages_started.set()
+                yield _rows("https://example.com/p", 1)
+
+    progress = await sync_search_analytics(
+        db, _InterleavedAdapter(pages={}, daily=[]), credentials,
+        user_id="u1", site_url="https://example.com/",
+    )
+
+    assert (progress.keywords, progress.pages) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_request_sync_makes_connection_due():
+    connection = SimpleNamespace(next_sync_at=datetime.now(UTC) + timedelta(hours=20))
+    db = _FakeSession()
+
+    requested_at = await gsc_sync.request_sync(db, connection)
+
+    assert connection.next_sync_at == requested_at <= datetime.now(UTC)
+    assert db.commits == 1
+
+@pytest.mark.asyncio
+async def test_scheduled_sync_cools_down_on_quota_error(monkeypatch):
+    connection = gsc_sync.GSCConnection(
+        id="c1", user_id="u1", site_url="https://example.com/", is_active=True, last_sync=None
+    )
+
+    class _Session:
+        def __init__(self):
+            self.rolled_back = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def get(self, model, ident):
+            return connection
+
+        async def rollback(self):
+            self.rolled_back = True
+
+        async def commit(self):
+            pass
+
+    class _Governor:
+        def __init__(self):
+            self.cooled = []
+
+        async def cooldown_remaining(self, site_url):
+            return 0
+
+        async def cool_down(self, site_url):
+            self.cooled.append(site_url)
+
+    async def _load_credentials(db, conn, adapter):
+        return None
+
+    async def _sync(*args, **kwargs):
+        raise GSCQuotaError("quota")
+
+    session = _Session()
+    governor = _Governor()
+    monkeypatch.setattr(gsc_sync, "async_session_maker", lambda: session)
+    monkeypatch.setattr(gsc_sync, "gsc_quota_governor", governor)
+    monkeypatch.setattr(gsc_sync, "load_credentials", _load_credentials)
+    monkeypatch.setattr(gsc_sync, "sync_search_analytics", _sync)
+
+    assert await gsc_sync.sync_connection("c1") is None
+    assert session.rolled_back
+    assert governor.cooled == ["https://example.com/"]
+    assert connection.last_sync is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for vectorized competitor keyword extraction.
+
+Tests cover:
+- Tokenization (punctuation, stop words, single characters)
+- Positional field weighting and the phrase-length bonus
+- Numeric-only phrases and phrases across field boundaries being ignored
+- First-seen phrase winning ties
+- Body TF-IDF boost, applied only with enough documents
+- Body document frequencies: IDF context for later pages, trimming, packing
+"""
+
+import numpy as np
+
+from services.keyword_extraction import (
+    DocumentFrequencies,
+    extract_keywords_and_frequencies,
+    extract_keywords_with_tfidf,
+    tokenize,
+)
+
+
+def _page(title: str, body: str = "", **extra) -> dict:
+    return {"title": title, "body_text": body, **extra}
+
+
+def test_tokenize():
+    assert tokenize("The Best SEO-Tips, for 2024!") == ["seo-tips", "2024"]
+    assert tokenize("a b c") == []
+
+
+def test_title_phrase_gets_length_bonus():
+    [(keyword, confidence)] = extract_keywords_with_tfidf([_page("Keyword Research Guide")])
+
+    # Every 1-3 word phrase scores 3.0 from the title; 2-3 word phrases get the bonus
+    assert keyword == "keyword research"
+    assert confidence == round(3.0 * 1.3 / (10.0 * 1.3), 3)
+
+
+def test_fields_combine_and_heavier_fields_win():
+    page = _page(
+        "Sourdough starter",
+        headings=[{"level": 1, "text": "Sourdough starter"}, {"level": 2, "text": "Feeding schedule"}],
+        url_slug="feeding-schedule",
+    )
+
+    [(keyword, _confidence)] = extract_keywords_with_tfidf([page])
+
+    assert keyword == "sourdough starter"
+
+
+def test_numeric_phrases_and_field_boundaries_ignored():
+    page = _page("2024 10-12", meta_description="Espresso")
+
+    [(keyword, _confidence)] = extract_keywords_with_tfidf([page])
+
+    assert keyword == "espresso"
+
+
+def test_empty_pages():
+    assert extract_keywords_with_tfidf([{}, _page("The and of")]) == [(None, 0.0), (None, 0.0)]
+    assert extract_keywords_with_tfidf([]) == []
+
+
+def test_body_tfidf_boost_needs_enough_documents():
+    pages = [
+        _page("Cold brew", body="cold brew " * 20),
+        _page("Latte art", body="milk foam"),
+        _page("Pour over", body="filter paper"),
+    ]
+
+    boosted = extract_keywords_with_tfidf(pages)
+    positional = extract_keywords_with_tfidf(pages[:2])
+
+    assert boosted[0][0] == positional[0][0] == "cold brew"
+    assert boosted[0][1] > positional[0][1]
+    # Keywords missing from their own body are not boosted
+    assert boosted[1] == positional[1]
+
+
+def test_idf_context_scores_few_pages_against_the_full_corpus():
+    corpus = [
+        _page("Latte art", body="milk foam cold brew"),
+        _page("Pour over", body="filter paper"),
+        _page("French press", body="coarse grind"),
+    ]
+    new_page = _page("Cold brew", body="cold brew " * 20)
+    _, frequencies = extract_keywords_and_frequencies(corpus)
+
+    [alone] = extract_keywords_with_tfidf([new_page])
+    [in_context] = extract_keywords_with_tfidf([new_page], frequencies)
+    [together] = extract_keywords_with_tfidf(corpus + [new_page])[3:]
+
+    assert frequencies.num_docs == 3
+    assert alone[0] == in_context[0] == "cold brew"
+    assert in_context[1] > alone[1]
+    assert in_context == together
+
+
+def test_document_frequencies_trim_and_round_trip():
+    pages = [_page("Espresso", body="crema shot"), _page("Ristretto", body="crema")]
+    _, frequencies = extract_keywords_and_frequencies(pages)
+
+    trimmed = frequencies.trimmed()
+    merged = trimmed.merge(frequencies)
+    restored = DocumentFrequencies.unpack(merged.pack())
+
+    # "crema", "shot", "crema shot"; only "crema" is in more than one body
+    assert len(frequencies.keys) == 3 and len(trimmed.keys) == 1
+    assert merged.num_docs == 4
+    assert restored.num_docs == 4
+    assert np.array_equal(restored.keys, merged.keys)
+    assert restored.lookup(merged.keys).tolist() == [4]
+    assert restored.lookup(np.asarray([1], dtype=np.uint64)).tolist() == [0]
+    assert DocumentFrequencies.unpack(None) is None
@@ -0,0 +1,193 @@
+"""
+Unit tests for near-variant keyword gap matching.
+
+Tests cover:
+- Stemming and order-insensitive normalized keyword forms
+- Batched cosine similarity
+- find_uncovered: normalized matches, embedding matches above the threshold,
+  fallback without an embedding API key or on API errors
+- Embedding and gap result caching through Redis
+- Thousands of keywords matched in well under a second
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from adapters.knowledge.embedding_service import EmbeddingError
+from services import keyword_matching
+from services.keyword_matching import best_similarity, find_uncovered, normalize_keyword, stem
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.ops.append((key, value))
+
+    async def execute(self):
+        for key, value in self.ops:
+            self.redis.store[key] = value
+
+
+class _FakeEmbeddings:
+    """Embeds each text as a fixed unit vector per topic word, or a random one."""
+
+    model = "test-embedding"
+    api_key = "test-key"
+
+    def __init__(self, topics: dict[str, list[float]]):
+        self.topics = topics
+        self.calls: list[list[str]] = []
+        self.fail = False
+
+    async def embed_texts(self, texts):
+        if self.fail:
+            raise EmbeddingError("boom")
+        self.calls.append(list(texts))
+        rng = np.random.default_rng(len(self.calls))
+        return [
+            next((v for word, v in self.topics.items() if word in t), None)
+            or list(rng.standard_normal(3))
+            for t in texts
+        ]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get():
+        return redis
+
+    monkeypatch.setattr(keyword_matching, "get_redis_text", _get)
+    return redis
+
+
+@pytest.fixture
+def embeddings(monkeypatch, fake_redis):
+    fake = _FakeEmbeddings({"espresso": [1.0, 0.0, 0.0], "coffee": [0.99, 0.1, 0.0], "tea": [0.0, 0.0, 1.0]})
+    monkeypatch.setattr(keyword_matching, "embedding_service", fake)
+    return fake
+
+
+def test_stem_inflections():
+    assert stem("guides") == stem("guide")
+    assert stem("running") == stem("run")
+    assert stem("studies") == stem("study")
+    assert stem("matches") == stem("match")
+    assert stem("class") == "class"
+
+
+def test_normalize_keyword_is_token_set():
+    assert normalize_keyword("Best Running Shoes") == normalize_keyword("shoes for running")
+    assert normalize_keyword("running shoe") == "run shoe"
+    # Stop-word-only keywords keep their own text rather than matching each other
+    assert normalize_keyword("How To") != normalize_keyword("what is")
+
+
+def test_best_similarity():
+    queries = np.array([[1.0, 0.0], [0.0, 2.0]])
+    candidates = np.array([[3.0, 0.0], [1.0, 1.0]])
+
+    assert best_similarity(queries, candidates) == pytest.approx([1.0, np.sqrt(0.5)])
+    assert best_similarity(queries, np.zeros((0, 2))).tolist() == [0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_normalized_matching_without_embeddings(monkeypatch):
+    class _NoKey:
+        api_key = None
+
+    monkeypatch.setattr(keyword_matching, "embedding_service", _NoKey())
+
+    uncovered = await find_uncovered(
+        ["running shoes", "trail shoes", "espresso machine"], ["best shoe for running"]
+    )
+
+    assert uncovered == ["trail shoes", "espresso machine"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_matches_above_threshold(embeddings):
+    uncovered = await find_uncovered(["espresso tips", "green tea"], ["coffee brewing"])
+
+    assert uncovered == ["green tea"]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_cached(embeddings, fake_redis):
+    await find_uncovered(["espresso tips", "green tea"], ["coffee brewing"])
+    await find_uncovered(["espresso tips", "green tea"], ["coffee brewing"])
+
+    assert len(embeddings.calls) == 1
+    assert len(fake_redis.store) == 3
+
+
+@pytest.mark.asyncio
+async def test_embedding_errors_fall_back(embeddings):
+    embeddings.fail = True
+
+    assert await find_uncovered(["espresso tips"], ["coffee brewing"]) == ["espresso tips"]
+
+
+@pytest.mark.asyncio
+async def test_gap_result_cache(fake_redis):
+    result = {"gaps": [], "total_gaps": 0}
+    await keyword_matching.set_cached_gaps("a1", ["x", "y"], result)
+
+    assert await keyword_matching.get_cached_gaps("a1", ["x", "y"]) == result
+    assert await keyword_matching.get_cached_gaps("a1", ["x"]) is None
+    assert await keyword_matching.get_cached_gaps("a2", ["x", "y"]) is None
+    # Monitoring bumps the analysis revision, which invalidates cached gaps
+    assert await keyword_matching.get_cached_gaps("a1", ["x", "y"], "2026-10-01T00:00:00+00:00") is None
+
+
+@pytest.mark.asyncio
+async def test_thousands_of_keywords_under_a_second(monkeypatch, fake_redis):
+    dim = 256
+    rng = np.random.default_rng(0)
+
+    class _Random:
+        model = "test-embedding"
+        api_key = "test-key"
+
+        async def embed_texts(self, texts):
+            return rng.standard_normal((len(texts), dim)).tolist()
+
+    monkeypatch.setattr(keyword_matching, "embedding_service", _Random())
+    competitor = [f"topic{i} guide" for i in range(3000)]
+    user = [f"subject{i} tutorial" for i in range(2000)]
+    await find_uncovered(competitor, user)  # fills the embedding cache
+
+    start = time.perf_counter()
+    uncovered = await find_uncovered(competitor, user)
+
+    assert time.perf_counter() - start < 1.0
+    assert len(uncovered) == 3000
@@ -0,0 +1,97 @@
+"""
+Unit tests for the corpus-versioned knowledge answer cache.
+
+Covers:
+- Query normalisation for near-identical questions
+- Key separation by corpus version, model, scope and filters
+- Version bumps making previous answers unreachable
+- Fail-open behaviour without Redis
+"""
+
+import pytest
+
+from services import knowledge_cache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get():
+        return redis
+
+    monkeypatch.setattr(knowledge_cache, "get_redis_text", _get)
+    return redis
+
+
+def test_normalize_query_ignores_case_punctuation_and_spacing():
+    assert knowledge_cache.normalize_query("  What is  SEO? ") == "what is seo"
+    assert knowledge_cache.normalize_query("what is seo") == "what is seo"
+
+
+def test_cache_key_varies_with_version_model_scope_and_filters():
+    base = {
+        "user_id": "u1",
+        "project_id": "p1",
+        "query": "What is SEO?",
+        "corpus_version": 1,
+        "model": "m",
+    }
+    key = knowledge_cache.answer_cache_key(**base)
+
+    assert key == knowledge_cache.answer_cache_key(**{**base, "query": "what is seo"})
+    assert key != knowledge_cache.answer_cache_key(**{**base, "corpus_version": 2})
+    assert key != knowledge_cache.answer_cache_key(**{**base, "model": "other"})
+    assert key != knowledge_cache.answer_cache_key(**{**base, "project_id": "p2"})
+    assert key != knowledge_cache.answer_cache_key(**{**base, "source_ids": ["s1"]})
+
+
+@pytest.mark.asyncio
+async def test_bump_makes_previous_answers_unreachable(fake_redis):
+    version = await knowledge_cache.get_corpus_version("u1", "p1")
+    key = knowledge_cache.answer_cache_key("u1", "p1", "q", version, "m")
+    await knowledge_cache.set_cached_answer(key, {"answer": "a", "sources": []})
+
+    assert (await knowledge_cache.get_cached_answer(key))["answer"] == "a"
+
+    await knowledge_cache.bump_corpus_version("u1", "p1")
+    new_version = await knowledge_cache.get_corpus_version("u1", "p1")
+    new_key = knowledge_cache.answer_cache_key("u1", "p1", "q", new_version, "m")
+
+    assert new_version == version + 1
+    assert await knowledge_cache.get_cached_answer(new_key) is None
+
+
+@pytest.mark.asyncio
+async def test_personal_scope_is_per_user(fake_redis):
+    await knowledge_cache.bump_corpus_version("u1", None)
+
+    assert await knowledge_cache.get_corpus_version("u1", "personal") == 1
+    assert await knowledge_cache.get_corpus_version("u2", None) == 0
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis(monkeypatch):
+    async def _none():
+        return None
+
+    monkeypatch.setattr(knowledge_cache, "get_redis_text", _none)
+
+    assert await knowledge_cache.get_corpus_version("u1") is None
+    assert await knowledge_cache.get_cached_answer("k") is None
+    await knowledge_cache.bump_corpus_version("u1")
+    await knowledge_cache.set_cached_answer("k", {"answer": "a"})
@@ -0,0 +1,126 @@
+"""
+Unit tests for the knowledge processor helpers.
+
+Covers:
+- chunk_hash stability
+- diff_chunks keep / changed / add / remove classification
+- Duplicate chunk matching and legacy (hash-less) rows
+- Content-defined chunk boundaries: an early edit re-chunks only nearby text
+"""
+
+import random
+
+from services.knowledge_processor import chunk_hash, diff_chunks, split_into_chunks
+
+
+def _paragraphs(rng: random.Random, n: int) -> list[str]:
+    vocab = [f"word{i}" for i in range(300)]
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(20, 120))) + "." for _ in range(n)]
+
+# ---------------------------------------------------------------------------
+# chunk_hash
+# ---------------------------------------------------------------------------
+
+
+def test_chunk_hash_is_stable_and_content_sensitive():
+    assert chunk_hash("hello world") == chunk_hash("hello world")
+    assert chunk_hash("hello world") != chunk_hash("hello world!")
+    assert len(chunk_hash("x")) == 64
+
+
+# ---------------------------------------------------------------------------
+# diff_chunks
+# ---------------------------------------------------------------------------
+
+
+def test_diff_first_index_adds_everything():
+    diff = diff_chunks([], [chunk_hash("a"), chunk_hash("b")])
+    assert diff.keep == []
+    assert diff.add == [0, 1]
+    assert diff.remove == []
+
+
+def test_diff_unchanged_document_keeps_all_ids():
+    existing = [("id-a", chunk_hash("a")), ("id-b", chunk_hash("b"))]
+    diff = diff_chunks(existing, [chunk_hash("a"), chunk_hash("b")])
+    assert diff.keep == [("id-a", 0), ("id-b", 1)]
+    assert diff.add == []
+    assert diff.remove == []
+
+
+def test_diff_edit_only_touches_changed_chunk():
+    existing = [("id-a", chunk_hash("a")), ("id-b", chunk_hash("b")), ("id-c", chunk_hash("c"))]
+    diff = diff_chunks(existing, [chunk_hash("a"), chunk_hash("B"), chunk_hash("c")])
+    assert diff.keep == [("id-a", 0), ("id-c", 2)]
+    assert diff.add == [1]
+    assert diff.remove == ["id-b"]
+
+
+def test_diff_inserted_chunk_renumbers_kept_chunks():
+    existing = [("id-a", chunk_hash("a")), ("id-b", chunk_hash("b"))]
+    diff = diff_chunks(existing, [chunk_hash("new"), chunk_hash("a"), chunk_hash("b")])
+    assert diff.keep == [("id-a", 1), ("id-b", 2)]
+    assert diff.add == [0]
+
+
+def test_diff_reports_only_moved_or_relabelled_chunks_as_changed():
+    existing = [("id-a", chunk_hash("a")), ("id-b", chunk_hash("b")), ("id-c", chunk_hash("c"))]
+    stored = {
+        "id-a": {"chunk_index": 0, "title": "Old"},
+        "id-b": {"chunk_index": 1, "title": "Doc"},
+        "id-c": {"chunk_index": 2, "title": "Doc"},
+    }
+    new = [{"chunk_index": i, "title": "Doc"} for i in range(4)]
+
+    diff = diff_chunks(
+        existing,
+        [chunk_hash("a"), chunk_hash("b"), chunk_hash("new"), chunk_hash("c")],
+        stored_metadata=stored,
+        new_metadata=new,
+    )
+
+    assert diff.keep == [("id-a", 0), ("id-b", 1), ("id-c", 3)]
+    assert diff.changed == [("id-a", 0), ("id-c", 3)]
+
+
+def test_diff_without_metadata_treats_kept_chunks_as_changed():
+    existing = [("id-a", chunk_hash("a"))]
+    assert diff_chunks(existing, [chunk_hash("a")]).changed == [("id-a", 0)]
+
+
+def test_diff_matches_duplicates_one_to_one():
+    h = chunk_hash("same")
+    diff = diff_chunks([("id-1", h), ("id-2", h), ("id-3", h)], [h, h])
+    assert [chunk_id for chunk_id, _ in diff.keep] == ["id-1", "id-2"]
+    assert diff.remove == ["id-3"]
+
+
+def test_diff_removes_rows_without_hash():
+    diff = diff_chunks([("legacy", None)], [chunk_hash("a")])
+    assert diff.remove == ["legacy"]
+    assert diff.add == [0]
+
+
+# ---------------------------------------------------------------------------
+# split_into_chunks
+# ---------------------------------------------------------------------------
+
+
+def test_split_into_chunks_respects_budget():
+    chunks = split_into_chunks("\n\n".join(_paragraphs(random.Random(1), 100)), words_per_chunk=200)
+
+    assert len(chunks) > 10
+    assert all(len(chunk.split()) <= 400 for chunk in chunks)
+
+
+def test_early_insert_reembeds_constant_chunks():
+    rng = random.Random(0)
+    paragraphs = _paragraphs(rng, 200)
+    before = split_into_chunks("\n\n".join(paragraphs))
+    after = split_into_chunks("\n\n".join(paragraphs[:3] + _paragraphs(rng, 1) + paragraphs[3:]))
+
+    diff = diff_chunks([(str(i), chunk_hash(c)) for i, c in enumerate(before)], [chunk_hash(c) for c in after])
+
+    assert len(before) > 20
+    assert len(diff.add) <= 2
+    assert len(diff.remove) <= 2
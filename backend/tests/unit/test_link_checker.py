@@ -0,0 +1,118 @@
+"""
+Unit tests for the audit link checker.
+
+Tests cover:
+- Broken vs. ignored status classification
+- HEAD checks with ranged-GET fallback for servers rejecting HEAD
+- One request per target (per-audit result cache, seeded statuses)
+- Unreachable hosts, SSRF-blocked URLs and the time budget
+- Timeouts (including pool waits) recorded as unknown, not broken
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from services.link_checker import LinkChecker, is_broken
+
+
+async def _safe(url):
+    return "internal" not in url
+
+
+def _client(requests: list, handler=None) -> httpx.AsyncClient:
+    def default(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/no-head" and request.method == "HEAD":
+            return httpx.Response(405)
+        if path == "/gone":
+            return httpx.Response(404)
+        if path == "/down":
+            raise httpx.ConnectError("refused")
+        if path == "/slow":
+            raise httpx.ReadTimeout("timed out")
+        if path == "/busy":
+            raise httpx.PoolTimeout("no connection available")
+        return httpx.Response(206 if "range" in request.headers else 200)
+
+    def recording(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, str(request.url), request.headers.get("range")))
+        return (handler or default)(request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(recording))
+
+
+def test_broken_classification():
+    assert is_broken(None)
+    assert is_broken(404) and is_broken(500)
+    assert not is_broken(200) and not is_broken(301)
+    assert not is_broken(403) and not is_broken(429) and not is_broken(999)
+
+
+@pytest.mark.asyncio
+async def test_head_with_ranged_get_fallback():
+    requests: list = []
+    async with _client(requests) as client:
+        checker = LinkChecker(client, "example.com", _safe)
+        results = await checker.check_all(
+            ["https://a.com/ok", "https://a.com/no-head", "https://a.com/gone"], timeout=5
+        )
+
+    assert results == {
+        "https://a.com/ok": 200,
+        "https://a.com/no-head": 206,
+        "https://a.com/gone": 404,
+    }
+    assert ("GET", "https://a.com/no-head", "bytes=0-0") in requests
+    assert sum(1 for method, _url, _r in requests if method == "GET") == 1
+
+
+@pytest.mark.asyncio
+async def test_each_target_is_requested_once():
+    requests: list = []
+    async with _client(requests) as client:
+        checker = LinkChecker(client, "example.com", _safe)
+        checker.seed("https://example.com/crawled", 404)
+        await checker.check_all(["https://a.com/x", "https://a.com/x"], timeout=5)
+        await checker.check_all(["https://a.com/x", "https://example.com/crawled"], timeout=5)
+
+    assert [url for _m, url, _r in requests] == ["https://a.com/x"]
+    assert checker.results["https://example.com/crawled"] == 404
+
+
+@pytest.mark.asyncio
+async def test_unreachable_and_unsafe_links():
+    requests: list = []
+    async with _client(requests) as client:
+        checker = LinkChecker(client, "example.com", _safe)
+        results = await checker.check_all(["https://a.com/down", "http://internal/admin"], timeout=5)
+
+    assert results == {"https://a.com/down": None}
+
+
+@pytest.mark.asyncio
+async def test_stops_at_time_budget():
+    async def hang(request):
+        await asyncio.Event().wait()
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+        checker = LinkChecker(client, "example.com", _safe)
+        results = await checker.check_all(["https://a.com/slow"], timeout=0.05)
+
+    assert results == {}
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_unknown_not_broken():
+    requests: list = []
+    async with _client(requests) as client:
+        checker = LinkChecker(client, "example.com", _safe, workers=2)
+        results = await checker.check_all(
+            ["https://a.com/slow", "https://a.com/busy", "https://a.com/ok"], timeout=5
+        )
+        await checker.check_all(["https://a.com/slow"], timeout=5)
+
+    assert results == {"https://a.com/ok": 200}
+    assert checker.unknown == {"https://a.com/slow", "https://a.com/busy"}
+    assert len(requests) == 3
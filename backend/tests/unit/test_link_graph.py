@@ -0,0 +1,75 @@
+"""
+Unit tests for internal link graph analytics.
+
+Tests cover:
+- Edge building limited to crawled pages, without self-links
+- PageRank summing to one and favouring heavily linked pages
+- Dangling pages redistributing their rank
+- BFS click depth from the homepage, with unreachable pages flagged
+- Weak link clusters numbered from the homepage's cluster
+"""
+
+import numpy as np
+import pytest
+
+from services.link_graph import UNREACHABLE, analyze_link_graph, build_edges, pagerank
+
+
+def _pages(links: dict[str, list[str]]) -> list[dict]:
+    return [{"url": url, "internal_links": targets} for url, targets in links.items()]
+
+
+def test_edges_keep_only_links_between_crawled_pages():
+    urls, src, dst = build_edges(_pages({"a": ["a", "b", "x"], "b": ["a"]}))
+
+    assert urls == ["a", "b"]
+    assert list(zip(src.tolist(), dst.tolist(), strict=True)) == [(0, 1), (1, 0)]
+
+
+def test_pagerank_favours_linked_pages():
+    metrics = analyze_link_graph(
+        _pages({"home": ["hub", "a"], "a": ["hub"], "b": ["hub"], "hub": ["home"]}), "home"
+    )
+    rank = dict(zip(metrics.urls, metrics.pagerank.tolist(), strict=True))
+
+    assert sum(rank.values()) == pytest.approx(1.0)
+    assert rank["hub"] == max(rank.values())
+    assert rank["b"] == min(rank.values())
+
+
+def test_dangling_pages_keep_rank_normalised():
+    rank = pagerank(np.array([0, 1]), np.array([1, 2]), 3)
+
+    assert rank.sum() == pytest.approx(1.0)
+    assert rank[2] > rank[1] > rank[0]
+
+
+def test_click_depth_from_homepage():
+    metrics = analyze_link_graph(
+        _pages({"home": ["a"], "a": ["b", "home"], "b": ["c"], "c": [], "island": ["c"]}), "home"
+    )
+    depth = dict(zip(metrics.urls, metrics.click_depth.tolist(), strict=True))
+
+    assert depth == {"home": 0, "a": 1, "b": 2, "c": 3, "island": UNREACHABLE}
+
+
+def test_missing_homepage_leaves_every_page_unreachable():
+    metrics = analyze_link_graph(_pages({"a": ["b"], "b": []}), "home")
+
+    assert (metrics.click_depth == UNREACHABLE).all()
+
+
+def test_clusters_start_with_the_homepage():
+    metrics = analyze_link_graph(
+        _pages({
+            "x1": ["x2"], "x2": ["x3"], "x3": [],  # larger, but not the homepage's
+            "home": ["a"], "a": [],
+            "y": [],
+        }),
+        "home",
+    )
+    cluster = dict(zip(metrics.urls, metrics.cluster.tolist(), strict=True))
+
+    assert cluster["home"] == cluster["a"] == 0
+    assert cluster["x1"] == cluster["x2"] == cluster["x3"] == 1
+    assert cluster["y"] == 2
@@ -0,0 +1,271 @@
+"""
+Unit tests for the in-process LocalVectorStore.
+
+Tests cover:
+- Add / query round trip with cosine scores
+- source_id and $in metadata filtering
+- Deletion by id and by source, with compaction
+- Persistence across store instances (memory-mapped reload)
+- IVF index path above the ANN threshold, built off the query path
+- Several store instances (worker processes) sharing one collection directory:
+  writes, compaction and deletion made by one are seen by the others, and a
+  torn write is dropped instead of shifting later rows
+- A compaction interrupted by a crash is undone before the switch and
+  finished after the vectors were replaced
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from adapters.knowledge import local_vector_store
+from adapters.knowledge.chroma_adapter import Document
+from adapters.knowledge.local_vector_store import DOCUMENTS_FILE, VECTORS_FILE, LocalVectorStore
+
+pytestmark = pytest.mark.asyncio
+
+
+def _docs(source_id: str, n: int, start: int = 0) -> list[Document]:
+    return [
+        Document(
+            id=f"{source_id}_{i}",
+            content=f"content {i}",
+            metadata={"source_id": source_id, "chunk_index": i},
+        )
+        for i in range(start, start + n)
+    ]
+
+
+def _unit(dim: int, hot: int) -> list[float]:
+    vec = [0.0] * dim
+    vec[hot] = 1.0
+    return vec
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+
+
+class TestLocalVectorStore:
+    async def test_add_and_query_returns_most_similar_first(self, store):
+        await store.add_documents("u1", _docs("s1", 3), [_unit(4, i) for i in range(3)])
+
+        results = await store.query("u1", _unit(4, 1), n_results=2)
+
+        assert results[0].document_id == "s1_1"
+        assert results[0].score == pytest.approx(1.0)
+        assert results[0].metadata["chunk_index"] == 1
+        assert len(results) == 2
+
+    async def test_query_filters_by_source(self, store):
+        await store.add_documents("u1", _docs("s1", 2), [_unit(4, 0), _unit(4, 1)])
+        await store.add_documents("u1", _docs("s2", 2), [_unit(4, 0), _unit(4, 1)])
+
+        single = await store.query("u1", _unit(4, 0), filter_metadata={"source_id": "s2"})
+        multi = await store.query(
+            "u1", _unit(4, 0), filter_metadata={"source_id": {"$in": ["s1", "s2"]}}
+        )
+
+        assert {r.metadata["source_id"] for r in single} == {"s2"}
+        assert len(multi) == 4
+
+    async def test_collections_are_isolated_by_project(self, store):
+        await store.add_documents("u1", _docs("s1", 1), [_unit(4, 0)], project_id="p1")
+
+        assert await store.query("u1", _unit(4, 0), project_id="p2") == []
+
+    async def test_delete_by_source_and_stats(self, store):
+        await store.add_documents("u1", _docs("s1", 3), [_unit(4, i) for i in range(3)])
+        await store.add_documents("u1", _docs("s2", 1), [_unit(4, 3)])
+
+        deleted = await store.delete_by_source("u1", "s1")
+        stats = await store.get_collection_stats("u1")
+
+        assert deleted == 3
+        assert stats["document_count"] == 1
+        results = await store.query("u1", _unit(4, 0), n_results=5)
+        assert [r.document_id for r in results] == ["s2_0"]
+
+    async def test_update_metadata_and_source_chunks(self, store):
+        docs = _docs("s1", 2)
+        docs[0].metadata["content_hash"] = "h0"
+        await store.add_documents("u1", docs, [_unit(4, 0), _unit(4, 1)])
+        await store.update_metadata(
+            "u1", ["s1_1"], [{"source_id": "s1", "chunk_index": 5, "content_hash": "h1"}]
+        )
+
+        chunks = dict(await store.get_source_chunks("u1", "s1"))
+
+        assert {doc_id: m["content_hash"] for doc_id, m in chunks.items()} == {"s1_0": "h0", "s1_1": "h1"}
+        assert chunks["s1_1"]["chunk_index"] == 5
+
+    async def test_persists_across_instances(self, store, tmp_path):
+        await store.add_documents("u1", _docs("s1", 3), [_unit(4, i) for i in range(3)])
+        await store.delete_documents("u1", ["s1_0"])
+
+        reloaded = LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+        results = await reloaded.query("u1", _unit(4, 2), n_results=5)
+
+        assert [r.document_id for r in results][0] == "s1_2"
+        assert {r.document_id for r in results} == {"s1_1", "s1_2"}
+
+    async def test_compaction_keeps_surviving_vectors(self, store):
+        await store.add_documents("u1", _docs("s1", 4), [_unit(4, i) for i in range(4)])
+        # Deleting half the rows crosses COMPACT_RATIO and rewrites the files
+        await store.delete_documents("u1", ["s1_0", "s1_1"])
+
+        results = await store.query("u1", _unit(4, 3), n_results=1)
+
+        assert results[0].document_id == "s1_3"
+        assert results[0].score == pytest.approx(1.0)
+        assert len(store.get_collection("u1").ids) == 2
+
+    async def test_ivf_path_finds_exact_match(self, tmp_path):
+        store = LocalVectorStore(
+            persist_directory=str(tmp_path), collection_prefix="kv", ann_threshold=50
+        )
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(400, 16)).astype(np.float32)
+        await store.add_documents("u1", _docs("s1", 400), vectors.tolist())
+
+        collection = store.get_collection("u1")
+        for _ in range(100):
+            if collection._ivf is not None:
+                break
+            await asyncio.sleep(0.02)
+
+        results = await store.query("u1", vectors[123].tolist(), n_results=3)
+
+        assert collection._ivf is not None
+        assert results[0].document_id == "s1_123"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+
+    async def test_queries_do_not_wait_for_the_index_build(self, tmp_path, monkeypatch):
+        release = threading.Event()
+        real_index = local_vector_store._IVFIndex
+
+        def slow_index(vectors, rows):
+            release.wait(5)
+            return real_index(vectors, rows)
+
+        monkeypatch.setattr(local_vector_store, "_IVFIndex", slow_index)
+        store = LocalVectorStore(
+            persist_directory=str(tmp_path), collection_prefix="kv", ann_threshold=50
+        )
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(200, 8)).astype(np.float32)
+        await store.add_documents("u1", _docs("s1", 200), vectors.tolist())
+
+        # Served by a brute-force scan while the index is still being built
+        results = await asyncio.wait_for(
+            store.query("u1", vectors[7].tolist(), n_results=1), timeout=2
+        )
+        collection = store.get_collection("u1")
+        assert results[0].document_id == "s1_7"
+        assert collection._ivf is None
+
+        release.set()
+        for _ in range(100):
+            if collection._ivf is not None:
+                break
+            await asyncio.sleep(0.02)
+        assert collection._ivf is not None and collection._ivf.size == 200
+
+    async def test_rejects_dimension_mismatch(self, store):
+        await store.add_documents("u1", _docs("s1", 1), [_unit(4, 0)])
+
+        with pytest.raises(Exception, match="dimension"):
+            await store.add_documents("u1", _docs("s1", 1, start=1), [_unit(8, 0)])
+
+
+class TestSharedCollection:
+    """Two store instances on one directory stand in for two worker processes."""
+
+    @pytest.fixture
+    def other(self, tmp_path):
+        return LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+
+    async def test_writes_are_seen_by_other_instances(self, store, other):
+        await store.add_documents("u1", _docs("s1", 2), [_unit(4, 0), _unit(4, 1)])
+        await other.query("u1", _unit(4, 0))  # loads the collection
+        await other.add_documents("u1", _docs("s2", 1), [_unit(4, 2)])
+        await store.add_documents("u1", _docs("s3", 1), [_unit(4, 3)])
+
+        for instance in (store, other):
+            for hot, doc_id in enumerate(["s1_0", "s1_1", "s2_0", "s3_0"]):
+                results = await instance.query("u1", _unit(4, hot), n_results=1)
+                assert results[0].document_id == doc_id
+                assert results[0].score == pytest.approx(1.0)
+
+    async def test_compaction_and_deletes_are_seen_by_other_instances(self, store, other):
+        await store.add_documents("u1", _docs("s1", 4), [_unit(4, i) for i in range(4)])
+        await other.query("u1", _unit(4, 0))
+        await store.delete_documents("u1", ["s1_0", "s1_1"])  # compacts
+        await other.add_documents("u1", _docs("s2", 1), [_unit(4, 0)])
+
+        results = await store.query("u1", _unit(4, 0), n_results=5)
+
+        assert results[0].document_id == "s2_0"
+        assert {r.document_id for r in results} == {"s2_0", "s1_2", "s1_3"}
+        assert (await other.get_collection_stats("u1"))["document_count"] == 3
+
+        await other.delete_collection("u1")
+        assert await store.query("u1", _unit(4, 0)) == []
+
+    async def test_torn_write_is_dropped(self, store, tmp_path):
+        await store.add_documents("u1", _docs("s1", 2), [_unit(4, 0), _unit(4, 1)])
+        path = store.get_collection("u1").path
+        # A crash after the vectors were written, mid-way through the log record
+        with open(path / VECTORS_FILE, "ab") as fh:
+            fh.write(np.ones(4, dtype=np.float32).tobytes())
+        with open(path / DOCUMENTS_FILE, "ab") as fh:
+            fh.write(b'{"op": "add", "row": 2, "dim"')
+
+        reloaded = LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+        await reloaded.add_documents("u1", _docs("s2", 1), [_unit(4, 2)])
+        await store.add_documents("u1", _docs("s3", 1), [_unit(4, 3)])
+
+        for instance in (store, reloaded):
+            results = await instance.query("u1", _unit(4, 2), n_results=1)
+            assert results[0].document_id == "s2_0"
+            assert results[0].score == pytest.approx(1.0)
+        assert (path / VECTORS_FILE).stat().st_size == 4 * 4 * 4
+
+    async def test_compaction_interrupted_before_switch_is_undone(self, store, tmp_path):
+        await store.add_documents("u1", _docs("s1", 2), [_unit(4, 0), _unit(4, 1)])
+        path = store.get_collection("u1").path
+        # A crash while the compacted files were still being written
+        (path / "vectors.tmp").write_bytes(b"\x00" * 8)
+        (path / "documents.tmp").write_bytes(b'{"op": "add", "row": 0')
+
+        reloaded = LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+        results = await reloaded.query("u1", _unit(4, 1), n_results=2)
+
+        assert [r.document_id for r in results] == ["s1_1", "s1_0"]
+        assert not (path / "vectors.tmp").exists() and not (path / "documents.tmp").exists()
+
+    async def test_compaction_interrupted_between_renames_is_finished(
+        self, store, tmp_path, monkeypatch
+    ):
+        await store.add_documents("u1", _docs("s1", 4), [_unit(4, i) for i in range(4)])
+        path = store.get_collection("u1").path
+
+        def crash(directory):
+            raise RuntimeError("crashed after replacing the vectors")
+
+        monkeypatch.setattr(local_vector_store, "_fsync_dir", crash)
+        with pytest.raises(RuntimeError, match="crashed"):
+            store.get_collection("u1").delete(["s1_0", "s1_1"])  # compacts
+        monkeypatch.undo()
+        assert (path / "documents.tmp").exists()
+
+        reloaded = LocalVectorStore(persist_directory=str(tmp_path), collection_prefix="kv")
+        results = await reloaded.query("u1", _unit(4, 3), n_results=5)
+
+        assert results[0].document_id == "s1_3"
+        assert {r.document_id for r in results} == {"s1_2", "s1_3"}
+        assert not (path / "documents.tmp").exists()
+        assert (path / VECTORS_FILE).stat().st_size == 2 * 4 * 4
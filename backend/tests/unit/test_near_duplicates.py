@@ -0,0 +1,72 @@
+"""
+Unit tests for SimHash near-duplicate detection.
+
+Tests cover:
+- Fingerprint stability and sensitivity to small vs. large edits
+- Short texts producing no fingerprint
+- LSH banding finding every pair within the Hamming threshold
+- Transitive clustering and exact-duplicate collapsing
+"""
+
+import random
+
+from services.near_duplicates import MAX_DISTANCE, near_duplicate_clusters, simhash
+
+
+def _text(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randrange(5000)}" for _ in range(words))
+
+
+def _distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def test_small_edit_keeps_fingerprint_close():
+    text = _text(1)
+    edited = text.replace(text.split()[200], "changed", 1)
+
+    assert _distance(simhash(text), simhash(edited)) <= MAX_DISTANCE
+    assert _distance(simhash(text), simhash(_text(2))) > MAX_DISTANCE
+
+
+def test_fingerprint_is_deterministic_and_case_insensitive():
+    text = _text(3)
+
+    assert simhash(text) == simhash(text.upper())
+    assert len(simhash(text)) == 16
+
+
+def test_short_text_has_no_fingerprint():
+    assert simhash("just a handful of words") is None
+
+
+def test_banding_finds_all_pairs_within_threshold():
+    rng = random.Random(7)
+    fingerprints = {}
+    expected = []
+    for n in range(200):
+        base = rng.getrandbits(64)
+        flipped = base
+        for bit in rng.sample(range(64), MAX_DISTANCE):
+            flipped ^= 1 << bit
+        fingerprints[f"a{n}"] = f"{base:016x}"
+        fingerprints[f"b{n}"] = f"{flipped:016x}"
+        expected.append([f"a{n}", f"b{n}"])
+
+    clusters = near_duplicate_clusters(fingerprints)
+
+    assert sorted(clusters) == sorted(expected)
+
+
+def test_clusters_are_transitive_and_collapse_exact_duplicates():
+    fingerprints = {
+        "a": "0000000000000000",
+        "a-copy": "0000000000000000",
+        "b": "0000000000000007",  # 3 bits from a
+        "c": "000000000000003f",  # 3 bits from b, 6 from a
+        "far": "ffffffffffffffff",
+        "none": None,
+    }
+
+    assert near_duplicate_clusters(fingerprints) == [["a", "a-copy", "b", "c"]]
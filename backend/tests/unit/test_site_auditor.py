@@ -0,0 +1,588 @@
+"""
+Unit tests for the site audit crawler pipeline.
+
+Tests cover:
+- Single-parse page processing (links + analysis + compact record)
+- Non-HTML pages producing minimal records
+- Page processing through the parse process pool
+- Batched page persistence with bounded buffering
+- Continuous crawl loop honouring the page budget
+- Incremental re-audits reusing unchanged pages (304 / identical body)
+- Near-duplicate content clusters reported as site-wide issues
+- Link graph issues (deep pages, isolated clusters) and per-page metric rows
+- Broken-link checks reported per source page
+- Sitemap seeding ranked by lastmod and crawled ahead of discovered links
+- Resuming an interrupted crawl from committed pages and its checkpoint
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from infrastructure.database.models.site_audit import AuditIssue, AuditPage
+from services import parse_pool, site_auditor
+from services.crawl_checkpoint import url_key
+
+HTML = """
+<html lang="en"><head><title>Example page title for the audit tests</title></head>
+<body>
+  <h1>Heading</h1>
+  <a href="/about/">About</a>
+  <a href="https://example.com/blog?x=1#top">Blog</a>
+  <a href="https://other.com/page">External</a>
+  <a href="/brochure.pdf">PDF</a>
+  <a href="mailto:hi@example.com">Mail</a>
+  <p>Some body text</p>
+</body></html>
+"""
+
+
+def _raw(url: str = "https://example.com", html: str = HTML, ct: str = "text/html") -> dict:
+    return {
+        "url": url,
+        "final_url": url,
+        "status_code": 200,
+        "response_time_ms": 120,
+        "html": html,
+        "headers": {"content-type": ct},
+        "page_size": len(html),
+        "redirect_chain": [],
+        "content_type": ct,
+    }
+
+
+class _FakeSession:
+    def __init__(self, log: list):
+        self.log = log
+        self.inserted: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        return None
+
+    async def commit(self):
+        self.log.append(self.inserted)
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    """Record (model, row) pairs bulk-inserted per committed session."""
+    log: list = []
+
+    async def _bulk_insert(db, model, rows, chunk_size=None):
+        db.inserted.extend((model, row) for row in rows)
+        return len(rows)
+
+    monkeypatch.setattr(site_auditor, "async_session_maker", lambda: _FakeSession(log))
+    monkeypatch.setattr(site_auditor, "bulk_insert", _bulk_insert)
+    return log
+
+
+class TestProcessPage:
+    def test_extracts_internal_links_and_analyzes(self):
+        page_data, issues, links = site_auditor._process_page(_raw(), "example.com")
+
+        assert links == {"https://example.com/about", "https://example.com/blog?x=1"}
+        assert page_data["outbound_links"] == [
+            "https://example.com/brochure.pdf",
+            "https://other.com/page",
+        ]
+        assert page_data["title"] == "Example page title for the audit tests"
+        assert page_data["h1_count"] == 1
+        assert "thin_content" in {i["issue_type"] for i in issues}
+
+    def test_non_html_page_yields_minimal_record(self):
+        page_data, issues, links = site_auditor._process_page(
+            _raw(html="", ct="application/pdf"), "example.com"
+        )
+
+        assert page_data["word_count"] == 0
+        assert page_data["content_type"] == "application/pdf"
+        assert issues == []
+        assert links == set()
+
+    @pytest.mark.asyncio
+    async def test_runs_in_parse_pool(self):
+        try:
+            page_data, _issues, links = await parse_pool.run_in_parse_pool(
+                site_auditor._process_page, _raw(), "example.com"
+            )
+        finally:
+            parse_pool.shutdown_parse_pool()
+
+        assert page_data["url"] == "https://example.com"
+        assert "https://example.com/about" in links
+
+
+@pytest.mark.asyncio
+class TestAuditPageWriter:
+    async def test_flushes_in_batches_and_keeps_summaries(self, commits):
+        writer = site_auditor._AuditPageWriter("audit-1", batch_size=2)
+        issue = {"issue_type": "missing_h1", "severity": "critical", "message": "m"}
+
+        for i in range(5):
+            await writer.add(
+                {"url": f"https://example.com/{i}", "status_code": 200, "response_time_ms": 1},
+                [issue],
+                {"https://example.com"},
+            )
+        await writer.close()
+
+        assert [sum(m is AuditPage for m, _row in batch) for batch in commits] == [2, 2, 1]
+        issue_rows = [row for batch in commits for m, row in batch if m is AuditIssue]
+        page_ids = {row["id"] for batch in commits for m, row in batch if m is AuditPage}
+        assert len(issue_rows) == 5
+        assert {row["page_id"] for row in issue_rows} == page_ids
+        assert writer.pages_analyzed == 5
+        assert writer.severity_counts["critical"] == 5
+        assert writer.summaries[0]["internal_links"] == ["https://example.com"]
+        assert set(writer.page_ids) == {f"https://example.com/{i}" for i in range(5)}
+
+    async def test_write_errors_surface_on_close(self, monkeypatch):
+        failing = AsyncMock(side_effect=RuntimeError("db down"))
+        writer = site_auditor._AuditPageWriter("audit-1", batch_size=1)
+        monkeypatch.setattr(writer, "_write", failing)
+
+        await writer.add({"url": "https://example.com", "status_code": 200, "response_time_ms": 1}, [], set())
+
+        with pytest.raises(RuntimeError, match="db down"):
+            await writer.close()
+
+
+async def _inline_parse(fn, *args):
+    return fn(*args)
+
+
+async def _always_safe(url):
+    return True
+
+
+def _site(pages: int, etags: bool = False):
+    """MockTransport serving a chain of linked pages /0 -> /1 -> ... plus a 404."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.strip("/") or "0"
+        if not path.isdigit() or int(path) >= pages:
+            return httpx.Response(404, text="missing", headers={"content-type": "text/html"})
+        n = int(path)
+        headers = {"content-type": "text/html"}
+        if etags:
+            headers["etag"] = f'"v{n}"'
+            if request.headers.get("if-none-match") == headers["etag"]:
+                return httpx.Response(304, headers=headers)
+        links = f'<a href="/{n + 1}">next</a><a href="/{n + 2}">skip</a><a href="/missing">x</a>'
+        html = f"<html><head><title>Page {n}</title></head><body><h1>{n}</h1>{links}</body></html>"
+        return httpx.Response(200, text=html, headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+def _as_previous(writer) -> dict[str, dict]:
+    """Turn the pages a writer wrote into _load_previous_pages-style records."""
+    previous = {}
+    for _page_id, pdata, issues, links in writer.written:
+        if pdata["status_code"] != 200:
+            continue
+        previous[pdata["url"]] = {
+            "page_data": {k: v for k, v in pdata.items() if k not in ("etag", "last_modified", "content_hash")},
+            "issues": issues,
+            "links": links,
+            "etag": pdata.get("etag"),
+            "last_modified": pdata.get("last_modified"),
+            "content_hash": pdata.get("content_hash"),
+        }
+    return previous
+
+
+class _RecordingWriter(site_auditor._AuditPageWriter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written: list = []
+
+    async def _write(self, batch, pages_crawled, pages_discovered):
+        self.written.extend(batch)
+
+
+@pytest.mark.asyncio
+class TestCrawlSite:
+    @pytest.fixture(autouse=True)
+    def _offline(self, monkeypatch, commits):
+        monkeypatch.setattr(site_auditor, "_is_safe_url", _always_safe)
+        monkeypatch.setattr(site_auditor, "run_in_parse_pool", _inline_parse)
+
+    async def test_crawls_until_frontier_drains(self):
+        writer = site_auditor._AuditPageWriter("audit-1", batch_size=3)
+        async with httpx.AsyncClient(transport=_site(6)) as client:
+            links = await site_auditor._crawl_site(
+                "audit-1", "example.com", 100, [], 0.0, client, writer
+            )
+        await writer.close()
+
+        urls = {s["url"] for s in writer.summaries}
+        assert urls == {"https://example.com"} | {
+            f"https://example.com/{i}" for i in range(1, 8)
+        } | {"https://example.com/missing"}
+        assert "https://example.com/1" in links["https://example.com"]
+
+    async def test_stops_at_page_budget(self):
+        writer = site_auditor._AuditPageWriter("audit-1", batch_size=3)
+        async with httpx.AsyncClient(transport=_site(500)) as client:
+            await site_auditor._crawl_site("audit-1", "example.com", 10, [], 0.0, client, writer)
+        await writer.close()
+
+        assert writer.pages_analyzed == 10
+
+    async def test_respects_robots_disallow(self):
+        writer = site_auditor._AuditPageWriter("audit-1")
+        async with httpx.AsyncClient(transport=_site(6)) as client:
+            await site_auditor._crawl_site("audit-1", "example.com", 100, ["/3"], 0.0, client, writer)
+        await writer.close()
+
+        assert "https://example.com/3" not in {s["url"] for s in writer.summaries}
+
+    async def test_recrawl_reuses_unchanged_pages(self):
+        first = _RecordingWriter("audit-1")
+        async with httpx.AsyncClient(transport=_site(6, etags=True)) as client:
+            await site_auditor._crawl_site("audit-1", "example.com", 100, [], 0.0, client, first)
+        await first.close()
+        previous = _as_previous(first)
+
+        second = _RecordingWriter("audit-2")
+        async with httpx.AsyncClient(transport=_site(6, etags=True)) as client:
+            await site_auditor._crawl_site(
+                "audit-2", "example.com", 100, [], 0.0, client, second, previous_pages=previous
+            )
+        await second.close()
+
+        assert second.pages_reused == len(previous) == 6
+        assert {s["url"] for s in second.summaries} == {s["url"] for s in first.summaries}
+        reused = {pdata["url"]: (pdata, issues) for _id, pdata, issues, _l in second.written}
+        pdata, issues = reused["https://example.com/2"]
+        assert pdata["status_code"] == 200
+        assert pdata["title"] == "Page 2"
+        assert pdata["etag"] == '"v2"'
+        assert {i["issue_type"] for i in issues} == {
+            i["issue_type"] for i in previous["https://example.com/2"]["issues"]
+        }
+
+    async def test_identical_body_without_validators_is_reused(self):
+        first = _RecordingWriter("audit-1")
+        async with httpx.AsyncClient(transport=_site(3)) as client:
+            await site_auditor._crawl_site("audit-1", "example.com", 100, [], 0.0, client, first)
+        await first.close()
+
+        second = _RecordingWriter("audit-2")
+        async with httpx.AsyncClient(transport=_site(3)) as client:
+            await site_auditor._crawl_site(
+                "audit-2", "example.com", 100, [], 0.0, client, second,
+                previous_pages=_as_previous(first),
+            )
+        await second.close()
+
+        assert second.pages_reused == 3
+
+
+def test_reuse_refreshes_timing_and_drops_post_analysis_issues():
+    prior = {
+        "page_data": {"url": "https://example.com", "status_code": 200},
+        "issues": [
+            {"issue_type": "slow_response", "severity": "warning", "message": "old"},
+            {"issue_type": "missing_h1", "severity": "critical", "message": "m"},
+            {"issue_type": "broken_links", "severity": "warning", "message": "old"},
+        ],
+        "links": ["https://example.com/a"],
+        "etag": '"v1"',
+        "last_modified": None,
+        "content_hash": "abc",
+    }
+
+    page_data, issues, links = site_auditor._reuse_previous(
+        prior, {"response_time_ms": 120, "etag": None, "last_modified": "Mon"}
+    )
+
+    assert [i["issue_type"] for i in issues] == ["missing_h1"]
+    assert page_data["issues"] == [{"type": "missing_h1", "severity": "critical"}]
+    assert page_data["etag"] == '"v1"' and page_data["last_modified"] == "Mon"
+    assert links == {"https://example.com/a"}
+
+
+def test_site_wide_reports_near_duplicate_clusters():
+    body = " ".join(f"word{i}" for i in range(400))
+    pages = []
+    for n, text in enumerate([body, body + " extra", body.replace("word7 ", "other ")]):
+        page_data, _ = site_auditor._analyze_page(
+            url=f"https://example.com/{n}",
+            status_code=200,
+            response_time_ms=100,
+            html_body=f"<html><body><p>{text}</p></body></html>",
+            headers={"content-type": "text/html"},
+            page_size=1000,
+            redirect_chain=[],
+        )
+        pages.append({**page_data, "internal_links": []})
+    unique = " ".join(f"distinct{i}" for i in range(400))
+    pages.append({"url": "https://example.com/3", "content_simhash": site_auditor.simhash(unique)})
+
+    issues = site_auditor._analyze_site_wide(pages)
+
+    [dup] = [i for i in issues if i["issue_type"] == "near_duplicate_content"]
+    assert dup["details"]["urls"] == [f"https://example.com/{n}" for n in range(3)]
+    assert dup["severity"] == "warning"
+
+
+def test_link_graph_issues_and_rows():
+    chain = {f"https://example.com/{n}": [f"https://example.com/{n + 1}"] for n in range(8)}
+    chain["https://example.com"] = ["https://example.com/0"]
+    chain["https://example.com/x"] = ["https://example.com/y"]
+    chain["https://example.com/y"] = []
+    metrics = site_auditor.analyze_link_graph(
+        [{"url": url, "internal_links": links} for url, links in chain.items()],
+        "https://example.com",
+    )
+
+    issues = {i["issue_type"]: i for i in site_auditor._link_graph_issues(metrics)}
+
+    deep = issues["deep_pages"]
+    assert deep["details"]["max_depth"] == 8
+    assert deep["details"]["urls"][0] == "https://example.com/7"
+    assert len(deep["details"]["urls"]) == 4  # depths 5..8
+    [cluster] = issues["isolated_link_clusters"]["details"]["clusters"]
+    assert cluster == {"size": 2, "urls": ["https://example.com/x", "https://example.com/y"]}
+
+    rows = site_auditor._link_metric_rows(metrics, {"https://example.com/x": "p1"})
+    assert rows == [{
+        "id": "p1",
+        "pagerank": pytest.approx(metrics.pagerank[metrics.urls.index("https://example.com/x")]),
+        "click_depth": None,
+        "link_cluster": 1,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_check_links_reports_broken_links_per_source(monkeypatch):
+    monkeypatch.setattr(site_auditor, "_is_safe_url", _always_safe)
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(404 if "dead" in request.url.path else 200)
+
+    summaries = [
+        {
+            "url": "https://example.com",
+            "status_code": 200,
+            "internal_links": ["https://example.com/missing", "https://example.com/uncrawled"],
+            "outbound_links": ["https://other.com/dead", "https://other.com/fine"],
+        },
+        {
+            "url": "https://example.com/missing",
+            "status_code": 404,
+            "internal_links": ["https://example.com/private/x"],
+            "outbound_links": ["https://other.com/dead"],
+        },
+    ]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        issues = await site_auditor._check_links(
+            client, "example.com", ["/private"], 0.0, summaries, timeout=5
+        )
+
+    # Crawled pages and robots-disallowed URLs are never requested
+    assert sorted(requested) == [
+        "https://example.com/uncrawled",
+        "https://other.com/dead",
+        "https://other.com/fine",
+    ]
+    home = issues["https://example.com"]
+    assert home["issue_type"] == "broken_links"
+    assert home["details"]["links"] == [
+        {"url": "https://example.com/missing", "status_code": 404},
+        {"url": "https://other.com/dead", "status_code": 404},
+    ]
+    assert issues["https://example.com/missing"]["details"]["count"] == 1
+
+
+SITEMAP = """<?xml version="1.0"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/old</loc><lastmod>2020-01-01</lastmod></url>
+  <url><loc>https://example.com/undated</loc></url>
+  <url><loc>https://example.com/new</loc><lastmod>2024-06-01</lastmod></url>
+  <url><loc>https://example.com/mid/</loc><lastmod>2023-01-01</lastmod></url>
+  <url><loc>https://other.com/elsewhere</loc><lastmod>2025-01-01</lastmod></url>
+  <url><loc>https://example.com/file.pdf</loc><lastmod>2025-01-01</lastmod></url>
+</urlset>"""
+
+
+@pytest.mark.asyncio
+class TestSitemapSeeding:
+    @pytest.fixture(autouse=True)
+    def _offline(self, monkeypatch, commits):
+        monkeypatch.setattr(site_auditor, "_is_safe_url", _always_safe)
+        monkeypatch.setattr(site_auditor, "run_in_parse_pool", _inline_parse)
+
+    @staticmethod
+    def _transport(order: list[str]):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/sitemap.xml":
+                return httpx.Response(200, text=SITEMAP)
+            order.append(request.url.path)
+            html = '<html><body><a href="/nav">nav</a></body></html>'
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+
+        return httpx.MockTransport(handler)
+
+    async def test_keeps_most_recent_same_domain_pages(self):
+        async with httpx.AsyncClient(transport=self._transport([])) as client:
+            seeds, found = await site_auditor._seed_from_sitemaps(client, "example.com", [], limit=3)
+
+        assert found is True
+        assert seeds == [
+            "https://example.com/new",
+            "https://example.com/mid",
+            "https://example.com/old",
+        ]
+
+    async def test_missing_sitemap_is_reported(self):
+        async with httpx.AsyncClient(transport=_site(1)) as client:
+            seeds, found = await site_auditor._seed_from_sitemaps(client, "example.com", [], limit=3)
+
+        assert (seeds, found) == ([], False)
+
+    async def test_seeds_are_crawled_before_discovered_links(self, monkeypatch):
+        # One worker makes the frontier order observable
+        monkeypatch.setattr(site_auditor, "MAX_CONCURRENCY", 1)
+        order: list[str] = []
+        writer = site_auditor._AuditPageWriter("audit-1")
+        async with httpx.AsyncClient(transport=self._transport(order)) as client:
+            await site_auditor._crawl_site(
+                "audit-1", "example.com", 100, [], 0.0, client, writer,
+                seed_urls=["https://example.com/new", "https://example.com/old"],
+            )
+        await writer.close()
+
+        assert order == ["/", "/new", "/old", "/nav"]
+
+
+class _RowsSession:
+    """Session whose execute() returns the given result rows in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def execute(self, statement):
+        return self.results.pop(0)
+
+
+@pytest.mark.asyncio
+class TestResume:
+    @pytest.fixture(autouse=True)
+    def _offline(self, monkeypatch, commits):
+        monkeypatch.setattr(site_auditor, "_is_safe_url", _always_safe)
+        monkeypatch.setattr(site_auditor, "run_in_parse_pool", _inline_parse)
+
+    @pytest.fixture
+    def saved(self, monkeypatch):
+        checkpoints: list = []
+
+        async def _save(audit_id, checkpoint):
+            checkpoints.append(checkpoint)
+
+        monkeypatch.setattr(site_auditor, "save_checkpoint", _save)
+        return checkpoints
+
+    async def test_restore_reloads_committed_pages(self):
+        writer = site_auditor._AuditPageWriter("audit-1")
+        db = _RowsSession(
+            [SimpleNamespace(
+                id="p1",
+                url="https://example.com",
+                status_code=200,
+                title="Home",
+                meta_description=None,
+                internal_links=["https://example.com/1"],
+                outbound_links=None,
+                content_simhash="00ff",
+            )],
+            [("critical", 2), ("warning", 1), ("notice", 4)],
+        )
+
+        await writer.restore(db)
+
+        assert writer.page_ids == {"https://example.com": "p1"}
+        assert writer.summaries[0]["internal_links"] == ["https://example.com/1"]
+        assert writer.summaries[0]["content_simhash"] == "00ff"
+        assert writer.severity_counts == {"critical": 2, "warning": 1, "info": 4}
+
+    async def test_resumes_without_refetching_committed_pages(self):
+        base = "https://example.com"
+        writer = site_auditor._AuditPageWriter("audit-1")
+        for n, url in enumerate([base, f"{base}/1", f"{base}/2"]):
+            writer.page_ids[url] = f"p{n}"
+            writer.summaries.append({
+                "url": url,
+                "title": f"Page {n}",
+                "meta_description": None,
+                "internal_links": [f"{base}/{n + 1}", f"{base}/{n + 2}"],
+            })
+        checkpoint = site_auditor.CrawlCheckpoint(
+            pending=[(2, 3, f"{base}/3")],
+            seen={url_key(u) for u in (base, f"{base}/1", f"{base}/2", f"{base}/3")},
+            discovered_order=3,
+        )
+        requested: list[str] = []
+        site = _site(6)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            return site.handler(request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            links = await site_auditor._crawl_site(
+                "audit-1", "example.com", 100, [], 0.0, client, writer, resume=checkpoint
+            )
+        await writer.close()
+
+        assert not {"/", "/1", "/2"} & set(requested)
+        # /4 was only linked from a restored page, after the checkpoint was taken
+        assert {"/3", "/4", "/5"} <= set(requested)
+        assert "https://example.com/1" in links[base]
+
+    async def test_cancelled_crawl_checkpoints_outstanding_urls(self, saved, commits):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path != "/":
+                await asyncio.Event().wait()
+            html = '<html><body><a href="/1">one</a></body></html>'
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+
+        writer = site_auditor._AuditPageWriter("audit-1", batch_size=1)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            crawl = asyncio.create_task(
+                site_auditor._crawl_site(
+                    "audit-1", "example.com", 100, [], 0.0, client, writer,
+                    seed_urls=["https://example.com/seed"], has_sitemap=True,
+                )
+            )
+            while not commits:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            crawl.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await crawl
+
+        checkpoint = saved[-1]
+        # The committed homepage is settled; the in-flight pages must be retried
+        assert {url for _t, _o, url in checkpoint.pending} == {
+            "https://example.com/seed",
+            "https://example.com/1",
+        }
+        assert url_key("https://example.com") in checkpoint.seen
+        assert checkpoint.pages_analyzed == 1
+        assert checkpoint.pages_discovered == 3
+        assert checkpoint.has_sitemap is True
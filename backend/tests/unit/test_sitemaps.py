@@ -0,0 +1,215 @@
+"""
+Unit tests for streaming sitemap parsing.
+
+Tests cover:
+- <url> and sitemap-index entries with lastmod parsing
+- Gzip-compressed sitemaps detected by magic bytes
+- Walking sitemap indexes with SSRF filtering and depth limits
+- Concurrent child-sitemap fetching under the per-host limit
+- Competitor URL discovery stopping once MAX_URLS article URLs are found
+- Competitor discovery skipping corrupt or failing sitemaps
+- Missing / malformed / corrupt gzip sitemaps yielding nothing
+- Walks skip broken sitemaps and count empty ones as fetched
+"""
+
+import asyncio
+import contextlib
+import gzip
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from services import competitor_analyzer
+from services.sitemaps import SitemapWalker, parse_lastmod, stream_sitemap
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(*entries: tuple[str, str | None]) -> str:
+    body = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{mod}</lastmod>' if mod else ''}</url>"
+        for loc, mod in entries
+    )
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'
+
+
+def _index(*locs: str) -> str:
+    body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0"?><sitemapindex {NS}>{body}</sitemapindex>'
+
+
+def _client(routes: dict[str, bytes | str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = routes.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body.encode() if isinstance(body, str) else body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _collect(agen) -> list:
+    async with contextlib.aclosing(agen) as entries:
+        return [e async for e in entries]
+
+
+async def _safe(url: str) -> bool:
+    return "blocked" not in url
+
+
+def test_parse_lastmod_formats():
+    assert parse_lastmod("2024-03-01") == datetime(2024, 3, 1, tzinfo=UTC)
+    assert parse_lastmod("2024-03-01T10:00:00Z") == datetime(2024, 3, 1, 10, tzinfo=UTC)
+    assert parse_lastmod("not a date") is None
+    assert parse_lastmod(None) is None
+
+
+@pytest.mark.asyncio
+async def test_streams_url_entries():
+    xml = _urlset(("https://a.com/x", "2024-01-02"), ("https://a.com/y", None))
+    async with _client({"https://a.com/sitemap.xml": xml}) as client:
+        entries = await _collect(stream_sitemap(client, "https://a.com/sitemap.xml"))
+
+    assert [e.loc for e in entries] == ["https://a.com/x", "https://a.com/y"]
+    assert entries[0].lastmod == datetime(2024, 1, 2, tzinfo=UTC)
+    assert entries[1].lastmod is None
+    assert not any(e.is_index for e in entries)
+
+
+@pytest.mark.asyncio
+async def test_gzip_sitemap():
+    xml = _urlset(("https://a.com/x", None))
+    async with _client({"https://a.com/sitemap.xml.gz": gzip.compress(xml.encode())}) as client:
+        entries = await _collect(stream_sitemap(client, "https://a.com/sitemap.xml.gz"))
+
+    assert [e.loc for e in entries] == ["https://a.com/x"]
+
+
+@pytest.mark.asyncio
+async def test_missing_and_malformed_sitemaps_yield_nothing():
+    async with _client({"https://a.com/bad.xml": "<html>not a sitemap"}) as client:
+        assert await _collect(stream_sitemap(client, "https://a.com/missing.xml")) == []
+        assert await _collect(stream_sitemap(client, "https://a.com/bad.xml")) == []
+
+
+@pytest.mark.asyncio
+async def test_corrupt_gzip_sitemap_yields_nothing():
+    corrupt = gzip.compress(_urlset(("https://a.com/x", None)).encode())[:12] + b"\x00" * 64
+    async with _client({"https://a.com/sitemap.xml.gz": corrupt}) as client:
+        assert await _collect(stream_sitemap(client, "https://a.com/sitemap.xml.gz")) == []
+
+
+@pytest.mark.asyncio
+async def test_walker_skips_broken_sitemaps_and_counts_empty_ones():
+    routes = {
+        "https://a.com/index.xml": _index(
+            "https://a.com/corrupt.xml.gz", "https://a.com/empty.xml", "https://a.com/s1.xml"
+        ),
+        "https://a.com/corrupt.xml.gz": b"\x1f\x8b" + b"\x00" * 64,
+        "https://a.com/empty.xml": _urlset(),
+        "https://a.com/s1.xml": _urlset(("https://a.com/1", None)),
+    }
+    async with _client(routes) as client:
+        walker = SitemapWalker(client, _safe)
+        entries = await _collect(walker.entries(["https://a.com/index.xml"]))
+        empty_walker = SitemapWalker(client, _safe)
+        assert await _collect(empty_walker.entries(["https://a.com/empty.xml"])) == []
+
+    assert [e.loc for e in entries] == ["https://a.com/1"]
+    assert walker.sitemaps_fetched == 3  # index, empty and s1
+    assert empty_walker.sitemaps_fetched == 1
+
+
+@pytest.mark.asyncio
+async def test_walker_follows_indexes_and_skips_unsafe():
+    routes = {
+        "https://a.com/index.xml": _index(
+            "https://a.com/s1.xml", "https://blocked.a.com/s2.xml", "https://a.com/nested.xml"
+        ),
+        "https://a.com/s1.xml": _urlset(("https://a.com/1", None)),
+        "https://blocked.a.com/s2.xml": _urlset(("https://a.com/2", None)),
+        "https://a.com/nested.xml": _index("https://a.com/deep.xml"),
+        "https://a.com/deep.xml": _urlset(("https://a.com/3", None)),
+    }
+    async with _client(routes) as client:
+        walker = SitemapWalker(client, _safe, max_depth=1)
+        entries = await _collect(walker.entries(["https://a.com/index.xml"]))
+
+    # deep.xml sits below max_depth; blocked.a.com fails the safety check
+    assert [e.loc for e in entries] == ["https://a.com/1"]
+    assert walker.sitemaps_fetched == 3
+
+
+@pytest.mark.asyncio
+async def test_walker_fetches_children_concurrently_per_host_limit():
+    children = [f"https://a.com/s{i}.xml" for i in range(12)]
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        url = str(request.url)
+        if url == "https://a.com/index.xml":
+            return httpx.Response(200, content=_index(*children).encode())
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=_urlset((url.replace(".xml", ""), None)).encode())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        walker = SitemapWalker(client, _safe, concurrency=8, per_host=3)
+        entries = await _collect(walker.entries(["https://a.com/index.xml"]))
+
+    assert sorted(e.loc for e in entries) == sorted(c.replace(".xml", "") for c in children)
+    assert peak == 3
+    assert walker.sitemaps_fetched == 13
+
+
+@pytest.mark.asyncio
+async def test_discover_urls_stops_at_max_urls(monkeypatch):
+    fetched: list[str] = []
+    children = [f"https://a.com/post-sitemap{i}.xml" for i in range(20)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        fetched.append(url)
+        if url == "https://a.com/sitemap.xml":
+            return httpx.Response(200, content=_index(*children).encode())
+        if url in children:
+            n = children.index(url)
+            posts = [(f"https://a.com/blog/post-{n}-{i}", None) for i in range(100)]
+            return httpx.Response(200, content=_urlset(*posts).encode())
+        return httpx.Response(404)
+
+    monkeypatch.setattr(competitor_analyzer, "_is_safe_url", _safe)
+    monkeypatch.setattr(competitor_analyzer, "MAX_URLS", 25)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        urls, _delay = await competitor_analyzer.discover_urls(client, "a.com")
+
+    assert len(urls) == 25
+    assert all(u.startswith("https://a.com/blog/post-") for u in urls)
+    # Stopped early instead of walking all 20 child sitemaps
+    assert sum(u in children for u in fetched) < len(children)
+
+
+@pytest.mark.asyncio
+async def test_discovery_skips_corrupt_and_failing_sitemaps(monkeypatch):
+    routes = {
+        "https://a.com/robots.txt": (
+            "Sitemap: https://a.com/corrupt.xml.gz\nSitemap: https://a.com/dns-error.xml\n"
+        ),
+        "https://a.com/corrupt.xml.gz": b"\x1f\x8b" + b"\x00" * 64,
+        "https://a.com/sitemap.xml": _urlset(("https://a.com/blog/post-1", None)),
+    }
+
+    async def safe(url: str) -> bool:
+        if "dns-error" in url:
+            raise OSError("name resolution failed")
+        return True
+
+    monkeypatch.setattr(competitor_analyzer, "_is_safe_url", safe)
+    async with _client(routes) as client:
+        discovery = await competitor_analyzer.discover_sitemap_entries(client, "a.com")
+
+    assert list(discovery.entries) == ["https://a.com/blog/post-1"]
@@ -149,8 +149,8 @@ export default function AnalyticsPage() {
 
   const syncMutation = useMutation({
     mutationFn: () => api.analytics.sync(),
-    onSuccess: async () => {
-      toast.success("Analytics data synced successfully!");
+    onSuccess: async (result) => {
+      toast.success(result.message || "Sync started");
       // Invalidate all analytics queries to refetch fresh data
       await queryClient.invalidateQueries({ queryKey: ["analytics"] });
     },
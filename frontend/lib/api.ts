@@ -2231,6 +2231,24 @@ export interface DailyAnalyticsListResponse {
   pages: number;
 }
 
+export interface KeywordTotals {
+  keyword: string;
+  date: string;
+  clicks: number;
+  impressions: number;
+  ctr: number;
+  position: number;
+}
+
+export interface PageTotals {
+  page_url: string;
+  date: string;
+  clicks: number;
+  impressions: number;
+  ctr: number;
+  position: number;
+}
+
 export interface TrendData {
   current: number;
   previous: number;
@@ -2247,8 +2265,8 @@ export interface AnalyticsSummary {
   impressions_trend?: TrendData;
   ctr_trend?: TrendData;
   position_trend?: TrendData;
-  top_keywords: KeywordRanking[];
-  top_pages: PagePerformance[];
+  top_keywords: KeywordTotals[];
+  top_pages: PageTotals[];
   start_date: string;
   end_date: string;
   site_url: string;
@@ -3157,6 +3175,9 @@ export interface AuditPage {
     opportunities: { id: string; title: string; description: string; display_value: string; savings_ms: number; score: number }[];
     diagnostics: { id: string; title: string; description: string; display_value: string }[];
   };
+  pagerank: number | null;
+  click_depth: number | null;
+  link_cluster: number | null;
   created_at: string;
 }
 